@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# La raíz del proyecto expone el paquete compartido `comun/` (también copiado en la imagen Docker)
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(_PROJECT_ROOT))
@@ -0,0 +1,225 @@
+"""
+Control de admisión por tipo de carga (compartimentos) y límite de peticiones por cliente.
+
+Cada ruta de /api se clasifica en una carga:
+- llm: chat, analizar-cv, comparar-tecnologias y estadísticas filtradas por rol
+  (esperan segundos a Groq)
+- cpu: generar-reporte (agrega todo jobs_clean en Python)
+- db: el resto de lecturas (ofertas, listas, estadísticas sin rol)
+
+Cada carga tiene su propio cupo de peticiones en curso y una cola acotada. Si la
+cola está llena la petición recibe 429 con Retry-After al instante, sin ocupar un
+hilo del threadpool; así una ráfaga de chat no deja sin hilos a /api/ofertas ni a
+/health. Además cada cliente (IP) tiene un token bucket por carga.
+
+Los cupos son por proceso: con varios workers el total se multiplica por WEB_CONCURRENCY.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.responses import JSONResponse
+
+ADMISION_HABILITADA = os.getenv("ADMISION_HABILITADA", "true").lower() == "true"
+CONFIAR_X_FORWARDED_FOR = os.getenv("CONFIAR_X_FORWARDED_FOR", "false").lower() == "true"
+MAX_CLIENTES_RASTREADOS = 10_000
+
+
+def _entero(nombre: str, defecto: int) -> int:
+    return int(os.getenv(nombre, str(defecto)))
+
+
+# carga -> (en curso, cola, espera máxima en cola (s), peticiones por minuto por cliente)
+CONFIG_CARGAS = {
+    "llm": (_entero("ADMISION_LLM_CONCURRENCIA", 12), _entero("ADMISION_LLM_COLA", 24),
+            float(os.getenv("ADMISION_LLM_ESPERA_S", "10")), _entero("LIMITE_LLM_POR_MINUTO", 20)),
+    "cpu": (_entero("ADMISION_CPU_CONCURRENCIA", 2), _entero("ADMISION_CPU_COLA", 8),
+            float(os.getenv("ADMISION_CPU_ESPERA_S", "10")), _entero("LIMITE_CPU_POR_MINUTO", 30)),
+    "db": (_entero("ADMISION_DB_CONCURRENCIA", 16), _entero("ADMISION_DB_COLA", 64),
+           float(os.getenv("ADMISION_DB_ESPERA_S", "5")), _entero("LIMITE_DB_POR_MINUTO", 300)),
+}
+
+RUTAS_LLM = ("/api/chat", "/api/analizar-cv", "/api/comparar-tecnologias")
+RUTAS_CPU = ("/api/generar-reporte",)
+
+ADMISION_RECHAZOS = Counter(
+    "devradar_admission_rejected_total",
+    "Peticiones rechazadas con 429 por carga y motivo (cola_llena, espera, limite_cliente)",
+    ["workload", "reason"],
+)
+CARGA_EN_CURSO = Gauge(
+    "devradar_workload_in_flight",
+    "Peticiones en curso por carga",
+    ["workload"],
+    multiprocess_mode="livesum",
+)
+CARGA_EN_COLA = Gauge(
+    "devradar_workload_queue_depth",
+    "Peticiones esperando cupo por carga",
+    ["workload"],
+    multiprocess_mode="livesum",
+)
+CARGA_ESPERA = Histogram(
+    "devradar_workload_queue_wait_seconds",
+    "Tiempo esperando cupo en la cola de la carga",
+    ["workload"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+class Rechazo(Exception):
+    """La petición no entra: se responde 429 con Retry-After."""
+
+    def __init__(self, motivo: str, reintentar_en: float):
+        super().__init__(motivo)
+        self.motivo = motivo
+        self.reintentar_en = max(1, math.ceil(reintentar_en))
+
+
+class Compartimento:
+    """Cupo de peticiones en curso con cola FIFO acotada y espera máxima."""
+
+    def __init__(self, nombre: str, concurrencia: int, cola: int, espera_max: float):
+        self.nombre = nombre
+        self.concurrencia = concurrencia
+        self.max_cola = cola
+        self.espera_max = espera_max
+        self.en_curso = 0
+        self.cola: "OrderedDict[asyncio.Future, None]" = OrderedDict()
+        # Media móvil de la duración de las peticiones, para estimar Retry-After
+        self.duracion_media = 1.0
+
+    def _estimar_espera(self) -> float:
+        return self.duracion_media * (len(self.cola) + 1) / max(self.concurrencia, 1)
+
+    async def entrar(self):
+        if self.en_curso < self.concurrencia and not self.cola:
+            self.en_curso += 1
+            CARGA_EN_CURSO.labels(self.nombre).inc()
+            return
+        if len(self.cola) >= self.max_cola:
+            raise Rechazo("cola_llena", self._estimar_espera())
+
+        turno = asyncio.get_running_loop().create_future()
+        self.cola[turno] = None
+        CARGA_EN_COLA.labels(self.nombre).inc()
+        inicio = time.perf_counter()
+        try:
+            await asyncio.wait_for(turno, self.espera_max)
+        except asyncio.TimeoutError:
+            raise Rechazo("espera", self._estimar_espera())
+        except asyncio.CancelledError:
+            # El cupo pudo llegar justo cuando el cliente se desconectó: se devuelve
+            if turno.done() and not turno.cancelled():
+                self.salir(0)
+            raise
+        finally:
+            # Si sigue en la cola es que no le llegó el cupo: se retira
+            self.cola.pop(turno, None)
+            CARGA_EN_COLA.labels(self.nombre).dec()
+            CARGA_ESPERA.labels(self.nombre).observe(time.perf_counter() - inicio)
+
+    def salir(self, duracion: float):
+        if duracion:
+            self.duracion_media = 0.9 * self.duracion_media + 0.1 * duracion
+        # El cupo pasa directo al primero de la cola (no se libera para no perder el orden)
+        while self.cola:
+            turno, _ = self.cola.popitem(last=False)
+            if not turno.done():
+                turno.set_result(None)
+                return
+        self.en_curso -= 1
+        CARGA_EN_CURSO.labels(self.nombre).dec()
+
+
+class LimitadorClientes:
+    """Token bucket por cliente: `por_minuto` peticiones sostenidas con ráfaga del mismo tamaño."""
+
+    def __init__(self, por_minuto: int):
+        self.capacidad = float(por_minuto)
+        self.tasa = por_minuto / 60.0
+        self.cubetas: "OrderedDict[str, list[float]]" = OrderedDict()
+
+    def consumir(self, cliente: str):
+        if self.tasa <= 0:
+            return
+        ahora = time.monotonic()
+        tokens, ultimo = self.cubetas.pop(cliente, (self.capacidad, ahora))
+        tokens = min(self.capacidad, tokens + (ahora - ultimo) * self.tasa)
+        if tokens < 1:
+            self.cubetas[cliente] = [tokens, ahora]
+            raise Rechazo("limite_cliente", (1 - tokens) / self.tasa)
+        self.cubetas[cliente] = [tokens - 1, ahora]
+        if len(self.cubetas) > MAX_CLIENTES_RASTREADOS:
+            self.cubetas.popitem(last=False)
+
+
+COMPARTIMENTOS = {nombre: Compartimento(nombre, c, q, e) for nombre, (c, q, e, _) in CONFIG_CARGAS.items()}
+LIMITADORES = {nombre: LimitadorClientes(por_minuto) for nombre, (_, _, _, por_minuto) in CONFIG_CARGAS.items()}
+
+
+def hilos_necesarios() -> int:
+    """Hilos del threadpool que pueden ocupar a la vez todas las cargas admitidas."""
+    return sum(c.concurrencia for c in COMPARTIMENTOS.values())
+
+
+def clasificar_carga(metodo: str, ruta: str, query_string: bytes) -> str | None:
+    """Carga de una petición o None si no pasa por admisión (/health, /ready, /metrics, CORS)."""
+    if metodo == "OPTIONS" or not ruta.startswith("/api/"):
+        return None
+    if ruta in RUTAS_LLM:
+        return "llm"
+    if ruta in RUTAS_CPU:
+        return "cpu"
+    if ruta.startswith("/api/estadisticas/") and parse_qs(query_string.decode("latin-1")).get("rol", [""])[0].strip():
+        # Con rol se valida el término con Groq
+        return "llm"
+    return "db"
+
+
+def _cliente(scope) -> str:
+    if CONFIAR_X_FORWARDED_FOR:
+        for nombre, valor in scope.get("headers") or []:
+            if nombre == b"x-forwarded-for":
+                return valor.decode("latin-1").split(",")[0].strip()
+    cliente = scope.get("client")
+    return cliente[0] if cliente else "desconocido"
+
+
+class AdmisionMiddleware:
+    """Middleware ASGI: límite por cliente y compartimento por carga antes de llegar al endpoint."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        carga = None
+        if ADMISION_HABILITADA and scope["type"] == "http":
+            carga = clasificar_carga(scope["method"], scope["path"], scope.get("query_string", b""))
+        if carga is None:
+            await self.app(scope, receive, send)
+            return
+
+        compartimento = COMPARTIMENTOS[carga]
+        try:
+            LIMITADORES[carga].consumir(_cliente(scope))
+            await compartimento.entrar()
+        except Rechazo as r:
+            ADMISION_RECHAZOS.labels(carga, r.motivo).inc()
+            respuesta = JSONResponse(
+                {"detail": "Demasiadas peticiones, intenta de nuevo en unos segundos.", "motivo": r.motivo},
+                status_code=429,
+                headers={"Retry-After": str(r.reintentar_en)},
+            )
+            await respuesta(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            compartimento.salir(time.perf_counter() - inicio)
@@ -0,0 +1,65 @@
+"""
+Precarga en segundo plano al arrancar la API y estado de preparación para /ready.
+
+Importar la app ya no carga torch ni el modelo: /health responde en cuanto uvicorn
+levanta, y el lifespan de main.py lanza precargar() en un hilo. /ready responde 200
+recién cuando el motor de embeddings está caliente.
+"""
+import os
+import time
+
+from app.embeddings import modelo_cargado, precargar_modelo
+
+PRECARGAR_MODELOS = os.getenv("PRECARGAR_MODELOS", "true").lower() == "true"
+
+_estado: dict = {"inicio": None, "segundos": None, "error": None}
+
+
+def precargar():
+    """Carga el modelo de embeddings y adelanta los imports/clientes de Groq y Supabase."""
+    _estado["inicio"] = time.monotonic()
+    print("⏳ Precargando modelo de embeddings...")
+    try:
+        precargar_modelo()
+        _estado["segundos"] = round(time.monotonic() - _estado["inicio"], 2)
+        print(f"✅ Modelo de embeddings listo en {_estado['segundos']} s")
+    except Exception as e:
+        _estado["error"] = str(e)
+        print(f"❌ Falló la precarga del modelo de embeddings: {e}")
+
+    # No afectan a /ready: solo evitan que la primera petición pague estos imports
+    # y arman el corrector ortográfico y el clasificador local (hasta entonces se valida con Groq)
+    try:
+        from app.database import get_supabase
+        get_supabase()
+    except Exception as e:
+        print(f"⚠️ No se pudo precargar el cliente de Supabase: {e}")
+    try:
+        import langchain_core.messages  # noqa: F401
+        import langchain_groq  # noqa: F401
+    except Exception as e:
+        print(f"⚠️ No se pudo precargar langchain_groq: {e}")
+    from app.services.ortografia_service import precargar_indice
+    precargar_indice()
+    if _estado["error"] is None:
+        from app.services.clasificador_service import precargar_clasificador
+        precargar_clasificador()
+
+
+def estado_preparacion() -> dict:
+    """Estado para /ready. Sin precarga, el modelo se carga en la primera petición que lo use."""
+    if modelo_cargado():
+        embedding = "listo"
+    elif _estado["error"]:
+        embedding = "error"
+    elif not PRECARGAR_MODELOS:
+        embedding = "bajo_demanda"
+    else:
+        embedding = "cargando"
+
+    return {
+        "listo": embedding in ("listo", "bajo_demanda"),
+        "embedding": embedding,
+        "segundos_precarga": _estado["segundos"],
+        "error": _estado["error"],
+    }
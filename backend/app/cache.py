@@ -0,0 +1,112 @@
+"""
+Caché de resultados para endpoints costosos.
+Usa Redis si está disponible (REDIS_URL) y cae a memoria local con TTL si no.
+"""
+import json
+import os
+import time
+from typing import Any
+
+from app.database import ejecutar, get_supabase
+from app.metrics import medir
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_ENABLED = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+
+# Cada cuánto se vuelve a consultar la versión de datos de jobs_clean (segundos)
+DATA_VERSION_TTL = int(os.getenv("DATA_VERSION_TTL", "60"))
+MAX_MEMORY_ITEMS = 1000
+
+_redis_client = None
+_memory_cache: dict[str, tuple[float, str]] = {}
+_data_version: tuple[float, str] | None = None
+
+
+def get_redis_client():
+    """Retorna un cliente singleton de Redis, o None si está deshabilitado o no instalado."""
+    global _redis_client
+    if not REDIS_ENABLED:
+        return None
+    if _redis_client is None:
+        try:
+            import redis
+            _redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+        except Exception as e:
+            print(f"Redis no disponible, usando memoria: {e}")
+            return None
+    return _redis_client
+
+
+def _memory_get(key: str) -> str | None:
+    item = _memory_cache.get(key)
+    if item is None:
+        return None
+    expira, valor = item
+    if expira < time.monotonic():
+        _memory_cache.pop(key, None)
+        return None
+    return valor
+
+
+def _memory_set(key: str, valor: str, ttl: int):
+    ahora = time.monotonic()
+    if len(_memory_cache) >= MAX_MEMORY_ITEMS:
+        for k in [k for k, (expira, _) in _memory_cache.items() if expira < ahora]:
+            _memory_cache.pop(k, None)
+        # Si sigue lleno, descartamos las entradas más antiguas (orden de inserción)
+        while len(_memory_cache) >= MAX_MEMORY_ITEMS:
+            _memory_cache.pop(next(iter(_memory_cache)))
+    _memory_cache[key] = (ahora + ttl, valor)
+
+
+def cache_get_json(key: str) -> Any | None:
+    """Lee un valor JSON de la caché. Retorna None si no existe o expiró."""
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            with medir("redis"):
+                valor = redis_client.get(key)
+            return json.loads(valor) if valor else None
+        except Exception:
+            pass
+    valor = _memory_get(key)
+    return json.loads(valor) if valor else None
+
+
+def cache_set_json(key: str, value: Any, ttl: int):
+    """Guarda un valor JSON con expiración (segundos)."""
+    valor = json.dumps(value, ensure_ascii=False)
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            with medir("redis"):
+                redis_client.setex(key, ttl, valor)
+            return
+        except Exception:
+            pass
+    _memory_set(key, valor, ttl)
+
+
+def get_data_version() -> str:
+    """
+    Versión de los datos de jobs_clean (total de filas + último id).
+    Cambia cuando el limpiador inserta ofertas nuevas, así las claves de caché
+    que la incluyen se invalidan solas. Se consulta como máximo cada DATA_VERSION_TTL.
+    """
+    global _data_version
+    ahora = time.monotonic()
+    if _data_version and _data_version[0] > ahora:
+        return _data_version[1]
+
+    try:
+        sb = get_supabase()
+        r = ejecutar(sb.table("jobs_clean").select("id", count="exact").order("id", desc=True).limit(1))
+        ultimo_id = r.data[0]["id"] if r.data else 0
+        version = f"{r.count or 0}-{ultimo_id}"
+    except Exception as e:
+        print(f"No se pudo obtener la versión de datos: {e}")
+        # Sin versión confiable, no reutilizamos resultados entre ventanas
+        version = f"t{int(time.time() // max(DATA_VERSION_TTL, 1))}"
+
+    _data_version = (ahora + DATA_VERSION_TTL, version)
+    return version
@@ -1,20 +1,45 @@
-from supabase import create_client, Client
+from __future__ import annotations
+
 import os
+from typing import TYPE_CHECKING
+
+from app.metrics import medir
+from app.resiliencia import BREAKER_SUPABASE
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
+# Tiempo máximo por consulta a PostgREST (tablas y rpc); el cliente trae 120 s por defecto
+SUPABASE_TIMEOUT_S = float(os.getenv("SUPABASE_TIMEOUT_S", "10"))
+
 _SUPABASE_CLIENT: Client | None = None
 
 
 def get_supabase() -> Client:
     """
     Retorna un cliente singleton de Supabase.
+    El paquete supabase se importa aquí (no al importar la app) para acortar el arranque.
     """
     global _SUPABASE_CLIENT
 
     if _SUPABASE_CLIENT is None:
+        from supabase import ClientOptions, create_client
+
         _SUPABASE_CLIENT = create_client(
             os.getenv("SUPABASE_URL"),
             os.getenv("SUPABASE_KEY"),
+            options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT_S),
         )
 
     return _SUPABASE_CLIENT
+
+
+def ejecutar(query, etapa: str = "supabase"):
+    """
+    Ejecuta una consulta de Supabase (table/rpc) midiendo su latencia.
+    Usar siempre en lugar de query.execute() para que quede en /metrics y Server-Timing
+    y pase por el circuit breaker (lanza CircuitoAbierto si Supabase está caído).
+    """
+    with BREAKER_SUPABASE.proteger(), medir(etapa):
+        return query.execute()
@@ -1,8 +1,101 @@
-from sentence_transformers import SentenceTransformer
+"""
+Motor de embeddings (MiniLM) compartido por toda la API.
+
+El modelo se carga la primera vez que se necesita, o antes en segundo plano desde
+el lifespan de main.py (precargar_modelo); así importar la app no arrastra torch.
+En la imagen Docker los pesos vienen empaquetados y se cargan mapeados en memoria
+sin acceso al hub (ver comun/modelo_embeddings.py).
+
+Con EMBEDDINGS_SIDECAR_SOCKET los workers no cargan el modelo: piden los vectores al
+sidecar (app/embeddings_sidecar.py). Si el sidecar no responde se usa el modelo
+local y se vuelve a probar el sidecar pasados EMBEDDINGS_SIDECAR_REINTENTO_S.
+"""
+import os
+import threading
+import time
 from typing import List
 
+from app.embeddings_sidecar import SIDECAR_SOCKET, ClienteSidecar, ErrorSidecar
+from app.metrics import medir
+from comun.modelo_embeddings import MODEL_ID, cargar_sentence_transformer
+
 # Debe ser EL MISMO modelo que usaste para poblar jobs_clean.embedding
-_MODEL = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+MODEL_NAME = MODEL_ID
+
+SIDECAR_TIMEOUT = float(os.getenv("EMBEDDINGS_SIDECAR_TIMEOUT", "5"))
+SIDECAR_REINTENTO_S = float(os.getenv("EMBEDDINGS_SIDECAR_REINTENTO_S", "30"))
+SIDECAR_ESPERA_S = float(os.getenv("EMBEDDINGS_SIDECAR_ESPERA_S", "120"))
+
+_MODEL = None
+_MODEL_LOCK = threading.Lock()
+
+_sidecar = ClienteSidecar(SIDECAR_SOCKET, SIDECAR_TIMEOUT) if SIDECAR_SOCKET else None
+_sidecar_listo = False
+_sidecar_caido_hasta = 0.0
+
+
+def get_model():
+    """Retorna el SentenceTransformer singleton, cargándolo si hace falta (thread-safe)."""
+    global _MODEL
+    if _MODEL is None:
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = cargar_sentence_transformer()
+    return _MODEL
+
+
+def modelo_cargado() -> bool:
+    return _MODEL is not None or _sidecar_listo
+
+
+def _sidecar_disponible() -> bool:
+    return _sidecar is not None and time.monotonic() >= _sidecar_caido_hasta
+
+
+def _marcar_sidecar_caido(error: Exception):
+    global _sidecar_caido_hasta
+    if time.monotonic() >= _sidecar_caido_hasta:
+        print(f"⚠️ Sidecar de embeddings sin respuesta ({error}); se usa el modelo local "
+              f"y se reintenta en {SIDECAR_REINTENTO_S:.0f} s")
+    _sidecar_caido_hasta = time.monotonic() + SIDECAR_REINTENTO_S
+
+
+def precargar_modelo():
+    """
+    Deja listo el motor de embeddings: espera al sidecar si está configurado
+    (arranca a la par de los workers) o carga el modelo local y lo calienta.
+    """
+    global _sidecar_listo
+    if _sidecar is not None:
+        limite = time.monotonic() + SIDECAR_ESPERA_S
+        while time.monotonic() < limite:
+            if _sidecar.ping():
+                _sidecar_listo = True
+                print(f"✅ Embeddings vía sidecar en {_sidecar.ruta}")
+                return
+            time.sleep(0.5)
+        _marcar_sidecar_caido(TimeoutError(f"no respondió en {SIDECAR_ESPERA_S:.0f} s"))
+
+    with medir("carga_modelo"):
+        get_model().encode("calentamiento", normalize_embeddings=True)
+
+
+def embed_texts(textos: List[str], tamano_lote: int = 128) -> List[List[float]]:
+    """Embeddings normalizados de varios textos en lotes (sidecar o modelo local)."""
+    vectores: List[List[float]] = []
+    for i in range(0, len(textos), tamano_lote):
+        lote = textos[i:i + tamano_lote]
+        if _sidecar_disponible():
+            try:
+                with medir("embedding"):
+                    vectores.extend(_sidecar.embeber(lote))
+                continue
+            except (OSError, ErrorSidecar, ValueError) as e:
+                _marcar_sidecar_caido(e)
+        model = get_model()
+        with medir("embedding"):
+            vectores.extend(model.encode(lote, normalize_embeddings=True, batch_size=tamano_lote).tolist())
+    return vectores
 
 
 def embed_text(text: str) -> List[float]:
@@ -10,9 +103,18 @@ def embed_text(text: str) -> List[float]:
     Genera embedding normalizado para un texto.
     Retorna un vector de 384 dimensiones.
     """
-    embedding = _MODEL.encode(
-        text,
-        normalize_embeddings=True
-    )
+    if _sidecar_disponible():
+        try:
+            with medir("embedding"):
+                return _sidecar.embeber([text])[0]
+        except (OSError, ErrorSidecar, ValueError) as e:
+            _marcar_sidecar_caido(e)
+
+    model = get_model()
+    with medir("embedding"):
+        embedding = model.encode(
+            text,
+            normalize_embeddings=True
+        )
 
     return embedding.tolist()
@@ -0,0 +1,236 @@
+"""
+Sidecar de embeddings: un solo proceso con MiniLM que atiende a todos los workers.
+
+Con N workers de uvicorn cada uno cargaría su propia copia del modelo (y de torch).
+El sidecar es dueño del modelo, escucha en un socket Unix y agrupa en lotes las
+peticiones que llegan casi juntas (una sola llamada a encode por lote). Los workers
+usan ClienteSidecar desde app/embeddings.py y, si el sidecar no responde, vuelven
+a cargar el modelo en su propio proceso.
+
+Protocolo (conexiones persistentes, un mensaje tras otro):
+    petición:  4 bytes big-endian con el largo + JSON {"textos": [...]}
+    respuesta: 4 bytes con el largo + JSON {"n": n, "dim": d} (o {"error": "..."})
+               seguido de n * d float32 en el orden de bytes de la máquina.
+Una petición con "textos": [] sirve de ping.
+
+Uso (desde backend/):
+    EMBEDDINGS_SIDECAR_SOCKET=/tmp/devradar-embeddings.sock python -m app.embeddings_sidecar
+"""
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+from array import array
+
+SIDECAR_SOCKET = os.getenv("EMBEDDINGS_SIDECAR_SOCKET", "")
+SOCKET_POR_DEFECTO = "/tmp/devradar-embeddings.sock"
+MAX_LOTE = int(os.getenv("EMBEDDINGS_SIDECAR_MAX_LOTE", "64"))
+ESPERA_LOTE_MS = float(os.getenv("EMBEDDINGS_SIDECAR_ESPERA_MS", "2"))
+MAX_TEXTOS_PETICION = 256
+
+_CABECERA = struct.Struct(">I")
+
+
+class ErrorSidecar(Exception):
+    """El sidecar respondió con error o cortó la conexión."""
+
+
+# =============================================================================
+# Cliente (workers de la API)
+# =============================================================================
+
+def _recibir_exacto(conexion: socket.socket, n: int) -> bytes:
+    partes = []
+    while n:
+        parte = conexion.recv(n)
+        if not parte:
+            raise ErrorSidecar("El sidecar cerró la conexión")
+        partes.append(parte)
+        n -= len(parte)
+    return b"".join(partes)
+
+
+class ClienteSidecar:
+    """Cliente síncrono con una conexión por hilo (los endpoints corren en el threadpool)."""
+
+    def __init__(self, ruta: str, timeout: float = 5.0):
+        self.ruta = ruta
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conexion(self) -> socket.socket:
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conexion.settimeout(self.timeout)
+            try:
+                conexion.connect(self.ruta)
+            except OSError:
+                conexion.close()
+                raise
+            self._local.conexion = conexion
+        return conexion
+
+    def _cerrar(self):
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
+
+    def embeber(self, textos: list[str]) -> list[list[float]]:
+        """Vectores normalizados para `textos`. Lanza OSError/ErrorSidecar si no responde."""
+        cuerpo = json.dumps({"textos": textos}).encode()
+        try:
+            conexion = self._conexion()
+            conexion.sendall(_CABECERA.pack(len(cuerpo)) + cuerpo)
+            largo, = _CABECERA.unpack(_recibir_exacto(conexion, _CABECERA.size))
+            cabecera = json.loads(_recibir_exacto(conexion, largo))
+            if "error" in cabecera:
+                raise ErrorSidecar(cabecera["error"])
+            n, dim = cabecera["n"], cabecera["dim"]
+            valores = array("f")
+            valores.frombytes(_recibir_exacto(conexion, n * dim * valores.itemsize))
+        except (OSError, ErrorSidecar, ValueError):
+            # La conexión puede quedar a mitad de un mensaje: se abre otra la próxima vez
+            self._cerrar()
+            raise
+        return [valores[i * dim:(i + 1) * dim].tolist() for i in range(n)]
+
+    def ping(self) -> bool:
+        try:
+            self.embeber([])
+            return True
+        except (OSError, ErrorSidecar, ValueError):
+            return False
+
+
+# =============================================================================
+# Servidor (proceso sidecar)
+# =============================================================================
+
+class AgrupadorLotes:
+    """Junta textos de varias conexiones y los codifica en una sola llamada al modelo."""
+
+    def __init__(self, modelo, max_lote: int = MAX_LOTE, espera_ms: float = ESPERA_LOTE_MS):
+        self.modelo = modelo
+        self.max_lote = max_lote
+        self.espera = espera_ms / 1000
+        self.cola: asyncio.Queue = asyncio.Queue()
+        self.lotes = 0
+        self.textos = 0
+
+    async def embeber(self, textos: list[str]):
+        futuro = asyncio.get_running_loop().create_future()
+        await self.cola.put((textos, futuro))
+        return await futuro
+
+    async def bucle(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pendientes = [await self.cola.get()]
+            total = len(pendientes[0][0])
+            limite = loop.time() + self.espera
+            while total < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.cola.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                pendientes.append(item)
+                total += len(item[0])
+
+            textos = [t for lote, _ in pendientes for t in lote]
+            try:
+                vectores = await asyncio.to_thread(
+                    self.modelo.encode, textos, normalize_embeddings=True,
+                    batch_size=self.max_lote, convert_to_numpy=True,
+                )
+            except Exception as e:
+                for _, futuro in pendientes:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+
+            self.lotes += 1
+            self.textos += len(textos)
+            inicio = 0
+            for lote, futuro in pendientes:
+                if not futuro.done():
+                    futuro.set_result(vectores[inicio:inicio + len(lote)])
+                inicio += len(lote)
+
+
+async def _responder(escritor: asyncio.StreamWriter, cabecera: dict, datos: bytes = b""):
+    cuerpo = json.dumps(cabecera).encode()
+    escritor.write(_CABECERA.pack(len(cuerpo)) + cuerpo + datos)
+    await escritor.drain()
+
+
+async def _atender(agrupador: AgrupadorLotes, dim: int, lector: asyncio.StreamReader,
+                   escritor: asyncio.StreamWriter):
+    try:
+        while True:
+            try:
+                largo, = _CABECERA.unpack(await lector.readexactly(_CABECERA.size))
+                textos = json.loads(await lector.readexactly(largo))["textos"]
+            except asyncio.IncompleteReadError:
+                break
+            except (ValueError, KeyError, TypeError):
+                await _responder(escritor, {"error": "Petición inválida"})
+                break
+
+            if not textos:
+                await _responder(escritor, {"n": 0, "dim": dim})
+                continue
+            if len(textos) > MAX_TEXTOS_PETICION:
+                await _responder(escritor, {"error": f"Máximo {MAX_TEXTOS_PETICION} textos por petición"})
+                continue
+            try:
+                vectores = await agrupador.embeber([str(t) for t in textos])
+            except Exception as e:
+                await _responder(escritor, {"error": str(e)})
+                continue
+            await _responder(escritor, {"n": len(textos), "dim": dim}, vectores.astype("float32").tobytes())
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(ruta: str):
+    from app.embeddings import get_model
+
+    print("⏳ Sidecar: cargando modelo de embeddings...")
+    modelo = await asyncio.to_thread(get_model)
+    dim = modelo.get_sentence_embedding_dimension()
+    modelo.encode("calentamiento", normalize_embeddings=True)
+
+    agrupador = AgrupadorLotes(modelo)
+    tarea_lotes = asyncio.create_task(agrupador.bucle())
+
+    # Un socket de una corrida anterior impide el bind
+    if os.path.exists(ruta):
+        os.unlink(ruta)
+    servidor = await asyncio.start_unix_server(
+        lambda lector, escritor: _atender(agrupador, dim, lector, escritor), path=ruta,
+    )
+    os.chmod(ruta, 0o660)
+    print(f"✅ Sidecar de embeddings escuchando en {ruta} (dim {dim}, lotes de hasta {agrupador.max_lote})")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        tarea_lotes.cancel()
+        if os.path.exists(ruta):
+            os.unlink(ruta)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(servir(SIDECAR_SOCKET or SOCKET_POR_DEFECTO))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,219 @@
+"""
+Extracción de texto de CVs (PDF/DOCX).
+
+Backends de PDF intercambiables: pypdfium2 (rápido, opcional) y pypdf (fallback).
+El orden se configura con PDF_EXTRACTORES. La extracción puede correr en un
+subproceso aislado con límite de memoria y tiempo, para que un PDF malicioso o
+gigante no deje un worker de la API bloqueado.
+"""
+import io
+import itertools
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import BinaryIO, Callable, Iterator
+
+# Límites de extracción de CVs: basta con el inicio del documento para validar y comparar
+MAX_CHARS_EXTRACCION = 20000
+MAX_PAGINAS_PDF = 10
+TIMEOUT_EXTRACCION = 15.0  # segundos
+
+# Orden de preferencia de backends PDF (se usa el primero que funcione)
+PDF_EXTRACTORES = [
+    x.strip() for x in os.getenv("PDF_EXTRACTORES", "pypdfium2,pypdf").split(",") if x.strip()
+]
+# Aislamiento en subproceso (desactivar solo para depuración local)
+EXTRACCION_AISLADA = os.getenv("EXTRACCION_AISLADA", "true").lower() == "true"
+LIMITE_MEMORIA_EXTRACCION_MB = int(os.getenv("LIMITE_MEMORIA_EXTRACCION_MB", "512"))
+
+
+def _paginas_pypdfium2(stream: BinaryIO, max_paginas: int) -> Iterator[str]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(stream)
+    try:
+        for i in range(min(len(pdf), max_paginas)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+
+def _paginas_pypdf(stream: BinaryIO, max_paginas: int) -> Iterator[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(stream)
+    for page in itertools.islice(reader.pages, max_paginas):
+        yield page.extract_text() or ""
+
+
+BACKENDS_PDF: dict[str, Callable[[BinaryIO, int], Iterator[str]]] = {
+    "pypdfium2": _paginas_pypdfium2,
+    "pypdf": _paginas_pypdf,
+}
+
+
+def _acumular(fragmentos: Iterator[str], max_chars: int, timeout: float) -> str:
+    """Junta fragmentos hasta max_chars o hasta agotar el tiempo (verificado entre fragmentos)."""
+    inicio = time.monotonic()
+    partes: list[str] = []
+    total = 0
+    for fragmento in fragmentos:
+        partes.append(fragmento)
+        total += len(fragmento) + 1
+        if total >= max_chars:
+            break
+        if time.monotonic() - inicio > timeout:
+            if not "".join(partes).strip():
+                raise TimeoutError(f"La extracción superó {timeout:.0f} s sin obtener texto")
+            break
+    return " ".join(partes)[:max_chars]
+
+
+def extraer_texto_pdf(
+    stream: BinaryIO,
+    max_chars: int = MAX_CHARS_EXTRACCION,
+    max_paginas: int = MAX_PAGINAS_PDF,
+    timeout: float = TIMEOUT_EXTRACCION,
+    backends: list[str] | None = None,
+) -> str:
+    """
+    Extrae texto de un PDF probando los backends en orden.
+    Si un backend no está instalado o falla con el documento, se intenta el siguiente.
+    """
+    errores = []
+    for nombre in backends or PDF_EXTRACTORES:
+        backend = BACKENDS_PDF.get(nombre)
+        if backend is None:
+            continue
+        stream.seek(0)
+        try:
+            return _acumular(backend(stream, max_paginas), max_chars, timeout)
+        except ImportError:
+            continue
+        except TimeoutError:
+            raise
+        except Exception as e:
+            errores.append(f"{nombre}: {e}")
+    if errores:
+        raise ValueError("; ".join(errores))
+    raise RuntimeError("No hay ningún backend de PDF instalado (pypdfium2 o pypdf)")
+
+
+def extraer_texto_archivo(
+    contenido: bytes | BinaryIO,
+    filename: str,
+    max_chars: int = MAX_CHARS_EXTRACCION,
+    max_paginas: int = MAX_PAGINAS_PDF,
+    timeout: float = TIMEOUT_EXTRACCION,
+) -> str:
+    """
+    Extrae texto de PDF o DOCX según extensión del archivo, en el proceso actual.
+    Se detiene al juntar max_chars caracteres, al llegar a max_paginas (PDF) o al
+    superar timeout segundos (verificado entre páginas/párrafos).
+    """
+    stream = io.BytesIO(contenido) if isinstance(contenido, (bytes, bytearray)) else contenido
+
+    name_lower = (filename or "").lower()
+    if name_lower.endswith(".pdf"):
+        return extraer_texto_pdf(stream, max_chars, max_paginas, timeout)
+    if name_lower.endswith(".docx"):
+        from docx import Document
+        doc = Document(stream)
+        return _acumular((p.text for p in doc.paragraphs), max_chars, timeout)
+    raise ValueError("Solo se soportan archivos PDF y DOCX")
+
+
+# =============================================================================
+# Ejecución aislada en subproceso
+# =============================================================================
+
+def _limitar_recursos(limite_memoria_mb: int, limite_cpu_s: int):
+    """Aplica límites de memoria y CPU al proceso actual (solo Unix)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    limite_bytes = limite_memoria_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limite_bytes, limite_bytes))
+    resource.setrlimit(resource.RLIMIT_CPU, (limite_cpu_s, limite_cpu_s + 1))
+
+
+def _trabajador(ruta: str, filename: str, max_chars: int, max_paginas: int, timeout: float,
+                limite_memoria_mb: int, conn):
+    try:
+        _limitar_recursos(limite_memoria_mb, int(timeout) + 1)
+        with open(ruta, "rb") as f:
+            texto = extraer_texto_archivo(f, filename, max_chars, max_paginas, timeout)
+        conn.send(("ok", texto))
+    except MemoryError:
+        conn.send(("error", "El documento excede el límite de memoria para extracción"))
+    except BaseException as e:
+        conn.send(("error", str(e) or type(e).__name__))
+    finally:
+        conn.close()
+
+
+def _contexto_mp():
+    # forkserver/spawn: el hijo no hereda la memoria del proceso de la API (modelo, torch),
+    # así el límite RLIMIT_AS aplica solo a lo que usa la extracción.
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def extraer_texto_aislado(
+    contenido: BinaryIO,
+    filename: str,
+    max_chars: int = MAX_CHARS_EXTRACCION,
+    max_paginas: int = MAX_PAGINAS_PDF,
+    timeout: float = TIMEOUT_EXTRACCION,
+    limite_memoria_mb: int = LIMITE_MEMORIA_EXTRACCION_MB,
+) -> str:
+    """
+    Ejecuta extraer_texto_archivo en un subproceso con límite de memoria y tiempo.
+    Si el subproceso no responde en timeout (+ margen de arranque) se mata y se
+    lanza TimeoutError. Con EXTRACCION_AISLADA=false corre en el proceso actual.
+    """
+    if not EXTRACCION_AISLADA:
+        return extraer_texto_archivo(contenido, filename, max_chars, max_paginas, timeout)
+
+    sufijo = os.path.splitext(filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=sufijo) as tmp:
+        contenido.seek(0)
+        shutil.copyfileobj(contenido, tmp)
+        tmp.flush()
+
+        ctx = _contexto_mp()
+        padre, hijo = ctx.Pipe(duplex=False)
+        proceso = ctx.Process(
+            target=_trabajador,
+            args=(tmp.name, filename, max_chars, max_paginas, timeout, limite_memoria_mb, hijo),
+            daemon=True,
+        )
+        proceso.start()
+        hijo.close()
+        try:
+            # Margen de 2 s para el arranque del subproceso
+            if not padre.poll(timeout + 2):
+                raise TimeoutError(f"La extracción superó {timeout:.0f} s")
+            estado, resultado = padre.recv()
+        except EOFError:
+            raise ValueError("El proceso de extracción terminó inesperadamente (documento inválido)") from None
+        finally:
+            if proceso.is_alive():
+                proceso.kill()
+            proceso.join(1)
+            padre.close()
+
+    if estado != "ok":
+        raise ValueError(resultado)
+    return resultado
@@ -5,27 +5,54 @@ Requiere GROQ_API_KEY en .env (cargado desde main.py).
 import json
 import os
 
+from app.metrics import medir
+from app.resiliencia import BREAKER_GROQ
+
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Deadline por llamada HTTP a Groq y reintentos del cliente (langchain_groq trae 2 sin timeout)
+GROQ_TIMEOUT_S = float(os.getenv("GROQ_TIMEOUT_S", "20"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "1"))
+
+
+def crear_llm(modelo: str = "llama-3.3-70b-versatile", temperatura: float = 0, api_key: str | None = None):
+    """ChatGroq con el timeout y los reintentos configurados."""
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        model=modelo,
+        temperature=temperatura,
+        api_key=api_key or GROQ_API_KEY,
+        timeout=GROQ_TIMEOUT_S,
+        max_retries=GROQ_MAX_RETRIES,
+    )
+
+
+def invocar_llm(llm, mensajes):
+    """
+    llm.invoke(mensajes) medido como etapa 'llm' (métricas y Server-Timing) y
+    protegido por el circuit breaker de Groq: abierto, lanza CircuitoAbierto al
+    instante y el llamador usa su fallback.
+    """
+    with BREAKER_GROQ.proteger(), medir("llm"):
+        return llm.invoke(mensajes)
 
 
-def validar_es_cv(texto: str) -> tuple[bool, str | None]:
+def validar_es_cv(texto: str) -> tuple[bool, str | None, bool]:
     """
     Valida si el documento es un CV DE TECNOLOGÍA usando Groq.
     Filtra perfiles no-tech (Chefs, Abogados, etc.).
+    Devuelve (es_cv, tipo_documento, veredicto_llm): veredicto_llm es False cuando
+    se dejó pasar sin respuesta de Groq (sin key, error o breaker abierto), y ese
+    "sí" no se debe cachear.
     """
     if not GROQ_API_KEY:
         # Si no hay API key, dejamos pasar por defecto para no bloquear
-        return True, None
+        return True, None, False
 
     try:
-        from langchain_groq import ChatGroq
         from langchain_core.messages import HumanMessage, SystemMessage
 
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0,
-            api_key=GROQ_API_KEY,
-        )
+        llm = crear_llm()
 
         # --- PROMPT ESTRICTO DE RECLUTADOR IT ---
         system = """Eres un Reclutador Técnico Senior (IT Recruiter) estricto.
@@ -57,7 +84,7 @@ Si rechazas porque no es un CV, pon qué es (Ej: "Receta de cocina").
 
 Responde solo con el JSON."""
 
-        response = llm.invoke([SystemMessage(content=system), HumanMessage(content=human)])
+        response = invocar_llm(llm, [SystemMessage(content=system), HumanMessage(content=human)])
         text = response.content if hasattr(response, "content") else str(response)
         text = text.strip()
 
@@ -73,12 +100,12 @@ Responde solo con el JSON."""
         es_cv = data.get("es_cv", False)
         tipo = data.get("tipo_documento")
 
-        return bool(es_cv), None if es_cv else str(tipo)
+        return bool(es_cv), None if es_cv else str(tipo), True
 
     except Exception as e:
         print(f"Validación CV con Groq falló: {e}")
         # Fail Open: Si la IA falla, dejamos pasar el archivo
-        return True, None
+        return True, None, False
 
 
 def _fallback_veredicto(
@@ -120,14 +147,9 @@ def generar_veredicto_comparacion(
         )
 
     try:
-        from langchain_groq import ChatGroq
         from langchain_core.messages import HumanMessage, SystemMessage
 
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0,
-            api_key=GROQ_API_KEY,
-        )
+        llm = crear_llm()
 
         system = """Eres un analista del mercado laboral IT. Redactas conclusiones OBJETIVAS y NEUTRALES.
 No declares ganador. No favorezcas a una tecnología sobre otra.
@@ -153,7 +175,7 @@ Tecnología B: {tecnologia_b}
 
 Genera el JSON. Solo JSON, sin markdown."""
 
-        response = llm.invoke([SystemMessage(content=system), HumanMessage(content=human)])
+        response = invocar_llm(llm, [SystemMessage(content=system), HumanMessage(content=human)])
         text = response.content if hasattr(response, "content") else str(response)
 
         text = text.strip()
@@ -0,0 +1,150 @@
+"""
+Métricas Prometheus y tiempos por etapa de cada petición.
+
+- TimingMiddleware: latencia por ruta, errores, peticiones en curso y header
+  Server-Timing con el desglose por etapa (embedding, supabase, llm, redis...).
+- medir(etapa): context manager que envuelve una llamada a una dependencia.
+- metrics_endpoint: expone todo en /metrics.
+
+Con varios workers cada proceso tiene sus propios contadores: si está definida
+PROMETHEUS_MULTIPROC_DIR (la crea docker-entrypoint.sh) prometheus_client escribe
+en esa carpeta y /metrics agrega los valores de todos los workers.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+MULTIPROCESO = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_LATENCIA = Histogram(
+    "devradar_http_request_duration_seconds",
+    "Latencia de peticiones HTTP por ruta",
+    ["route", "method", "status"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+HTTP_ERRORES = Counter(
+    "devradar_http_errors_total",
+    "Respuestas 5xx o excepciones no controladas por ruta",
+    ["route", "method"],
+)
+HTTP_EN_CURSO = Gauge(
+    "devradar_http_in_flight_requests",
+    "Peticiones HTTP en curso por ruta",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ETAPA_LATENCIA = Histogram(
+    "devradar_stage_duration_seconds",
+    "Latencia de llamadas a dependencias por etapa",
+    ["stage"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+ETAPA_ERRORES = Counter(
+    "devradar_stage_errors_total",
+    "Errores en llamadas a dependencias por etapa",
+    ["stage"],
+)
+
+# Etapa -> [segundos acumulados, llamadas] de la petición actual.
+# El dict se comparte con los hilos del threadpool (copian el contexto, no el dict).
+_etapas_peticion: ContextVar[dict[str, list[float]] | None] = ContextVar("_etapas_peticion", default=None)
+
+
+@contextmanager
+def medir(etapa: str):
+    """Mide una llamada a una dependencia (histograma, errores y Server-Timing)."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        ETAPA_ERRORES.labels(etapa).inc()
+        raise
+    finally:
+        duracion = time.perf_counter() - inicio
+        ETAPA_LATENCIA.labels(etapa).observe(duracion)
+        etapas = _etapas_peticion.get()
+        if etapas is not None:
+            acumulado = etapas.setdefault(etapa, [0.0, 0])
+            acumulado[0] += duracion
+            acumulado[1] += 1
+
+
+def _server_timing(etapas: dict[str, list[float]], total: float) -> str:
+    partes = [
+        f'{etapa};dur={seg * 1000:.1f};desc="{int(n)} llamada(s)"'
+        for etapa, (seg, n) in etapas.items()
+    ]
+    partes.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(partes)
+
+
+def _plantilla_ruta(scope) -> str:
+    """Ruta como plantilla (/api/ofertas/{id}) para no disparar la cardinalidad de labels."""
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "sin_ruta"
+
+
+class TimingMiddleware:
+    """Middleware ASGI de métricas por ruta y header Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ruta = _plantilla_ruta(scope)
+        metodo = scope["method"]
+        etapas: dict[str, list[float]] = {}
+        token = _etapas_peticion.set(etapas)
+        inicio = time.perf_counter()
+        status = 500
+
+        async def send_con_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(etapas, time.perf_counter() - inicio).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        HTTP_EN_CURSO.labels(ruta).inc()
+        try:
+            await self.app(scope, receive, send_con_timing)
+        finally:
+            HTTP_EN_CURSO.labels(ruta).dec()
+            _etapas_peticion.reset(token)
+            HTTP_LATENCIA.labels(ruta, metodo, str(status)).observe(time.perf_counter() - inicio)
+            if status >= 500:
+                HTTP_ERRORES.labels(ruta, metodo).inc()
+
+
+def metrics_endpoint(request: Request) -> Response:
+    if MULTIPROCESO:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+        return Response(generate_latest(registro), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def cerrar_metricas_proceso():
+    """Al apagar un worker: sus gauges 'live' dejan de sumar en /metrics."""
+    if MULTIPROCESO:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,150 @@
+"""
+Circuit breakers para las dependencias externas (Supabase y Groq).
+
+Cada dependencia tiene un breaker que se abre tras N fallos transitorios seguidos
+(timeouts, errores de conexión, 5xx/429) o N llamadas lentas seguidas. Abierto,
+las llamadas fallan al instante con CircuitoAbierto y entran los fallbacks que ya
+existen (_fallback_veredicto, ValidationResult(is_tech=True), etc.) en vez de
+colgar la petición. Pasado el enfriamiento deja pasar una sola llamada de prueba
+(semiabierto): si sale bien se cierra, si no vuelve a abrirse.
+
+Se usan desde app.database.ejecutar y app.llm.invocar_llm; el estado queda en
+/metrics como devradar_circuit_breaker_state.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge
+
+CERRADO, SEMIABIERTO, ABIERTO = "cerrado", "semiabierto", "abierto"
+_VALOR_ESTADO = {CERRADO: 0, SEMIABIERTO: 1, ABIERTO: 2}
+
+# Excepciones que indican que la dependencia no está respondiendo (httpx, groq, builtins)
+_FALLAS_TRANSITORIAS = {
+    "TimeoutError", "ConnectionError", "TransportError", "TimeoutException",
+    "APIConnectionError", "APITimeoutError", "InternalServerError", "RateLimitError",
+}
+
+BREAKER_ESTADO = Gauge(
+    "devradar_circuit_breaker_state",
+    "Estado del circuit breaker por dependencia (0 cerrado, 1 semiabierto, 2 abierto)",
+    ["dependency"],
+    multiprocess_mode="max",
+)
+BREAKER_TRANSICIONES = Counter(
+    "devradar_circuit_breaker_transitions_total",
+    "Cambios de estado del circuit breaker",
+    ["dependency", "state"],
+)
+BREAKER_RECHAZOS = Counter(
+    "devradar_circuit_breaker_rejected_total",
+    "Llamadas cortadas sin intentar porque el breaker estaba abierto",
+    ["dependency"],
+)
+
+
+class CircuitoAbierto(Exception):
+    """La dependencia está marcada como caída: no se intenta la llamada."""
+
+    def __init__(self, dependencia: str, reintentar_en: float):
+        super().__init__(f"{dependencia} no disponible (circuit breaker abierto)")
+        self.dependencia = dependencia
+        self.reintentar_en = max(1, int(reintentar_en + 0.999))
+
+
+def es_falla_transitoria(error: BaseException) -> bool:
+    """
+    True si el error indica que la dependencia no responde. Un 4xx o un error de
+    consulta (p. ej. columna inexistente) no cuenta: la dependencia sí respondió.
+    """
+    if any(clase.__name__ in _FALLAS_TRANSITORIAS for clase in type(error).__mro__):
+        return True
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and (status >= 500 or status == 429):
+        return True
+    # postgrest.APIError: status HTTP cuando no hay JSON, PGRST00x = sin conexión a Postgres,
+    # 57014 = statement_timeout
+    codigo = str(getattr(error, "code", "") or "")
+    return (len(codigo) == 3 and codigo.startswith("5")) or codigo.startswith("PGRST00") or codigo == "57014"
+
+
+class CircuitBreaker:
+    def __init__(self, dependencia: str, fallos_para_abrir: int, lento_s: float, enfriamiento_s: float):
+        self.dependencia = dependencia
+        self.fallos_para_abrir = fallos_para_abrir
+        self.lento_s = lento_s
+        self.enfriamiento_s = enfriamiento_s
+        self.estado = CERRADO
+        self.fallos_seguidos = 0
+        self.abierto_desde = 0.0
+        self._sonda_en_curso = False
+        self._lock = threading.Lock()
+        BREAKER_ESTADO.labels(dependencia).set(0)
+
+    def _cambiar(self, estado: str):
+        if estado != self.estado:
+            self.estado = estado
+            BREAKER_ESTADO.labels(self.dependencia).set(_VALOR_ESTADO[estado])
+            BREAKER_TRANSICIONES.labels(self.dependencia, estado).inc()
+            emoji = {CERRADO: "✅", SEMIABIERTO: "🟡", ABIERTO: "🔴"}[estado]
+            print(f"{emoji} Circuit breaker de {self.dependencia}: {estado}")
+
+    def _antes_de_llamar(self) -> bool:
+        """Lanza CircuitoAbierto si no se puede llamar; retorna True si la llamada es la sonda."""
+        with self._lock:
+            if self.estado == ABIERTO:
+                restante = self.abierto_desde + self.enfriamiento_s - time.monotonic()
+                if restante > 0:
+                    BREAKER_RECHAZOS.labels(self.dependencia).inc()
+                    raise CircuitoAbierto(self.dependencia, restante)
+                self._cambiar(SEMIABIERTO)
+            if self.estado == SEMIABIERTO:
+                if self._sonda_en_curso:
+                    BREAKER_RECHAZOS.labels(self.dependencia).inc()
+                    raise CircuitoAbierto(self.dependencia, self.enfriamiento_s)
+                self._sonda_en_curso = True
+                return True
+            return False
+
+    def _registrar(self, fallo: bool, sonda: bool):
+        with self._lock:
+            if sonda:
+                self._sonda_en_curso = False
+            if not fallo:
+                self.fallos_seguidos = 0
+                self._cambiar(CERRADO)
+                return
+            self.fallos_seguidos += 1
+            if sonda or self.fallos_seguidos >= self.fallos_para_abrir:
+                self.abierto_desde = time.monotonic()
+                self._cambiar(ABIERTO)
+
+    @contextmanager
+    def proteger(self):
+        """Envuelve una llamada a la dependencia (cuenta fallos transitorios y llamadas lentas)."""
+        sonda = self._antes_de_llamar()
+        inicio = time.perf_counter()
+        fallo = True
+        try:
+            yield
+            fallo = time.perf_counter() - inicio > self.lento_s
+        except Exception as e:
+            fallo = es_falla_transitoria(e)
+            raise
+        finally:
+            self._registrar(fallo, sonda)
+
+
+def _breaker(dependencia: str, prefijo: str, lento_s: float) -> CircuitBreaker:
+    return CircuitBreaker(
+        dependencia,
+        fallos_para_abrir=int(os.getenv(f"{prefijo}_BREAKER_FALLOS", "5")),
+        lento_s=float(os.getenv(f"{prefijo}_BREAKER_LENTO_S", str(lento_s))),
+        enfriamiento_s=float(os.getenv(f"{prefijo}_BREAKER_ENFRIAMIENTO_S", "30")),
+    )
+
+
+BREAKER_SUPABASE = _breaker("supabase", "SUPABASE", lento_s=5)
+BREAKER_GROQ = _breaker("groq", "GROQ", lento_s=15)
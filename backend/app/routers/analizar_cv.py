@@ -1,15 +1,70 @@
 """Análisis de CV: extrae texto del archivo, usa embeddings para comparar con el mercado."""
+import os
+from typing import BinaryIO
+
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-from app.database import get_supabase
-from app.utils import parse_habilidades, extraer_texto_archivo
+from fastapi.concurrency import run_in_threadpool
+from app.cache import cache_get_json, cache_set_json, get_data_version
+from app.database import ejecutar, get_supabase
+from app.utils import parse_habilidades
+from app.extraccion import extraer_texto_aislado
 from app.embeddings import embed_text
 from app.llm import validar_es_cv
+from app.metrics import medir
+from app.services.skills_service import get_skill_matcher
+from app.uploads import leer_upload_acotado
+from comun.skills import SkillMatcher
 from collections import Counter
 
 router = APIRouter(tags=["analizar-cv"])
 
 SIMILARITY_THRESHOLD = 0.27
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+# Tiempo máximo que el texto extraído y el análisis de un CV viven en caché (segundos)
+CV_CACHE_TTL = int(os.getenv("CV_CACHE_TTL", "3600"))
+
+
+def _extraer_y_validar(contenido: BinaryIO, filename: str, contenido_hash: str) -> tuple[str, bool]:
+    """
+    Extrae el texto del CV y lo valida con Groq. Devuelve (texto, veredicto_llm).
+    El texto se cachea por hash del archivo, así un re-upload idéntico no repite la
+    extracción. El veredicto solo se cachea si vino de una respuesta real de Groq: el
+    "sí" por defecto de una caída no debe aceptar ese archivo durante CV_CACHE_TTL.
+    """
+    key = f"cv:texto:{contenido_hash}"
+    cacheado = cache_get_json(key)
+    if cacheado is not None:
+        texto_cv = cacheado["texto"]
+    else:
+        # 2. Extraer texto del CV
+        try:
+            with medir("extraccion"):
+                texto_cv = extraer_texto_aislado(contenido, filename)
+        except Exception as e:
+            raise HTTPException(422, f"No se pudo extraer texto del archivo: {e}")
+
+        texto_cv = texto_cv.replace("\n", " ").strip()
+        if not texto_cv or len(texto_cv) < 20:
+            raise HTTPException(422, "El archivo no contiene texto suficiente para analizar")
+
+    if cacheado is not None and "es_cv" in cacheado:
+        es_cv, tipo_documento, veredicto_llm = cacheado["es_cv"], cacheado["tipo_documento"], True
+    else:
+        # 3. Validación con Groq: confirmar que el documento es un CV/Hoja de Vida
+        texto_muestra = texto_cv[:1000]
+        es_cv, tipo_documento, veredicto_llm = validar_es_cv(texto_muestra)
+        entrada = {"texto": texto_cv}
+        if veredicto_llm:
+            entrada.update(es_cv=es_cv, tipo_documento=tipo_documento)
+        if cacheado is None or veredicto_llm:
+            cache_set_json(key, entrada, CV_CACHE_TTL)
+
+    if not es_cv and tipo_documento:
+        raise HTTPException(
+            422,
+            f"Solo se aceptan Currículum Vitae u Hojas de Vida. El documento subido parece ser un {tipo_documento}.",
+        )
+    return texto_cv, veredicto_llm
 
 
 @router.post("/analizar-cv")
@@ -22,31 +77,25 @@ async def analizar_cv(
     if not (filename.lower().endswith(".pdf") or filename.lower().endswith(".docx")):
         raise HTTPException(400, "Solo se aceptan archivos PDF o DOCX")
 
-    contenido = await archivo.read()
-    if len(contenido) > MAX_FILE_SIZE:
-        raise HTTPException(400, "El archivo supera el límite de 10 MB")
+    # Lectura por bloques: corta apenas supera MAX_FILE_SIZE y no copia el archivo a RAM
+    contenido, contenido_hash, tamano = await leer_upload_acotado(archivo, MAX_FILE_SIZE)
 
-    if len(contenido) == 0:
+    if tamano == 0:
         raise HTTPException(400, "El archivo está vacío")
 
-    # 2. Extraer texto del CV
-    try:
-        texto_cv = extraer_texto_archivo(contenido, filename)
-    except Exception as e:
-        raise HTTPException(422, f"No se pudo extraer texto del archivo: {e}")
+    # Extracción, Groq, embeddings y Supabase bloquean: fuera del event loop
+    return await run_in_threadpool(_analizar, contenido, filename, contenido_hash, rol_objetivo)
 
-    texto_cv = texto_cv.replace("\n", " ").strip()
-    if not texto_cv or len(texto_cv) < 20:
-        raise HTTPException(422, "El archivo no contiene texto suficiente para analizar")
 
-    # 3. Validación con Groq: confirmar que el documento es un CV/Hoja de Vida
-    texto_muestra = texto_cv[:1000]
-    es_cv, tipo_documento = validar_es_cv(texto_muestra)
-    if not es_cv and tipo_documento:
-        raise HTTPException(
-            422,
-            f"Solo se aceptan Currículum Vitae u Hojas de Vida. El documento subido parece ser un {tipo_documento}.",
-        )
+def _analizar(contenido: BinaryIO, filename: str, contenido_hash: str, rol_objetivo: str | None) -> dict:
+    # El análisis depende del archivo, del rol y de los datos actuales de jobs_clean
+    rol_key = (rol_objetivo or "").strip().lower()
+    analisis_key = f"cv:analisis:{contenido_hash}:{rol_key}:{get_data_version()}"
+    cacheado = cache_get_json(analisis_key)
+    if cacheado is not None:
+        return cacheado
+
+    texto_cv, veredicto_llm = _extraer_y_validar(contenido, filename, contenido_hash)
 
     # 4. Generar embedding del CV con embed_text (embeddings.py)
     try:
@@ -67,24 +116,25 @@ async def analizar_cv(
             "match_threshold": SIMILARITY_THRESHOLD,
             "match_count": 200,
         }
-        rpc_response = sb.rpc("match_jobs_ids", params).execute()
+        rpc_response = ejecutar(sb.rpc("match_jobs_ids", params))
         matched_ids = [row["id"] for row in (rpc_response.data or [])]
 
         if matched_ids:
-            r = sb.table("jobs_clean").select("habilidades, seniority").in_("id", matched_ids).execute()
+            r = ejecutar(sb.table("jobs_clean").select("habilidades, seniority").in_("id", matched_ids))
             matched_jobs = r.data or []
     except Exception as e:
         print(f"RPC match_jobs_ids falló (columna embedding puede no existir): {e}")
         # Fallback: obtener todas las habilidades del mercado
-        r = sb.table("jobs_clean").select("habilidades, seniority").limit(500).execute()
+        r = ejecutar(sb.table("jobs_clean").select("habilidades, seniority").limit(500))
         matched_jobs = r.data or []
 
-    # 6. Agregar habilidades del mercado desde ofertas coincidentes
+    # 6. Agregar habilidades del mercado desde ofertas coincidentes (normalizadas con alias)
+    matcher = get_skill_matcher()
     todas_habilidades = []
     seniorities: list[str] = []
     for row in matched_jobs:
         habs = parse_habilidades(row.get("habilidades"))
-        todas_habilidades.extend(h.strip().upper() for h in habs if h.strip())
+        todas_habilidades.extend(matcher.canonico(h) for h in habs if h.strip())
         s = row.get("seniority")
         if s and str(s).lower() not in ("no especificado", ""):
             seniorities.append(str(s).lower())
@@ -92,12 +142,17 @@ async def analizar_cv(
     top_skills = [nombre for nombre, _ in Counter(todas_habilidades).most_common(30)]
 
     # 7. Clasificar: detectadas (aparecen en CV) vs faltantes (del mercado, no en CV)
-    texto_cv_upper = texto_cv.upper()
+    # Una sola pasada del diccionario compilado sobre el CV (respeta límites de palabra y alias)
+    en_cv = set(matcher.buscar(texto_cv))
+    fuera_de_diccionario = [s for s in top_skills if s not in matcher]
+    if fuera_de_diccionario:
+        # Ofertas más nuevas que el diccionario vigente
+        en_cv.update(SkillMatcher(fuera_de_diccionario).buscar(texto_cv))
+
     habilidades_detectadas = []
     habilidades_faltantes = []
     for skill in top_skills:
-        # El skill está en el CV si la palabra (o variante) aparece en el texto
-        if skill in texto_cv_upper or skill.replace(" ", "") in texto_cv_upper.replace(" ", ""):
+        if skill in en_cv:
             habilidades_detectadas.append(skill)
         else:
             habilidades_faltantes.append(skill)
@@ -145,11 +200,15 @@ async def analizar_cv(
             "descripcion": f"Considera aprender o profundizar: {', '.join(habilidades_faltantes[:5])}.",
         })
 
-    return {
+    resultado = {
         "compatibilidad_porcentaje": compatibilidad_porcentaje,
         "nivel_seniority": nivel_seniority,
         "resumen": resumen,
         "habilidades_detectadas": habilidades_detectadas,
         "habilidades_faltantes": habilidades_faltantes,
         "sugerencias": sugerencias,
-    }
\ No newline at end of file
+    }
+    # Sin veredicto real de Groq no se cachea: el próximo intento vuelve a validar
+    if veredicto_llm:
+        cache_set_json(analisis_key, resultado, CV_CACHE_TTL)
+    return resultado
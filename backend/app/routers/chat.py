@@ -30,10 +30,12 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+def chat(request: ChatRequest):
     """
     Endpoint de chat RAG mejorado.
     Retorna respuesta en Markdown y lista de fuentes estructurada.
+    Síncrono: chat_rag bloquea en Groq/Supabase, así corre en el threadpool y no
+    en el event loop.
     """
     try:
         resultado = chat_rag(request.mensaje, request.session_id)
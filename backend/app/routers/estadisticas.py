@@ -10,7 +10,7 @@ router = APIRouter(prefix="/estadisticas", tags=["estadisticas"])
 
 def _obtener_rol_validado(rol: str | None) -> tuple[bool, str | None]:
     """
-    Valida el rol con IA.
+    Valida el rol (corrector local, clasificador local y, si no alcanzan, Groq).
     Retorna: (es_valido, rol_corregido).
     """
     if not rol:
@@ -1,6 +1,7 @@
-"""Listas para filtros: roles, ubicaciones, habilidades populares."""
+"""Listas para filtros: roles, ubicaciones, habilidades populares y sugerencias ortográficas."""
 from fastapi import APIRouter, Query
-from app.database import get_supabase
+from app.database import ejecutar, get_supabase
+from app.services.ortografia_service import sugerir
 from app.utils import parse_habilidades
 from collections import Counter
 
@@ -10,7 +11,7 @@ router = APIRouter(tags=["listas"])
 @router.get("/roles-disponibles")
 def roles_disponibles():
     sb = get_supabase()
-    r = sb.table("jobs_clean").select("rol_busqueda").execute()
+    r = ejecutar(sb.table("jobs_clean").select("rol_busqueda"))
     rows = r.data or []
     roles = sorted({str(x.get("rol_busqueda", "")).strip() for x in rows if x.get("rol_busqueda")})
     return [r for r in roles if r]
@@ -19,7 +20,7 @@ def roles_disponibles():
 @router.get("/ubicaciones")
 def ubicaciones():
     sb = get_supabase()
-    r = sb.table("jobs_clean").select("locacion").execute()
+    r = ejecutar(sb.table("jobs_clean").select("locacion"))
     rows = r.data or []
     locs = sorted({str(x.get("locacion", "")).strip() for x in rows if x.get("locacion")})
     return [l for l in locs if l]
@@ -28,7 +29,7 @@ def ubicaciones():
 @router.get("/habilidades-populares")
 def habilidades_populares(limit: int = Query(50, ge=1, le=200)):
     sb = get_supabase()
-    r = sb.table("jobs_clean").select("habilidades").execute()
+    r = ejecutar(sb.table("jobs_clean").select("habilidades"))
     rows = r.data or []
     counter: Counter = Counter()
     for row in rows:
@@ -36,3 +37,12 @@ def habilidades_populares(limit: int = Query(50, ge=1, le=200)):
             if h:
                 counter[h.strip()] += 1
     return [nombre for nombre, _ in counter.most_common(limit)]
+
+
+@router.get("/sugerencias")
+def sugerencias(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(5, ge=1, le=20)):
+    """
+    "Quisiste decir...": correcciones del corrector ortográfico local para el chat y
+    el buscador de roles. Distancia 0 = el término ya existe en jobs_clean.
+    """
+    return [s._asdict() for s in sugerir(q, limite=limit)]
@@ -2,8 +2,9 @@
 from datetime import datetime
 from fastapi import APIRouter
 from pydantic import BaseModel
-from app.database import get_supabase
+from app.database import ejecutar, get_supabase
 from app.utils import parse_habilidades
+from app.services.rollup_service import get_serie_mensual
 from collections import Counter
 
 router = APIRouter(tags=["reporte-ia"])
@@ -18,7 +19,7 @@ class GenerarReporteBody(BaseModel):
 @router.post("/generar-reporte")
 def generar_reporte(body: GenerarReporteBody):
     sb = get_supabase()
-    r = sb.table("jobs_clean").select("habilidades, locacion, sueldo, created_at").execute()
+    r = ejecutar(sb.table("jobs_clean").select("habilidades, locacion, sueldo, created_at"))
     rows = r.data or []
 
     counter: Counter = Counter()
@@ -41,8 +42,10 @@ def generar_reporte(body: GenerarReporteBody):
     region = body.region or "Ecuador"
     salario_promedio = sum(sueldos) / len(sueldos) if sueldos else 0
     top_herramientas = [{"nombre": n, "porcentaje": round(c / len(rows) * 100, 1)} for n, c in counter.most_common(10)] if rows else []
-    meses = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
-    tendencia_crecimiento = [{"mes": m, "valor": len(rows) // 12 + (hash(m) % 20)} for m in meses]
+    # Ofertas reales por mes (últimos 12) desde el rollup mensual
+    tendencia_crecimiento = [
+        {"mes": p["etiqueta"], "valor": p["ofertas"]} for p in get_serie_mensual(sb, meses=12)
+    ]
 
     resumen = [
         f"Total de ofertas analizadas: {len(rows)}.",
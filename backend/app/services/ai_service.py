@@ -1,29 +1,28 @@
 """
 Servicio de IA para el Backend.
-Maneja Embeddings (HuggingFace) y Validaciones Inteligentes (Groq).
+Maneja Embeddings (MiniLM, vía app.embeddings) y Validaciones Inteligentes (Groq).
 """
 import os
 
-from langchain_groq import ChatGroq
-from langchain_huggingface import HuggingFaceEmbeddings
 from pydantic import BaseModel, Field
 
+from app.embeddings import embed_text
+from app.llm import crear_llm, invocar_llm
+from app.services.clasificador_service import decidir_termino
+from app.services.ortografia_service import corregir_termino
+
 # ==========================================
-# 1. MODELO DE EMBEDDINGS (HuggingFace)
+# 1. EMBEDDINGS
 # ==========================================
-# Se inicializa una sola vez al arrancar
-_embeddings_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2",
-    model_kwargs={"device": "cpu"},
-    encode_kwargs={"normalize_embeddings": True}, 
-)
+# Mismo modelo y normalización que app.embeddings: se reutiliza esa única instancia
+# en lugar de cargar MiniLM una segunda vez con HuggingFaceEmbeddings.
 
 def get_embedding(text: str) -> list[float]:
     """Genera vector de 384 dimensiones para búsquedas semánticas."""
     try:
         if not text: return []
         texto_limpio = text.replace("\n", " ").strip()
-        return _embeddings_model.embed_query(texto_limpio)
+        return embed_text(texto_limpio)
     except Exception as e:
         print(f"⚠️ Error generando embedding en backend: {e}")
         return []
@@ -37,7 +36,21 @@ class ValidationResult(BaseModel):
     suggested_correction: str | None = Field(description="Corrección del término si está mal escrito (ej: 'pyton'->'python'). Si es válido, null.")
 
 def validar_termino_con_ia(query: str) -> ValidationResult:
-    """Consulta a Groq para saber si el término vale la pena buscarlo."""
+    """
+    ¿El término vale la pena buscarlo? Decide el clasificador local (vocabulario de
+    jobs_clean + MiniLM) si está seguro; si no, consulta a Groq.
+
+    La candidata del corrector ortográfico ("pyton" -> PYTHON) no basta por sí sola:
+    "pera" está a una letra de PERL y "doctor" a dos de DOCKER. Se usa como corrección
+    solo si el clasificador dice que el término original es tech, y si no está seguro
+    se le pasa a Groq como pista.
+    """
+    candidata = corregir_termino(query)
+    decision = decidir_termino(query)
+    if decision is not None:
+        correccion = candidata.termino if decision and candidata is not None else None
+        return ValidationResult(is_tech=decision, suggested_correction=correccion)
+
     try:
         # Usamos Llama 3.3 Versatile (Rápido y barato)
         api_key = os.getenv("GROQ_API_KEY")
@@ -45,11 +58,7 @@ def validar_termino_con_ia(query: str) -> ValidationResult:
             print("⚠️ Faltan GROQ_API_KEY, saltando validación.")
             return ValidationResult(is_tech=True, suggested_correction=None)
 
-        llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0,
-            api_key=api_key
-        )
+        llm = crear_llm(api_key=api_key)
         
         # Estructura de salida estricta
         structured_llm = llm.with_structured_output(ValidationResult)
@@ -62,8 +71,13 @@ def validar_termino_con_ia(query: str) -> ValidationResult:
             "2. Si es una tecnología real (Java, Python, AWS, Scrum) -> is_tech=True. "
             "3. Si está mal escrito, corrígelo en 'suggested_correction'."
         )
-        
-        return structured_llm.invoke(f"{system_msg} Analiza: '{query}'")
+        pista = ""
+        if candidata is not None:
+            # Solo una pista: "doctor" se parece a DOCKER pero no es un error de tipeo
+            pista = (f" El corrector ortográfico propone '{candidata.termino}'; úsalo como "
+                     "corrección solo si el término es claramente un error de tipeo de esa tecnología.")
+
+        return invocar_llm(structured_llm, f"{system_msg}{pista} Analiza: '{query}'")
         
     except Exception as e:
         print(f"⚠️ Error validando con Groq: {e}")
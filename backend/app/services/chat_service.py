@@ -1,76 +1,115 @@
 """
 Servicio de Chat RAG para DevRadar - Versión "Visual & Markdown"
 """
+import inspect
 import json
-import os
+import time
 from typing import List, Optional
 
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
-
-from app.database import get_supabase
+from app.cache import get_redis_client
+from app.database import ejecutar, get_supabase
 from app.embeddings import embed_text
-from app.llm import GROQ_API_KEY
-
-# Redis (opcional, fallback a memoria)
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-REDIS_ENABLED = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+from app.llm import GROQ_API_KEY, crear_llm, invocar_llm
+from app.metrics import medir
+from app.services.clasificador_semillas import MENSAJE_RECHAZO
+from app.services.clasificador_service import decidir_intencion
+from app.services.herramientas_chat import consultar_estadisticas
+from app.services.prompt_chat import (
+    CHAT_PROMPT_MAX_TOKENS, actualizar_resumen, construir_prompt, registrar_uso, uso_tokens,
+)
 
 _memory_cache: dict[str, list[dict]] = {}
-MAX_HISTORY = 5
+_memory_resumen: dict[str, str] = {}
+# Mensajes que se guardan completos; los que salen de la ventana pasan al resumen acumulado
+MAX_HISTORY = 6
+HISTORY_TTL = 3600 * 24
 SIMILARITY_THRESHOLD = 0.27
-
-
-def _get_redis_client():
-    if not REDIS_ENABLED:
-        return None
-    try:
-        import redis
-        return redis.from_url(REDIS_URL, decode_responses=True)
-    except Exception as e:
-        print(f"Redis no disponible, usando memoria: {e}")
-        return None
+# Ofertas recuperadas: con estadísticas del mercado bastan unas pocas como ejemplo y fuente
+MAX_OFERTAS = 6
+MAX_OFERTAS_CON_ESTADISTICAS = 3
 
 
 def _get_history(session_id: str) -> list[dict]:
-    redis_client = _get_redis_client()
+    redis_client = get_redis_client()
     if redis_client:
         try:
-            history_json = redis_client.lrange(f"chat:history:{session_id}", 0, MAX_HISTORY - 1)
+            with medir("redis"):
+                history_json = redis_client.lrange(f"chat:history:{session_id}", 0, MAX_HISTORY - 1)
             return [json.loads(msg) for msg in reversed(history_json)] if history_json else []
         except Exception:
             return _memory_cache.get(session_id, [])[-MAX_HISTORY:]
     return _memory_cache.get(session_id, [])[-MAX_HISTORY:]
 
 
-def _save_message(session_id: str, role: str, content: str):
-    msg = {"role": role, "content": content}
-    redis_client = _get_redis_client()
+def _get_resumen(session_id: str) -> str:
+    redis_client = get_redis_client()
     if redis_client:
         try:
-            redis_client.lpush(f"chat:history:{session_id}", json.dumps(msg))
-            redis_client.ltrim(f"chat:history:{session_id}", 0, MAX_HISTORY - 1)
-            redis_client.expire(f"chat:history:{session_id}", 3600 * 24)
+            with medir("redis"):
+                return redis_client.get(f"chat:resumen:{session_id}") or ""
         except Exception:
-            if session_id not in _memory_cache: _memory_cache[session_id] = []
-            _memory_cache[session_id].append(msg)
-    else:
-        if session_id not in _memory_cache: _memory_cache[session_id] = []
-        _memory_cache[session_id].append(msg)
+            pass
+    return _memory_resumen.get(session_id, "")
 
 
-def _validar_intencion(mensaje: str) -> tuple[bool, Optional[str]]:
-    """Filtro de intención."""
+def _plegar_en_resumen(session_id: str, salientes: list[dict]):
+    """Compacta en el resumen los mensajes que salieron de la ventana de historial."""
+    if not salientes:
+        return
+    resumen = actualizar_resumen(_get_resumen(session_id), salientes)
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            with medir("redis"):
+                redis_client.set(f"chat:resumen:{session_id}", resumen, ex=HISTORY_TTL)
+            return
+        except Exception:
+            pass
+    _memory_resumen[session_id] = resumen
+
+
+def _save_message(session_id: str, role: str, content: str):
+    msg = {"role": role, "content": content}
+    redis_client = get_redis_client()
+    if redis_client:
+        try:
+            clave = f"chat:history:{session_id}"
+            with medir("redis"):
+                pipe = redis_client.pipeline()
+                pipe.lpush(clave, json.dumps(msg))
+                pipe.lrange(clave, MAX_HISTORY, -1)
+                pipe.ltrim(clave, 0, MAX_HISTORY - 1)
+                pipe.expire(clave, HISTORY_TTL)
+                salientes = pipe.execute()[1]
+            _plegar_en_resumen(session_id, [json.loads(m) for m in reversed(salientes)])
+            return
+        except Exception:
+            pass
+    historial = _memory_cache.setdefault(session_id, [])
+    historial.append(msg)
+    if len(historial) > MAX_HISTORY:
+        salientes = historial[:-MAX_HISTORY]
+        del historial[:-MAX_HISTORY]
+        _plegar_en_resumen(session_id, salientes)
+
+
+def _validar_intencion(mensaje: str, query_embedding: Optional[List[float]] = None) -> tuple[bool, Optional[str]]:
+    """Filtro de intención: clasificador local si está seguro, si no Groq."""
+    decision = decidir_intencion(mensaje, query_embedding)
+    if decision is not None:
+        return decision, None if decision else MENSAJE_RECHAZO
     if not GROQ_API_KEY: return True, None
     try:
-        llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0, api_key=GROQ_API_KEY)
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        llm = crear_llm("llama-3.1-8b-instant")
         
         system = """Eres el guardián de DevRadar.
         Misión: Aceptar SOLO preguntas sobre tecnología, programación, salarios IT y carrera profesional.
         Rechaza preguntas de cocina, deportes, medicina, leyes, etc.
         Responde JSON: {"es_valida": true/false, "mensaje_rechazo": "msg o null"}
         """
-        response = llm.invoke([SystemMessage(content=system), HumanMessage(content=mensaje)])
+        response = invocar_llm(llm, [SystemMessage(content=system), HumanMessage(content=mensaje)])
         text = response.content
         if "```" in text: text = text.split("```")[1].replace("json", "")
         data = json.loads(text)
@@ -79,24 +118,33 @@ def _validar_intencion(mensaje: str) -> tuple[bool, Optional[str]]:
         return True, None
 
 
-def _buscar_ofertas_semanticas(query: str, limit: int = 6) -> list[dict]:
+def _embedding_mensaje(mensaje: str) -> List[float]:
+    try:
+        return embed_text(mensaje)
+    except Exception as e:
+        print(f"Error generando embedding del mensaje: {e}")
+        return []
+
+
+def _buscar_ofertas_semanticas(query: str, limit: int = 6, query_embedding: Optional[List[float]] = None) -> list[dict]:
     """Busca ofertas y retorna los datos crudos de Supabase."""
     try:
-        query_embedding = embed_text(query)
+        if query_embedding is None:
+            query_embedding = embed_text(query)
         if not query_embedding: return []
         
         sb = get_supabase()
         params = {"query_embedding": query_embedding, "match_threshold": SIMILARITY_THRESHOLD, "match_count": limit}
         
         try:
-            rpc = sb.rpc("match_jobs", params).execute()
+            rpc = ejecutar(sb.rpc("match_jobs", params))
             return rpc.data or []
         except Exception:
             # Fallback a IDs
-            rpc = sb.rpc("match_jobs_ids", params).execute()
+            rpc = ejecutar(sb.rpc("match_jobs_ids", params))
             ids = [row["id"] for row in (rpc.data or [])]
             if ids:
-                r = sb.table("jobs_clean").select("*").in_("id", ids).execute()
+                r = ejecutar(sb.table("jobs_clean").select("*").in_("id", ids))
                 return r.data or []
             return []
     except Exception as e:
@@ -104,29 +152,18 @@ def _buscar_ofertas_semanticas(query: str, limit: int = 6) -> list[dict]:
         return []
 
 
-def _formatear_ofertas_contexto(ofertas: list[dict]) -> str:
-    """Convierte las ofertas en texto para el Prompt del LLM."""
-    if not ofertas: return "No se encontraron ofertas específicas."
-    
-    txt = "OFERTAS ENCONTRADAS (Úsalas para responder):\n"
-    for oferta in ofertas:
-        txt += f"- Puesto: {oferta.get('oferta_laboral')}\n"
-        txt += f"  Empresa: {oferta.get('compania')}\n"
-        txt += f"  Salario: {oferta.get('sueldo')}\n"
-        txt += f"  Skills: {oferta.get('habilidades')}\n"
-        txt += f"  Ubicación: {oferta.get('locacion')}\n\n"
-    return txt
-
-
 def chat_rag(mensaje: str, session_id: str) -> dict:
-    # 1. Validar
-    es_valida, rechazo = _validar_intencion(mensaje)
+    # 1. Validar (el embedding del mensaje sirve para el clasificador local y para la búsqueda)
+    query_embedding = _embedding_mensaje(mensaje)
+    es_valida, rechazo = _validar_intencion(mensaje, query_embedding)
     if not es_valida:
         return {"respuesta": rechazo, "ofertas_encontradas": 0, "rechazada": True, "fuentes": []}
 
-    # 2. Buscar
-    ofertas = _buscar_ofertas_semanticas(mensaje, limit=6)
-    contexto = _formatear_ofertas_contexto(ofertas)
+    # 2. Estadísticas de todo el mercado si la pregunta las pide (cacheadas por versión de datos)
+    #    y ofertas concretas por similitud
+    estadisticas, herramientas = consultar_estadisticas(mensaje)
+    limite = MAX_OFERTAS_CON_ESTADISTICAS if estadisticas else MAX_OFERTAS
+    ofertas = _buscar_ofertas_semanticas(mensaje, limit=limite, query_embedding=query_embedding)
     
     # 3. Preparar lista de fuentes para el botón (Data para el Frontend)
     fuentes_output = []
@@ -143,9 +180,11 @@ def chat_rag(mensaje: str, session_id: str) -> dict:
         return {"respuesta": "Sin servicio de IA.", "ofertas_encontradas": 0, "rechazada": False, "fuentes": []}
 
     try:
-        llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.6, api_key=GROQ_API_KEY)
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+        llm = crear_llm(temperatura=0.6)
 
-        system_prompt = """Eres DevRadar, el asistente más cool y experto en empleo IT de Ecuador.
+        system_prompt = inspect.cleandoc("""Eres DevRadar, el asistente más cool y experto en empleo IT de Ecuador.
         
         TU OBJETIVO: Dar respuestas visualmente atractivas, directas y útiles.
         
@@ -157,32 +196,35 @@ def chat_rag(mensaje: str, session_id: str) -> dict:
         
         ESTRUCTURA DE RESPUESTA:
         - Empieza con una frase gancho o resumen directo.
-        - Desarrolla el análisis de las ofertas encontradas.
+        - Desarrolla el análisis con las estadísticas del mercado (si las hay) y las ofertas encontradas.
         - NO pongas los enlaces/URLs en el texto (se mostrarán en un botón aparte).
         - Si no hay salario exacto, da estimaciones basadas en tu conocimiento general pero aclara que es estimado.
         
         CONTEXTO:
-        Usa EXCLUSIVAMENTE la información de las ofertas provistas abajo para los detalles específicos.
-        """
-
-        mensajes = [SystemMessage(content=system_prompt)]
-        
-        # Historial
-        historial = _get_history(session_id)
-        for m in historial:
-            cls = HumanMessage if m["role"] == "user" else AIMessage
-            mensajes.append(cls(content=m["content"]))
-
-        # Input actual
-        final_prompt = f"""
-        {contexto}
-        
-        PREGUNTA DEL USUARIO: {mensaje}
-        """
-        mensajes.append(HumanMessage(content=final_prompt))
-
-        response = llm.invoke(mensajes)
+        Usa EXCLUSIVAMENTE las estadísticas y las ofertas provistas abajo para los detalles específicos.
+        Las estadísticas cubren todas las ofertas de DevRadar; las ofertas son solo ejemplos.
+        """)
+
+        # Ofertas, historial reciente y resumen de lo anterior dentro del presupuesto de tokens
+        prompt = construir_prompt(
+            system_prompt, mensaje, ofertas, _get_history(session_id), _get_resumen(session_id),
+            estadisticas=estadisticas,
+        )
+        clases = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+        mensajes = [clases[rol](content=contenido) for rol, contenido in prompt.mensajes]
+
+        inicio = time.perf_counter()
+        response = invocar_llm(llm, mensajes)
         respuesta_texto = response.content
+        prompt_reales, completion = uso_tokens(response)
+        registrar_uso(prompt.total_tokens, prompt_reales, completion)
+        print(
+            f"🧮 Chat: prompt ~{prompt.total_tokens} tokens estimados / {prompt_reales or '?'} reales "
+            f"(presupuesto {CHAT_PROMPT_MAX_TOKENS}; {prompt.tokens}), "
+            f"ofertas {prompt.ofertas}/{len(ofertas)}, herramientas {herramientas or '-'}, "
+            f"historial {prompt.historial} mensajes, "
+            f"completion {completion or '?'} tokens, {time.perf_counter() - inicio:.2f} s"
+        )
 
         # Guardar
         _save_message(session_id, "user", mensaje)
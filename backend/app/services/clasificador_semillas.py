@@ -0,0 +1,137 @@
+"""
+Ejemplos etiquetados para el clasificador local de términos e intención del chat.
+
+Se combinan con el vocabulario real de jobs_clean (habilidades y rol_busqueda) como
+positivos y con plantillas de preguntas. El set de evaluación offline vive aparte en
+benchmarks/eval_clasificador.py para no medir sobre lo mismo que se entrena.
+"""
+
+# Términos de búsqueda (filtro de rol en estadísticas, comparar)
+TERMINOS_TECH = [
+    "python", "java", "javascript", "typescript", "react", "angular", "vue", "node", "nodejs",
+    "django", "flask", "fastapi", "spring boot", ".net", "c#", "c++", "golang", "rust", "php",
+    "laravel", "ruby on rails", "kotlin", "swift", "flutter", "react native", "android", "ios",
+    "sql", "postgresql", "mysql", "mongodb", "redis", "oracle", "sql server", "power bi", "tableau",
+    "excel avanzado", "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "git",
+    "linux", "scrum", "kanban", "jira", "devops", "qa", "testing", "selenium", "cypress",
+    "machine learning", "deep learning", "data science", "big data", "spark", "airflow", "etl",
+    "ciberseguridad", "redes", "cisco", "soporte técnico", "help desk", "sap", "salesforce",
+    "desarrollador", "programador", "ingeniero de software", "analista de datos", "data engineer",
+    "frontend", "backend", "fullstack", "arquitecto de software", "product owner", "ux", "ui",
+    "diseñador ux/ui", "administrador de base de datos", "sysadmin", "sre", "cloud", "microservicios",
+    "api rest", "graphql", "html", "css", "tailwind", "bootstrap", "wordpress", "shopify",
+    "pentester", "analista de sistemas", "ingeniero en sistemas", "tester", "business intelligence",
+]
+
+TERMINOS_NO_TECH = [
+    "pilsener", "club verde", "tropico", "zhumir", "cerveza", "ron", "whisky", "vino", "aguardiente",
+    "encebollado", "ceviche", "hornado", "fritada", "bolón", "llapingacho", "pizza", "hamburguesa",
+    "sushi", "empanadas", "tortilla", "café", "chocolate", "helado", "pan de yuca", "seco de pollo",
+    "fútbol", "barcelona sc", "emelec", "liga de quito", "ecuavóley", "tenis", "natación", "ciclismo",
+    "boxeo", "gimnasio", "yoga", "crossfit", "quito", "guayaquil", "cuenca", "manta", "loja",
+    "galápagos", "montañita", "baños", "salinas", "ambato", "playa", "montaña", "volcán",
+    "abogado", "chef", "cocinero", "mesero", "chofer", "enfermera", "médico", "odontólogo",
+    "contador", "psicólogo", "veterinario", "albañil", "carpintero", "peluquero", "vendedor de seguros",
+    "cajero", "bodeguero", "guardia de seguridad", "agricultor", "camarero", "niñera", "jardinero",
+    "perro", "gato", "caballo", "flores", "rosas", "banano", "cacao", "camarón", "mango",
+    "telenovela", "reguetón", "salsa", "bachata", "karaoke", "fiesta", "boda", "cumpleaños",
+    "zapatos", "ropa", "maquillaje", "perfume", "joyas", "carro", "moto", "bicicleta",
+    "horóscopo", "lotería", "casino", "iglesia", "misa", "navidad", "carnaval", "feriado",
+    "receta", "dieta", "vacaciones", "hotel", "arriendo", "departamento", "terreno",
+]
+
+# Mensajes del chat
+PREGUNTAS_TECH = [
+    "¿Cuánto gana un desarrollador junior en Quito?",
+    "¿Qué tecnologías piden más para backend?",
+    "¿Hay ofertas de trabajo remoto para programadores?",
+    "¿Conviene aprender Python o Java en 2025?",
+    "¿Qué necesito para ser data engineer?",
+    "Dame ofertas de React en Guayaquil",
+    "¿Cuál es el salario promedio de un DevOps?",
+    "¿Qué skills debo tener para un puesto semi senior?",
+    "¿Las empresas piden inglés para trabajos de TI?",
+    "¿Cómo paso de soporte técnico a desarrollo?",
+    "¿Qué certificaciones de AWS valen la pena?",
+    "¿Hay demanda de analistas de datos en Ecuador?",
+    "¿Qué lenguaje me recomiendas para empezar a programar?",
+    "¿Cuánto pagan por un fullstack con 3 años de experiencia?",
+    "¿Qué empresas contratan QA automation?",
+    "Quiero cambiarme a ciberseguridad, ¿por dónde empiezo?",
+    "¿Es buen momento para estudiar ingeniería en sistemas?",
+    "¿Piden Docker y Kubernetes en las ofertas?",
+    "¿Qué diferencia hay entre frontend y backend en sueldo?",
+    "¿Cómo mejoro mi CV para aplicar a un puesto de programador?",
+    "¿Qué frameworks de JavaScript piden más?",
+    "¿Vale la pena aprender Flutter?",
+    "¿Cuántas ofertas hay para SQL?",
+    "¿Hay trabajos de machine learning en Cuenca?",
+    "¿Qué sueldo pedir en una entrevista para desarrollador?",
+    "¿Cuál es la tendencia del mercado IT este año?",
+    "¿Me conviene ser freelance o trabajar en una empresa de software?",
+    "¿Qué debo estudiar para ser arquitecto cloud?",
+    "recomiéndame un roadmap para backend",
+    "ofertas de trabajo para practicantes de sistemas",
+    "hola, busco trabajo como programador",
+    "qué tal pagan los trabajos de power bi",
+    "necesito consejos para una entrevista técnica",
+    "cuánto gana un scrum master",
+    "que piden para ser product owner",
+]
+
+PREGUNTAS_NO_TECH = [
+    "¿Cómo preparo un encebollado?",
+    "¿Quién ganó el partido de Barcelona ayer?",
+    "¿Cuál es la mejor playa de Ecuador?",
+    "Dame una receta de ceviche de camarón",
+    "¿Qué cerveza es mejor, Pilsener o Club?",
+    "¿Cómo bajo de peso rápido?",
+    "¿Qué medicamento tomo para el dolor de cabeza?",
+    "¿Cómo me divorcio?",
+    "¿Cuál es mi horóscopo de hoy?",
+    "¿Dónde puedo ver la telenovela de anoche?",
+    "¿Cómo cuido a mi perro enfermo?",
+    "¿Qué regalo para el día de la madre?",
+    "Cuéntame un chiste",
+    "¿Qué hago este fin de semana en Quito?",
+    "¿Cuánto cuesta un pasaje a Galápagos?",
+    "¿Cómo hago pan casero?",
+    "¿Cuál es la capital de Francia?",
+    "¿Qué número sale en la lotería?",
+    "¿Cómo arreglo la llanta de mi carro?",
+    "¿Cómo conquisto a una chica?",
+    "¿Qué equipo va a ganar el mundial?",
+    "¿Cómo se hace un mojito?",
+    "¿Cuándo es el próximo feriado?",
+    "¿Qué plantas crecen bien en la sierra?",
+    "¿Cómo tramito mi cédula?",
+    "¿Cuánto gana un futbolista en Ecuador?",
+    "¿Dónde compro zapatos baratos en Guayaquil?",
+    "¿Cuál es la mejor marca de maquillaje?",
+    "escribe un poema de amor",
+    "qué clima hace mañana en Cuenca",
+    "cómo demando a mi vecino",
+    "receta de torta de chocolate",
+    "cuánto gana un médico general",
+    "necesito un abogado laboral",
+    "recomiéndame una serie de netflix",
+]
+
+# Plantillas para convertir el vocabulario de jobs_clean en preguntas positivas
+PLANTILLAS_TECH = [
+    "¿Cuánto gana un {termino}?",
+    "¿Hay ofertas de {termino} en Ecuador?",
+    "¿Qué piden para trabajar con {termino}?",
+    "¿Vale la pena aprender {termino}?",
+    "ofertas de {termino}",
+]
+PLANTILLAS_NO_TECH = [
+    "¿Dónde consigo {termino}?",
+    "¿Qué opinas de {termino}?",
+    "háblame de {termino}",
+]
+
+MENSAJE_RECHAZO = (
+    "Solo puedo ayudarte con tecnología, empleo IT, salarios y carrera profesional. "
+    "¡Pregúntame por ofertas, skills o sueldos! 🚀"
+)
@@ -0,0 +1,217 @@
+"""
+Clasificador local "¿es tecnología?" sobre embeddings MiniLM.
+
+Reemplaza la llamada a Groq de validar_termino_con_ia y del filtro de intención del
+chat cuando tiene confianza suficiente:
+- Coincidencia exacta con el vocabulario (habilidades y rol_busqueda de jobs_clean,
+  más las semillas): respuesta inmediata.
+- Si no, regresión logística sobre el embedding del texto (un producto punto de 384
+  dimensiones). Para términos el embedding se cachea; en el chat se reutiliza el
+  embedding que ya se calcula para la búsqueda semántica.
+- Con confianza menor a CLASIFICADOR_UMBRAL retorna None y el llamador escala a Groq.
+
+Se entrena en segundo plano al arrancar (después del modelo) y se reentrena cuando
+cambia la versión de jobs_clean. Mientras no está listo, todo escala a Groq como antes.
+Evaluación offline: benchmarks/eval_clasificador.py.
+"""
+import math
+import os
+import random
+import threading
+from functools import lru_cache
+
+from prometheus_client import Counter
+
+from app.cache import get_data_version
+from app.embeddings import embed_text, embed_texts
+from app.services import clasificador_semillas as semillas
+from app.services.skills_service import get_vocabulario
+
+CLASIFICADOR_LOCAL = os.getenv("CLASIFICADOR_LOCAL", "true").lower() == "true"
+CLASIFICADOR_UMBRAL = float(os.getenv("CLASIFICADOR_UMBRAL", "0.85"))
+# Términos del vocabulario usados como ejemplos positivos (el resto solo sirve de coincidencia exacta)
+MAX_VOCABULARIO_ENTRENAMIENTO = 1500
+PREGUNTAS_POR_TERMINO = 1
+
+CLASIFICADOR_DECISIONES = Counter(
+    "devradar_classifier_decisions_total",
+    "Decisiones del filtro '¿es tecnología?' por tarea y origen (vocabulario, local, groq)",
+    ["task", "source"],
+)
+
+
+def normalizar(texto: str) -> str:
+    return " ".join(texto.lower().split())
+
+
+class ClasificadorBinario:
+    """Regresión logística sobre embeddings normalizados."""
+
+    def __init__(self, pesos, sesgo: float):
+        self.pesos = pesos
+        self.sesgo = sesgo
+
+    @classmethod
+    def entrenar(cls, X, y, epocas: int = 400, tasa: float = 2.0, l2: float = 1e-3) -> "ClasificadorBinario":
+        """Descenso de gradiente por lotes completos con pesos por clase (las clases vienen desbalanceadas)."""
+        import numpy as np
+
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32)
+        positivos = max(float(y.sum()), 1.0)
+        negativos = max(float(len(y) - y.sum()), 1.0)
+        pesos_muestra = np.where(y == 1, len(y) / (2 * positivos), len(y) / (2 * negativos))
+
+        w = np.zeros(X.shape[1], dtype=np.float32)
+        b = 0.0
+        for _ in range(epocas):
+            p = 1 / (1 + np.exp(-(X @ w + b)))
+            error = (p - y) * pesos_muestra
+            w -= tasa * (X.T @ error / len(y) + l2 * w)
+            b -= tasa * float(error.mean())
+        return cls(w, b)
+
+    def probabilidad(self, vector) -> float:
+        z = float(self.pesos @ vector) + self.sesgo
+        return 1 / (1 + math.exp(-max(min(z, 30.0), -30.0)))
+
+
+class ClasificadorLocal:
+    def __init__(self, termino: ClasificadorBinario, intencion: ClasificadorBinario,
+                 vocabulario_tech: set[str], vocabulario_no_tech: set[str]):
+        self.termino = termino
+        self.intencion = intencion
+        self.vocabulario_tech = vocabulario_tech
+        self.vocabulario_no_tech = vocabulario_no_tech
+
+    def clasificar_termino(self, termino: str, vector=None) -> tuple[bool, float, str]:
+        """(es_tech, confianza, origen)."""
+        clave = normalizar(termino)
+        if clave in self.vocabulario_tech:
+            return True, 1.0, "vocabulario"
+        if clave in self.vocabulario_no_tech:
+            return False, 1.0, "vocabulario"
+        p = self.termino.probabilidad(vector if vector is not None else _vector_termino(clave))
+        return p >= 0.5, max(p, 1 - p), "local"
+
+    def clasificar_intencion(self, mensaje: str, vector) -> tuple[bool, float, str]:
+        p = self.intencion.probabilidad(vector)
+        return p >= 0.5, max(p, 1 - p), "local"
+
+
+@lru_cache(maxsize=4096)
+def _vector_termino(clave: str):
+    import numpy as np
+
+    return np.asarray(embed_text(clave), dtype=np.float32)
+
+
+def _ejemplos(vocabulario: list[str], rng: random.Random) -> tuple[list[tuple[str, int]], list[tuple[str, int]]]:
+    """(términos etiquetados, preguntas etiquetadas) a partir de semillas, vocabulario y plantillas."""
+    positivos = list(dict.fromkeys(semillas.TERMINOS_TECH + vocabulario))
+    terminos = [(t, 1) for t in positivos] + [(t, 0) for t in semillas.TERMINOS_NO_TECH]
+
+    preguntas = [(p, 1) for p in semillas.PREGUNTAS_TECH] + [(p, 0) for p in semillas.PREGUNTAS_NO_TECH]
+    for termino in rng.sample(positivos, min(len(positivos), 400)):
+        for plantilla in rng.sample(semillas.PLANTILLAS_TECH, PREGUNTAS_POR_TERMINO):
+            preguntas.append((plantilla.format(termino=termino), 1))
+    for termino in semillas.TERMINOS_NO_TECH:
+        for plantilla in semillas.PLANTILLAS_NO_TECH:
+            preguntas.append((plantilla.format(termino=termino), 0))
+    return terminos, preguntas
+
+
+def construir_clasificador(vocabulario: set[str], semilla: int = 42) -> ClasificadorLocal:
+    """Entrena ambos clasificadores. `vocabulario`: habilidades y roles reales (cualquier capitalización)."""
+    import numpy as np
+
+    rng = random.Random(semilla)
+    vocabulario_tech = {normalizar(v) for v in vocabulario if v and v.strip()}
+    muestra = sorted(vocabulario_tech)
+    if len(muestra) > MAX_VOCABULARIO_ENTRENAMIENTO:
+        muestra = rng.sample(muestra, MAX_VOCABULARIO_ENTRENAMIENTO)
+
+    terminos, preguntas = _ejemplos(muestra, rng)
+    textos = [normalizar(t) for t, _ in terminos] + [p for p, _ in preguntas]
+    vectores = np.asarray(embed_texts(textos), dtype=np.float32)
+
+    termino = ClasificadorBinario.entrenar(vectores[:len(terminos)], [e for _, e in terminos])
+    intencion = ClasificadorBinario.entrenar(vectores[len(terminos):], [e for _, e in preguntas])
+    vocabulario_tech |= {normalizar(t) for t in semillas.TERMINOS_TECH}
+    vocabulario_no_tech = {normalizar(t) for t in semillas.TERMINOS_NO_TECH} - vocabulario_tech
+    return ClasificadorLocal(termino, intencion, vocabulario_tech, vocabulario_no_tech)
+
+
+# =============================================================================
+# Ciclo de vida: uno por versión de jobs_clean, construido en segundo plano
+# =============================================================================
+
+_estado: dict = {"version": None, "clasificador": None, "construyendo": False}
+_lock = threading.Lock()
+
+
+def _construir(version: str):
+    try:
+        _, habilidades, roles = get_vocabulario()
+        vocabulario = set(habilidades) | set(roles)
+        clasificador = construir_clasificador(vocabulario)
+        _vector_termino.cache_clear()
+        _estado["clasificador"] = clasificador
+        _estado["version"] = version
+        print(f"🧭 Clasificador local listo ({len(clasificador.vocabulario_tech)} términos de vocabulario)")
+    except Exception as e:
+        print(f"⚠️ No se pudo construir el clasificador local (se usa Groq): {e}")
+        # Se reintenta con la próxima versión de datos
+        _estado["version"] = version
+    finally:
+        _estado["construyendo"] = False
+
+
+def precargar_clasificador():
+    """Construcción síncrona (arranque en segundo plano)."""
+    if CLASIFICADOR_LOCAL:
+        with _lock:
+            _estado["construyendo"] = True
+        _construir(get_data_version())
+
+
+def get_clasificador() -> ClasificadorLocal | None:
+    """El clasificador vigente (o None); si cambió jobs_clean lo reentrena en otro hilo."""
+    if not CLASIFICADOR_LOCAL:
+        return None
+    version = get_data_version()
+    with _lock:
+        if version != _estado["version"] and not _estado["construyendo"]:
+            _estado["construyendo"] = True
+            threading.Thread(target=_construir, args=(version,), daemon=True).start()
+    return _estado["clasificador"]
+
+
+def decidir_termino(termino: str) -> bool | None:
+    """True/False si el clasificador local está seguro; None para escalar a Groq."""
+    clasificador = get_clasificador()
+    if clasificador is None or not termino.strip():
+        CLASIFICADOR_DECISIONES.labels("termino", "groq").inc()
+        return None
+    es_tech, confianza, origen = clasificador.clasificar_termino(termino)
+    if confianza < CLASIFICADOR_UMBRAL:
+        CLASIFICADOR_DECISIONES.labels("termino", "groq").inc()
+        return None
+    CLASIFICADOR_DECISIONES.labels("termino", origen).inc()
+    return es_tech
+
+
+def decidir_intencion(mensaje: str, embedding: list[float] | None) -> bool | None:
+    """Como decidir_termino para mensajes del chat; `embedding` es el de la búsqueda semántica."""
+    clasificador = get_clasificador()
+    if clasificador is None or not embedding:
+        CLASIFICADOR_DECISIONES.labels("intencion", "groq").inc()
+        return None
+    import numpy as np
+
+    es_tech, confianza, origen = clasificador.clasificar_intencion(mensaje, np.asarray(embedding, dtype=np.float32))
+    if confianza < CLASIFICADOR_UMBRAL:
+        CLASIFICADOR_DECISIONES.labels("intencion", "groq").inc()
+        return None
+    CLASIFICADOR_DECISIONES.labels("intencion", origen).inc()
+    return es_tech
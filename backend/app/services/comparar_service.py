@@ -6,9 +6,10 @@ Tendencia histórica: conteo real por mes usando fecha_publicacion (solo meses c
 """
 from collections import defaultdict
 from datetime import datetime, timezone, timedelta
-from app.database import get_supabase
+from app.database import ejecutar, get_supabase
 from app.utils import parse_fecha_publicacion
 from app.llm import generar_veredicto_comparacion
+from app.services.rollup_service import get_serie_mensual, calcular_variaciones, clasificar_tendencia
 
 MESES_ABREV = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
 MAX_MESES_TENDENCIA = 12
@@ -32,7 +33,7 @@ def _contar_y_promedio_sueldo_por_habilidad(sb, tecnologia: str) -> tuple[int, f
     columna_busqueda = "descripcion" if termino.lower() in roles_comunes else "habilidades"
 
     # Hacemos la query sobre la columna que SÍ existe
-    r = sb.table("jobs_clean").select("sueldo").ilike(columna_busqueda, patron).execute()
+    r = ejecutar(sb.table("jobs_clean").select("sueldo").ilike(columna_busqueda, patron))
     rows = r.data or []
 
     count = len(rows)
@@ -64,8 +65,8 @@ def _tendencia_historica_real(sb, tecnologia_a: str, tecnologia_b: str, periodo_
     patron_b = f"%{(tecnologia_b or '').strip()}%" if (tecnologia_b or "").strip() else "%"
 
     # Mismo ILIKE que _contar_y_promedio_sueldo_por_habilidad: conteo con LIKE en la BD
-    r_a = sb.table("jobs_clean").select("fecha_publicacion").ilike("habilidades", patron_a).execute()
-    r_b = sb.table("jobs_clean").select("fecha_publicacion").ilike("habilidades", patron_b).execute()
+    r_a = ejecutar(sb.table("jobs_clean").select("fecha_publicacion").ilike("habilidades", patron_a))
+    r_b = ejecutar(sb.table("jobs_clean").select("fecha_publicacion").ilike("habilidades", patron_b))
     rows_a = r_a.data or []
     rows_b = r_b.data or []
 
@@ -118,10 +119,10 @@ def comparar_tecnologias(
     count_b, salario_b = _contar_y_promedio_sueldo_por_habilidad(sb, tecnologia_b)
 
     try:
-        r_total = sb.table("jobs_clean").select("id", count="exact").limit(1).execute()
+        r_total = ejecutar(sb.table("jobs_clean").select("id", count="exact").limit(1))
         total_ofertas = getattr(r_total, "count", None)
         if total_ofertas is None:
-            r_all = sb.table("jobs_clean").select("id").execute()
+            r_all = ejecutar(sb.table("jobs_clean").select("id"))
             total_ofertas = len(r_all.data or [])
     except Exception:
         total_ofertas = 0
@@ -144,24 +145,28 @@ def comparar_tecnologias(
         sb, tecnologia_a, tecnologia_b, min(periodo_meses, MAX_MESES_TENDENCIA)
     )
 
+    # Variaciones mes a mes desde el rollup mensual (lecturas pequeñas, sin escanear jobs_clean)
+    variaciones_a = calcular_variaciones(get_serie_mensual(sb, tecnologia_a, meses=3))
+    variaciones_b = calcular_variaciones(get_serie_mensual(sb, tecnologia_b, meses=3))
+
     return {
         "tecnologia_a": {
             "nombre": tecnologia_a,
             "tipo": "Tecnología",
             "salario_promedio": salario_a,
-            "salario_variacion": 0,
+            "salario_variacion": variaciones_a["salario_variacion_porcentaje"],
             "vacantes_activas": count_a,
             "cuota_mercado": cuota_a,
-            "tendencia": "estable",
+            "tendencia": clasificar_tendencia(variaciones_a["ofertas_variacion_porcentaje"], cuota_a),
         },
         "tecnologia_b": {
             "nombre": tecnologia_b,
             "tipo": "Tecnología",
             "salario_promedio": salario_b,
-            "salario_variacion": 0,
+            "salario_variacion": variaciones_b["salario_variacion_porcentaje"],
             "vacantes_activas": count_b,
             "cuota_mercado": cuota_b,
-            "tendencia": "estable",
+            "tendencia": clasificar_tendencia(variaciones_b["ofertas_variacion_porcentaje"], cuota_b),
         },
         "tendencia_historica": tendencia,
         "conclusion": {
@@ -1,7 +1,7 @@
-from collections import Counter
-from app.database import get_supabase
-from app.utils import parse_habilidades
+from app.database import ejecutar, get_supabase
+from app.utils import contar_habilidades, contar_seniority, sueldos_validos
 from app.services.ai_service import get_embedding 
+from app.services.rollup_service import get_serie_mensual, calcular_variaciones, ofertas_mes_en_curso
 
 # CONFIGURACIÓN
 SIMILARITY_THRESHOLD = 0.27
@@ -29,7 +29,7 @@ def _aplicar_filtro_semantico(query_builder, rol: str | None):
     }
     
     try:
-        rpc_response = sb.rpc("match_jobs_ids", params).execute()
+        rpc_response = ejecutar(sb.rpc("match_jobs_ids", params))
     except Exception as e:
         print(f"Error en RPC match_jobs_ids: {e}")
         return query_builder.eq("id", -1)
@@ -50,21 +50,13 @@ def get_estadisticas_mercado(rol: str | None = None) -> dict:
 
     q = _aplicar_filtro_semantico(q, rol)
 
-    r = q.limit(MAX_LIMIT).execute()
+    r = ejecutar(q.limit(MAX_LIMIT))
     rows = r.data or []
 
     # Usamos el count real si existe, sino el conteo de filas
     total_real = r.count if r.count is not None else len(rows)
     
-    sueldos = []
-    for x in rows:
-        v = x.get("sueldo")
-        if v is not None and v != "":
-            try:
-                sueldos.append(float(v))
-            except (TypeError, ValueError):
-                continue
-
+    sueldos = sueldos_validos(rows)
     salario_promedio = (sum(sueldos) / len(sueldos)) if sueldos else 0.0
 
     if total_real < 20:
@@ -74,13 +66,19 @@ def get_estadisticas_mercado(rol: str | None = None) -> dict:
     else:
         nivel_demanda = "alto"
 
+    # Variaciones mes a mes desde el rollup mensual. El cubo no tiene dimensión de rol:
+    # con rol se usa la serie de la skill homónima (ej: "python"); si no existe, quedan en 0.
+    serie = get_serie_mensual(sb, skill=rol, meses=3)
+    variaciones = calcular_variaciones(serie)
+    nuevas_vacantes = ofertas_mes_en_curso(serie)
+
     return {
         "total_ofertas": total_real,
-        "ofertas_variacion_porcentaje": 0.0, 
+        "ofertas_variacion_porcentaje": variaciones["ofertas_variacion_porcentaje"],
         "salario_promedio": round(salario_promedio, 2),
-        "salario_variacion_porcentaje": 0.0,
+        "salario_variacion_porcentaje": variaciones["salario_variacion_porcentaje"],
         "nivel_demanda": nivel_demanda,
-        "nuevas_vacantes_porcentaje": 0.0,
+        "nuevas_vacantes_porcentaje": round(nuevas_vacantes / total_real * 100, 1) if total_real else 0.0,
     }
 
 
@@ -90,21 +88,10 @@ def get_tecnologias_demandadas(limit: int = 10, rol: str | None = None) -> list[
     
     q = _aplicar_filtro_semantico(q, rol)
 
-    r = q.limit(MAX_LIMIT).execute()
+    r = ejecutar(q.limit(MAX_LIMIT))
     rows = r.data or []
 
-    counter: Counter = Counter()
-    total_validas = 0
-
-    for row in rows:
-        raw_habs = row.get("habilidades") 
-        habs = parse_habilidades(raw_habs)
-        
-        if habs:
-            total_validas += 1
-            for h in habs:
-                if h:
-                    counter[h.strip().upper()] += 1
+    counter, total_validas = contar_habilidades(rows)
 
     out = []
     base_calc = total_validas if total_validas > 0 else 1
@@ -125,35 +112,17 @@ def get_distribucion_seniority(rol: str | None = None) -> dict:
     
     q = _aplicar_filtro_semantico(q, rol)
     
-    r = q.limit(MAX_LIMIT).execute()
+    r = ejecutar(q.limit(MAX_LIMIT))
     rows = r.data or []
 
-    senior = 0
-    semi_senior = 0
-    junior = 0
-    total = 0
-
-    for row in rows:
-        s = (row.get("seniority") or "").lower()
-        
-        if not s or s == "no especificado":
-            continue
-            
-        total += 1
-        if "senior" in s and "semi" not in s:
-            senior += 1
-        elif "semi" in s:
-            semi_senior += 1
-        elif "junior" in s or "trainee" in s:
-            junior += 1
-        else:
-            semi_senior += 1
+    conteo = contar_seniority(rows)
+    total = conteo["total"]
 
     if total == 0:
         return {"senior": 0, "semi_senior": 0, "junior": 0}
 
     return {
-        "senior": int(senior / total * 100),
-        "semi_senior": int(semi_senior / total * 100),
-        "junior": int(junior / total * 100)
+        "senior": int(conteo["senior"] / total * 100),
+        "semi_senior": int(conteo["semi_senior"] / total * 100),
+        "junior": int(conteo["junior"] / total * 100)
     }
\ No newline at end of file
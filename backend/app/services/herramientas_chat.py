@@ -0,0 +1,279 @@
+"""
+Herramientas de estadísticas del mercado para el chat RAG.
+
+Con seis ofertas recuperadas por similitud el modelo solo puede dar anécdotas a
+"¿qué tecnologías piden más para backend?". Estas herramientas responden sobre todo
+jobs_clean con los servicios que ya alimentan el dashboard (get_tecnologias_demandadas,
+get_distribucion_seniority, get_estadisticas_mercado y el cubo jobs_rollup_mensual)
+y entregan al prompt un resumen numérico de pocas líneas en lugar de filas crudas.
+
+- Qué herramientas llamar lo decide un planificador local (intención por palabras
+  clave, rol y tecnologías sacados del vocabulario de jobs_clean). Con
+  CHAT_HERRAMIENTAS=llm lo decide el modelo chico de Groq con tool calling y, si
+  falla, el planificador local; con `off` el chat vuelve a usar solo ofertas.
+- Cada resultado se cachea (Redis o memoria) por argumentos y versión de datos:
+  cambia solo cuando corre el pipeline.
+"""
+import json
+import os
+import re
+
+from pydantic import BaseModel, Field
+
+from comun.ortografia import normalizar_termino
+from app.cache import cache_get_json, cache_set_json, get_data_version
+from app.database import get_supabase
+from app.services.estadisticas_service import (
+    get_distribucion_seniority, get_estadisticas_mercado, get_tecnologias_demandadas,
+)
+from app.services.rollup_service import calcular_variaciones, get_serie_mensual
+from app.services.skills_service import get_skill_matcher, get_vocabulario
+
+CHAT_HERRAMIENTAS = os.getenv("CHAT_HERRAMIENTAS", "local").lower()  # local | llm | off
+CHAT_HERRAMIENTAS_TTL = int(os.getenv("CHAT_HERRAMIENTAS_TTL", "3600"))
+MAX_HERRAMIENTAS = 3
+MAX_TECNOLOGIAS_SALARIO = 2
+
+
+# =============================================================================
+# Definición (los docstrings y descripciones son lo que ve el modelo en modo llm)
+# =============================================================================
+
+class TecnologiasDemandadas(BaseModel):
+    """Tecnologías y skills más pedidas en las ofertas, con su porcentaje."""
+    rol: str | None = Field(None, description="Rol o área para filtrar (ej: 'backend', 'data engineer'); null para todo el mercado")
+    limite: int = Field(10, description="Cantidad de tecnologías (máximo 15)")
+
+
+class DistribucionSeniority(BaseModel):
+    """Porcentaje de ofertas senior, semi senior y junior."""
+    rol: str | None = Field(None, description="Rol o área para filtrar; null para todo el mercado")
+
+
+class ResumenMercado(BaseModel):
+    """Total de ofertas, salario promedio, nivel de demanda y variación mes a mes."""
+    rol: str | None = Field(None, description="Rol o área para filtrar; null para todo el mercado")
+
+
+class SalarioTecnologia(BaseModel):
+    """Ofertas y salario promedio mensual de una tecnología concreta en los últimos meses."""
+    tecnologia: str = Field(description="Tecnología o skill (ej: 'python', 'react')")
+
+
+def _tecnologias(rol: str | None = None, limite: int = 10) -> dict:
+    return {"rol": rol, "tecnologias": get_tecnologias_demandadas(limit=min(max(limite, 1), 15), rol=rol)}
+
+
+def _seniority(rol: str | None = None) -> dict:
+    return {"rol": rol, **get_distribucion_seniority(rol=rol)}
+
+
+def _mercado(rol: str | None = None) -> dict:
+    return {"rol": rol, **get_estadisticas_mercado(rol=rol)}
+
+
+def _salario_tecnologia(tecnologia: str) -> dict:
+    serie = get_serie_mensual(get_supabase(), skill=tecnologia, meses=4)
+    return {"tecnologia": tecnologia, "serie": serie, **calcular_variaciones(serie)}
+
+
+HERRAMIENTAS = {
+    "TecnologiasDemandadas": (TecnologiasDemandadas, _tecnologias),
+    "DistribucionSeniority": (DistribucionSeniority, _seniority),
+    "ResumenMercado": (ResumenMercado, _mercado),
+    "SalarioTecnologia": (SalarioTecnologia, _salario_tecnologia),
+}
+
+
+# =============================================================================
+# Resúmenes compactos para el prompt
+# =============================================================================
+
+def _ambito(rol: str | None) -> str:
+    return f" ({rol})" if rol else " (todo el mercado)"
+
+
+def _signo(valor: float) -> str:
+    return f"{valor:+.1f}%"
+
+
+def resumir(nombre: str, datos: dict) -> str:
+    """Una o dos líneas con los números de una herramienta."""
+    if nombre == "TecnologiasDemandadas":
+        tecnologias = datos.get("tecnologias") or []
+        if not tecnologias:
+            return f"Tecnologías más pedidas{_ambito(datos.get('rol'))}: sin datos."
+        top = ", ".join(f"{t['nombre']} {t['porcentaje']}%" for t in tecnologias)
+        return f"Tecnologías más pedidas{_ambito(datos.get('rol'))}, % de ofertas que la piden: {top}"
+    if nombre == "DistribucionSeniority":
+        return (f"Seniority{_ambito(datos.get('rol'))}: senior {datos.get('senior', 0)}%, "
+                f"semi senior {datos.get('semi_senior', 0)}%, junior {datos.get('junior', 0)}%")
+    if nombre == "ResumenMercado":
+        salario = datos.get("salario_promedio") or 0
+        return (f"Mercado{_ambito(datos.get('rol'))}: {datos.get('total_ofertas', 0)} ofertas, "
+                f"salario promedio {'$' + format(salario, ',.0f') if salario else 'sin datos'}, "
+                f"demanda {datos.get('nivel_demanda', 'bajo')}, ofertas mes a mes "
+                f"{_signo(datos.get('ofertas_variacion_porcentaje', 0.0))}, salario mes a mes "
+                f"{_signo(datos.get('salario_variacion_porcentaje', 0.0))}")
+    if nombre == "SalarioTecnologia":
+        serie = [p for p in datos.get("serie") or [] if p.get("ofertas")]
+        if not serie:
+            return f"Salario de {datos.get('tecnologia')}: sin datos mensuales."
+        meses = "; ".join(
+            f"{p['etiqueta']}: {p['ofertas']} ofertas"
+            + (f", ${p['salario_promedio']:,.0f}" if p.get("salario_promedio") else "")
+            for p in serie
+        )
+        return (f"{datos.get('tecnologia')} por mes: {meses} "
+                f"(ofertas {_signo(datos.get('ofertas_variacion_porcentaje', 0.0))}, "
+                f"salario {_signo(datos.get('salario_variacion_porcentaje', 0.0))} mes a mes)")
+    return ""
+
+
+# =============================================================================
+# Planificación
+# =============================================================================
+
+_INTENCIONES = {
+    "TecnologiasDemandadas": re.compile(
+        r"tecnolog|skill|habilidad|lenguaje|framework|herramienta|piden|requisit|stack|aprend|estudi"
+    ),
+    "DistribucionSeniority": re.compile(r"senior|junior|seniority|trainee|practicante|experiencia|nivel"),
+    "Salario": re.compile(r"salari|sueldo|gana|pagan|paga |cobra|remunera"),
+    "ResumenMercado": re.compile(
+        r"demanda|mercado|tendencia|cu[aá]nt[oa]s (ofertas|vacantes|trabajos|empleos)|hay (ofertas|trabajo|empleo|vacantes)"
+    ),
+}
+
+# Áreas frecuentes en las preguntas -> término de búsqueda semántica
+_ROLES_FRECUENTES = {
+    "backend": "backend", "back end": "backend", "back-end": "backend",
+    "frontend": "frontend", "front end": "frontend", "front-end": "frontend",
+    "fullstack": "fullstack", "full stack": "fullstack", "full-stack": "fullstack",
+    "devops": "devops", "sre": "devops", "cloud": "cloud",
+    "data engineer": "data engineer", "ingeniero de datos": "data engineer",
+    "data scientist": "data science", "ciencia de datos": "data science", "científico de datos": "data science",
+    "analista de datos": "analista de datos", "business intelligence": "business intelligence",
+    "qa": "qa", "tester": "qa", "testing": "qa", "móvil": "mobile", "mobile": "mobile",
+    "android": "android", "ios": "ios", "ciberseguridad": "ciberseguridad", "soporte": "soporte técnico",
+    "machine learning": "machine learning", "scrum master": "scrum master", "product owner": "product owner",
+}
+
+
+def _contiene(texto: str, termino: str) -> bool:
+    return re.search(rf"(?<!\w){re.escape(termino)}(?!\w)", texto) is not None
+
+
+def extraer_rol(mensaje: str) -> str | None:
+    """Rol mencionado: primero un rol_busqueda real de jobs_clean, luego áreas frecuentes."""
+    texto = normalizar_termino(mensaje)
+    try:
+        _, _, roles = get_vocabulario()
+        candidatos = sorted((normalizar_termino(r) for r in roles), key=len, reverse=True)
+        rol = next((r for r in candidatos if len(r) > 3 and _contiene(texto, r)), None)
+        if rol:
+            return rol
+    except Exception as e:
+        print(f"⚠️ Sin vocabulario de roles para el chat: {e}")
+    for patron in sorted(_ROLES_FRECUENTES, key=len, reverse=True):
+        if _contiene(texto, patron):
+            return _ROLES_FRECUENTES[patron]
+    return None
+
+
+def planificar_local(mensaje: str) -> list[tuple[str, dict]]:
+    """Herramientas a llamar según la intención del mensaje (sin LLM)."""
+    texto = normalizar_termino(mensaje) + " "
+    rol = extraer_rol(mensaje)
+    tecnologias = [t for t in get_skill_matcher().buscar(mensaje) if rol is None or normalizar_termino(t) != rol]
+    # Sin rol, la tecnología nombrada acota el resto: "¿cuántas ofertas de java hay?" no
+    # es una pregunta sobre todo el mercado
+    if rol is None and tecnologias:
+        rol = normalizar_termino(tecnologias[0])
+    plan: list[tuple[str, dict]] = []
+
+    if _INTENCIONES["Salario"].search(texto):
+        for tecnologia in tecnologias[:MAX_TECNOLOGIAS_SALARIO]:
+            plan.append(("SalarioTecnologia", {"tecnologia": tecnologia}))
+        if not tecnologias:
+            plan.append(("ResumenMercado", {"rol": rol}))
+    if _INTENCIONES["TecnologiasDemandadas"].search(texto):
+        plan.append(("TecnologiasDemandadas", {"rol": rol, "limite": 10}))
+    if _INTENCIONES["DistribucionSeniority"].search(texto):
+        plan.append(("DistribucionSeniority", {"rol": rol}))
+    if _INTENCIONES["ResumenMercado"].search(texto) and not any(n == "ResumenMercado" for n, _ in plan):
+        plan.append(("ResumenMercado", {"rol": rol}))
+    return plan[:MAX_HERRAMIENTAS]
+
+
+def planificar_llm(mensaje: str) -> list[tuple[str, dict]]:
+    """Tool calling con el modelo chico de Groq: solo elige herramientas y argumentos."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    from app.llm import crear_llm, invocar_llm
+
+    llm = crear_llm("llama-3.1-8b-instant").bind_tools([esquema for esquema, _ in HERRAMIENTAS.values()])
+    system = (
+        "Eres el planificador de DevRadar (empleo IT en Ecuador). Decide qué estadísticas del "
+        "mercado hacen falta para responder la pregunta y llama a esas herramientas (máximo 3). "
+        "Si la pregunta no necesita estadísticas, no llames ninguna."
+    )
+    respuesta = invocar_llm(llm, [SystemMessage(content=system), HumanMessage(content=mensaje)])
+    plan = []
+    for llamada in getattr(respuesta, "tool_calls", None) or []:
+        if llamada.get("name") in HERRAMIENTAS:
+            argumentos = HERRAMIENTAS[llamada["name"]][0](**(llamada.get("args") or {}))
+            plan.append((llamada["name"], argumentos.model_dump()))
+    return plan[:MAX_HERRAMIENTAS]
+
+
+def planificar(mensaje: str) -> list[tuple[str, dict]]:
+    if CHAT_HERRAMIENTAS == "off":
+        return []
+    if CHAT_HERRAMIENTAS == "llm":
+        try:
+            return planificar_llm(mensaje)
+        except Exception as e:
+            print(f"⚠️ Falló el planificador con Groq, se usa el local: {e}")
+    try:
+        return planificar_local(mensaje)
+    except Exception as e:
+        print(f"⚠️ Falló el planificador de herramientas del chat: {e}")
+        return []
+
+
+# =============================================================================
+# Ejecución con caché
+# =============================================================================
+
+def ejecutar_herramienta(nombre: str, argumentos: dict) -> dict:
+    """Resultado de la herramienta; se cachea por argumentos y versión de jobs_clean."""
+    esquema, funcion = HERRAMIENTAS[nombre]
+    argumentos = esquema(**argumentos).model_dump()
+    key = f"chat:herramienta:{nombre}:{json.dumps(argumentos, sort_keys=True, ensure_ascii=False)}:{get_data_version()}"
+    cacheado = cache_get_json(key)
+    if cacheado is not None:
+        return cacheado
+    datos = funcion(**argumentos)
+    cache_set_json(key, datos, CHAT_HERRAMIENTAS_TTL)
+    return datos
+
+
+def consultar_estadisticas(mensaje: str) -> tuple[str, list[str]]:
+    """
+    Bloque de estadísticas para el prompt ("" si la pregunta no las necesita) y los
+    nombres de las herramientas que respondieron.
+    """
+    lineas, usadas = [], []
+    for nombre, argumentos in planificar(mensaje):
+        try:
+            linea = resumir(nombre, ejecutar_herramienta(nombre, argumentos))
+        except Exception as e:
+            print(f"⚠️ Herramienta {nombre} falló: {e}")
+            continue
+        if linea:
+            lineas.append(f"- {linea}")
+            usadas.append(nombre)
+    if not lineas:
+        return "", []
+    return "ESTADÍSTICAS DEL MERCADO (sobre todas las ofertas de DevRadar):\n" + "\n".join(lineas), usadas
@@ -3,7 +3,7 @@ Servicio de ofertas laborales desde jobs_clean.
 Filtro de fechas por fecha_publicacion (TEXT con formatos mixtos: solo fecha o fecha+hora).
 """
 from datetime import datetime, timezone
-from app.database import get_supabase
+from app.database import ejecutar, get_supabase
 from app.utils import row_to_oferta, parse_habilidades, parse_fecha_publicacion
 
 # Límite de filas a traer cuando se filtra por fecha (fecha_publicacion se filtra en Python)
@@ -69,7 +69,7 @@ def get_ofertas(
         # Traer más filas para filtrar por fecha_publicacion en Python (columna TEXT con formatos mixtos)
         q = q.order("created_at", desc=True)
         q = q.limit(MAX_ROWS_WHEN_DATE_FILTER)
-        r = q.execute()
+        r = ejecutar(q)
         all_rows = r.data or []
         rows_with_fp = [(row, parse_fecha_publicacion(row.get("fecha_publicacion"))) for row in all_rows]
         filtered = [row for row, fp in rows_with_fp if fp is not None
@@ -83,7 +83,7 @@ def get_ofertas(
         q = q.order("created_at", desc=True)
         offset = (page - 1) * limit
         q = q.range(offset, offset + limit - 1)
-        r = q.execute()
+        r = ejecutar(q)
         rows = r.data or []
         total = getattr(r, "count", None)
         if total is None:
@@ -109,7 +109,7 @@ def get_oferta_by_id(id_str: str) -> dict | None:
     """Obtiene una oferta por id."""
     sb = get_supabase()
     try:
-        r = sb.table("jobs_clean").select("*").eq("id", int(id_str)).limit(1).execute()
+        r = ejecutar(sb.table("jobs_clean").select("*").eq("id", int(id_str)).limit(1))
         if r.data and len(r.data) > 0:
             return row_to_oferta(r.data[0])
     except (ValueError, TypeError):
@@ -0,0 +1,88 @@
+"""
+Corrector ortográfico local sobre el vocabulario de jobs_clean.
+
+Índice de borrados simétricos (comun.ortografia) con las habilidades distintas de
+`habilidades` y los valores de `rol_busqueda`, ponderados por número de ofertas. Se
+reconstruye cuando cambia la versión de jobs_clean, es decir, después de cada corrida
+del pipeline. Corrige "pyton" -> "PYTHON" en microsegundos; Groq solo ve los
+términos que el índice no sabe resolver.
+
+Ninguna candidata se da por buena sin más: hay demasiadas palabras comunes a una o dos
+letras de una tecnología ("pera" -> PERL, "lava" -> JAVA, "doctor" -> DOCKER). La
+candidata es una pista que confirma el clasificador o Groq (ver validar_termino_con_ia);
+las palabras de _NO_CORREGIR ni siquiera la reciben.
+"""
+import threading
+
+from prometheus_client import Counter
+
+from comun.ortografia import IndiceOrtografico, Sugerencia, normalizar_termino
+from app.services.clasificador_semillas import TERMINOS_NO_TECH
+from app.services.skills_service import get_vocabulario
+
+CORRECCIONES = Counter(
+    "devradar_spell_corrections_total",
+    "Búsquedas al corrector ortográfico local por resultado (exacto, candidato, sin_candidato)",
+    ["result"],
+)
+
+# Palabras del español a una letra de una tecnología del vocabulario
+PALABRAS_CERCANAS = [
+    "pera", "perla", "escala", "sala", "lava", "jaba", "rusa", "mira", "gira", "nodo", "rubí", "sopa",
+    "poder", "base",
+]
+# Palabras comunes que no se deben "corregir" hacia una tecnología parecida
+_NO_CORREGIR = {normalizar_termino(t) for t in [*TERMINOS_NO_TECH, *PALABRAS_CERCANAS]}
+
+_indice: tuple[str, IndiceOrtografico] | None = None
+_lock = threading.Lock()
+
+
+def get_indice() -> IndiceOrtografico:
+    """Índice vigente; se reconstruye (unas decenas de ms) si cambió el vocabulario."""
+    global _indice
+    version, habilidades, roles = get_vocabulario()
+    if _indice and _indice[0] == version:
+        return _indice[1]
+    with _lock:
+        if _indice and _indice[0] == version:
+            return _indice[1]
+        indice = IndiceOrtografico({**habilidades, **roles})
+        _indice = (version, indice)
+        print(f"🔤 Índice ortográfico listo ({len(indice)} términos)")
+        return indice
+
+
+def precargar_indice():
+    try:
+        get_indice()
+    except Exception as e:
+        print(f"⚠️ No se pudo construir el índice ortográfico: {e}")
+
+
+def sugerir(termino: str, limite: int = 5) -> list[Sugerencia]:
+    """Sugerencias ordenadas (la primera es la corrección); distancia 0 = el término existe."""
+    if normalizar_termino(termino) in _NO_CORREGIR:
+        return []
+    try:
+        return get_indice().sugerencias(termino, limite=limite)
+    except Exception as e:
+        print(f"⚠️ Error en el corrector ortográfico: {e}")
+        return []
+
+
+def corregir_termino(termino: str) -> Sugerencia | None:
+    """
+    Mejor candidata si el término está mal escrito y el índice conoce algo parecido;
+    None si no hay candidata o si el término ya existe. Quien llama debe confirmarla
+    (ver validar_termino_con_ia).
+    """
+    mejores = sugerir(termino, limite=1)
+    if not mejores:
+        CORRECCIONES.labels("sin_candidato").inc()
+        return None
+    if mejores[0].distancia == 0:
+        CORRECCIONES.labels("exacto").inc()
+        return None
+    CORRECCIONES.labels("candidato").inc()
+    return mejores[0]
@@ -0,0 +1,288 @@
+"""
+Armado del prompt del chat RAG con presupuesto de tokens.
+
+Antes cada turno mandaba al 70B las últimas cinco respuestas completas en Markdown,
+el string crudo de `habilidades` y todos los campos de seis ofertas, así que el
+prompt (y la latencia) crecía con la conversación. Ahora:
+- Las ofertas se escriben en una línea cada una, sin campos vacíos, sin repetir las
+  duplicadas y sacando a una cabecera los valores comunes a todas (ubicación,
+  skills...). Entran mientras quepan en su parte del presupuesto.
+- Del historial entran los mensajes más recientes que quepan (las respuestas largas
+  recortadas); los que no caben y los que ya salieron de la ventana de Redis se
+  compactan en un resumen acumulado de una línea por mensaje.
+- Se registra por petición la estimación de tokens y, cuando Groq la devuelve, la
+  cuenta real, que además corrige la estimación de las siguientes.
+
+CHAT_PROMPT_MAX_TOKENS es el presupuesto total del prompt (sin la respuesta).
+"""
+import math
+import os
+import re
+import threading
+
+from prometheus_client import Counter
+
+from app.utils import parse_habilidades
+
+CHAT_PROMPT_MAX_TOKENS = int(os.getenv("CHAT_PROMPT_MAX_TOKENS", "1800"))
+# Parte de lo que queda (sin system ni pregunta) reservada para las ofertas
+FRACCION_OFERTAS = 0.55
+CHAT_RESUMEN_MAX_TOKENS = int(os.getenv("CHAT_RESUMEN_MAX_TOKENS", "200"))
+# Tope por respuesta previa del asistente incluida tal cual
+MAX_TOKENS_RESPUESTA_PREVIA = 250
+MAX_SKILLS_OFERTA = 8
+PALABRAS_LINEA_RESUMEN = 24
+
+CHAT_TOKENS = Counter(
+    "devradar_chat_tokens_total",
+    "Tokens del chat RAG (prompt y completion; reales de Groq o estimados si no vienen)",
+    ["kind"],
+)
+
+_VACIOS = {"", "none", "null", "nan", "no especificado", "n/a", "-"}
+_TOKENS = re.compile(r"\w+|[^\w\s]")
+_MARKDOWN = re.compile(r"[#*_`>|]+")
+_ESPACIOS = re.compile(r"\s+")
+_FIN_ORACION = re.compile(r"(?<=[.!?])\s")
+
+# Relación tokens reales / estimados (Groq devuelve la cuenta real en cada respuesta)
+_calibracion = {"factor": 1.0}
+_lock = threading.Lock()
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Tokens aproximados del tokenizer de Llama 3 sin cargarlo: cada signo cuenta uno y
+    cada palabra uno por cada 4 caracteres. Ajustado con la cuenta real de Groq.
+    """
+    if not texto:
+        return 0
+    crudo = sum(math.ceil(len(t) / 4) if t[0].isalnum() or t[0] == "_" else 1 for t in _TOKENS.findall(texto))
+    return math.ceil(crudo * _calibracion["factor"])
+
+
+def registrar_uso(estimados: int, prompt_reales: int | None, completion: int | None):
+    """Cuenta los tokens de la petición y recalibra la estimación (media móvil)."""
+    if prompt_reales:
+        CHAT_TOKENS.labels("prompt").inc(prompt_reales)
+        if estimados:
+            with _lock:
+                crudo = estimados / _calibracion["factor"]
+                factor = 0.9 * _calibracion["factor"] + 0.1 * (prompt_reales / crudo)
+                _calibracion["factor"] = min(max(factor, 0.5), 3.0)
+    else:
+        CHAT_TOKENS.labels("prompt_estimado").inc(estimados)
+    if completion:
+        CHAT_TOKENS.labels("completion").inc(completion)
+
+
+def uso_tokens(respuesta) -> tuple[int | None, int | None]:
+    """(prompt, completion) reales de una respuesta de langchain_groq, si vienen."""
+    uso = getattr(respuesta, "usage_metadata", None) or {}
+    if uso:
+        return uso.get("input_tokens"), uso.get("output_tokens")
+    uso = (getattr(respuesta, "response_metadata", None) or {}).get("token_usage") or {}
+    return uso.get("prompt_tokens"), uso.get("completion_tokens")
+
+
+# =============================================================================
+# Historial y resumen acumulado
+# =============================================================================
+
+def _texto_plano(texto: str) -> str:
+    return _ESPACIOS.sub(" ", _MARKDOWN.sub(" ", texto or "")).strip()
+
+
+def _recortar_palabras(texto: str, palabras: int) -> str:
+    partes = texto.split(" ")
+    return texto if len(partes) <= palabras else " ".join(partes[:palabras]) + "…"
+
+
+def compactar_mensaje(mensaje: dict) -> str:
+    """Una línea por mensaje: la pregunta recortada o la primera oración de la respuesta."""
+    texto = _texto_plano(mensaje.get("content", ""))
+    if mensaje.get("role") == "user":
+        return f"Usuario: {_recortar_palabras(texto, PALABRAS_LINEA_RESUMEN)}"
+    primera = _FIN_ORACION.split(texto, maxsplit=1)[0]
+    return f"DevRadar: {_recortar_palabras(primera, PALABRAS_LINEA_RESUMEN)}"
+
+
+def _ajustar_lineas(lineas: list[str], max_tokens: int) -> list[str]:
+    """Descarta las líneas más viejas hasta que el bloque entra en max_tokens."""
+    while lineas and estimar_tokens("\n".join(lineas)) > max_tokens:
+        lineas = lineas[1:]
+    return lineas
+
+
+def actualizar_resumen(resumen: str, mensajes: list[dict]) -> str:
+    """Agrega al resumen los mensajes que salen de la ventana de historial."""
+    lineas = [l for l in (resumen or "").splitlines() if l.strip()]
+    lineas += [compactar_mensaje(m) for m in mensajes]
+    return "\n".join(_ajustar_lineas(lineas, CHAT_RESUMEN_MAX_TOKENS))
+
+
+def _recortar_tokens(texto: str, max_tokens: int) -> str:
+    if estimar_tokens(texto) <= max_tokens:
+        return texto
+    # Recorte proporcional y luego fino por palabras
+    palabras = texto.split(" ")
+    n = max(1, int(len(palabras) * max_tokens / max(estimar_tokens(texto), 1)))
+    while n > 1 and estimar_tokens(" ".join(palabras[:n])) > max_tokens:
+        n = int(n * 0.9)
+    return " ".join(palabras[:n]) + " …"
+
+
+# =============================================================================
+# Ofertas
+# =============================================================================
+
+def _valor(oferta: dict, campo: str) -> str:
+    v = _ESPACIOS.sub(" ", str(oferta.get(campo) or "")).strip()
+    return "" if v.lower() in _VACIOS else v
+
+
+def _skills(oferta: dict) -> list[str]:
+    vistas: dict[str, str] = {}
+    for h in parse_habilidades(oferta.get("habilidades")):
+        clave = h.strip().upper()
+        if clave and clave.lower() not in _VACIOS:
+            vistas.setdefault(clave, h.strip())
+    return list(vistas.values())
+
+
+def formatear_ofertas(ofertas: list[dict], max_tokens: int) -> tuple[str, int]:
+    """
+    Bloque de contexto con las ofertas que entran en max_tokens.
+    Retorna (texto, ofertas incluidas).
+    """
+    if not ofertas:
+        return "No se encontraron ofertas específicas.", 0
+
+    # Duplicados (la misma oferta publicada en dos plataformas)
+    unicas, vistas = [], set()
+    for o in ofertas:
+        clave = (_valor(o, "oferta_laboral").lower(), _valor(o, "compania").lower())
+        if clave not in vistas:
+            vistas.add(clave)
+            unicas.append(o)
+
+    filas = [{
+        "Puesto": _valor(o, "oferta_laboral") or "Oferta IT",
+        "Empresa": _valor(o, "compania"),
+        "Salario": _valor(o, "sueldo"),
+        "Ubicación": _valor(o, "locacion"),
+        "skills": _skills(o),
+    } for o in unicas]
+
+    # Valores repetidos en todas las ofertas -> una sola vez en la cabecera
+    comunes: list[str] = []
+    if len(filas) > 1:
+        for campo in ("Empresa", "Salario", "Ubicación"):
+            valores = {f[campo] for f in filas}
+            if len(valores) == 1 and "" not in valores:
+                comunes.append(f"{campo} (todas): {valores.pop()}")
+                for f in filas:
+                    f[campo] = ""
+        skills_comunes = set.intersection(*(set(s.upper() for s in f["skills"]) for f in filas))
+        if skills_comunes:
+            comunes.append("Skills en todas: " + ", ".join(s for s in filas[0]["skills"] if s.upper() in skills_comunes))
+            for f in filas:
+                f["skills"] = [s for s in f["skills"] if s.upper() not in skills_comunes]
+
+    cabecera = "OFERTAS ENCONTRADAS (Úsalas para responder):"
+    lineas = [cabecera] + comunes
+    usados = estimar_tokens("\n".join(lineas))
+    incluidas = 0
+    for f in filas:
+        partes = [f["Puesto"]] + [f"{c}: {f[c]}" for c in ("Empresa", "Salario", "Ubicación") if f[c]]
+        if f["skills"]:
+            partes.append("Skills: " + ", ".join(f["skills"][:MAX_SKILLS_OFERTA]))
+        linea = "- " + " | ".join(partes)
+        costo = estimar_tokens(linea) + 1
+        if usados + costo > max_tokens and incluidas:
+            break
+        lineas.append(linea)
+        usados += costo
+        incluidas += 1
+    return "\n".join(lineas), incluidas
+
+
+# =============================================================================
+# Prompt completo
+# =============================================================================
+
+class PromptChat:
+    """Mensajes [(rol, contenido)] listos para el LLM y el desglose de tokens."""
+
+    def __init__(self, mensajes: list[tuple[str, str]], tokens: dict[str, int], ofertas: int, historial: int):
+        self.mensajes = mensajes
+        self.tokens = tokens
+        self.ofertas = ofertas
+        self.historial = historial
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens.values())
+
+
+def construir_prompt(
+    system: str,
+    pregunta: str,
+    ofertas: list[dict],
+    historial: list[dict],
+    resumen: str = "",
+    presupuesto: int | None = None,
+    estadisticas: str = "",
+) -> PromptChat:
+    """
+    Reparte el presupuesto: system y pregunta siempre; las estadísticas del mercado
+    (herramientas_chat) primero y las ofertas en lo que quede de FRACCION_OFERTAS; el
+    resto para el historial reciente, y lo que no entra se compacta junto al resumen
+    acumulado.
+    """
+    presupuesto = presupuesto or CHAT_PROMPT_MAX_TOKENS
+    tokens = {"system": estimar_tokens(system), "pregunta": estimar_tokens(pregunta) + 8}
+    restante = max(presupuesto - tokens["system"] - tokens["pregunta"], 0)
+
+    contexto_datos = int(restante * FRACCION_OFERTAS)
+    estadisticas = _recortar_tokens(estadisticas, contexto_datos // 2) if estadisticas else ""
+    tokens["estadisticas"] = estimar_tokens(estadisticas)
+    restante -= tokens["estadisticas"]
+
+    contexto, n_ofertas = formatear_ofertas(ofertas, contexto_datos - tokens["estadisticas"])
+    if estadisticas:
+        contexto = f"{estadisticas}\n\n{contexto}"
+    tokens["ofertas"] = estimar_tokens(contexto) - tokens["estadisticas"]
+    restante = max(restante - tokens["ofertas"], 0)
+
+    # Historial: del más nuevo al más viejo mientras quepa (dejando lugar al resumen)
+    lineas_resumen = [l for l in (resumen or "").splitlines() if l.strip()]
+    espacio_resumen = min(CHAT_RESUMEN_MAX_TOKENS, restante // 3) if (lineas_resumen or historial) else 0
+    disponible = restante - espacio_resumen
+    recientes: list[tuple[str, str]] = []
+    compactados: list[dict] = []
+    usados = 0
+    for i, m in enumerate(reversed(historial)):
+        contenido = m.get("content", "")
+        if m.get("role") != "user":
+            contenido = _recortar_tokens(contenido, MAX_TOKENS_RESPUESTA_PREVIA)
+        costo = estimar_tokens(contenido) + 4
+        if usados + costo > disponible:
+            compactados = historial[:len(historial) - i]
+            break
+        recientes.append(("user" if m.get("role") == "user" else "assistant", contenido))
+        usados += costo
+    recientes.reverse()
+    tokens["historial"] = usados
+
+    lineas_resumen += [compactar_mensaje(m) for m in compactados]
+    lineas_resumen = _ajustar_lineas(lineas_resumen, espacio_resumen + max(disponible - usados, 0))
+    texto_resumen = "\n".join(lineas_resumen)
+    tokens["resumen"] = estimar_tokens(texto_resumen)
+
+    system_final = system
+    if texto_resumen:
+        system_final = f"{system}\n\nRESUMEN DE LA CONVERSACIÓN PREVIA:\n{texto_resumen}"
+    mensajes = [("system", system_final)] + recientes
+    mensajes.append(("user", f"{contexto}\n\nPREGUNTA DEL USUARIO: {pregunta}"))
+    return PromptChat(mensajes, tokens, n_ofertas, len(recientes))
@@ -0,0 +1,95 @@
+"""
+Lecturas del cubo mensual jobs_rollup_mensual (lo mantiene el limpiador).
+Series y variaciones mes a mes con unas pocas filas, sin escanear jobs_clean.
+"""
+from datetime import datetime, timezone
+
+from comun.skills import canonizar_skill
+from app.database import ejecutar
+
+TODOS = "*"
+MESES_ABREV = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
+# Umbral (%) de variación de ofertas para considerar una tendencia creciente/decreciente
+UMBRAL_TENDENCIA = 10.0
+# Cuota de mercado (%) a partir de la cual una tecnología se considera dominante
+CUOTA_DOMINANTE = 30.0
+
+
+def _inicio_mes(fecha: datetime, meses_atras: int = 0) -> datetime:
+    total = fecha.year * 12 + (fecha.month - 1) - meses_atras
+    return datetime(total // 12, total % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def get_serie_mensual(sb, skill: str | None = None, meses: int = 12) -> list[dict]:
+    """
+    Serie mensual (orden ascendente) de ofertas y salario promedio.
+    skill=None usa el total del mercado. Retorna [] si el cubo no existe o está vacío.
+    """
+    clave = canonizar_skill(skill) if skill else TODOS
+    desde = _inicio_mes(datetime.now(timezone.utc), meses - 1).strftime("%Y-%m-%d")
+    try:
+        r = ejecutar(
+            sb.table("jobs_rollup_mensual")
+            .select("mes, ofertas, salario_suma, salario_count")
+            .eq("skill", clave)
+            .eq("seniority", TODOS)
+            .eq("locacion", TODOS)
+            .gte("mes", desde)
+            .order("mes")
+        )
+    except Exception as e:
+        print(f"No se pudo leer jobs_rollup_mensual: {e}")
+        return []
+
+    serie = []
+    for row in r.data or []:
+        mes = str(row.get("mes", ""))[:10]
+        salario_count = int(row.get("salario_count") or 0)
+        salario_suma = float(row.get("salario_suma") or 0)
+        serie.append({
+            "mes": mes,
+            "etiqueta": f"{MESES_ABREV[int(mes[5:7]) - 1]} {mes[:4]}",
+            "ofertas": int(row.get("ofertas") or 0),
+            "salario_promedio": round(salario_suma / salario_count, 2) if salario_count else 0.0,
+        })
+    return serie
+
+
+def _variacion(actual: float, anterior: float) -> float:
+    if not anterior:
+        return 0.0
+    return round((actual - anterior) / anterior * 100, 1)
+
+
+def calcular_variaciones(serie: list[dict]) -> dict:
+    """
+    Variación mes a mes entre los dos últimos meses completos de la serie
+    (el mes en curso se excluye porque está incompleto).
+    """
+    mes_actual = _inicio_mes(datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+    completos = [p for p in serie if p["mes"] < mes_actual]
+    if len(completos) < 2:
+        return {"ofertas_variacion_porcentaje": 0.0, "salario_variacion_porcentaje": 0.0}
+
+    anterior, ultimo = completos[-2], completos[-1]
+    return {
+        "ofertas_variacion_porcentaje": _variacion(ultimo["ofertas"], anterior["ofertas"]),
+        "salario_variacion_porcentaje": _variacion(ultimo["salario_promedio"], anterior["salario_promedio"]),
+    }
+
+
+def ofertas_mes_en_curso(serie: list[dict]) -> int:
+    """Ofertas publicadas en el mes calendario actual."""
+    mes_actual = _inicio_mes(datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+    return next((p["ofertas"] for p in serie if p["mes"] == mes_actual), 0)
+
+
+def clasificar_tendencia(ofertas_variacion: float, cuota_mercado: float | None = None) -> str:
+    """'dominante' | 'creciente' | 'estable' | 'decreciente' (valores que espera el frontend)."""
+    if cuota_mercado is not None and cuota_mercado >= CUOTA_DOMINANTE:
+        return "dominante"
+    if ofertas_variacion >= UMBRAL_TENDENCIA:
+        return "creciente"
+    if ofertas_variacion <= -UMBRAL_TENDENCIA:
+        return "decreciente"
+    return "estable"
@@ -0,0 +1,65 @@
+"""
+Diccionario de habilidades compilado a partir de jobs_clean.
+Se construye una vez por versión de datos y se comparte entre peticiones.
+"""
+from collections import Counter
+
+from comun.skills import SkillMatcher
+from app.cache import get_data_version
+from app.database import ejecutar, get_supabase
+from app.utils import parse_habilidades
+
+_vocabulario: tuple[str, Counter, Counter] | None = None
+_matcher: tuple[str, SkillMatcher] | None = None
+
+
+def cargar_frecuencias_vocabulario(sb) -> tuple[Counter, Counter]:
+    """
+    (habilidades, roles) distintos de jobs_clean con su número de ofertas, en una sola
+    lectura. Habilidades en mayúsculas; rol_busqueda tal como está guardado.
+    """
+    r = ejecutar(sb.table("jobs_clean").select("habilidades, rol_busqueda"))
+    habilidades: Counter = Counter()
+    roles: Counter = Counter()
+    for row in r.data or []:
+        for h in {h.strip().upper() for h in parse_habilidades(row.get("habilidades")) if h.strip()}:
+            habilidades[h] += 1
+        rol = str(row.get("rol_busqueda") or "").strip()
+        if rol:
+            roles[rol] += 1
+    return habilidades, roles
+
+
+def get_vocabulario() -> tuple[str, Counter, Counter]:
+    """
+    (versión, habilidades, roles) vigentes. Lo comparten el matcher, el clasificador
+    local y el corrector ortográfico: jobs_clean se lee una vez por versión de datos.
+    Si la lectura falla se conserva el vocabulario anterior (con su versión).
+    """
+    global _vocabulario
+    version = get_data_version()
+    if _vocabulario and _vocabulario[0] == version:
+        return _vocabulario
+
+    try:
+        habilidades, roles = cargar_frecuencias_vocabulario(get_supabase())
+    except Exception as e:
+        print(f"No se pudo cargar el vocabulario de habilidades: {e}")
+        if _vocabulario:
+            return _vocabulario
+        habilidades, roles = Counter(), Counter()
+
+    _vocabulario = (version, habilidades, roles)
+    return _vocabulario
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Retorna el matcher vigente; lo recompila si cambió la versión de jobs_clean."""
+    global _matcher
+    version, habilidades, _ = get_vocabulario()
+    if _matcher and _matcher[0] == version:
+        return _matcher[1]
+
+    matcher = SkillMatcher(habilidades)
+    _matcher = (version, matcher)
+    return matcher
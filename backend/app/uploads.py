@@ -0,0 +1,76 @@
+"""
+Lectura acotada de archivos subidos.
+Evita cargar el upload completo en RAM y corta la petición apenas supera el límite.
+"""
+import hashlib
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+CHUNK_SIZE = 64 * 1024  # 64 KB
+# Margen para los boundaries del multipart y los campos de formulario (rol_objetivo)
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+async def leer_upload_acotado(archivo: UploadFile, max_bytes: int) -> tuple[BinaryIO, str, int]:
+    """
+    Recorre el upload por bloques calculando tamaño y SHA-256 sin copiarlo a memoria.
+    Starlette ya guarda el archivo en un SpooledTemporaryFile (RAM hasta 1 MB, luego disco),
+    así que se reutiliza ese mismo archivo rebobinado para la extracción.
+    Retorna (archivo, hash, tamaño). Lanza HTTPException si supera max_bytes.
+    """
+    hasher = hashlib.sha256()
+    total = 0
+    while True:
+        chunk = await archivo.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(400, f"El archivo supera el límite de {max_bytes // (1024 * 1024)} MB")
+        hasher.update(chunk)
+    await archivo.seek(0)
+    return archivo.file, hasher.hexdigest(), total
+
+
+class LimiteCuerpoMiddleware:
+    """
+    Middleware ASGI que limita el tamaño del body en rutas de subida.
+    Rechaza por Content-Length antes de leer nada y, si el cliente no lo envía
+    (chunked), corta la lectura en cuanto los bytes recibidos superan el límite.
+    """
+
+    def __init__(self, app, max_bytes: int, rutas: tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes + MULTIPART_OVERHEAD
+        self.rutas = rutas
+        self.mensaje = f"El archivo supera el límite de {max_bytes // (1024 * 1024)} MB"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.rutas:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        try:
+            content_length = int(headers.get(b"content-length", b"0"))
+        except ValueError:
+            content_length = 0
+        if content_length > self.max_bytes:
+            response = JSONResponse({"detail": self.mensaje}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        recibidos = 0
+
+        async def receive_limitado():
+            nonlocal recibidos
+            message = await receive()
+            if message["type"] == "http.request":
+                recibidos += len(message.get("body", b""))
+                if recibidos > self.max_bytes:
+                    raise HTTPException(400, self.mensaje)
+            return message
+
+        await self.app(scope, receive_limitado, send)
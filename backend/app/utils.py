@@ -2,9 +2,9 @@
 Utilidades para mapear filas de jobs_clean al formato API.
 """
 import re
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Any
-import io
 
 
 def parse_fecha_publicacion(texto: str | None) -> datetime | None:
@@ -45,22 +45,6 @@ def parse_fecha_publicacion(texto: str | None) -> datetime | None:
     return None
 
 
-def extraer_texto_archivo(contenido: bytes, filename: str) -> str:
-    """
-    Extrae texto de PDF o DOCX según extensión del archivo.
-    """
-    name_lower = (filename or "").lower()
-    if name_lower.endswith(".pdf"):
-        from pypdf import PdfReader
-        reader = PdfReader(io.BytesIO(contenido))
-        return " ".join(page.extract_text() or "" for page in reader.pages)
-    if name_lower.endswith(".docx"):
-        from docx import Document
-        doc = Document(io.BytesIO(contenido))
-        return " ".join(p.text for p in doc.paragraphs)
-    raise ValueError("Solo se soportan archivos PDF y DOCX")
-
-
 def parse_habilidades(h: Any) -> list[str]:
     """Convierte habilidades (TEXT en DB: comma-separated o JSON string) a lista."""
     if h is None or (isinstance(h, str) and not h.strip()):
@@ -95,3 +79,51 @@ def row_to_oferta(row: dict) -> dict:
         "created_at": row.get("created_at", ""),
         "seniority": row.get("seniority"),
     }
+
+
+def sueldos_validos(rows: list[dict]) -> list[float]:
+    """Sueldos numéricos de las filas (ignora vacíos y valores no convertibles)."""
+    sueldos = []
+    for x in rows:
+        v = x.get("sueldo")
+        if v is not None and v != "":
+            try:
+                sueldos.append(float(v))
+            except (TypeError, ValueError):
+                continue
+    return sueldos
+
+
+def contar_habilidades(rows: list[dict]) -> tuple[Counter, int]:
+    """Frecuencia de cada habilidad (en mayúsculas) y cantidad de filas con habilidades."""
+    counter: Counter = Counter()
+    total_validas = 0
+    for row in rows:
+        habs = parse_habilidades(row.get("habilidades"))
+        if habs:
+            total_validas += 1
+            for h in habs:
+                if h:
+                    counter[h.strip().upper()] += 1
+    return counter, total_validas
+
+
+def contar_seniority(rows: list[dict]) -> dict[str, int]:
+    """Conteo por seniority (senior, semi_senior, junior); omite 'no especificado'."""
+    conteo = {"senior": 0, "semi_senior": 0, "junior": 0, "total": 0}
+    for row in rows:
+        s = (row.get("seniority") or "").lower()
+
+        if not s or s == "no especificado":
+            continue
+
+        conteo["total"] += 1
+        if "senior" in s and "semi" not in s:
+            conteo["senior"] += 1
+        elif "semi" in s:
+            conteo["semi_senior"] += 1
+        elif "junior" in s or "trainee" in s:
+            conteo["junior"] += 1
+        else:
+            conteo["semi_senior"] += 1
+    return conteo
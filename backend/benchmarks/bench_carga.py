@@ -0,0 +1,424 @@
+"""
+Prueba de carga de la API con dependencias locales (sin Supabase ni Groq reales).
+
+Levanta:
+- fake_postgrest.py: PostgREST en memoria con jobs_clean sintético y match_jobs*.
+- fake_groq.py: Groq compatible con OpenAI con latencia log-normal inyectada.
+- redis-server local (si está en el PATH; o --redis-url; si no, caché en memoria).
+- main:app con uvicorn apuntando a todo lo anterior (--workers N; con --sidecar los
+  workers piden los embeddings a un único sidecar).
+
+Luego reproduce una mezcla de tráfico realista (ofertas, estadísticas, comparar,
+chat y analizar-cv) con N clientes concurrentes en lazo cerrado, y reporta p50,
+p95, p99 y throughput por ruta y por nivel de concurrencia, más el desglose medio
+por etapa leído del header Server-Timing.
+
+Uso (desde backend/):
+    python benchmarks/bench_carga.py
+    python benchmarks/bench_carga.py --concurrencias 1,8,32 --duracion 30 --groq-latencia-ms 900
+    python benchmarks/bench_carga.py --workers 4 --sidecar
+    python benchmarks/bench_carga.py --api-url http://localhost:8000   # API ya levantada
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+_BENCH_DIR = Path(__file__).resolve().parent
+_BACKEND_ROOT = _BENCH_DIR.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from bench_extraccion import pdf_minimo
+from bench_funciones import LOCACIONES, ROLES, SKILLS
+
+# Clave con forma de JWT: create_client valida el formato, el fake no la verifica
+CLAVE_FALSA = "bench.bench.bench"
+MENSAJES_CHAT = [
+    "¿Cuánto gana un desarrollador Python en Quito?",
+    "¿Qué tecnologías piden más para backend?",
+    "Quiero ser data engineer, ¿qué debo aprender?",
+    "¿Hay ofertas remotas de React?",
+    "¿Qué empresas buscan DevOps con AWS?",
+]
+
+# Mezcla de tráfico por defecto (peso relativo de cada ruta)
+MEZCLA = {
+    "GET /api/ofertas": 30,
+    "GET /api/ofertas/{id}": 10,
+    "GET /api/estadisticas/mercado": 8,
+    "GET /api/estadisticas/tecnologias": 8,
+    "GET /api/estadisticas/seniority": 4,
+    "POST /api/comparar-tecnologias": 10,
+    "POST /api/chat": 20,
+    "POST /api/analizar-cv": 10,
+}
+
+
+# =============================================================================
+# Servicios locales
+# =============================================================================
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _esperar_http(url: str, proceso: subprocess.Popen | None, timeout: float = 120):
+    """Espera a que el servicio responda cualquier status HTTP."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if proceso is not None and proceso.poll() is not None:
+            raise RuntimeError(f"El proceso de {url} terminó con código {proceso.returncode}")
+        try:
+            httpx.get(url, timeout=2)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.3)
+    raise TimeoutError(f"{url} no respondió en {timeout:.0f} s")
+
+
+def _esperar_listo(url: str, proceso: subprocess.Popen, timeout: float = 300):
+    """Espera a que /ready responda 200 (modelo de embeddings cargado)."""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"La API terminó con código {proceso.returncode}")
+        try:
+            r = httpx.get(f"{url}/ready", timeout=2)
+            if r.status_code == 200:
+                return
+            if r.json().get("embedding") == "error":
+                raise RuntimeError(f"La precarga del modelo falló: {r.json().get('error')}")
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise TimeoutError(f"{url}/ready no respondió 200 en {timeout:.0f} s")
+
+
+def _esperar_tcp(puerto: int, timeout: float = 20):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Redis no respondió en el puerto {puerto}")
+
+
+class Servicios:
+    """Levanta los fakes, Redis y la API; los detiene al salir del bloque with."""
+
+    def __init__(self, args, logs: Path):
+        self.args = args
+        self.logs = logs
+        self.procesos: list[subprocess.Popen] = []
+        self.api_url = args.api_url
+
+    def _lanzar(self, nombre: str, comando: list[str], env: dict) -> subprocess.Popen:
+        log = open(self.logs / f"{nombre}.log", "w")
+        proceso = subprocess.Popen(comando, cwd=_BACKEND_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        self.procesos.append(proceso)
+        return proceso
+
+    def _uvicorn(self, app: str, puerto: int, extra: list[str] | None = None) -> list[str]:
+        return [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(puerto),
+                "--log-level", "warning", *(extra or [])]
+
+    def __enter__(self):
+        if self.api_url:
+            return self
+        try:
+            self._iniciar()
+        except BaseException:
+            # __exit__ no corre si __enter__ falla: detener lo que ya se levantó
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def _iniciar(self):
+        base_env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+        puerto_pg = _puerto_libre()
+        pg = self._lanzar("fake_postgrest", self._uvicorn("fake_postgrest:app", puerto_pg, ["--app-dir", str(_BENCH_DIR)]),
+                          {**base_env, "FAKE_PG_FILAS": str(self.args.filas),
+                           "FAKE_PG_LATENCIA_MS": str(self.args.pg_latencia_ms)})
+        _esperar_http(f"http://127.0.0.1:{puerto_pg}/rest/v1/jobs_clean?limit=1", pg)
+
+        puerto_groq = _puerto_libre()
+        groq = self._lanzar("fake_groq", self._uvicorn("fake_groq:app", puerto_groq, ["--app-dir", str(_BENCH_DIR)]),
+                            {**base_env, "FAKE_GROQ_LATENCIA_MS": str(self.args.groq_latencia_ms)})
+        _esperar_http(f"http://127.0.0.1:{puerto_groq}/", groq)
+
+        redis_url = self.args.redis_url
+        if not redis_url and shutil.which("redis-server"):
+            puerto_redis = _puerto_libre()
+            self._lanzar("redis", ["redis-server", "--port", str(puerto_redis), "--save", "", "--appendonly", "no"],
+                         base_env)
+            _esperar_tcp(puerto_redis)
+            redis_url = f"redis://127.0.0.1:{puerto_redis}"
+        if not redis_url:
+            print("⚠️ redis-server no está en el PATH: la API usará la caché en memoria (--redis-url para usar uno)")
+
+        sidecar_env = {}
+        if self.args.sidecar:
+            from app.embeddings_sidecar import ClienteSidecar
+
+            ruta = str(self.logs / "embeddings.sock")
+            sidecar = self._lanzar("sidecar", [sys.executable, "-m", "app.embeddings_sidecar"],
+                                   {**base_env, "EMBEDDINGS_SIDECAR_SOCKET": ruta})
+            print("⏳ Esperando al sidecar de embeddings...")
+            limite = time.monotonic() + 300
+            while not ClienteSidecar(ruta).ping():
+                if sidecar.poll() is not None or time.monotonic() > limite:
+                    raise RuntimeError("El sidecar de embeddings no levantó (ver sidecar.log)")
+                time.sleep(0.3)
+            sidecar_env["EMBEDDINGS_SIDECAR_SOCKET"] = ruta
+        if self.args.workers > 1:
+            carpeta_metricas = self.logs / "metricas"
+            carpeta_metricas.mkdir(exist_ok=True)
+            sidecar_env["PROMETHEUS_MULTIPROC_DIR"] = str(carpeta_metricas)
+
+        puerto_api = _puerto_libre()
+        api_env = {
+            **sidecar_env,
+            **base_env,
+            "SUPABASE_URL": f"http://127.0.0.1:{puerto_pg}",
+            "SUPABASE_KEY": CLAVE_FALSA,
+            "GROQ_API_KEY": "bench",
+            "GROQ_API_BASE": f"http://127.0.0.1:{puerto_groq}",
+            "REDIS_URL": redis_url or "",
+            "REDIS_ENABLED": "true" if redis_url else "false",
+        }
+        api = self._lanzar("api", self._uvicorn("main:app", puerto_api, ["--workers", str(self.args.workers)]), api_env)
+        self.api_url = f"http://127.0.0.1:{puerto_api}"
+        print("⏳ Esperando a la API (carga del modelo de embeddings)...")
+        _esperar_listo(self.api_url, api)
+
+    def __exit__(self, *exc):
+        for proceso in reversed(self.procesos):
+            proceso.terminate()
+        for proceso in self.procesos:
+            try:
+                proceso.wait(10)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+
+
+# =============================================================================
+# Mezcla de tráfico
+# =============================================================================
+
+def _cvs_sinteticos(cantidad: int, semilla: int = 7) -> list[bytes]:
+    """CVs distintos: la API cachea por hash, así se mezclan aciertos y fallos de caché."""
+    rng = random.Random(semilla)
+    cvs = []
+    for i in range(cantidad):
+        lineas = [f"Curriculum Vitae {i} - {rng.choice(ROLES)}", f"{rng.choice(LOCACIONES)}, Ecuador"]
+        lineas += [f"- Proyectos con {', '.join(rng.sample(SKILLS, 4))}." for _ in range(30)]
+        cvs.append(pdf_minimo([lineas]))
+    return cvs
+
+
+class GeneradorTrafico:
+    def __init__(self, mezcla: dict[str, int], filas: int, semilla: int):
+        self.rutas = list(mezcla)
+        self.pesos = [mezcla[r] for r in self.rutas]
+        self.filas = filas
+        self.cvs = _cvs_sinteticos(20)
+        self.semilla = semilla
+
+    def peticion(self, rng: random.Random) -> tuple[str, dict]:
+        ruta = rng.choices(self.rutas, self.pesos)[0]
+        metodo, _, path = ruta.partition(" ")
+        kwargs: dict = {}
+        if ruta == "GET /api/ofertas":
+            params = {"page": rng.randint(1, 5), "limit": 20}
+            if rng.random() < 0.4:
+                params["rol"] = rng.choice(ROLES).split()[0]
+            if rng.random() < 0.3:
+                params["locacion"] = rng.choice(LOCACIONES)
+            kwargs["params"] = params
+        elif ruta == "GET /api/ofertas/{id}":
+            path = f"/api/ofertas/{rng.randrange(self.filas)}"
+        elif ruta.startswith("GET /api/estadisticas"):
+            if rng.random() < 0.5:
+                kwargs["params"] = {"rol": rng.choice(SKILLS).lower()}
+        elif ruta == "POST /api/comparar-tecnologias":
+            a, b = rng.sample(SKILLS, 2)
+            kwargs["json"] = {"tecnologia_a": a, "tecnologia_b": b}
+        elif ruta == "POST /api/chat":
+            kwargs["json"] = {"mensaje": rng.choice(MENSAJES_CHAT), "session_id": f"bench-{rng.randrange(50)}"}
+        elif ruta == "POST /api/analizar-cv":
+            i = rng.randrange(len(self.cvs))
+            kwargs["files"] = {"archivo": (f"cv_{i}.pdf", self.cvs[i], "application/pdf")}
+            kwargs["data"] = {"rol_objetivo": rng.choice(ROLES)}
+        return ruta, {"method": metodo, "url": path, **kwargs}
+
+
+def _parsear_server_timing(valor: str) -> dict[str, float]:
+    etapas = {}
+    for parte in valor.split(","):
+        nombre, *atributos = [x.strip() for x in parte.split(";")]
+        for atributo in atributos:
+            if atributo.startswith("dur="):
+                etapas[nombre] = float(atributo[4:])
+    return etapas
+
+
+# =============================================================================
+# Ejecución y reporte
+# =============================================================================
+
+async def _trabajador(cliente: httpx.AsyncClient, trafico: GeneradorTrafico, rng: random.Random,
+                      inicio_medicion: float, fin: float, registros: list):
+    while time.perf_counter() < fin:
+        ruta, peticion = trafico.peticion(rng)
+        t0 = time.perf_counter()
+        etapas = {}
+        try:
+            r = await cliente.request(**peticion)
+            status = r.status_code
+            etapas = _parsear_server_timing(r.headers.get("server-timing", ""))
+        except httpx.HTTPError:
+            status = 0
+        latencia = time.perf_counter() - t0
+        if t0 >= inicio_medicion:
+            registros.append((ruta, latencia, status, etapas))
+
+
+def _percentil(ordenados: list[float], p: float) -> float:
+    if not ordenados:
+        return 0.0
+    k = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[k]
+
+
+def _resumir(registros: list, duracion: float) -> dict:
+    por_ruta: dict[str, list] = defaultdict(list)
+    for registro in registros:
+        por_ruta[registro[0]].append(registro)
+        por_ruta["TOTAL"].append(registro)
+
+    resumen = {}
+    for ruta, filas in por_ruta.items():
+        latencias = sorted(f[1] * 1000 for f in filas)
+        etapas: dict[str, float] = defaultdict(float)
+        for f in filas:
+            for etapa, ms in f[3].items():
+                etapas[etapa] += ms
+        resumen[ruta] = {
+            "peticiones": len(filas),
+            "rps": round(len(filas) / duracion, 2),
+            "p50_ms": round(_percentil(latencias, 50), 1),
+            "p95_ms": round(_percentil(latencias, 95), 1),
+            "p99_ms": round(_percentil(latencias, 99), 1),
+            "errores": sum(1 for f in filas if f[2] == 0 or f[2] >= 500),
+            "respuestas_4xx": sum(1 for f in filas if 400 <= f[2] < 500),
+            "etapas_media_ms": {e: round(total / len(filas), 1) for e, total in sorted(etapas.items()) if e != "total"},
+        }
+    return resumen
+
+
+async def _nivel(api_url: str, trafico: GeneradorTrafico, concurrencia: int,
+                 duracion: float, calentamiento: float) -> dict:
+    registros: list = []
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=api_url, timeout=120, limits=limites) as cliente:
+        ahora = time.perf_counter()
+        inicio_medicion = ahora + calentamiento
+        fin = inicio_medicion + duracion
+        await asyncio.gather(*(
+            _trabajador(cliente, trafico, random.Random(trafico.semilla * 1000 + i), inicio_medicion, fin, registros)
+            for i in range(concurrencia)
+        ))
+    return _resumir(registros, duracion)
+
+
+def _imprimir(concurrencia: int, resumen: dict, duracion: float):
+    total = resumen.get("TOTAL", {})
+    print(f"\n=== Concurrencia {concurrencia} ({duracion:.0f} s): "
+          f"{total.get('rps', 0)} req/s, {total.get('errores', 0)} errores ===")
+    print(f"{'ruta':<34}{'n':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err':>6}{'4xx':>6}  etapas (media ms)")
+    for ruta in [*(r for r in MEZCLA if r in resumen), "TOTAL"]:
+        r = resumen.get(ruta)
+        if not r:
+            continue
+        etapas = " ".join(f"{e}={ms}" for e, ms in r["etapas_media_ms"].items()) if ruta != "TOTAL" else ""
+        print(f"{ruta:<34}{r['peticiones']:>7}{r['rps']:>9}{r['p50_ms']:>10}{r['p95_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['errores']:>6}{r['respuestas_4xx']:>6}  {etapas}")
+
+
+def _parsear_mezcla(texto: str | None) -> dict[str, int]:
+    """'chat=40,ofertas=20' -> pesos sobre las rutas cuyo nombre contiene cada clave."""
+    if not texto:
+        return dict(MEZCLA)
+    mezcla = {}
+    for parte in texto.split(","):
+        clave, _, peso = parte.partition("=")
+        for ruta in MEZCLA:
+            if clave.strip() and clave.strip() in ruta:
+                mezcla[ruta] = int(peso)
+    if not mezcla:
+        raise SystemExit(f"La mezcla '{texto}' no coincide con ninguna ruta: {', '.join(MEZCLA)}")
+    return mezcla
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API con dependencias locales")
+    parser.add_argument("--concurrencias", default="1,4,16", help="Niveles de clientes concurrentes")
+    parser.add_argument("--duracion", type=float, default=20, help="Segundos medidos por nivel")
+    parser.add_argument("--calentamiento", type=float, default=3, help="Segundos descartados al inicio de cada nivel")
+    parser.add_argument("--mezcla", help="Pesos por ruta, ej: 'chat=40,ofertas=30,analizar=10'")
+    parser.add_argument("--filas", type=int, default=5000, help="Filas sintéticas de jobs_clean en el fake")
+    parser.add_argument("--groq-latencia-ms", type=float, default=600, help="Mediana de latencia del Groq falso")
+    parser.add_argument("--pg-latencia-ms", type=float, default=5, help="Latencia por consulta del PostgREST falso")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn para la API")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="Embeddings desde un sidecar compartido por los workers (app/embeddings_sidecar.py)")
+    parser.add_argument("--redis-url", help="Redis existente (por defecto se levanta redis-server si está instalado)")
+    parser.add_argument("--api-url", help="Usar una API ya levantada (no se inician fakes ni Redis)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    concurrencias = [int(c) for c in args.concurrencias.split(",") if c.strip()]
+    trafico = GeneradorTrafico(_parsear_mezcla(args.mezcla), args.filas, args.semilla)
+    resultados = []
+
+    with tempfile.TemporaryDirectory(prefix="devradar-carga-") as tmp:
+        try:
+            with Servicios(args, Path(tmp)) as servicios:
+                print(f"🎯 API: {servicios.api_url} | Groq falso p50 {args.groq_latencia_ms:.0f} ms | {args.filas} filas")
+                for concurrencia in concurrencias:
+                    resumen = asyncio.run(_nivel(servicios.api_url, trafico, concurrencia,
+                                                 args.duracion, args.calentamiento))
+                    _imprimir(concurrencia, resumen, args.duracion)
+                    resultados.append({"concurrencia": concurrencia, "duracion_s": args.duracion, "rutas": resumen})
+        except (RuntimeError, TimeoutError) as e:
+            print(f"❌ {e}")
+            for log in sorted(Path(tmp).glob("*.log")):
+                print(f"\n--- {log.name} (últimas líneas) ---")
+                print("\n".join(log.read_text(errors="replace").splitlines()[-20:]))
+            sys.exit(1)
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
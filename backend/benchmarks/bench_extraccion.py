@@ -0,0 +1,192 @@
+"""
+Benchmark de extracción de texto de CVs por backend (pypdfium2 vs pypdf).
+
+Mide páginas/segundo y tasa de fallos sobre un corpus de CVs. Por defecto genera
+un corpus sintético (CVs de 1 a 60 páginas, más documentos dañados y páginas sin
+texto); con --corpus se usa una carpeta con PDFs reales.
+
+Uso (desde backend/):
+    python benchmarks/bench_extraccion.py
+    python benchmarks/bench_extraccion.py --corpus ~/cvs --repeticiones 5 --aislado
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.extraccion import BACKENDS_PDF, MAX_PAGINAS_PDF, extraer_texto_aislado
+
+SKILLS = ["PYTHON", "JAVA", "REACT", "AWS", "DOCKER", "SQL", "KUBERNETES", "ANGULAR", "NODE.JS", "GIT", "SCRUM"]
+ROLES = ["Desarrollador Backend", "Frontend Developer", "Data Engineer", "QA Automation", "DevOps"]
+
+
+# =============================================================================
+# Generación de corpus sintético
+# =============================================================================
+
+def _escapar_pdf(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_minimo(paginas: list[list[str]]) -> bytes:
+    """Construye un PDF válido (Helvetica, una línea por elemento) sin dependencias externas."""
+    objetos: list[bytes] = []
+    n_paginas = len(paginas)
+    kids = " ".join(f"{4 + i * 2} 0 R" for i in range(n_paginas))
+    objetos.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objetos.append(f"<< /Type /Pages /Kids [{kids}] /Count {n_paginas} >>".encode())
+    objetos.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, lineas in enumerate(paginas):
+        contenido_id = 5 + i * 2
+        objetos.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {contenido_id} 0 R >>".encode()
+        )
+        ops = "BT /F1 10 Tf 14 TL 50 750 Td " + " ".join(f"({_escapar_pdf(l)}) Tj T*" for l in lineas) + " ET"
+        stream = ops.encode("latin-1", "replace")
+        objetos.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    salida = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objetos, 1):
+        offsets.append(len(salida))
+        salida += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(salida)
+    salida += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        salida += f"{off:010d} 00000 n \n".encode()
+    salida += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(salida)
+
+
+def _pagina_cv(rng: random.Random, n: int) -> list[str]:
+    lineas = [f"Curriculum Vitae - {rng.choice(ROLES)} - Pagina {n}", "Quito, Ecuador | linkedin.com/in/candidato"]
+    for _ in range(45):
+        skills = ", ".join(rng.sample(SKILLS, 4))
+        lineas.append(f"- Experiencia en proyectos con {skills}; {rng.randint(1, 8)} anios de trabajo.")
+    return lineas
+
+
+def generar_corpus(destino: Path, semilla: int = 42) -> list[Path]:
+    """Escribe el corpus sintético en destino y retorna las rutas generadas."""
+    rng = random.Random(semilla)
+    destino.mkdir(parents=True, exist_ok=True)
+    archivos: dict[str, bytes] = {}
+    for paginas in (1, 2, 3, 5, 20, 60):
+        archivos[f"cv_{paginas:02d}_paginas.pdf"] = pdf_minimo([_pagina_cv(rng, i + 1) for i in range(paginas)])
+    # Páginas sin texto (equivalente a un CV escaneado)
+    archivos["cv_sin_texto.pdf"] = pdf_minimo([[] for _ in range(3)])
+    # Documentos dañados / hostiles
+    completo = archivos["cv_05_paginas.pdf"]
+    archivos["danado_truncado.pdf"] = completo[: len(completo) // 2]
+    archivos["danado_basura.pdf"] = bytes(rng.getrandbits(8) for _ in range(50_000))
+    archivos["danado_sin_xref.pdf"] = completo.split(b"xref")[0]
+
+    rutas = []
+    for nombre, datos in archivos.items():
+        ruta = destino / nombre
+        ruta.write_bytes(datos)
+        rutas.append(ruta)
+    return rutas
+
+
+# =============================================================================
+# Medición
+# =============================================================================
+
+def medir_backend(nombre: str, rutas: list[Path], repeticiones: int, max_paginas: int) -> dict:
+    backend = BACKENDS_PDF[nombre]
+    paginas = fallos = documentos = 0
+    segundos = 0.0
+    for _ in range(repeticiones):
+        for ruta in rutas:
+            documentos += 1
+            inicio = time.perf_counter()
+            try:
+                with open(ruta, "rb") as f:
+                    paginas += sum(1 for _ in backend(f, max_paginas))
+            except ImportError:
+                return {"backend": nombre, "disponible": False}
+            except Exception:
+                fallos += 1
+            segundos += time.perf_counter() - inicio
+    return {
+        "backend": nombre,
+        "disponible": True,
+        "documentos": documentos,
+        "paginas": paginas,
+        "segundos": round(segundos, 4),
+        "paginas_por_segundo": round(paginas / segundos, 1) if segundos else 0.0,
+        "fallos": fallos,
+        "tasa_fallos": round(fallos / documentos, 3) if documentos else 0.0,
+    }
+
+
+def medir_aislado(rutas: list[Path], repeticiones: int) -> dict:
+    """Latencia de extracción completa en subproceso (incluye arranque y límites)."""
+    latencias = []
+    fallos = 0
+    for _ in range(repeticiones):
+        for ruta in rutas:
+            inicio = time.perf_counter()
+            try:
+                with open(ruta, "rb") as f:
+                    extraer_texto_aislado(f, ruta.name)
+            except Exception:
+                fallos += 1
+            latencias.append(time.perf_counter() - inicio)
+    latencias.sort()
+    return {
+        "backend": "aislado (subproceso)",
+        "documentos": len(latencias),
+        "p50_ms": round(latencias[len(latencias) // 2] * 1000, 1),
+        "max_ms": round(latencias[-1] * 1000, 1),
+        "fallos": fallos,
+        "tasa_fallos": round(fallos / len(latencias), 3) if latencias else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de extractores de texto PDF")
+    parser.add_argument("--corpus", type=Path, help="Carpeta con PDFs reales (por defecto: corpus sintético)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--max-paginas", type=int, default=1000,
+                        help=f"Tope de páginas por documento (la API usa {MAX_PAGINAS_PDF})")
+    parser.add_argument("--aislado", action="store_true", help="Medir también la extracción en subproceso")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = sorted(args.corpus.glob("*.pdf")) if args.corpus else generar_corpus(Path(tmp))
+        if not rutas:
+            print("❌ No hay PDFs en el corpus.")
+            return
+
+        print(f"📄 Corpus: {len(rutas)} documentos x {args.repeticiones} repeticiones")
+        resultados = [medir_backend(n, rutas, args.repeticiones, args.max_paginas) for n in BACKENDS_PDF]
+        if args.aislado:
+            resultados.append(medir_aislado(rutas, args.repeticiones))
+
+    print(f"\n{'backend':<22}{'pág/s':>10}{'páginas':>10}{'fallos':>8}{'tasa':>8}")
+    for r in resultados:
+        if not r.get("disponible", True):
+            print(f"{r['backend']:<22}{'no instalado':>36}")
+        elif "paginas_por_segundo" in r:
+            print(f"{r['backend']:<22}{r['paginas_por_segundo']:>10}{r['paginas']:>10}{r['fallos']:>8}{r['tasa_fallos']:>8}")
+        else:
+            print(f"{r['backend']:<22}{'p50 ' + str(r['p50_ms']) + ' ms':>20}{r['fallos']:>8}{r['tasa_fallos']:>8}")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmarks de las funciones puras que corren por fila en cada request.
+
+parse_habilidades, parse_fecha_publicacion, row_to_oferta y los conteos de
+estadísticas (sueldos, habilidades, seniority) sobre datasets con forma de
+jobs_clean de 1k, 10k y 100k filas. Reporta filas/segundo y pico de memoria por
+fila, y falla (exit 1) si alguna función empeora más que el umbral respecto al
+baseline guardado en benchmarks/baseline_funciones.json.
+
+Uso (desde backend/):
+    python benchmarks/bench_funciones.py
+    python benchmarks/bench_funciones.py --dataset jobs_clean.csv   # export real de Supabase
+    python benchmarks/bench_funciones.py --guardar-baseline         # tras una mejora intencional
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.utils import (
+    contar_habilidades,
+    contar_seniority,
+    parse_fecha_publicacion,
+    parse_habilidades,
+    row_to_oferta,
+    sueldos_validos,
+)
+from comun.microbench import ejecutar_suite
+
+BASELINE = Path(__file__).resolve().parent / "baseline_funciones.json"
+
+SKILLS = ["Python", "Java", "React", "AWS", "Docker", "SQL", "Kubernetes", "Angular", "Node.js",
+          "Git", "Scrum", "TypeScript", "Azure", "Power BI", "C#", ".NET", "Linux", "Django"]
+ROLES = ["Desarrollador Backend", "Frontend Developer", "Data Engineer", "QA Automation", "DevOps"]
+LOCACIONES = ["Quito", "Guayaquil", "Cuenca", "Remoto", "Ecuador"]
+SENIORITIES = ["Senior", "Semi-Senior", "Junior", "Trainee", "No especificado", None, "Lead"]
+
+
+def _fecha(rng: random.Random) -> str | None:
+    d, m = rng.randint(1, 28), rng.randint(1, 12)
+    return rng.choice([
+        f"2026-{m:02d}-{d:02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+        f"2026-{m:02d}-{d:02d}",
+        f"2026-{m:02d}-{d:02d} 10:15:00",
+        f"{d:02d}/{m:02d}/2026",
+        "hace 3 días",
+        None,
+    ])
+
+
+def _habilidades(rng: random.Random) -> str | None:
+    elegidas = rng.sample(SKILLS, rng.randint(0, 8))
+    formato = rng.random()
+    if formato < 0.1:
+        return None
+    if formato < 0.25:
+        return json.dumps(elegidas)
+    return ", ".join(elegidas)
+
+
+def _sueldo(rng: random.Random):
+    return rng.choice([None, None, "", rng.randint(470, 4500), float(rng.randint(800, 3000)), "a convenir"])
+
+
+def generar_filas(n: int, semilla: int = 42) -> list[dict]:
+    """Filas sintéticas con la forma (y los formatos mezclados) de jobs_clean."""
+    rng = random.Random(semilla)
+    return [
+        {
+            "id": i,
+            "plataforma": rng.choice(["computrabajo", "jooble", "linkedin"]),
+            "rol_busqueda": rng.choice(ROLES),
+            "fecha_publicacion": _fecha(rng),
+            "oferta_laboral": f"{rng.choice(ROLES)} {rng.choice(['Sr', 'Jr', ''])}".strip(),
+            "locacion": rng.choice(LOCACIONES),
+            "descripcion": " ".join(rng.choices(SKILLS + ["experiencia", "equipo", "proyectos"], k=80)),
+            "sueldo": _sueldo(rng),
+            "compania": f"Empresa {rng.randint(1, 400)}",
+            "habilidades": _habilidades(rng),
+            "url_publicacion": f"https://ec.computrabajo.com/ofertas-de-trabajo/oferta-{i}",
+            "created_at": "2026-10-01T12:00:00+00:00",
+            "seniority": rng.choice(SENIORITIES),
+        }
+        for i in range(n)
+    ]
+
+
+CASOS = {
+    "parse_habilidades": lambda filas: [parse_habilidades(f.get("habilidades")) for f in filas],
+    "parse_fecha_publicacion": lambda filas: [parse_fecha_publicacion(f.get("fecha_publicacion")) for f in filas],
+    "row_to_oferta": lambda filas: [row_to_oferta(f) for f in filas],
+    "estadisticas.sueldos_validos": sueldos_validos,
+    "estadisticas.contar_habilidades": contar_habilidades,
+    "estadisticas.contar_seniority": contar_seniority,
+}
+
+
+if __name__ == "__main__":
+    ejecutar_suite(__doc__.strip().splitlines()[0], CASOS, generar_filas, BASELINE)
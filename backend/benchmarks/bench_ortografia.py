@@ -0,0 +1,157 @@
+"""
+Benchmark del corrector ortográfico local (comun/ortografia.py).
+
+Arma el índice igual que la API (habilidades y rol_busqueda de jobs_clean con su
+frecuencia) y le pasa errores de tipeo generados a partir del mismo vocabulario
+(borrar, insertar, cambiar o transponer letras):
+- tiempo de construcción y tamaño del índice
+- latencia por búsqueda (p50/p95/p99 en µs)
+- % de errores que se corrigen al término original, que quedan sin candidato (irían
+  a Groq) o que se corrigen a otro término
+- correcciones espurias sobre términos que no son tecnología (semillas del clasificador)
+
+Uso (desde backend/):
+    python benchmarks/bench_ortografia.py
+    python benchmarks/bench_ortografia.py --vocabulario sintetico --tamano 5000 --errores 5000
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+_BENCH_DIR = Path(__file__).resolve().parent
+_BACKEND_ROOT = _BENCH_DIR.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+if str(_BACKEND_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT.parent))
+
+from bench_funciones import ROLES, SKILLS  # noqa: E402
+
+_LETRAS = string.ascii_lowercase
+
+
+def _vocabulario(fuente: str, tamano: int, rng: random.Random) -> tuple[dict[str, int], str]:
+    if fuente in ("supabase", "auto"):
+        try:
+            from app.database import get_supabase
+            from app.services.skills_service import cargar_frecuencias_vocabulario
+
+            habilidades, roles = cargar_frecuencias_vocabulario(get_supabase())
+            if habilidades or roles:
+                return {**habilidades, **roles}, "supabase"
+        except Exception as e:
+            if fuente == "supabase":
+                raise
+            print(f"⚠️ Sin vocabulario de Supabase ({e}); se usa uno sintético")
+
+    from app.services.clasificador_semillas import TERMINOS_TECH
+
+    vocabulario = {t: rng.randint(50, 2000) for t in SKILLS + ROLES + TERMINOS_TECH}
+    # Relleno con la cola larga de habilidades raras (pocas ofertas cada una)
+    while len(vocabulario) < tamano:
+        largo = rng.randint(4, 12)
+        vocabulario["".join(rng.choice(_LETRAS) for _ in range(largo))] = rng.randint(1, 20)
+    return vocabulario, "sintetico"
+
+
+def _con_error(termino: str, rng: random.Random) -> str:
+    """Una edición para términos cortos, una o dos para los largos."""
+    texto = termino.lower()
+    for _ in range(1 if len(texto) <= 5 else rng.randint(1, 2)):
+        i = rng.randrange(len(texto))
+        operacion = rng.choice(("borrar", "insertar", "cambiar", "transponer"))
+        if operacion == "borrar" and len(texto) > 4:
+            texto = texto[:i] + texto[i + 1:]
+        elif operacion == "insertar":
+            texto = texto[:i] + rng.choice(_LETRAS) + texto[i:]
+        elif operacion == "transponer" and i < len(texto) - 1:
+            texto = texto[:i] + texto[i + 1] + texto[i] + texto[i + 2:]
+        else:
+            texto = texto[:i] + rng.choice(_LETRAS) + texto[i + 1:]
+    return texto
+
+
+def _percentil_us(muestras: list[float], p: float) -> float:
+    ordenadas = sorted(muestras)
+    return round(ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))] * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del corrector ortográfico local")
+    parser.add_argument("--vocabulario", choices=("auto", "supabase", "sintetico"), default="auto")
+    parser.add_argument("--tamano", type=int, default=3000, help="Términos del vocabulario sintético")
+    parser.add_argument("--errores", type=int, default=3000, help="Términos mal escritos a corregir")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    from comun.ortografia import IndiceOrtografico, distancia_maxima, normalizar_termino
+    from app.services.clasificador_semillas import TERMINOS_NO_TECH
+    from app.services.ortografia_service import PALABRAS_CERCANAS
+
+    rng = random.Random(7)
+    vocabulario, fuente = _vocabulario(args.vocabulario, args.tamano, rng)
+
+    inicio = time.perf_counter()
+    indice = IndiceOrtografico(vocabulario)
+    construccion_ms = (time.perf_counter() - inicio) * 1000
+    print(f"📚 Vocabulario {fuente}: {len(vocabulario)} términos -> índice de {len(indice)} claves "
+          f"y {len(indice.borrados)} borrados en {construccion_ms:.1f} ms")
+
+    # Solo términos que admiten corrección (más de 3 letras) y cuyo error no cae en otro término real
+    candidatos = [t for t in vocabulario if distancia_maxima(normalizar_termino(t)) > 0]
+    casos = []
+    while len(casos) < args.errores:
+        original = rng.choice(candidatos)
+        error = _con_error(original, rng)
+        if error not in indice:
+            casos.append((error, normalizar_termino(original)))
+
+    corregidos = sin_candidato = otro = 0
+    tiempos = []
+    for error, original in casos:
+        inicio = time.perf_counter()
+        sugerencias = indice.sugerencias(error, limite=5)
+        tiempos.append(time.perf_counter() - inicio)
+        if not sugerencias:
+            sin_candidato += 1
+        elif normalizar_termino(sugerencias[0].termino) == original:
+            corregidos += 1
+        else:
+            otro += 1
+
+    no_tech = [*TERMINOS_NO_TECH, *PALABRAS_CERCANAS]
+    espurias = [t for t in no_tech if indice.corregir(t)]
+    n = len(casos)
+    resultados = {
+        "vocabulario": fuente,
+        "terminos": len(indice),
+        "borrados": len(indice.borrados),
+        "construccion_ms": round(construccion_ms, 1),
+        "errores": n,
+        "corregidos_al_original": round(corregidos / n, 3),
+        "sin_candidato_groq": round(sin_candidato / n, 3),
+        "corregidos_a_otro": round(otro / n, 3),
+        "latencia_us": {"p50": _percentil_us(tiempos, 0.5), "p95": _percentil_us(tiempos, 0.95),
+                        "p99": _percentil_us(tiempos, 0.99)},
+        "no_tech_corregidos": espurias,
+    }
+
+    print(f"🔤 {n} errores de tipeo: {resultados['corregidos_al_original']:.1%} al original, "
+          f"{resultados['sin_candidato_groq']:.1%} sin candidato (Groq), "
+          f"{resultados['corregidos_a_otro']:.1%} a otro término")
+    print(f"⏱️  Búsqueda: p50 {resultados['latencia_us']['p50']} µs · p95 {resultados['latencia_us']['p95']} µs "
+          f"· p99 {resultados['latencia_us']['p99']} µs")
+    print(f"🚫 No tecnología con corrección: {len(espurias)}/{len(no_tech)} {espurias[:10]}")
+    print("   (la API no corrige estas palabras; ver ortografia_service._NO_CORREGIR)")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Resultados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Memoria y throughput de embeddings según cantidad de workers, con y sin sidecar.
+
+Para cada modo (local: cada worker carga su MiniLM; sidecar: un proceso con el
+modelo y los workers como clientes por socket Unix) y cada cantidad de workers,
+levanta N procesos que llaman a app.embeddings.embed_text como lo haría la API
+(un texto por llamada, --hilos llamadas concurrentes por worker) y reporta:
+- textos/s agregados y latencia p50/p95 por llamada
+- RSS total (suma de procesos; cuenta dos veces lo compartido) y PSS total
+  (reparte las páginas compartidas, p. ej. pesos mapeados del safetensors)
+
+Uso (desde backend/):
+    python benchmarks/bench_workers.py
+    python benchmarks/bench_workers.py --workers 1,2,4,8 --modos sidecar --duracion 20
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+_BENCH_DIR = Path(__file__).resolve().parent
+_BACKEND_ROOT = _BENCH_DIR.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from bench_funciones import ROLES, SKILLS  # noqa: E402
+
+MODOS = ("local", "sidecar")
+
+
+def _textos(cantidad: int, semilla: int) -> list[str]:
+    rng = random.Random(semilla)
+    return [
+        f"{rng.choice(ROLES)} con experiencia en {', '.join(rng.sample(SKILLS, rng.randint(1, 5)))}"
+        for _ in range(cantidad)
+    ]
+
+
+def _memoria_kb(pid: int) -> tuple[int, int]:
+    """(RSS, PSS) en kB desde /proc; PSS es 0 si el kernel no expone smaps_rollup."""
+    rss = pss = 0
+    with open(f"/proc/{pid}/status") as f:
+        for linea in f:
+            if linea.startswith("VmRSS:"):
+                rss = int(linea.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for linea in f:
+                if linea.startswith("Pss:"):
+                    pss = int(linea.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def _worker(socket_sidecar: str, hilos: int, duracion: float, semilla: int, barrera, salida):
+    """Proceso worker: carga el motor como la API y llama a embed_text en lazo cerrado."""
+    # Debe definirse antes de importar app.embeddings (se lee al importar)
+    os.environ["EMBEDDINGS_SIDECAR_SOCKET"] = socket_sidecar
+    os.environ["EMBEDDINGS_SIDECAR_REINTENTO_S"] = "3600"
+    try:
+        from app.embeddings import embed_text, precargar_modelo
+        precargar_modelo()
+    except Exception as e:
+        # Rompe la barrera para que el proceso principal no espere a este worker
+        salida.put(f"{type(e).__name__}: {e}")
+        barrera.abort()
+        return
+    textos = _textos(2000, semilla)
+    latencias: list[float] = []
+    lock = threading.Lock()
+
+    barrera.wait()
+    fin = time.perf_counter() + duracion
+
+    def lazo(desfase: int):
+        propias = []
+        i = desfase
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            embed_text(textos[i % len(textos)])
+            propias.append(time.perf_counter() - inicio)
+            i += hilos
+        with lock:
+            latencias.extend(propias)
+
+    trabajadores = [threading.Thread(target=lazo, args=(h,)) for h in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    salida.put(latencias)
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def _lanzar_sidecar(ruta: str, log: Path) -> subprocess.Popen:
+    from app.embeddings_sidecar import ClienteSidecar
+
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "app.embeddings_sidecar"],
+        cwd=_BACKEND_ROOT, env={**os.environ, "EMBEDDINGS_SIDECAR_SOCKET": ruta, "PYTHONUNBUFFERED": "1"},
+        stdout=open(log, "w"), stderr=subprocess.STDOUT,
+    )
+    cliente = ClienteSidecar(ruta)
+    limite = time.monotonic() + 300
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"El sidecar terminó con código {proceso.returncode}: {log.read_text()[-500:]}")
+        if os.path.exists(ruta) and cliente.ping():
+            return proceso
+        time.sleep(0.3)
+    proceso.kill()
+    raise TimeoutError("El sidecar no respondió en 300 s")
+
+
+def medir(modo: str, workers: int, hilos: int, duracion: float, tmp: Path) -> dict:
+    ctx = mp.get_context("spawn")
+    sidecar = None
+    ruta = ""
+    if modo == "sidecar":
+        ruta = str(tmp / f"sidecar-{workers}.sock")
+        sidecar = _lanzar_sidecar(ruta, tmp / f"sidecar-{workers}.log")
+
+    barrera = ctx.Barrier(workers + 1)
+    salida = ctx.Queue()
+    procesos = [
+        ctx.Process(target=_worker, args=(ruta, hilos, duracion, 1000 + i, barrera, salida))
+        for i in range(workers)
+    ]
+    try:
+        for p in procesos:
+            p.start()
+        # Todos cargados: empieza la medición
+        try:
+            barrera.wait(timeout=600)
+        except threading.BrokenBarrierError:
+            try:
+                error = salida.get(timeout=5)
+            except queue.Empty:
+                error = "timeout cargando el modelo"
+            raise RuntimeError(f"Un worker no pudo cargar el motor de embeddings: {error}")
+        time.sleep(min(duracion / 2, 5))
+        pids = [p.pid for p in procesos] + ([sidecar.pid] if sidecar else [])
+        memoria = [_memoria_kb(pid) for pid in pids]
+        latencias = [lat for _ in procesos for lat in salida.get(timeout=duracion + 120)]
+        for p in procesos:
+            p.join(30)
+    finally:
+        for p in procesos:
+            if p.is_alive():
+                p.kill()
+        if sidecar:
+            sidecar.terminate()
+            sidecar.wait(10)
+
+    return {
+        "modo": modo,
+        "workers": workers,
+        "hilos_por_worker": hilos,
+        "textos_s": round(len(latencias) / duracion, 1),
+        "p50_ms": round(_percentil(latencias, 0.50) * 1000, 2),
+        "p95_ms": round(_percentil(latencias, 0.95) * 1000, 2),
+        "rss_mb": round(sum(r for r, _ in memoria) / 1024, 1),
+        "pss_mb": round(sum(p for _, p in memoria) / 1024, 1),
+        "rss_sidecar_mb": round(memoria[-1][0] / 1024, 1) if sidecar else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS y throughput de embeddings por cantidad de workers")
+    parser.add_argument("--workers", default="1,2,4", help="Cantidades de workers a probar")
+    parser.add_argument("--modos", default=",".join(MODOS), help="local, sidecar o ambos")
+    parser.add_argument("--hilos", type=int, default=4, help="Llamadas concurrentes por worker (threadpool)")
+    parser.add_argument("--duracion", type=float, default=10, help="Segundos medidos por combinación")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    modos = [m.strip() for m in args.modos.split(",") if m.strip()]
+    if any(m not in MODOS for m in modos):
+        parser.error(f"--modos admite: {', '.join(MODOS)}")
+    cantidades = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    print(f"{'modo':<9}{'workers':>8}{'textos/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>9}{'PSS MB':>9}")
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="devradar-workers-") as tmp:
+        for modo in modos:
+            for workers in cantidades:
+                try:
+                    r = medir(modo, workers, args.hilos, args.duracion, Path(tmp))
+                except (RuntimeError, TimeoutError) as e:
+                    print(f"❌ {modo} x{workers}: {e}")
+                    sys.exit(1)
+                resultados.append(r)
+                print(f"{r['modo']:<9}{r['workers']:>8}{r['textos_s']:>10.1f}{r['p50_ms']:>9.2f}"
+                      f"{r['p95_ms']:>9.2f}{r['rss_mb']:>9.1f}{r['pss_mb']:>9.1f}")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Evaluación offline del clasificador local "¿es tecnología?" (app/services/clasificador_service.py).
+
+Entrena el clasificador igual que la API (semillas + vocabulario de jobs_clean) y lo
+mide sobre un set etiquetado aparte (no usado en el entrenamiento):
+- exactitud global, tasa de escalado a Groq y exactitud de lo que se decide localmente
+  para varios umbrales de confianza
+- latencia del clasificador (producto punto, µs) y del camino completo de un término
+  con embedding sin caché y con caché (ms)
+
+Uso (desde backend/):
+    python benchmarks/eval_clasificador.py
+    python benchmarks/eval_clasificador.py --vocabulario sintetico --umbrales 0.7,0.85,0.95
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+_BENCH_DIR = Path(__file__).resolve().parent
+_BACKEND_ROOT = _BENCH_DIR.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+
+from bench_funciones import ROLES, SKILLS  # noqa: E402
+
+EVAL_TERMINOS = [
+    # Tecnología (incluye errores de tipeo y términos fuera de las semillas)
+    ("pyton", 1), ("javscript", 1), ("reactjs", 1), ("next.js", 1), ("nestjs", 1), ("svelte", 1),
+    ("elixir", 1), ("scala", 1), ("haskell", 1), ("matlab", 1), ("r studio", 1), ("pandas", 1),
+    ("tensorflow", 1), ("pytorch", 1), ("llm", 1), ("prompt engineering", 1), ("mlops", 1),
+    ("snowflake", 1), ("databricks", 1), ("kafka", 1), ("rabbitmq", 1), ("elasticsearch", 1),
+    ("grafana", 1), ("prometheus", 1), ("ansible", 1), ("github actions", 1), ("gitlab ci", 1),
+    ("firebase", 1), ("supabase", 1), ("unity", 1), ("unreal engine", 1), ("blockchain", 1),
+    ("solidity", 1), ("odoo", 1), ("dynamics 365", 1), ("itil", 1), ("cobol", 1), ("as400", 1),
+    ("desarrolladora web", 1), ("ingeniera de datos", 1), ("técnico en redes", 1),
+    ("analista qa", 1), ("líder técnico", 1), ("cto", 1), ("mesa de ayuda", 1),
+    # No tecnología
+    ("guatita", 0), ("locro de papa", 0), ("colada morada", 0), ("canelazo", 0), ("chicha", 0),
+    ("biela", 0), ("norteño", 0), ("tigrillo", 0), ("cuy asado", 0), ("humitas", 0),
+    ("independiente del valle", 0), ("aucas", 0), ("básquet", 0), ("surf", 0), ("atletismo", 0),
+    ("riobamba", 0), ("esmeraldas", 0), ("otavalo", 0), ("mindo", 0), ("vilcabamba", 0),
+    ("arquitecto de interiores", 0), ("cosmetóloga", 0), ("panadero", 0), ("electricista", 0),
+    ("mecánico automotriz", 0), ("asesor comercial", 0), ("recepcionista", 0), ("chef pastelero", 0),
+    ("enfermero", 0), ("profesor de inglés", 0), ("tatuajes", 0), ("muebles", 0), ("ferretería", 0),
+    ("mascotas", 0), ("pesca", 0), ("telenovelas", 0), ("pasillo", 0), ("sanjuanito", 0),
+    ("misa de gallo", 0), ("día de difuntos", 0), ("inti raymi", 0), ("tarot", 0), ("piscina", 0),
+]
+
+EVAL_PREGUNTAS = [
+    ("¿Cuánto pagan a un ingeniero de datos senior?", 1),
+    ("¿Qué empresas en Quito buscan desarrolladores Go?", 1),
+    ("¿Sirve un bootcamp para conseguir trabajo de programador?", 1),
+    ("¿Cuál es el rango salarial de un tester manual?", 1),
+    ("¿Me recomiendas aprender Kotlin o Swift?", 1),
+    ("¿Hay vacantes de soporte técnico nivel 1?", 1),
+    ("¿Qué tan demandado está Terraform?", 1),
+    ("¿Cómo negocio mi sueldo como desarrollador?", 1),
+    ("quiero trabajar en ciencia de datos sin título", 1),
+    ("¿Qué skills piden para un puesto de SRE?", 1),
+    ("¿Hay trabajos remotos en empresas de software extranjeras?", 1),
+    ("¿Cuánto gana un pasante de sistemas?", 1),
+    ("¿Es mejor Angular o React para conseguir empleo?", 1),
+    ("¿Qué perfil tecnológico tiene más ofertas?", 1),
+    ("dame tips para mi portafolio de github", 1),
+    ("¿Qué base de datos debería aprender?", 1),
+    ("¿Qué tan difícil es conseguir trabajo como junior?", 1),
+    ("¿Conviene especializarse en SAP?", 1),
+    ("¿Cuánto cobra un freelance de WordPress por proyecto?", 1),
+    ("¿Qué es lo más pedido en ofertas de ciberseguridad?", 1),
+    ("¿Cómo hago un seco de chivo?", 0),
+    ("¿Cuándo juega la selección?", 0),
+    ("¿Qué hacer en Baños de Agua Santa?", 0),
+    ("¿Cómo saco la licencia de conducir?", 0),
+    ("¿Qué vacuna le pongo a mi gato?", 0),
+    ("¿Cuál es el mejor gimnasio en Cumbayá?", 0),
+    ("¿Cómo quito una mancha de vino?", 0),
+    ("¿Qué signo zodiacal es compatible con leo?", 0),
+    ("¿Dónde venden cuy en Cuenca?", 0),
+    ("¿Cómo cultivo tomates en casa?", 0),
+    ("¿Cuánto gana un chofer de bus?", 0),
+    ("¿Qué estudio para ser chef?", 0),
+    ("¿Qué película me recomiendas?", 0),
+    ("¿Cómo pido la visa americana?", 0),
+    ("¿Cuánto cuesta una cirugía de rodilla?", 0),
+    ("dime un trabalenguas", 0),
+    ("¿Qué pongo en una carta de amor?", 0),
+    ("¿Cómo se juega cuarenta?", 0),
+    ("¿A qué hora abre el banco?", 0),
+    ("¿Qué es mejor para el resfriado?", 0),
+]
+
+
+def _vocabulario(fuente: str) -> tuple[set[str], str]:
+    if fuente in ("supabase", "auto"):
+        try:
+            from app.database import get_supabase
+            from app.services.skills_service import cargar_frecuencias_vocabulario
+
+            sb = get_supabase()
+            habilidades, roles = cargar_frecuencias_vocabulario(sb)
+            vocabulario = set(habilidades) | set(roles)
+            if vocabulario:
+                return vocabulario, "supabase"
+        except Exception as e:
+            if fuente == "supabase":
+                raise
+            print(f"⚠️ Sin vocabulario de Supabase ({e}); se usa el sintético de bench_funciones")
+    return set(SKILLS) | set(ROLES), "sintetico"
+
+
+def _metricas(probabilidades: list[float], etiquetas: list[int], umbrales: list[float]) -> dict:
+    aciertos = sum((p >= 0.5) == bool(e) for p, e in zip(probabilidades, etiquetas))
+    por_umbral = []
+    for umbral in umbrales:
+        locales = [(p, e) for p, e in zip(probabilidades, etiquetas) if max(p, 1 - p) >= umbral]
+        aciertos_locales = sum((p >= 0.5) == bool(e) for p, e in locales)
+        falsos_rechazos = sum(1 for p, e in locales if e == 1 and p < 0.5)
+        por_umbral.append({
+            "umbral": umbral,
+            "escalado_groq": round(1 - len(locales) / len(etiquetas), 3),
+            "exactitud_local": round(aciertos_locales / len(locales), 3) if locales else None,
+            "tech_rechazados": falsos_rechazos,
+        })
+    return {"n": len(etiquetas), "exactitud": round(aciertos / len(etiquetas), 3), "umbrales": por_umbral}
+
+
+def _percentil_us(muestras: list[float], p: float) -> float:
+    ordenadas = sorted(muestras)
+    return ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluación offline del clasificador local")
+    parser.add_argument("--vocabulario", choices=("auto", "supabase", "sintetico"), default="auto")
+    parser.add_argument("--umbrales", default="0.6,0.75,0.85,0.95")
+    parser.add_argument("--repeticiones", type=int, default=2000, help="Llamadas para medir latencia del clasificador")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+    umbrales = [float(u) for u in args.umbrales.split(",")]
+
+    import numpy as np
+
+    from app.embeddings import embed_texts
+    from app.services.clasificador_service import _vector_termino, construir_clasificador, normalizar
+
+    vocabulario, fuente = _vocabulario(args.vocabulario)
+    print(f"📚 Vocabulario {fuente}: {len(vocabulario)} términos")
+    inicio = time.perf_counter()
+    clasificador = construir_clasificador(vocabulario)
+    print(f"🧭 Entrenado en {time.perf_counter() - inicio:.1f} s\n")
+
+    resultados = {"vocabulario": fuente, "terminos_vocabulario": len(vocabulario)}
+    vectores_terminos = np.asarray(embed_texts([normalizar(t) for t, _ in EVAL_TERMINOS]), dtype=np.float32)
+    vectores_preguntas = np.asarray(embed_texts([p for p, _ in EVAL_PREGUNTAS]), dtype=np.float32)
+
+    # Probabilidad "es tech" (las coincidencias exactas de vocabulario cuentan con confianza 1)
+    prob_terminos = []
+    for (termino, _), vector in zip(EVAL_TERMINOS, vectores_terminos):
+        es_tech, confianza, _ = clasificador.clasificar_termino(termino, vector)
+        prob_terminos.append(confianza if es_tech else 1 - confianza)
+    prob_preguntas = [clasificador.intencion.probabilidad(v) for v in vectores_preguntas]
+
+    for tarea, probs, datos in (("termino", prob_terminos, EVAL_TERMINOS), ("intencion", prob_preguntas, EVAL_PREGUNTAS)):
+        m = _metricas(probs, [e for _, e in datos], umbrales)
+        resultados[tarea] = m
+        print(f"== {tarea}: {m['n']} ejemplos | exactitud {m['exactitud']:.1%}")
+        print(f"{'umbral':>8}{'escala a Groq':>15}{'exactitud local':>17}{'tech rechazados':>17}")
+        for u in m["umbrales"]:
+            exactitud = f"{u['exactitud_local']:.1%}" if u["exactitud_local"] is not None else "-"
+            print(f"{u['umbral']:>8.2f}{u['escalado_groq']:>15.1%}{exactitud:>17}{u['tech_rechazados']:>17}")
+        errores = [t for (t, e), p in zip(datos, probs) if (p >= 0.5) != bool(e)]
+        if errores:
+            print(f"   errores: {', '.join(errores[:10])}")
+        print()
+
+    # Latencia: solo el clasificador (vector ya calculado)
+    vector = vectores_preguntas[0]
+    muestras = []
+    for _ in range(args.repeticiones):
+        t = time.perf_counter()
+        clasificador.intencion.probabilidad(vector)
+        muestras.append(time.perf_counter() - t)
+    # Camino completo de un término: embedding sin caché y luego con caché
+    _vector_termino.cache_clear()
+    sin_cache, con_cache = [], []
+    for termino, _ in EVAL_TERMINOS:
+        t = time.perf_counter()
+        clasificador.clasificar_termino(termino)
+        sin_cache.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        clasificador.clasificar_termino(termino)
+        con_cache.append(time.perf_counter() - t)
+
+    resultados["latencia"] = {
+        "clasificador_p50_us": round(_percentil_us(muestras, 0.5), 1),
+        "clasificador_p99_us": round(_percentil_us(muestras, 0.99), 1),
+        "termino_sin_cache_p50_ms": round(_percentil_us(sin_cache, 0.5) / 1000, 2),
+        "termino_con_cache_p50_us": round(_percentil_us(con_cache, 0.5), 1),
+    }
+    lat = resultados["latencia"]
+    print(f"⏱️ clasificador: p50 {lat['clasificador_p50_us']} µs, p99 {lat['clasificador_p99_us']} µs")
+    print(f"⏱️ término con embedding: {lat['termino_sin_cache_p50_ms']} ms sin caché, "
+          f"{lat['termino_con_cache_p50_us']} µs con caché")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False))
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Chequeo offline del planificador local de herramientas del chat (app/services/herramientas_chat.py).
+
+Arma el vocabulario sintético de bench_funciones (sin Supabase) y compara el plan de
+planificar_local con el esperado para un set de preguntas: qué herramientas se llaman
+y con qué rol o tecnología. Sale con código 1 si algún plan no coincide.
+
+Uso (desde backend/):
+    python benchmarks/eval_planificador.py
+"""
+import sys
+from collections import Counter
+from pathlib import Path
+
+_BENCH_DIR = Path(__file__).resolve().parent
+_BACKEND_ROOT = _BENCH_DIR.parent
+if str(_BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT))
+if str(_BACKEND_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(_BACKEND_ROOT.parent))
+
+from bench_funciones import ROLES, SKILLS  # noqa: E402
+
+CASOS = [
+    # Una tecnología sin rol acota todas las herramientas, no solo el salario
+    ("¿cuántas ofertas de java hay?", [("ResumenMercado", {"rol": "java"})]),
+    ("cuántos trabajos de react hay", [("ResumenMercado", {"rol": "react"})]),
+    ("¿Hay vacantes de Docker?", [("ResumenMercado", {"rol": "docker"})]),
+    ("¿qué más piden junto con kubernetes?", [("TecnologiasDemandadas", {"rol": "kubernetes", "limite": 10})]),
+    ("¿hay ofertas junior de python?", [("DistribucionSeniority", {"rol": "python"}),
+                                        ("ResumenMercado", {"rol": "python"})]),
+    ("¿Cuánto pagan por Angular?", [("SalarioTecnologia", {"tecnologia": "ANGULAR"})]),
+    # Con rol, el rol manda y la tecnología solo entra en el salario
+    ("¿qué tecnologías piden para backend?", [("TecnologiasDemandadas", {"rol": "backend", "limite": 10})]),
+    ("¿cuánto gana un data engineer con python?", [("SalarioTecnologia", {"tecnologia": "PYTHON"})]),
+    ("¿Cuántas ofertas de devops hay?", [("ResumenMercado", {"rol": "devops"})]),
+    # Sin rol ni tecnología: todo el mercado
+    ("¿cuántas ofertas hay en total?", [("ResumenMercado", {"rol": None})]),
+    ("¿cómo está la demanda este mes?", [("ResumenMercado", {"rol": None})]),
+    ("¿cuánto pagan en promedio?", [("ResumenMercado", {"rol": None})]),
+    # Sin intención de estadísticas
+    ("dame tips para mi portafolio", []),
+]
+
+
+def main():
+    from comun.skills import SkillMatcher
+    import app.services.herramientas_chat as herramientas
+
+    habilidades = Counter({s: 10 for s in SKILLS})
+    roles = Counter({r: 10 for r in ROLES})
+    matcher = SkillMatcher(habilidades)
+    herramientas.get_vocabulario = lambda: ("eval", habilidades, roles)
+    herramientas.get_skill_matcher = lambda: matcher
+
+    fallas = 0
+    for mensaje, esperado in CASOS:
+        plan = herramientas.planificar_local(mensaje)
+        ok = plan == esperado
+        fallas += not ok
+        print(f"{'✅' if ok else '❌'} {mensaje!r}: {plan}" + ("" if ok else f" (esperado {esperado})"))
+
+    print(f"\n🧭 {len(CASOS) - fallas}/{len(CASOS)} planes correctos")
+    if fallas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
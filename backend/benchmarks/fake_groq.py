@@ -0,0 +1,104 @@
+"""
+Groq falso (API compatible con OpenAI) con latencia inyectada, para pruebas de carga.
+
+Responde POST /openai/v1/chat/completions después de una espera log-normal
+(mediana FAKE_GROQ_LATENCIA_MS, dispersión FAKE_GROQ_SIGMA). El contenido imita lo
+que espera cada llamada del backend: JSON de validación de CV, de intención del
+chat o del veredicto de comparación, tool calls para with_structured_output y
+Markdown para la respuesta del chat. El backend lo usa vía GROQ_API_BASE.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import time
+import uuid
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+LATENCIA_MS = float(os.getenv("FAKE_GROQ_LATENCIA_MS", "600"))
+SIGMA = float(os.getenv("FAKE_GROQ_SIGMA", "0.5"))
+
+RESPUESTA_CHAT = (
+    "Hay buena demanda para este perfil en Ecuador. 🚀\n\n"
+    "### 💰 Rango Salarial\n- Entre **$1.200** y **$2.500** según seniority.\n\n"
+    "### 🛠️ Tecnologías Top\n- **Python**\n- **AWS**\n- **Docker**\n"
+)
+
+
+def _latencia() -> float:
+    return random.lognormvariate(math.log(max(LATENCIA_MS, 1) / 1000), SIGMA)
+
+
+def _contenido(mensajes: list[dict]) -> str:
+    texto = " ".join(str(m.get("content") or "") for m in mensajes)
+    if "es_cv" in texto:
+        return json.dumps({"es_cv": True, "tipo_documento": None})
+    if "es_valida" in texto:
+        return json.dumps({"es_valida": True, "mensaje_rechazo": None})
+    if "veredicto_final" in texto:
+        return json.dumps({
+            "resumen_a": "Alta presencia en ofertas.",
+            "resumen_b": "Presencia estable en el mercado.",
+            "resumen_neutral": "Ambas tecnologías tienen demanda.",
+            "cosas_buenas_a": ["Ecosistema amplio", "Buena paga"],
+            "cosas_buenas_b": ["Comunidad activa", "Madurez"],
+            "veredicto_final": "Elige según tu rol y objetivos.",
+        })
+    return RESPUESTA_CHAT
+
+
+def _argumentos_desde_esquema(esquema: dict) -> dict:
+    """Argumentos válidos para una tool a partir de su JSON Schema (structured output)."""
+    valores = {"boolean": True, "string": "", "integer": 0, "number": 0.0, "array": [], "object": {}}
+    salida = {}
+    for nombre, prop in (esquema.get("properties") or {}).items():
+        tipos = [prop.get("type")] + [x.get("type") for x in prop.get("anyOf", [])]
+        salida[nombre] = None if "null" in tipos else valores.get(next((t for t in tipos if t), "string"))
+    return salida
+
+
+async def chat_completions(request: Request):
+    cuerpo = await request.json()
+    await asyncio.sleep(_latencia())
+
+    mensaje: dict = {"role": "assistant", "content": None}
+    finish_reason = "stop"
+    tools = cuerpo.get("tools") or []
+    if tools:
+        funcion = tools[0]["function"]
+        mensaje["tool_calls"] = [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {
+                "name": funcion["name"],
+                "arguments": json.dumps(_argumentos_desde_esquema(funcion.get("parameters") or {})),
+            },
+        }]
+        finish_reason = "tool_calls"
+    else:
+        mensaje["content"] = _contenido(cuerpo.get("messages") or [])
+
+    prompt_tokens = sum(len(str(m.get("content") or "")) for m in cuerpo.get("messages") or []) // 4
+    completion_tokens = len(mensaje["content"] or "") // 4 + 10
+    return JSONResponse({
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": cuerpo.get("model", "fake"),
+        "choices": [{"index": 0, "message": mensaje, "finish_reason": finish_reason, "logprobs": None}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    })
+
+
+app = Starlette(routes=[
+    Route("/openai/v1/chat/completions", chat_completions, methods=["POST"]),
+])
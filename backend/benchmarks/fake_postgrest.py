@@ -0,0 +1,188 @@
+"""
+PostgREST falso en memoria para pruebas de carga (sin tocar Supabase de producción).
+
+Implementa el subconjunto de la API REST que usa el backend:
+- GET /rest/v1/{tabla} con select, filtros (eq, neq, gt, gte, lt, lte, ilike, in, is),
+  order, limit/offset y Prefer: count=exact (header Content-Range).
+- POST /rest/v1/rpc/match_jobs y match_jobs_ids (vecinos deterministas por embedding).
+
+Tablas: jobs_clean (filas sintéticas de bench_funciones) y jobs_rollup_mensual
+(calculada desde esas filas). Se levanta solo desde bench_carga.py, o a mano:
+    FAKE_PG_FILAS=5000 uvicorn fake_postgrest:app --app-dir benchmarks --port 54321
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from bench_funciones import generar_filas
+from app.utils import parse_fecha_publicacion, parse_habilidades
+
+FILAS = int(os.getenv("FAKE_PG_FILAS", "5000"))
+# Latencia fija por consulta (ms) para simular la red hasta Supabase
+LATENCIA_MS = float(os.getenv("FAKE_PG_LATENCIA_MS", "0"))
+PARAMETROS_RESERVADOS = {"select", "order", "limit", "offset"}
+
+
+def _normalizar_fila(fila: dict) -> dict:
+    """jobs_clean guarda sueldo como NUMERIC: lo no numérico queda en NULL."""
+    sueldo = fila.get("sueldo")
+    try:
+        fila["sueldo"] = float(sueldo) if sueldo not in (None, "") else None
+    except (TypeError, ValueError):
+        fila["sueldo"] = None
+    fp = parse_fecha_publicacion(fila.get("fecha_publicacion"))
+    if fp:
+        fila["created_at"] = fp.isoformat()
+    return fila
+
+
+def _rollup(filas: list[dict]) -> list[dict]:
+    celdas: dict[tuple[str, str], list[float]] = defaultdict(lambda: [0, 0.0, 0])
+    for fila in filas:
+        fp = parse_fecha_publicacion(fila.get("fecha_publicacion"))
+        if not fp:
+            continue
+        mes = fp.strftime("%Y-%m-01")
+        for skill in {h.upper() for h in parse_habilidades(fila.get("habilidades"))} | {"*"}:
+            celda = celdas[(mes, skill)]
+            celda[0] += 1
+            if fila.get("sueldo"):
+                celda[1] += fila["sueldo"]
+                celda[2] += 1
+    return [
+        {"mes": mes, "skill": skill, "seniority": "*", "locacion": "*",
+         "ofertas": ofertas, "salario_suma": suma, "salario_count": count}
+        for (mes, skill), (ofertas, suma, count) in celdas.items()
+    ]
+
+
+JOBS_CLEAN = [_normalizar_fila(f) for f in generar_filas(FILAS)]
+TABLAS = {
+    "jobs_clean": JOBS_CLEAN,
+    "jobs_rollup_mensual": _rollup(JOBS_CLEAN),
+}
+
+
+# =============================================================================
+# Filtros PostgREST
+# =============================================================================
+
+def _como_numero(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _comparar(valor, operador: str, argumento: str) -> bool:
+    if operador == "is":
+        return (valor is None) == (argumento == "null")
+    if valor is None:
+        return operador == "neq"
+    if operador == "ilike":
+        regex = "^" + re.escape(argumento).replace("%", ".*").replace(r"\*", ".*") + "$"
+        return re.match(regex, str(valor), re.IGNORECASE | re.DOTALL) is not None
+    if operador == "in":
+        opciones = [x.strip().strip('"') for x in argumento.strip("()").split(",")]
+        return str(valor) in opciones
+    a, b = _como_numero(valor), _como_numero(argumento)
+    if a is None or b is None:
+        a, b = str(valor), argumento
+    return {
+        "eq": a == b, "neq": a != b, "gt": a > b, "gte": a >= b, "lt": a < b, "lte": a <= b,
+    }.get(operador, True)
+
+
+def _filtrar(filas: list[dict], params) -> list[dict]:
+    filtros = []
+    for columna, expresion in params.multi_items():
+        if columna in PARAMETROS_RESERVADOS or "." not in expresion:
+            continue
+        operador, _, argumento = expresion.partition(".")
+        negar = operador == "not"
+        if negar:
+            operador, _, argumento = argumento.partition(".")
+        filtros.append((columna, operador, argumento, negar))
+    return [
+        f for f in filas
+        if all(_comparar(f.get(col), op, arg) != negar for col, op, arg, negar in filtros)
+    ]
+
+
+def _ordenar(filas: list[dict], orden: str | None) -> list[dict]:
+    for criterio in reversed((orden or "").split(",")):
+        if not criterio:
+            continue
+        columna, *mods = criterio.split(".")
+        desc = "desc" in mods
+        con_valor = [f for f in filas if f.get(columna) is not None]
+        nulos = [f for f in filas if f.get(columna) is None]
+        con_valor.sort(key=lambda f: f[columna], reverse=desc)
+        filas = nulos + con_valor if desc else con_valor + nulos
+    return filas
+
+
+def _proyectar(filas: list[dict], select: str | None) -> list[dict]:
+    columnas = [c.strip() for c in (select or "*").split(",") if c.strip()]
+    if not columnas or "*" in columnas:
+        return filas
+    return [{c: f.get(c) for c in columnas} for f in filas]
+
+
+async def tabla(request: Request):
+    if LATENCIA_MS:
+        await asyncio.sleep(LATENCIA_MS / 1000)
+    nombre = request.path_params["tabla"]
+    if nombre not in TABLAS:
+        return JSONResponse({"message": f'relation "{nombre}" does not exist'}, status_code=404)
+
+    params = request.query_params
+    filas = _ordenar(_filtrar(TABLAS[nombre], params), params.get("order"))
+    total = len(filas)
+    offset = int(params.get("offset") or 0)
+    limit = int(params["limit"]) if params.get("limit") else None
+    pagina = filas[offset:offset + limit if limit is not None else None]
+
+    headers = {}
+    if "count=" in request.headers.get("prefer", ""):
+        headers["Content-Range"] = f"{offset}-{offset + len(pagina) - 1}/{total}" if pagina else f"*/{total}"
+    return JSONResponse(_proyectar(pagina, params.get("select")), headers=headers)
+
+
+# =============================================================================
+# RPC de búsqueda semántica
+# =============================================================================
+
+def _vecinos(embedding: list[float], cantidad: int) -> list[dict]:
+    """Subconjunto determinista de filas según el embedding (misma consulta -> mismos vecinos)."""
+    semilla = hashlib.sha256(json.dumps(embedding[:8]).encode()).digest()
+    inicio = int.from_bytes(semilla[:4], "big") % max(len(JOBS_CLEAN), 1)
+    cantidad = min(cantidad, len(JOBS_CLEAN))
+    return [JOBS_CLEAN[(inicio + i * 7) % len(JOBS_CLEAN)] for i in range(cantidad)]
+
+
+async def rpc(request: Request):
+    if LATENCIA_MS:
+        await asyncio.sleep(LATENCIA_MS / 1000)
+    funcion = request.path_params["funcion"]
+    cuerpo = await request.json()
+    vecinos = _vecinos(cuerpo.get("query_embedding") or [], int(cuerpo.get("match_count") or 10))
+    if funcion == "match_jobs":
+        return JSONResponse([{**f, "similarity": 0.5} for f in vecinos])
+    if funcion == "match_jobs_ids":
+        return JSONResponse([{"id": f["id"], "similarity": 0.5} for f in vecinos])
+    return JSONResponse({"message": f"function {funcion} does not exist"}, status_code=404)
+
+
+app = Starlette(routes=[
+    Route("/rest/v1/rpc/{funcion}", rpc, methods=["POST"]),
+    Route("/rest/v1/{tabla}", tabla, methods=["GET"]),
+])
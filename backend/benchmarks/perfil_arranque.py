@@ -0,0 +1,147 @@
+"""
+Perfil de arranque de la API: costo de imports y tiempo hasta /health y /ready.
+
+Ejecuta `python -X importtime -c "import main"` en un proceso limpio y muestra los
+paquetes que más tiempo suman al importar la app (agrupados por paquete raíz) y los
+imports directos más lentos. Con --servidor además levanta uvicorn y mide cuánto
+tarda en responder /health (proceso listo) y /ready (modelo de embeddings caliente).
+
+Uso (desde backend/):
+    python benchmarks/perfil_arranque.py
+    python benchmarks/perfil_arranque.py --top 30 --servidor
+"""
+import argparse
+import json
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+_LINEA_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)$")
+
+
+def perfil_imports(modulo: str = "main") -> tuple[float, list[dict]]:
+    """Retorna (segundos totales del import, lista de módulos con self/cumulative en ms y nivel)."""
+    inicio = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=_BACKEND_ROOT, capture_output=True, text=True,
+    )
+    total = time.perf_counter() - inicio
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1] if proceso.stderr else "import falló")
+
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        m = _LINEA_IMPORTTIME.match(linea)
+        if m:
+            modulos.append({
+                "modulo": m.group(4),
+                "self_ms": int(m.group(1)) / 1000,
+                "acumulado_ms": int(m.group(2)) / 1000,
+                "nivel": (len(m.group(3)) - 1) // 2,
+            })
+    return total, modulos
+
+
+def imports_directos(modulos: list[dict], modulo: str = "main") -> list[dict]:
+    """Imports hechos directamente por el módulo (importtime lista los hijos antes que el padre)."""
+    hijos: list[dict] = []
+    for m in modulos:
+        if m["nivel"] == 1:
+            hijos.append(m)
+        elif m["nivel"] == 0:
+            if m["modulo"] == modulo:
+                return sorted(hijos, key=lambda h: h["acumulado_ms"], reverse=True)
+            hijos = []
+    return []
+
+
+def por_paquete_raiz(modulos: list[dict]) -> list[tuple[str, float]]:
+    totales: dict[str, float] = defaultdict(float)
+    for m in modulos:
+        totales[m["modulo"].split(".")[0]] += m["self_ms"]
+    return sorted(totales.items(), key=lambda x: x[1], reverse=True)
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def medir_servidor(timeout: float = 300) -> dict:
+    """Segundos desde lanzar uvicorn hasta que /health y /ready responden 200."""
+    puerto = _puerto_libre()
+    url = f"http://127.0.0.1:{puerto}"
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(puerto),
+         "--log-level", "warning"],
+        cwd=_BACKEND_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    tiempos: dict = {"health_s": None, "ready_s": None, "ready": None}
+    try:
+        while time.perf_counter() - inicio < timeout and proceso.poll() is None:
+            try:
+                if tiempos["health_s"] is None and httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                    tiempos["health_s"] = round(time.perf_counter() - inicio, 2)
+                if tiempos["health_s"] is not None:
+                    r = httpx.get(f"{url}/ready", timeout=2)
+                    tiempos["ready"] = r.json()
+                    if r.status_code == 200 or r.json().get("embedding") == "error":
+                        if r.status_code == 200:
+                            tiempos["ready_s"] = round(time.perf_counter() - inicio, 2)
+                        break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+    finally:
+        proceso.terminate()
+        proceso.wait(10)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de arranque de la API")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--servidor", action="store_true", help="Medir también el tiempo hasta /health y /ready")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    total, modulos = perfil_imports()
+    importados = sum(m["self_ms"] for m in modulos)
+    print(f"📦 import main: {total:.2f} s de proceso ({importados / 1000:.2f} s en imports, {len(modulos)} módulos)\n")
+
+    raices = por_paquete_raiz(modulos)
+    print(f"{'paquete raíz':<32}{'ms (self)':>12}")
+    for paquete, ms in raices[:args.top]:
+        print(f"{paquete:<32}{ms:>12.1f}")
+
+    directos = imports_directos(modulos)
+    print(f"\n{'import directo de main.py':<32}{'ms (acumulado)':>16}")
+    for m in directos[:args.top]:
+        print(f"{m['modulo']:<32}{m['acumulado_ms']:>16.1f}")
+
+    resultado = {"import_s": round(total, 3), "paquetes": dict(raices), "imports_main": directos[:args.top]}
+    if args.servidor:
+        print("\n⏳ Levantando uvicorn main:app...")
+        resultado["servidor"] = medir_servidor()
+        s = resultado["servidor"]
+        print(f"/health en {s['health_s']} s | /ready en {s['ready_s']} s")
+        if s["ready_s"] is None:
+            print(f"⚠️ /ready no llegó a 200: {s['ready']}")
+
+    if args.json:
+        args.json.write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+
+if __name__ == "__main__":
+    main()
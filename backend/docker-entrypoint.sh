@@ -0,0 +1,23 @@
+#!/bin/sh
+# Arranque de la API en Docker.
+#   WEB_CONCURRENCY     workers de uvicorn (por defecto 1)
+#   EMBEDDINGS_SIDECAR  "true": un solo proceso con el modelo de embeddings que
+#                       comparten todos los workers vía socket Unix
+set -e
+
+WORKERS="${WEB_CONCURRENCY:-1}"
+
+if [ "${EMBEDDINGS_SIDECAR:-false}" = "true" ]; then
+    export EMBEDDINGS_SIDECAR_SOCKET="${EMBEDDINGS_SIDECAR_SOCKET:-/tmp/devradar-embeddings.sock}"
+    # Si el sidecar cae, cada worker vuelve a cargar el modelo localmente
+    python -m app.embeddings_sidecar &
+fi
+
+if [ "$WORKERS" -gt 1 ]; then
+    # Métricas Prometheus agregadas entre workers
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/devradar-metricas}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec uvicorn main:app --host 0.0.0.0 --port 8000 --workers "$WORKERS"
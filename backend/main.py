@@ -11,17 +11,55 @@ from dotenv import load_dotenv
 # Cargar .env desde la raíz del proyecto (no desde backend/)
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(_PROJECT_ROOT / ".env")
+import asyncio
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.admision import AdmisionMiddleware, hilos_necesarios
+from app.arranque import PRECARGAR_MODELOS, estado_preparacion, precargar
 from app.routers import ofertas, estadisticas, listas, comparar, analizar_cv, reporte_ia, chat
+from app.metrics import TimingMiddleware, cerrar_metricas_proceso, metrics_endpoint
+from app.resiliencia import CircuitoAbierto
+from app.uploads import LimiteCuerpoMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Hilos suficientes para todos los cupos de admisión (llm + cpu + db) sin agotar el threadpool
+    limitador = anyio.to_thread.current_default_thread_limiter()
+    limitador.total_tokens = max(limitador.total_tokens, hilos_necesarios() + 8)
+    # El modelo se carga en un hilo: /health responde ya y /ready cuando el modelo está caliente
+    if PRECARGAR_MODELOS:
+        app.state.precarga = asyncio.create_task(asyncio.to_thread(precargar))
+    yield
+    cerrar_metricas_proceso()
+
 
 app = FastAPI(
     title="DevRadar API",
     description="API para datos del mercado IT Ecuador (scraper + jobs_clean)",
     version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Corta subidas de CV demasiado grandes antes de parsear el multipart completo
+# (se registra antes que CORS para que sus respuestas 400 lleven headers CORS)
+app.add_middleware(
+    LimiteCuerpoMiddleware,
+    max_bytes=analizar_cv.MAX_FILE_SIZE,
+    rutas=("/api/analizar-cv",),
 )
 
+# Cupos por tipo de carga (llm/cpu/db) y límite por cliente: 429 + Retry-After al saturarse
+app.add_middleware(AdmisionMiddleware)
+
+# Latencia por ruta/etapa para /metrics y header Server-Timing (mide también los 400 de subida)
+app.add_middleware(TimingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -30,6 +68,7 @@ app.add_middleware(
         "http://217.216.89.228:8080",
         "http://localhost:8080"  # Agregado para permitir el frontend en el puerto 8080
     ],
+    expose_headers=["Server-Timing", "Retry-After"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -44,12 +83,33 @@ app.include_router(analizar_cv.router, prefix="/api")
 app.include_router(reporte_ia.router, prefix="/api")
 app.include_router(chat.router, prefix="/api")
 
+# Métricas Prometheus (fuera de /api y del esquema OpenAPI)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+
+@app.exception_handler(CircuitoAbierto)
+async def dependencia_caida(request, exc: CircuitoAbierto):
+    """Supabase/Groq marcados como caídos y sin fallback en la ruta: 503 inmediato."""
+    return JSONResponse(
+        {"detail": f"Servicio temporalmente no disponible ({exc.dependencia}). Intenta en unos segundos."},
+        status_code=503,
+        headers={"Retry-After": str(exc.reintentar_en)},
+    )
+
 
 @app.get("/")
 def root():
     return {"message": "DevRadar API", "docs": "/docs"}
 
 
+# async: no pasan por el threadpool, así responden aunque esté ocupado
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """200 cuando el motor de embeddings está cargado; 503 mientras se precarga."""
+    estado = estado_preparacion()
+    return JSONResponse(estado, status_code=200 if estado["listo"] else 503)
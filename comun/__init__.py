@@ -0,0 +1 @@
+"""Código compartido entre backend/ y scraper/ (se copia en ambas imágenes Docker)."""
@@ -0,0 +1,202 @@
+"""
+Arnés de micro-benchmarks para funciones puras que corren por fila (backend y scraper).
+
+Cada caso recibe la lista completa de filas y la procesa; se reporta filas/segundo
+(mejor de N repeticiones) y el pico de memoria asignada por fila (tracemalloc).
+La regresión se evalúa sobre la velocidad relativa a una carga de calibración fija,
+para que el baseline en JSON sirva entre máquinas de distinta velocidad.
+"""
+import argparse
+import csv
+import gc
+import itertools
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+TAMANOS_POR_DEFECTO = (1_000, 10_000, 100_000)
+UMBRAL_REGRESION = 0.25  # 25 % más lento (o más memoria por fila) que el baseline
+# Holgura absoluta de memoria por fila, para que variaciones mínimas no cuenten como regresión
+HOLGURA_BYTES_FILA = 64
+
+Caso = Callable[[list], object]
+
+
+N_CALIBRACION = 100_000
+
+
+def _carga_calibracion():
+    total = 0
+    d = {}
+    for i in range(N_CALIBRACION):
+        s = str(i)
+        d[s] = total
+        total += len(s)
+    return total
+
+
+def _cronometrar(funcion: Callable[[], object]) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def calibrar(repeticiones: int = 5) -> float:
+    """ops/s de una carga de referencia en Python puro (strings, dicts y enteros)."""
+    return N_CALIBRACION / min(_cronometrar(_carga_calibracion) for _ in range(repeticiones))
+
+
+def medir_caso(nombre: str, caso: Caso, filas: list, repeticiones: int = 5) -> dict:
+    """
+    Mide un caso sobre las filas: filas/segundo (mejor repetición), velocidad relativa
+    a la calibración y pico de memoria por fila. Cada repetición se empareja con una
+    corrida de calibración y se usa la mediana de los cocientes, así el ruido de una
+    máquina compartida afecta a ambos por igual.
+    """
+    n = len(filas)
+    tiempos, relativas = [], []
+    for _ in range(repeticiones):
+        t_calibracion = _cronometrar(_carga_calibracion)
+        t_caso = _cronometrar(lambda: caso(filas))
+        tiempos.append(t_caso)
+        relativas.append((n / t_caso) / (N_CALIBRACION / t_calibracion))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        caso(filas)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "funcion": nombre,
+        "filas": n,
+        "ops_s": round(n / min(tiempos), 1),
+        "ops_relativas": round(statistics.median(relativas), 6),
+        "bytes_pico_por_fila": round(pico / n, 1),
+    }
+
+
+def cargar_filas(ruta: str | Path) -> list[dict]:
+    """Filas grabadas desde Supabase: JSON (lista de objetos) o CSV exportado del dashboard."""
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == ".csv":
+        with open(ruta, newline="", encoding="utf-8") as f:
+            return [{k: (v if v != "" else None) for k, v in fila.items()} for fila in csv.DictReader(f)]
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    return datos["data"] if isinstance(datos, dict) and "data" in datos else datos
+
+
+def ajustar_tamano(filas: list, n: int) -> list:
+    """Repite (o recorta) las filas grabadas hasta tener exactamente n."""
+    if not filas:
+        raise ValueError("El dataset grabado está vacío")
+    return list(itertools.islice(itertools.cycle(filas), n))
+
+
+def _clave(resultado: dict) -> str:
+    return f"{resultado['funcion']}@{resultado['filas']}"
+
+
+def guardar_baseline(ruta: Path, resultados: list[dict], calibracion: float):
+    baseline = {
+        "calibracion_ops_s": round(calibracion, 1),
+        "python": sys.version.split()[0],
+        "resultados": {
+            _clave(r): {
+                "ops_s": r["ops_s"],
+                "ops_relativas": r["ops_relativas"],
+                "bytes_pico_por_fila": r["bytes_pico_por_fila"],
+            }
+            for r in resultados
+        },
+    }
+    ruta.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def comparar_con_baseline(resultados: list[dict], baseline: dict, umbral: float = UMBRAL_REGRESION) -> list[str]:
+    """Regresiones de velocidad (relativa a la calibración) o de memoria respecto al baseline."""
+    regresiones = []
+    for r in resultados:
+        base = baseline.get("resultados", {}).get(_clave(r))
+        if not base:
+            continue
+        relativa = r["ops_relativas"]
+        if relativa < base["ops_relativas"] * (1 - umbral):
+            caida = (1 - relativa / base["ops_relativas"]) * 100
+            regresiones.append(f"{_clave(r)}: {caida:.0f}% más lento que el baseline")
+        limite_memoria = base["bytes_pico_por_fila"] * (1 + umbral) + HOLGURA_BYTES_FILA
+        if r["bytes_pico_por_fila"] > limite_memoria:
+            regresiones.append(
+                f"{_clave(r)}: {r['bytes_pico_por_fila']:.0f} B/fila vs {base['bytes_pico_por_fila']:.0f} B/fila del baseline"
+            )
+    return regresiones
+
+
+def ejecutar_suite(
+    descripcion: str,
+    casos: dict[str, Caso],
+    generar_filas: Callable[[int], list],
+    baseline_por_defecto: Path,
+):
+    """CLI común: mide todos los casos por tamaño, imprime la tabla y compara con el baseline."""
+    parser = argparse.ArgumentParser(description=descripcion)
+    parser.add_argument("--tamanos", default=",".join(str(t) for t in TAMANOS_POR_DEFECTO),
+                        help="Tamaños de dataset separados por coma")
+    parser.add_argument("--dataset", help="JSON o CSV con filas reales (se repiten hasta cada tamaño)")
+    parser.add_argument("--solo", help="Solo los casos que contengan este texto")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=baseline_por_defecto)
+    parser.add_argument("--guardar-baseline", action="store_true", help="Sobrescribe el baseline con esta corrida")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="Fracción de regresión tolerada (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    args = parser.parse_args()
+
+    tamanos = [int(t) for t in args.tamanos.split(",") if t.strip()]
+    grabadas = cargar_filas(args.dataset) if args.dataset else None
+    seleccion = {k: v for k, v in casos.items() if not args.solo or args.solo in k}
+
+    calibracion = calibrar()
+    resultados = []
+    for n in tamanos:
+        filas = ajustar_tamano(grabadas, n) if grabadas else generar_filas(n)
+        for nombre, caso in seleccion.items():
+            resultados.append(medir_caso(nombre, caso, filas, args.repeticiones))
+
+    if args.json:
+        print(json.dumps({"calibracion_ops_s": calibracion, "resultados": resultados}, indent=2))
+    else:
+        origen = args.dataset or "sintético"
+        print(f"Dataset: {origen} | calibración: {calibracion:,.0f} ops/s\n")
+        print(f"{'función':<38} {'filas':>8} {'ops/s':>14} {'B pico/fila':>12}")
+        for r in resultados:
+            print(f"{r['funcion']:<38} {r['filas']:>8} {r['ops_s']:>14,.0f} {r['bytes_pico_por_fila']:>12,.0f}")
+
+    if args.guardar_baseline:
+        guardar_baseline(args.baseline, resultados, calibracion)
+        print(f"\n💾 Baseline guardado en {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\n⚠️ No hay baseline en {args.baseline} (usa --guardar-baseline)")
+        return
+    if args.dataset:
+        print("\nℹ️ Dataset grabado: no se compara contra el baseline (generado con datos sintéticos)")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regresiones = comparar_con_baseline(resultados, baseline, args.umbral)
+    if regresiones:
+        print(f"\n❌ Regresiones (umbral {args.umbral:.0%}):")
+        for r in regresiones:
+            print(f"   - {r}")
+        sys.exit(1)
+    print(f"\n✅ Sin regresiones respecto al baseline (umbral {args.umbral:.0%})")
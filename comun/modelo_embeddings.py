@@ -0,0 +1,167 @@
+"""
+Modelo de embeddings (all-MiniLM-L6-v2) empaquetado en las imágenes Docker.
+
+En el build se descargan los pesos en safetensors a EMBEDDINGS_MODEL_DIR; en runtime
+backend y limpiador cargan desde esa carpeta sin tocar el hub (HF_HUB_OFFLINE) y
+reemplazan los pesos del transformer por tensores respaldados por un mmap del
+archivo. Así varios workers comparten las mismas páginas de la caché del sistema
+en lugar de tener cada uno su copia. Si la carpeta no existe (desarrollo local) se
+usa el id del hub como antes.
+
+Descarga (build de la imagen, desde la raíz del proyecto):
+    python comun/modelo_embeddings.py /opt/modelos/all-MiniLM-L6-v2
+"""
+import json
+import mmap
+import os
+import sys
+from pathlib import Path
+
+# Debe ser EL MISMO modelo con el que se pobló jobs_clean.embedding
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+MODEL_REVISION = os.getenv("EMBEDDINGS_MODEL_REVISION", "main")
+MODELO_DIR = os.getenv("EMBEDDINGS_MODEL_DIR", "/opt/modelos/all-MiniLM-L6-v2")
+MAPEAR_PESOS = os.getenv("EMBEDDINGS_MMAP", "true").lower() == "true"
+
+# Solo lo que necesita SentenceTransformer: sin pytorch_model.bin, onnx ni openvino
+ARCHIVOS_MODELO = [
+    "config.json",
+    "model.safetensors",
+    "modules.json",
+    "sentence_bert_config.json",
+    "config_sentence_transformers.json",
+    "tokenizer.json",
+    "tokenizer_config.json",
+    "special_tokens_map.json",
+    "vocab.txt",
+    "1_Pooling/config.json",
+]
+
+_DTYPES_SAFETENSORS = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8", "U8": "uint8", "BOOL": "bool",
+}
+
+
+def modelo_local() -> bool:
+    return (Path(MODELO_DIR) / "model.safetensors").is_file()
+
+
+def ruta_modelo() -> str:
+    """
+    Carpeta local del modelo si está empaquetado (y activa el modo offline del hub),
+    o el id del hub si no.
+    """
+    if modelo_local():
+        # Debe fijarse antes de importar huggingface_hub/transformers
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+        return MODELO_DIR
+    return MODEL_ID
+
+
+def kwargs_modelo(device: str = "cpu") -> dict:
+    """Argumentos para SentenceTransformer (o model_kwargs de HuggingFaceEmbeddings)."""
+    kwargs = {"device": device}
+    if modelo_local():
+        kwargs["local_files_only"] = True
+    return kwargs
+
+
+def _tensores_mmap(archivo: Path) -> tuple[dict, mmap.mmap]:
+    """
+    Lee un .safetensors como tensores que apuntan directo al archivo mapeado.
+
+    Formato: 8 bytes little-endian con el largo del header JSON, el header
+    ({nombre: {dtype, shape, data_offsets}}) y después los datos crudos.
+    ACCESS_COPY (MAP_PRIVATE): las páginas se comparten entre procesos mientras
+    nadie las escriba, y la inferencia nunca escribe los pesos.
+    """
+    import torch
+
+    with open(archivo, "rb") as f:
+        largo_header = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(largo_header))
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    inicio_datos = 8 + largo_header
+    tensores = {}
+    for nombre, info in header.items():
+        if nombre == "__metadata__":
+            continue
+        dtype = getattr(torch, _DTYPES_SAFETENSORS[info["dtype"]])
+        desde, hasta = info["data_offsets"]
+        if hasta == desde:
+            tensores[nombre] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        elementos = (hasta - desde) // torch.tensor([], dtype=dtype).element_size()
+        tensores[nombre] = torch.frombuffer(
+            mapa, dtype=dtype, count=elementos, offset=inicio_datos + desde
+        ).reshape(info["shape"])
+    return tensores, mapa
+
+
+def mapear_pesos(modelo, ruta: str | None = None) -> int:
+    """
+    Reemplaza los pesos del transformer de un SentenceTransformer ya cargado por
+    tensores mmap del safetensors local. Retorna cuántos tensores quedaron mapeados
+    (0 si no hay modelo local o si falla: el modelo sigue funcionando con su copia).
+    """
+    ruta = ruta or MODELO_DIR
+    archivo = Path(ruta) / "model.safetensors"
+    if not MAPEAR_PESOS or not archivo.is_file():
+        return 0
+    try:
+        auto_model = modelo[0].auto_model
+        tensores, mapa = _tensores_mmap(archivo)
+        prefijo = f"{auto_model.base_model_prefix}."
+        tensores = {k.removeprefix(prefijo): v for k, v in tensores.items()}
+        propios = auto_model.state_dict()
+        compatibles = {
+            k: v for k, v in tensores.items()
+            if k in propios and propios[k].shape == v.shape and propios[k].dtype == v.dtype
+        }
+        auto_model.load_state_dict(compatibles, strict=False, assign=True)
+        # El mmap vive mientras viva el modelo
+        auto_model._pesos_mmap = mapa
+        print(f"🧠 Pesos de embeddings mapeados en memoria: {len(compatibles)}/{len(propios)} tensores")
+        return len(compatibles)
+    except Exception as e:
+        print(f"⚠️ No se pudieron mapear los pesos de embeddings (se usa la copia en memoria): {e}")
+        return 0
+
+
+def cargar_sentence_transformer(device: str = "cpu"):
+    """SentenceTransformer desde la carpeta empaquetada (o el hub) con pesos mapeados."""
+    ruta = ruta_modelo()
+    from sentence_transformers import SentenceTransformer
+
+    modelo = SentenceTransformer(ruta, **kwargs_modelo(device))
+    if ruta == MODELO_DIR:
+        mapear_pesos(modelo, ruta)
+    return modelo
+
+
+def descargar_modelo(destino: str) -> Path:
+    """Descarga del hub los archivos del modelo (solo safetensors) a `destino`."""
+    from huggingface_hub import snapshot_download
+
+    carpeta = Path(snapshot_download(
+        MODEL_ID,
+        revision=MODEL_REVISION,
+        local_dir=destino,
+        allow_patterns=ARCHIVOS_MODELO,
+    ))
+    faltantes = [a for a in ARCHIVOS_MODELO if not (carpeta / a).is_file()]
+    if "model.safetensors" in faltantes:
+        raise RuntimeError(f"{MODEL_ID}@{MODEL_REVISION} no publicó model.safetensors")
+    if faltantes:
+        print(f"⚠️ Archivos opcionales no publicados: {', '.join(faltantes)}")
+    return carpeta
+
+
+if __name__ == "__main__":
+    destino = sys.argv[1] if len(sys.argv) > 1 else MODELO_DIR
+    carpeta = descargar_modelo(destino)
+    tamano = sum(p.stat().st_size for p in carpeta.rglob("*") if p.is_file())
+    print(f"✅ {MODEL_ID} en {carpeta} ({tamano / 1e6:.1f} MB)")
@@ -0,0 +1,155 @@
+"""
+Corrector ortográfico por borrado simétrico (estilo SymSpell).
+
+Se indexan los borrados de hasta `max_distancia` caracteres de cada término del
+vocabulario (sobre un prefijo de `largo_prefijo`); buscar una palabra mal escrita
+es generar sus propios borrados y cruzarlos con el índice, y solo los candidatos que
+salen de ahí se verifican con distancia Damerau-Levenshtein (OSA). No hay LLM ni
+recorrido del vocabulario: una búsqueda son unas decenas de lookups en un dict.
+
+Las sugerencias se ordenan por distancia y luego por frecuencia en jobs_clean. Lo usa
+el backend para "pyton" -> "PYTHON" antes de consultar a Groq.
+"""
+import re
+from collections import defaultdict
+from typing import Iterable, NamedTuple
+
+_ESPACIOS = re.compile(r"\s+")
+# Palabras sueltas de términos compuestos que también se indexan ("desarrollador backend"
+# -> "desarrollador", "backend"); las cortas ("de", "en") solo meterían ruido
+LARGO_MIN_PALABRA = 4
+
+
+class Sugerencia(NamedTuple):
+    termino: str
+    distancia: int
+    frecuencia: int
+
+
+def normalizar_termino(texto: str) -> str:
+    """Minúsculas y espacios colapsados: la clave del índice."""
+    return _ESPACIOS.sub(" ", str(texto or "")).strip().lower()
+
+
+def distancia_maxima(termino: str) -> int:
+    """Tolerancia según el largo: sin corrección hasta 3 letras ("go", "sql"), 1 hasta 5, si no 2."""
+    largo = len(termino)
+    if largo <= 3:
+        return 0
+    return 1 if largo <= 5 else 2
+
+
+def _borrados(palabra: str, max_distancia: int) -> set[str]:
+    resultado = {palabra}
+    frontera = {palabra}
+    for _ in range(max_distancia):
+        frontera = {p[:i] + p[i + 1:] for p in frontera for i in range(len(p))}
+        resultado |= frontera
+    return resultado
+
+
+def distancia_osa(a: str, b: str, maximo: int) -> int:
+    """Damerau-Levenshtein (transposiciones adyacentes); retorna maximo + 1 si se pasa."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2: list[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        minimo_fila = i
+        for j in range(1, len(b) + 1):
+            costo = 0 if a[i - 1] == b[j - 1] else 1
+            valor = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + costo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                valor = min(valor, anterior2[j - 2] + 1)
+            actual[j] = valor
+            minimo_fila = min(minimo_fila, valor)
+        if minimo_fila > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1] if anterior[-1] <= maximo else maximo + 1
+
+
+class IndiceOrtografico:
+    """Índice de borrados simétricos sobre un vocabulario con frecuencias."""
+
+    def __init__(self, frecuencias: dict[str, int] | Iterable[str], max_distancia: int = 2, largo_prefijo: int = 7):
+        self.max_distancia = max_distancia
+        self.largo_prefijo = largo_prefijo
+        # clave normalizada -> (forma a mostrar, frecuencia)
+        self.terminos: dict[str, tuple[str, int]] = {}
+        self.borrados: dict[str, list[str]] = defaultdict(list)
+
+        if not isinstance(frecuencias, dict):
+            frecuencias = {t: 1 for t in frecuencias}
+        for termino, frecuencia in frecuencias.items():
+            self._agregar(termino, int(frecuencia or 1))
+            palabras = normalizar_termino(termino).split(" ")
+            if len(palabras) > 1:
+                for palabra in palabras:
+                    if len(palabra) >= LARGO_MIN_PALABRA:
+                        self._agregar(palabra, int(frecuencia or 1), sumar=True)
+
+        for clave in self.terminos:
+            for borrado in _borrados(clave[:largo_prefijo], max_distancia):
+                self.borrados[borrado].append(clave)
+        self.borrados = dict(self.borrados)
+
+    def _agregar(self, termino: str, frecuencia: int, sumar: bool = False):
+        clave = normalizar_termino(termino)
+        if not clave:
+            return
+        existente = self.terminos.get(clave)
+        if existente is None:
+            self.terminos[clave] = (str(termino).strip() if not sumar else clave, frecuencia)
+        elif sumar:
+            self.terminos[clave] = (existente[0], existente[1] + frecuencia)
+        elif frecuencia > existente[1]:
+            # Dos capitalizaciones del mismo término: se muestra la más frecuente
+            self.terminos[clave] = (str(termino).strip(), existente[1] + frecuencia)
+        else:
+            self.terminos[clave] = (existente[0], existente[1] + frecuencia)
+
+    def __contains__(self, termino: str) -> bool:
+        return normalizar_termino(termino) in self.terminos
+
+    def __len__(self) -> int:
+        return len(self.terminos)
+
+    def sugerencias(self, termino: str, max_distancia: int | None = None, limite: int = 5) -> list[Sugerencia]:
+        """Términos del vocabulario a distancia <= max_distancia, los mejores primero."""
+        clave = normalizar_termino(termino)
+        if not clave:
+            return []
+        if max_distancia is None:
+            max_distancia = distancia_maxima(clave)
+        max_distancia = min(max_distancia, self.max_distancia)
+        if clave in self.terminos:
+            forma, frecuencia = self.terminos[clave]
+            return [Sugerencia(forma, 0, frecuencia)]
+        if max_distancia == 0:
+            return []
+
+        encontrados: dict[str, int] = {}
+        prefijo = clave[:self.largo_prefijo]
+        for borrado in _borrados(prefijo, max_distancia):
+            for candidato in self.borrados.get(borrado, ()):
+                if candidato in encontrados:
+                    continue
+                encontrados[candidato] = distancia_osa(clave, candidato, max_distancia)
+
+        resultado = [
+            Sugerencia(self.terminos[c][0], d, self.terminos[c][1])
+            for c, d in encontrados.items() if d <= max_distancia
+        ]
+        resultado.sort(key=lambda s: (s.distancia, -s.frecuencia, s.termino))
+        return resultado[:limite]
+
+    def corregir(self, termino: str) -> str | None:
+        """La mejor corrección, o None si el término ya existe o no hay candidato."""
+        mejores = self.sugerencias(termino, limite=1)
+        if not mejores or mejores[0].distancia == 0:
+            return None
+        return mejores[0].termino
@@ -0,0 +1,165 @@
+"""
+Detector de habilidades por diccionario (Aho-Corasick).
+
+Se compila una sola vez a partir del vocabulario de habilidades de jobs_clean y
+recorre un documento en una sola pasada lineal, respetando límites de palabra
+("GO" no coincide dentro de "GOOGLE") y resolviendo alias ("REACTJS" -> "REACT").
+Lo usan el análisis de CV del backend y el limpiador antes de llamar al LLM.
+"""
+import re
+from collections import deque
+from typing import Iterable
+
+# Alias frecuentes -> forma canónica (todo en mayúsculas)
+ALIAS_SKILLS: dict[str, str] = {
+    "REACTJS": "REACT",
+    "REACT.JS": "REACT",
+    "REACT JS": "REACT",
+    "VUEJS": "VUE",
+    "VUE.JS": "VUE",
+    "ANGULARJS": "ANGULAR",
+    "NODEJS": "NODE.JS",
+    "NODE JS": "NODE.JS",
+    "NEXTJS": "NEXT.JS",
+    "EXPRESSJS": "EXPRESS",
+    "JS": "JAVASCRIPT",
+    "TS": "TYPESCRIPT",
+    "GOLANG": "GO",
+    "POSTGRES": "POSTGRESQL",
+    "K8S": "KUBERNETES",
+    "AMAZON WEB SERVICES": "AWS",
+    "GOOGLE CLOUD": "GCP",
+    "GOOGLE CLOUD PLATFORM": "GCP",
+    "MICROSOFT AZURE": "AZURE",
+    "MS SQL SERVER": "SQL SERVER",
+    "MSSQL": "SQL SERVER",
+    "DOTNET": ".NET",
+    "C SHARP": "C#",
+    "SPRINGBOOT": "SPRING BOOT",
+    "SCIKIT LEARN": "SCIKIT-LEARN",
+    "SKLEARN": "SCIKIT-LEARN",
+    "ML": "MACHINE LEARNING",
+    "POWERBI": "POWER BI",
+}
+
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_skill(texto: str) -> str:
+    """Mayúsculas y espacios colapsados: la misma normalización para vocabulario y documentos."""
+    return _ESPACIOS.sub(" ", str(texto or "")).strip().upper()
+
+
+def canonizar_skill(skill: str, alias: dict[str, str] | None = None) -> str:
+    """Forma canónica de una habilidad sin necesidad de compilar el diccionario."""
+    s = normalizar_skill(skill)
+    return (alias or ALIAS_SKILLS).get(s, s)
+
+
+def _es_palabra(c: str) -> bool:
+    return c.isalnum()
+
+
+class SkillMatcher:
+    """Autómata Aho-Corasick sobre las variantes de cada habilidad del vocabulario."""
+
+    def __init__(self, vocabulario: Iterable[str], alias: dict[str, str] | None = None):
+        self.alias = {normalizar_skill(k): normalizar_skill(v) for k, v in (alias or ALIAS_SKILLS).items()}
+        self.vocabulario: set[str] = set()
+        # Estado 0 = raíz. goto[estado] = {caracter: estado}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Por estado: (largo del patrón, skill canónica) de cada patrón que termina ahí
+        self._salida: list[list[tuple[int, str]]] = [[]]
+
+        for skill in vocabulario:
+            canonico = self.canonico(skill)
+            if not canonico:
+                continue
+            self.vocabulario.add(canonico)
+            self._agregar_variantes(normalizar_skill(skill), canonico)
+            self._agregar_variantes(canonico, canonico)
+        for alias_skill, canonico in self.alias.items():
+            self._agregar_variantes(alias_skill, canonico)
+        self._construir_fallos()
+
+    def canonico(self, skill: str) -> str:
+        """Forma canónica de una habilidad (aplica alias)."""
+        s = normalizar_skill(skill)
+        return self.alias.get(s, s)
+
+    def __contains__(self, skill: str) -> bool:
+        return self.canonico(skill) in self.vocabulario
+
+    def __len__(self) -> int:
+        return len(self.vocabulario)
+
+    def _agregar_variantes(self, patron: str, canonico: str):
+        variantes = {patron}
+        # "MACHINE LEARNING" también como "MACHINELEARNING", "CI-CD" como "CICD"
+        compacto = re.sub(r"[\s\-]", "", patron)
+        if len(compacto) >= 2:
+            variantes.add(compacto)
+        for v in variantes:
+            self._agregar_patron(v, canonico)
+
+    def _agregar_patron(self, patron: str, canonico: str):
+        estado = 0
+        for c in patron:
+            siguiente = self._goto[estado].get(c)
+            if siguiente is None:
+                siguiente = len(self._goto)
+                self._goto[estado][c] = siguiente
+                self._goto.append({})
+                self._fail.append(0)
+                self._salida.append([])
+            estado = siguiente
+        if (len(patron), canonico) not in self._salida[estado]:
+            self._salida[estado].append((len(patron), canonico))
+
+    def _construir_fallos(self):
+        cola = deque(self._goto[0].values())
+        while cola:
+            estado = cola.popleft()
+            for c, hijo in self._goto[estado].items():
+                cola.append(hijo)
+                f = self._fail[estado]
+                while f and c not in self._goto[f]:
+                    f = self._fail[f]
+                destino = self._goto[f].get(c, 0)
+                self._fail[hijo] = destino if destino != hijo else 0
+                self._salida[hijo] = self._salida[hijo] + self._salida[self._fail[hijo]]
+
+    def buscar(self, texto: str) -> list[str]:
+        """
+        Habilidades canónicas presentes en el texto, en orden de aparición y sin repetir.
+        Solo cuenta coincidencias delimitadas por caracteres no alfanuméricos; si dos
+        coincidencias se solapan gana la más larga ("C++" sobre "C").
+        """
+        texto = normalizar_skill(texto)
+        n = len(texto)
+        coincidencias: list[tuple[int, int, str]] = []
+        goto, fail, salida = self._goto, self._fail, self._salida
+        estado = 0
+        for i, c in enumerate(texto):
+            while estado and c not in goto[estado]:
+                estado = fail[estado]
+            estado = goto[estado].get(c, 0)
+            for largo, canonico in salida[estado]:
+                inicio = i - largo + 1
+                if inicio > 0 and _es_palabra(texto[inicio - 1]) and _es_palabra(texto[inicio]):
+                    continue
+                if i + 1 < n and _es_palabra(texto[i + 1]) and _es_palabra(texto[i]):
+                    continue
+                coincidencias.append((inicio, i + 1, canonico))
+
+        # Resolución leftmost-longest: descarta coincidencias contenidas en otra más larga
+        coincidencias.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        encontrados: dict[str, None] = {}
+        fin_cubierto = -1
+        for inicio, fin, canonico in coincidencias:
+            if inicio < fin_cubierto:
+                continue
+            encontrados.setdefault(canonico, None)
+            fin_cubierto = fin
+        return list(encontrados)
@@ -14,7 +14,7 @@ import {
   Tooltip,
   ResponsiveContainer,
 } from 'recharts';
-import { compararTecnologias, getHabilidadesPopulares, type ComparacionTecnologias } from '@/services/api';
+import { compararTecnologias, getHabilidadesPopulares, getSugerencias, type ComparacionTecnologias } from '@/services/api';
 import { exportComparacionToPdf } from '@/lib/exportComparePdf';
 
 export default function ComparePage() {
@@ -24,14 +24,30 @@ export default function ComparePage() {
   const [suggestions, setSuggestions] = useState<string[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // "¿Quisiste decir...?" del corrector ortográfico para cada tecnología
+  const [corrections, setCorrections] = useState<{ a?: string; b?: string }>({});
 
-  const fetchComparison = () => {
+  const suggestCorrection = (term: string) =>
+    getSugerencias(term, 1)
+      .then(([mejor]) => (mejor && mejor.distancia > 0 ? mejor.termino : undefined))
+      .catch(() => undefined);
+
+  const fetchComparison = (tecnologiaA = techA, tecnologiaB = techB) => {
     setLoading(true);
     setError(null);
-    compararTecnologias({ tecnologia_a: techA, tecnologia_b: techB })
+    compararTecnologias({ tecnologia_a: tecnologiaA, tecnologia_b: tecnologiaB })
       .then(setComparison)
       .catch((e) => setError(e instanceof Error ? e.message : 'Error al comparar'))
       .finally(() => setLoading(false));
+    Promise.all([suggestCorrection(tecnologiaA), suggestCorrection(tecnologiaB)])
+      .then(([a, b]) => setCorrections({ a, b }));
+  };
+
+  const applyCorrection = (side: 'a' | 'b', term: string) => {
+    const [nuevaA, nuevaB] = side === 'a' ? [term, techB] : [techA, term];
+    setTechA(nuevaA);
+    setTechB(nuevaB);
+    fetchComparison(nuevaA, nuevaB);
   };
 
   useEffect(() => {
@@ -83,9 +99,21 @@ export default function ComparePage() {
               className="bg-secondary"
             />
           </div>
-          <Button onClick={fetchComparison} disabled={loading}>
+          <Button onClick={() => fetchComparison()} disabled={loading}>
             {loading ? 'Cargando...' : 'Comparar'}
           </Button>
+          {(corrections.a || corrections.b) && (
+            <div className="w-full flex flex-wrap items-center gap-2 text-sm text-muted-foreground">
+              ¿Quisiste decir
+              {(['a', 'b'] as const).map((side) => corrections[side] && (
+                <Button key={side} variant="link" size="sm" className="px-1"
+                  onClick={() => applyCorrection(side, corrections[side]!)}>
+                  {corrections[side]}
+                </Button>
+              ))}
+              ?
+            </div>
+          )}
           {suggestions.length > 0 && (
             <div className="w-full flex flex-wrap gap-2 mt-2">
               {suggestions.slice(0, 10).map((s) => (
@@ -93,7 +121,7 @@ export default function ComparePage() {
                   key={s}
                   variant="ghost"
                   size="sm"
-                  onClick={() => { setTechA(s); fetchComparison(); }}
+                  onClick={() => { setTechA(s); fetchComparison(s, techB); }}
                 >
                   {s}
                 </Button>
@@ -146,10 +174,10 @@ export default function ComparePage() {
                   <div className="flex gap-4 text-sm">
                     <span className="text-success flex items-center gap-1">
                       <TrendingUp className="h-4 w-4" />
-                      +{a.salario_variacion}% <span className="text-muted-foreground">vs año anterior</span>
+                      {a.salario_variacion >= 0 ? '+' : ''}{a.salario_variacion}% <span className="text-muted-foreground">vs mes anterior</span>
                     </span>
                     <span className="text-success flex items-center gap-1">
-                      +{b.salario_variacion}% <span className="text-muted-foreground">vs año anterior</span>
+                      {b.salario_variacion >= 0 ? '+' : ''}{b.salario_variacion}% <span className="text-muted-foreground">vs mes anterior</span>
                     </span>
                   </div>
                 </div>
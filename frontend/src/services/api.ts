@@ -123,6 +123,12 @@ export interface ChatRespuesta {
   fuentes?: FuenteChat[];
 }
 
+export interface SugerenciaOrtografica {
+  termino: string;
+  distancia: number;
+  frecuencia: number;
+}
+
 export interface FiltrosOfertas {
   rol?: string;
   locacion?: string;
@@ -364,3 +370,19 @@ export async function getHabilidadesPopulares(limit?: number): Promise<string[]>
   if (!response.ok) throw new Error('Error fetching habilidades');
   return response.json();
 }
+
+/**
+ * GET /api/sugerencias
+ * Correcciones ortográficas ("pyton" -> "PYTHON") para el chat y el buscador
+ * 
+ * Query params:
+ * - q: string
+ * - limit: number (default: 5)
+ */
+export async function getSugerencias(q: string, limit?: number): Promise<SugerenciaOrtografica[]> {
+  const params = new URLSearchParams({ q });
+  if (limit) params.append('limit', String(limit));
+  const response = await fetch(`${API_BASE_URL}/sugerencias?${params}`);
+  if (!response.ok) throw new Error('Error fetching sugerencias');
+  return response.json();
+}
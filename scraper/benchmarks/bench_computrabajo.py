@@ -0,0 +1,193 @@
+"""
+Benchmark del scraper de Computrabajo contra el servidor local de fixtures.
+
+Corre RecolectorComputrabajo completo (listados + detalles, sin guardar en Supabase)
+contra benchmarks/servidor_fixtures.py con una latencia inyectada, para varias
+concurrencias por host. Concurrencia 1 equivale al recorrido secuencial de antes
+(sin las pausas). Reporta páginas/minuto, ofertas y el máximo de peticiones en
+vuelo que vio el servidor, y verifica que todas las corridas extraen lo mismo.
+
+Sin --limite-rps el regulador AIMD no frena (se mide solo la concurrencia). Con
+--limite-rps el servidor responde 429 + Retry-After por encima de ese ritmo y el
+regulador arranca en --tasa-inicial: se ve cómo sube mientras todo va bien, cómo
+recorta ante los 429 y que igual no se pierde ninguna oferta.
+
+Con --conocidas F se agrega una corrida final en la que una fracción F de las ofertas
+ya "está en jobs_raw": sus detalles no se descargan y se reportan como evitados.
+
+Con --corte N se simula una corrida que muere tras guardar N páginas y luego una con
+--resume: la segunda debe pedir solo las páginas que faltaban y entre las dos guardar
+todas las ofertas.
+
+Uso (desde scraper/):
+    python benchmarks/bench_computrabajo.py
+    python benchmarks/bench_computrabajo.py --paginas 5 --latencia-ms 300 --concurrencias 1,4,8
+    python benchmarks/bench_computrabajo.py --limite-rps 10 --concurrencias 4,8
+    python benchmarks/bench_computrabajo.py --concurrencias 4 --conocidas 0.8
+    python benchmarks/bench_computrabajo.py --concurrencias 4 --corte 2
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_scraper_root = Path(__file__).resolve().parent.parent
+if str(_scraper_root) not in sys.path:
+    sys.path.insert(0, str(_scraper_root))
+if str(_scraper_root.parent) not in sys.path:
+    sys.path.append(str(_scraper_root.parent))
+
+# El benchmark nunca consulta Supabase: estos valores solo permiten importar
+# db.supabase_helper cuando no hay .env (el cliente no se conecta al crearse).
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from servidor_fixtures import iniciar_servidor  # noqa: E402
+from db.urls_conocidas import UrlsConocidas  # noqa: E402
+from scrapers.checkpoints import Checkpoint  # noqa: E402
+from scrapers.regulador_tasa import ReguladorAIMD  # noqa: E402
+from scrapers.scraper_computrabajos import RecolectorComputrabajo  # noqa: E402
+
+
+class CorteSimulado(Exception):
+    pass
+
+
+class RecolectorSinGuardar(RecolectorComputrabajo):
+    """Deja las ofertas en self.datos en vez de subirlas; con corte_en, 'muere' tras esas páginas."""
+    corte_en: int | None = None
+
+    def guardar_lote(self):
+        if self.corte_en is not None:
+            if self.corte_en == 0:
+                raise CorteSimulado()
+            self.corte_en -= 1
+        self.urls_guardadas.update(d["url_publicacion"] for d in self.datos)
+        return True
+
+    def guardar_supabase(self):
+        pass
+
+
+def correr(servidor, roles: list[str], concurrencia: int, regulador: ReguladorAIMD,
+           conocidas: set[str] = frozenset(), checkpoints: Path | None = None,
+           reanudar: bool = False, corte_en: int | None = None) -> dict:
+    servidor.reiniciar_contadores()
+    recolector = RecolectorSinGuardar(roles, scrape_days=2, concurrencia=concurrencia)
+    recolector.base_url = servidor.url
+    recolector.regulador = regulador
+    recolector.conocidas = UrlsConocidas("computrabajo", urls=conocidas)
+    recolector.corte_en = corte_en
+    with tempfile.TemporaryDirectory() as temporal:
+        recolector.checkpoint = Checkpoint("computrabajo", 2, reanudar=reanudar, directorio=checkpoints or temporal)
+
+        inicio = time.perf_counter()
+        try:
+            recolector.recolectar()
+        except CorteSimulado:
+            pass
+        segundos = time.perf_counter() - inicio
+
+    return {
+        "concurrencia": concurrencia,
+        "segundos": round(segundos, 2),
+        "paginas": servidor.peticiones,
+        "paginas_por_minuto": round(servidor.peticiones / segundos * 60),
+        "ofertas": len(recolector.datos),
+        "detalles_evitados": recolector.conocidas.evitadas,
+        "con_descripcion": sum(1 for d in recolector.datos if d["descripcion"]),
+        "max_en_vuelo": servidor.max_en_vuelo,
+        "respuestas_429": servidor.rechazadas,
+        "tasa_final": round(regulador.tasa(servidor.url), 2),
+        "_urls": sorted(d["url_publicacion"] for d in recolector.datos),
+        "_urls_guardadas": sorted(recolector.urls_guardadas),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scraper de Computrabajo con fixtures locales")
+    parser.add_argument("--paginas", type=int, default=3, help="Páginas de listado por rol (20 ofertas cada una)")
+    parser.add_argument("--roles", type=int, default=2)
+    parser.add_argument("--latencia-ms", type=float, default=200)
+    parser.add_argument("--concurrencias", default="1,4,8")
+    parser.add_argument("--limite-rps", type=float, default=0, help="El servidor responde 429 por encima de este ritmo")
+    parser.add_argument("--tasa-inicial", type=float, default=2, help="req/s iniciales del regulador (con --limite-rps)")
+    parser.add_argument("--tasa-max", type=float, default=50)
+    parser.add_argument("--conocidas", type=float, default=0, help="Fracción de ofertas ya guardadas (corrida extra)")
+    parser.add_argument("--corte", type=int, default=0, help="Páginas guardadas antes de un corte simulado + --resume")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    servidor = iniciar_servidor(paginas=args.paginas, latencia_ms=args.latencia_ms, limite_rps=args.limite_rps)
+    roles = [f"rol prueba {i}" for i in range(args.roles)]
+    print(f"🧪 Fixtures en {servidor.url}: {args.roles} roles × {args.paginas} páginas, {args.latencia_ms:.0f} ms por petición"
+          + (f", límite {args.limite_rps:g} req/s" if args.limite_rps else ""))
+
+    def regulador() -> ReguladorAIMD:
+        if args.limite_rps:
+            return ReguladorAIMD(tasa_inicial=args.tasa_inicial, tasa_max=args.tasa_max)
+        return ReguladorAIMD(tasa_inicial=float("inf"), tasa_max=float("inf"))  # sin freno: solo cuenta la concurrencia
+
+    resultados = []
+    try:
+        for concurrencia in (int(c) for c in args.concurrencias.split(",")):
+            resultados.append(correr(servidor, roles, concurrencia, regulador()))
+        completa = resultados[-1]
+        if args.conocidas:
+            urls = sorted(set(resultados[0]["_urls"]))
+            conocidas = set(urls[:int(len(urls) * args.conocidas)])
+            incremental = correr(servidor, roles, resultados[-1]["concurrencia"], regulador(), conocidas)
+        if args.corte:
+            with tempfile.TemporaryDirectory() as checkpoints:
+                cortada = correr(servidor, roles, completa["concurrencia"], regulador(),
+                                 checkpoints=Path(checkpoints), corte_en=args.corte)
+                reanudada = correr(servidor, roles, completa["concurrencia"], regulador(),
+                                   checkpoints=Path(checkpoints), reanudar=True)
+    finally:
+        servidor.shutdown()
+
+    print(f"\n{'concurrencia':>12} {'segundos':>9} {'páginas':>8} {'págs/min':>9} {'ofertas':>8} {'en vuelo':>9} "
+          f"{'429':>5} {'tasa final':>11}")
+    for r in resultados:
+        print(f"{r['concurrencia']:>12} {r['segundos']:>9} {r['paginas']:>8} {r['paginas_por_minuto']:>9} "
+              f"{r['ofertas']:>8} {r['max_en_vuelo']:>9} {r['respuestas_429']:>5} {r['tasa_final']:>11}")
+    base = resultados[0]
+    for r in resultados[1:]:
+        print(f"⚡ Concurrencia {r['concurrencia']}: {base['segundos'] / r['segundos']:.1f}x más rápido que {base['concurrencia']}")
+
+    iguales = all(r["_urls"] == base["_urls"] for r in resultados)
+    print("✅ Todas las corridas extrajeron las mismas ofertas" if iguales else "❌ Las corridas extrajeron ofertas distintas")
+
+    if args.conocidas:
+        base_final = resultados[-1]
+        nuevas_ok = set(incremental["_urls"]) == set(base_final["_urls"]) - conocidas
+        print(f"\n🔁 Con {len(conocidas)} ofertas ya en jobs_raw: {incremental['detalles_evitados']} detalles evitados, "
+              f"{incremental['paginas']} páginas en vez de {base_final['paginas']}, "
+              f"{incremental['segundos']} s en vez de {base_final['segundos']} s")
+        print("✅ Se extrajeron exactamente las ofertas nuevas" if nuevas_ok else "❌ Las ofertas nuevas no coinciden")
+        iguales = iguales and nuevas_ok
+        resultados.append({**incremental, "conocidas": len(conocidas)})
+
+    if args.corte:
+        # Lo guardado antes del corte (páginas anotadas) + lo de la corrida reanudada
+        guardadas = set(cortada["_urls_guardadas"]) | set(reanudada["_urls"])
+        reanudo_bien = guardadas == set(completa["_urls"])
+        print(f"\n⏯️ Corte tras {args.corte} páginas guardadas: la corrida reanudada pidió {reanudada['paginas']} "
+              f"páginas en vez de {completa['paginas']} ({reanudada['segundos']} s en vez de {completa['segundos']} s)")
+        print("✅ Entre las dos corridas se guardaron todas las ofertas" if reanudo_bien
+              else f"❌ Faltan {len(set(completa['_urls']) - guardadas)} ofertas tras reanudar")
+        iguales = iguales and reanudo_bien
+        resultados.append({**reanudada, "reanudada_tras_paginas": args.corte})
+
+    if args.json:
+        limpio = [{k: v for k, v in r.items() if not k.startswith("_")} for r in resultados]
+        args.json.write_text(json.dumps(limpio, indent=2, ensure_ascii=False), encoding="utf-8")
+    if not iguales:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
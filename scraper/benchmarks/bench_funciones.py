@@ -0,0 +1,104 @@
+"""
+Micro-benchmarks de las funciones puras que corren por oferta en el pipeline.
+
+limpiar_valor_para_supabase (los 9 campos que arma guardar_oferta_cruda) y los
+extractores de sueldo del limpiador y de Computrabajo, sobre datasets con forma
+de jobs_raw de 1k, 10k y 100k filas. Reporta filas/segundo y pico de memoria por
+fila, y falla (exit 1) si alguna función empeora más que el umbral respecto al
+baseline guardado en benchmarks/baseline_funciones.json.
+
+Uso (desde scraper/):
+    python benchmarks/bench_funciones.py
+    python benchmarks/bench_funciones.py --dataset jobs_raw.csv     # export real de Supabase
+    python benchmarks/bench_funciones.py --guardar-baseline         # tras una mejora intencional
+"""
+import os
+import random
+import sys
+from pathlib import Path
+
+_scraper_root = Path(__file__).resolve().parent.parent
+if str(_scraper_root) not in sys.path:
+    sys.path.insert(0, str(_scraper_root))
+if str(_scraper_root.parent) not in sys.path:
+    sys.path.append(str(_scraper_root.parent))
+
+# El benchmark nunca consulta Supabase: estos valores solo permiten importar
+# db.supabase_helper cuando no hay .env (el cliente no se conecta al crearse).
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from comun.microbench import ejecutar_suite
+from db.supabase_helper import limpiar_valor_para_supabase
+from limpiador.limpiador_de_datos import extraer_sueldo_numerico
+from scrapers.scraper_computrabajos import RecolectorComputrabajo
+
+BASELINE = Path(__file__).resolve().parent / "baseline_funciones.json"
+
+CAMPOS_OFERTA = [
+    ("plataforma", "text"), ("rol_busqueda", "text"), ("fecha_publicacion", "text"),
+    ("oferta_laboral", "text"), ("locacion", "text"), ("descripcion", "text"),
+    ("sueldo", "numeric"), ("compania", "text"), ("url_publicacion", "text"),
+]
+ROLES = ["desarrollador python", "frontend developer", "data engineer", "qa automation", "devops"]
+
+
+def _sueldo_texto(rng: random.Random):
+    monto = rng.randint(470, 4500)
+    return rng.choice([
+        f"$ {monto:,}".replace(",", ".") + ",00 (Mensual)",
+        f"{monto} - {monto + rng.randint(100, 900)}",
+        f"USD {monto}",
+        "No especificado",
+        "A convenir",
+        "",
+        None,
+        float("nan"),
+        monto,
+    ])
+
+
+def generar_filas(n: int, semilla: int = 42) -> list[dict]:
+    """Ofertas sintéticas con la forma (y la basura típica) de lo que llega a jobs_raw."""
+    rng = random.Random(semilla)
+    return [
+        {
+            "plataforma": rng.choice(["computrabajo", "jooble", "linkedin"]),
+            "rol_busqueda": rng.choice(ROLES),
+            "fecha_publicacion": rng.choice(["2026-10-01 10:00:00", "nan", None, "15/09/2026"]),
+            "oferta_laboral": rng.choice(["Desarrollador Python Sr", "QA Tester", "nan", None]),
+            "locacion": rng.choice(["Quito, Pichincha", "Guayaquil", "", None]),
+            "descripcion": " ".join(rng.choices(["python", "django", "equipo", "experiencia", "aws"], k=120)),
+            "sueldo": _sueldo_texto(rng),
+            "compania": rng.choice([f"Empresa {rng.randint(1, 400)}", "None", ""]),
+            "url_publicacion": f"https://ec.computrabajo.com/ofertas-de-trabajo/oferta-{i}",
+        }
+        for i in range(n)
+    ]
+
+
+def _limpiar_ofertas(filas: list[dict]) -> list[dict]:
+    return [
+        {campo: limpiar_valor_para_supabase(f.get(campo), tipo) for campo, tipo in CAMPOS_OFERTA}
+        for f in filas
+    ]
+
+
+def _sueldos_computrabajo(filas: list[dict]) -> list:
+    # El método no usa estado de la instancia: se llama sin construir el recolector
+    return [
+        RecolectorComputrabajo.extraer_sueldo_numerico(None, f["sueldo"])
+        for f in filas
+        if isinstance(f.get("sueldo"), str)
+    ]
+
+
+CASOS = {
+    "limpiar_valor_para_supabase": _limpiar_ofertas,
+    "limpiador.extraer_sueldo_numerico": lambda filas: [extraer_sueldo_numerico(f.get("sueldo")) for f in filas],
+    "computrabajo.extraer_sueldo_numerico": _sueldos_computrabajo,
+}
+
+
+if __name__ == "__main__":
+    ejecutar_suite(__doc__.strip().splitlines()[0], CASOS, generar_filas, BASELINE)
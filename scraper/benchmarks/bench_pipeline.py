@@ -0,0 +1,176 @@
+"""
+Benchmark del modo streaming contra el modo por fases (scrapear todo, subir, limpiar).
+
+Tres "plataformas" sintéticas corren en procesos con el orquestador real y producen
+ofertas a ritmo fijo (como un scraper que parsea una oferta cada --intervalo-ms). Las
+ofertas van a un PostgREST falso (el de bench_upsert) y un limpiador falso tarda
+--limpieza-ms por oferta y las marca como procesadas, como procesar_lote.
+
+- Por fases: cada plataforma sube todo al final y el limpiador arranca cuando terminan.
+- Streaming: PipelineStreaming sube y limpia mientras se produce; lo que no alcanzó a
+  limpiar lo termina una FASE 2 al final, igual que en main.py.
+
+Reporta el tiempo total y la latencia descubrimiento → limpia (mediana y máxima), y
+verifica que en los dos modos se limpien exactamente las mismas ofertas.
+
+Uso (desde scraper/):
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --ofertas 500 --intervalo-ms 20 --limpieza-ms 5 --tamano-cola 100
+"""
+import argparse
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+_scraper_root = Path(__file__).resolve().parent.parent
+if str(_scraper_root) not in sys.path:
+    sys.path.insert(0, str(_scraper_root))
+if str(_scraper_root.parent) not in sys.path:
+    sys.path.append(str(_scraper_root.parent))
+
+# El benchmark escribe solo en el servidor falso: estos valores solo permiten importar
+# db.supabase_helper cuando no hay .env (el cliente global no se usa).
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from supabase import create_client  # noqa: E402
+
+from bench_upsert import PostgrestFalso  # noqa: E402
+from db.supabase_helper import guardar_ofertas_crudas  # noqa: E402
+from scrapers.orquestador import Plataforma, ejecutar_en_paralelo  # noqa: E402
+from scrapers.pipeline_streaming import PipelineStreaming  # noqa: E402
+
+PLATAFORMAS = [Plataforma(f"sintetica{i}", "bench_pipeline", "producir", timeout_min=10) for i in range(3)]
+
+
+def producir(roles, dias=2, sumidero=None):
+    """'Scraper' que corre en el proceso hijo: una oferta cada BENCH_INTERVALO_MS."""
+    n = int(os.environ["BENCH_OFERTAS"])
+    intervalo = float(os.environ["BENCH_INTERVALO_MS"]) / 1000
+    plataforma = mp.current_process().name.removeprefix("scraper-") # el orquestador nombra así al proceso
+    datos = []
+    for i in range(n):
+        time.sleep(intervalo)
+        oferta = {
+            "plataforma": plataforma,
+            "rol_busqueda": "desarrollador python",
+            "fecha_publicacion": f"{time.time():.3f}", # momento del descubrimiento
+            "oferta_laboral": f"Desarrollador Python {i}",
+            "descripcion": "Buscamos desarrollador con experiencia en Django y PostgreSQL. " * 20,
+            "sueldo": 1200,
+            "url_publicacion": f"https://{plataforma}.example/oferta/{i}",
+        }
+        if sumidero is not None:
+            sumidero(oferta)
+        else:
+            datos.append(oferta)
+    if sumidero is None:
+        cliente = create_client(os.environ["BENCH_URL"], os.environ["SUPABASE_KEY"])
+        guardar_ofertas_crudas(datos, cliente=cliente, verbose=False)
+    return {"ofertas": n}
+
+
+class LimpiadorFalso:
+    def __init__(self, servidor: PostgrestFalso, segundos_por_oferta: float):
+        self.servidor = servidor
+        self.segundos = segundos_por_oferta
+        self.latencias: list[float] = []
+        self.limpiadas: set[str] = set()
+
+    def __call__(self, lote: list[dict]):
+        time.sleep(self.segundos * len(lote))
+        ahora = time.time()
+        with self.servidor._lock:
+            for oferta in lote:
+                self.servidor.filas[oferta["url_publicacion"]]["processed"] = True
+                self.latencias.append(ahora - float(oferta["fecha_publicacion"]))
+                self.limpiadas.add(oferta["url_publicacion"])
+
+    def fase_2(self, lote: int = 20):
+        """Como ejecutar_limpieza_ia: todo lo que sigue con processed=False."""
+        with self.servidor._lock:
+            pendientes = [dict(f) for f in self.servidor.filas.values() if not f["processed"]]
+        for k in range(0, len(pendientes), lote):
+            self(pendientes[k:k + lote])
+        return len(pendientes)
+
+
+def correr(servidor, args, streaming: bool) -> dict:
+    servidor.filas.clear()
+    limpiador = LimpiadorFalso(servidor, args.limpieza_ms / 1000)
+    inicio = time.perf_counter()
+    pipeline = None
+    if streaming:
+        cliente = create_client(servidor.url, os.environ["SUPABASE_KEY"])
+        pipeline = PipelineStreaming(tamano_cola=args.tamano_cola, espera_max=0.5, limpiar=limpiador, cliente=cliente)
+        pipeline.iniciar()
+    try:
+        resumenes = ejecutar_en_paralelo(["desarrollador python"], 2, plataformas=PLATAFORMAS,
+                                         cola_ofertas=pipeline.cola_ofertas if pipeline else None)
+    finally:
+        if pipeline:
+            pipeline.cerrar()
+    fin_recoleccion = time.perf_counter() - inicio
+    en_fase_2 = limpiador.fase_2()
+    return {
+        "modo": "streaming" if streaming else "por fases",
+        "segundos": time.perf_counter() - inicio,
+        "recoleccion": fin_recoleccion,
+        "latencias": limpiador.latencias,
+        "limpiadas": limpiador.limpiadas,
+        "en_fase_2": en_fase_2,
+        "errores": [r for r in resumenes if r["estado"] != "ok"],
+        "cola_max": pipeline.max_cola if pipeline else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline streaming vs por fases")
+    parser.add_argument("--ofertas", type=int, default=300, help="Ofertas por plataforma (3 plataformas)")
+    parser.add_argument("--intervalo-ms", type=float, default=20, help="Tiempo del scraper por oferta")
+    parser.add_argument("--limpieza-ms", type=float, default=5, help="Tiempo del limpiador por oferta")
+    parser.add_argument("--latencia-ms", type=float, default=30, help="Ida y vuelta simulado a Supabase")
+    parser.add_argument("--tamano-cola", type=int, default=200)
+    args = parser.parse_args()
+
+    servidor = PostgrestFalso(args.latencia_ms)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    os.environ.update(BENCH_OFERTAS=str(args.ofertas), BENCH_INTERVALO_MS=str(args.intervalo_ms),
+                      BENCH_URL=servidor.url)
+    total = args.ofertas * len(PLATAFORMAS)
+    print(f"🧪 {len(PLATAFORMAS)} plataformas × {args.ofertas} ofertas, una cada {args.intervalo_ms:g} ms; "
+          f"limpieza {args.limpieza_ms:g} ms por oferta; Supabase falso en {servidor.url}")
+
+    try:
+        resultados = [correr(servidor, args, streaming=False), correr(servidor, args, streaming=True)]
+    finally:
+        servidor.shutdown()
+
+    print(f"\n{'modo':>10} {'segundos':>9} {'recolección':>12} {'limpiadas':>10} {'en FASE 2':>10} "
+          f"{'latencia mediana':>17} {'latencia máx':>13} {'cola máx':>9}")
+    for r in resultados:
+        print(f"{r['modo']:>10} {r['segundos']:>9.1f} {r['recoleccion']:>12.1f} {len(r['limpiadas']):>10} "
+              f"{r['en_fase_2']:>10} {statistics.median(r['latencias']):>16.1f}s {max(r['latencias']):>12.1f}s "
+              f"{r['cola_max'] if r['cola_max'] is not None else '-':>9}")
+    fases, streaming = resultados
+    print(f"⚡ Una oferta llega limpia {statistics.median(fases['latencias']) / statistics.median(streaming['latencias']):.1f}x "
+          f"antes (mediana) y la corrida termina en {streaming['segundos']:.1f} s en vez de {fases['segundos']:.1f} s")
+
+    correcto = (
+        not fases["errores"] and not streaming["errores"]
+        and len(fases["limpiadas"]) == total
+        and fases["limpiadas"] == streaming["limpiadas"]
+    )
+    print("✅ Los dos modos limpiaron exactamente las mismas ofertas" if correcto
+          else f"❌ Resultado inesperado: {len(fases['limpiadas'])} vs {len(streaming['limpiadas'])} limpiadas, "
+               f"errores {fases['errores'] + streaming['errores']}")
+    if not correcto:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Benchmark de escritura en jobs_raw: un upsert por oferta vs guardar_ofertas_crudas por lotes.
+
+Levanta un PostgREST falso local (POST /rest/v1/jobs_raw y /rest/v1/rpc/upsert_jobs_raw
+con latencia fija por petición, como el viaje de ida y vuelta a Supabase) y escribe N
+ofertas sintéticas con el cliente oficial de supabase por los dos caminos. Algunas filas
+llevan una marca que el servidor rechaza con 400, como haría Postgres con un dato
+inválido, para ejercitar la bisección: deben fallar exactamente esas y nada más.
+
+Después simula un re-scrape: el limpiador marcó todo como procesado, se vuelven a
+subir las mismas ofertas con --modificadas de ellas cambiadas, y solo esas deben
+volver a processed=False (el resto solo refresca last_seen_at).
+
+Por último el servidor rechaza todo con un JWT vencido (401 PGRST301): un error que no
+es de una fila no debe partir el lote, así que debe costar una petición por lote.
+
+Uso (desde scraper/):
+    python benchmarks/bench_upsert.py
+    python benchmarks/bench_upsert.py --ofertas 2000 --latencia-ms 80 --lote 500 --invalidas 3 --modificadas 0.1
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+_scraper_root = Path(__file__).resolve().parent.parent
+if str(_scraper_root) not in sys.path:
+    sys.path.insert(0, str(_scraper_root))
+if str(_scraper_root.parent) not in sys.path:
+    sys.path.append(str(_scraper_root.parent))
+
+# El benchmark escribe solo en el servidor falso: estos valores solo permiten importar
+# db.supabase_helper cuando no hay .env (el cliente global no se usa).
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from supabase import create_client  # noqa: E402
+
+from db.supabase_helper import guardar_ofertas_crudas, preparar_oferta_cruda  # noqa: E402
+
+MARCA_INVALIDA = "/invalida/"
+
+
+class PostgrestFalso(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latencia_ms: float):
+        super().__init__(("127.0.0.1", 0), _Manejador)
+        self.latencia_ms = latencia_ms
+        self.peticiones = 0
+        self.filas = {}
+        self.rechazar_todo = False # responde 401 PGRST301 a todo, como con un JWT vencido
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        servidor: PostgrestFalso = self.server
+        cuerpo = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"[]")
+        rpc = self.path.startswith("/rest/v1/rpc/upsert_jobs_raw")
+        filas = cuerpo["filas"] if rpc else cuerpo if isinstance(cuerpo, list) else [cuerpo]
+        time.sleep(servidor.latencia_ms / 1000)
+        with servidor._lock:
+            servidor.peticiones += 1
+            if servidor.rechazar_todo:
+                self._responder(401, {"code": "PGRST301", "message": "JWT expired", "details": None, "hint": None})
+                return
+            if any(MARCA_INVALIDA in f["url_publicacion"] for f in filas):
+                # Como Postgres: una fila inválida rechaza la sentencia completa
+                self._responder(400, {"code": "22P02", "message": "invalid input syntax for type numeric",
+                                      "details": None, "hint": None})
+                return
+            if not rpc:
+                for fila in filas:
+                    servidor.filas[fila["url_publicacion"]] = {**fila, "processed": False}
+                self._responder(201, None)
+                return
+            # Misma lógica que public.upsert_jobs_raw en db/create_tables.sql
+            estados = []
+            for fila in filas:
+                previa = servidor.filas.get(fila["url_publicacion"])
+                if previa is None:
+                    estado, processed = "nueva", False
+                elif previa.get("content_hash") in (None, fila["content_hash"]):
+                    estado, processed = "sin_cambios", previa["processed"]
+                else:
+                    estado, processed = "modificada", False
+                servidor.filas[fila["url_publicacion"]] = {**fila, "processed": processed}
+                estados.append({"url": fila["url_publicacion"], "estado": estado})
+        self._responder(200, estados)
+
+    def _responder(self, estado: int, cuerpo):
+        datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+
+def ofertas_sinteticas(n: int, invalidas: int) -> list[dict]:
+    paso = max(n // max(invalidas, 1), 1)
+    ofertas = []
+    for i in range(n):
+        ruta = MARCA_INVALIDA if invalidas and i % paso == paso // 2 and i // paso < invalidas else "/oferta/"
+        ofertas.append({
+            "plataforma": "computrabajo",
+            "rol_busqueda": "desarrollador python",
+            "fecha_publicacion": "2026-01-15 10:00:00",
+            "oferta_laboral": f"Desarrollador Python {i}",
+            "locacion": "Quito",
+            "descripcion": "Buscamos desarrollador con experiencia en Django y PostgreSQL. " * 20,
+            "sueldo": 1200 + i % 800,
+            "compania": "Empresa Demo",
+            "url_publicacion": f"https://ec.computrabajo.com{ruta}{i}",
+        })
+    return ofertas
+
+
+def modificar(ofertas: list[dict], fraccion: float) -> tuple[list[dict], set[str]]:
+    """Copia de las ofertas con una fracción de descripciones cambiadas (y el resto solo con otra fecha)."""
+    paso = max(int(1 / fraccion), 1) if fraccion else 0
+    nuevas, cambiadas = [], set()
+    for i, oferta in enumerate(ofertas):
+        copia = {**oferta, "fecha_publicacion": "2026-01-16 09:00:00"}
+        if paso and i % paso == 0:
+            copia["descripcion"] = oferta["descripcion"] + " Actualizado: ahora también Kubernetes."
+            cambiadas.add(oferta["url_publicacion"])
+        nuevas.append(copia)
+    return nuevas, cambiadas
+
+
+def una_por_una(cliente, ofertas) -> tuple[float, int]:
+    """El camino anterior (guardar_oferta_cruda en un bucle iterrows), con el cliente local."""
+    inicio = time.perf_counter()
+    exitos = 0
+    for datos in ofertas:
+        try:
+            cliente.table("jobs_raw").upsert(preparar_oferta_cruda(datos), on_conflict="url_publicacion").execute()
+            exitos += 1
+        except Exception:
+            pass
+    return time.perf_counter() - inicio, exitos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de upsert en jobs_raw: por fila vs por lotes")
+    parser.add_argument("--ofertas", type=int, default=2000)
+    parser.add_argument("--latencia-ms", type=float, default=50, help="Ida y vuelta simulado a Supabase")
+    parser.add_argument("--lote", type=int, default=500)
+    parser.add_argument("--invalidas", type=int, default=3, help="Filas que el servidor rechaza")
+    parser.add_argument("--modificadas", type=float, default=0.1, help="Fracción que cambia en el re-scrape")
+    args = parser.parse_args()
+
+    servidor = PostgrestFalso(args.latencia_ms)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    cliente = create_client(servidor.url, os.environ["SUPABASE_KEY"])
+    ofertas = ofertas_sinteticas(args.ofertas, args.invalidas)
+    esperadas_invalidas = {o["url_publicacion"] for o in ofertas if MARCA_INVALIDA in o["url_publicacion"]}
+    print(f"🧪 PostgREST falso en {servidor.url}: {args.ofertas} ofertas, {args.latencia_ms:.0f} ms por petición, "
+          f"{len(esperadas_invalidas)} inválidas")
+
+    try:
+        servidor.peticiones = 0
+        seg_fila, exitos_fila = una_por_una(cliente, ofertas)
+        pet_fila = servidor.peticiones
+
+        servidor.peticiones = 0
+        servidor.filas.clear()
+        inicio = time.perf_counter()
+        resultados = guardar_ofertas_crudas(ofertas, tamano_lote=args.lote, cliente=cliente)
+        seg_lote = time.perf_counter() - inicio
+        pet_lote = servidor.peticiones
+
+        # Re-scrape tras una pasada del limpiador
+        for fila in servidor.filas.values():
+            fila["processed"] = True
+        segunda, cambiadas = modificar(ofertas, args.modificadas)
+        cambiadas -= esperadas_invalidas
+        resultados_2 = guardar_ofertas_crudas(segunda, tamano_lote=args.lote, cliente=cliente)
+        reencoladas = {url for url, fila in servidor.filas.items() if not fila["processed"]}
+
+        servidor.rechazar_todo = True
+        servidor.peticiones = 0
+        resultados_auth = guardar_ofertas_crudas(ofertas, tamano_lote=args.lote, cliente=cliente, verbose=False)
+        pet_auth = servidor.peticiones
+    finally:
+        servidor.shutdown()
+
+    fallidas = {r.url_publicacion for r in resultados if not r.ok}
+    print(f"\n{'modo':>10} {'segundos':>9} {'peticiones':>11} {'guardadas':>10}")
+    print(f"{'por fila':>10} {seg_fila:>9.2f} {pet_fila:>11} {exitos_fila:>10}")
+    print(f"{'por lotes':>10} {seg_lote:>9.2f} {pet_lote:>11} {len(resultados) - len(fallidas):>10}")
+    print(f"⚡ {seg_fila / seg_lote:.0f}x más rápido por lotes ({args.lote} filas por petición)")
+
+    estados_2 = {}
+    for r in resultados_2:
+        estados_2[r.estado] = estados_2.get(r.estado, 0) + 1
+    print(f"🔁 Re-scrape: {estados_2} -> {len(reencoladas)} ofertas vuelven al limpiador "
+          f"(antes: {len(servidor.filas)})")
+
+    lotes = -(-(len(ofertas)) // args.lote)
+    print(f"🔒 JWT vencido: {pet_auth} peticiones para {lotes} lotes (sin partirlos)")
+
+    correcto = (
+        pet_auth == lotes
+        and not any(r.ok for r in resultados_auth)
+        and len(resultados) == len(ofertas)
+        and fallidas == esperadas_invalidas
+        and len(servidor.filas) == len(ofertas) - len(esperadas_invalidas)
+        and reencoladas == cambiadas
+    )
+    print("✅ Fallaron exactamente las filas inválidas y se guardó el resto" if correcto
+          else f"❌ Resultado inesperado: fallidas={sorted(fallidas)[:5]}")
+    if not correcto:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Servidor HTTP local que imita a ec.computrabajo.com con las páginas de
+benchmarks/fixtures/computrabajo, para probar y medir el scraper sin salir a internet.
+
+- /trabajo-de-<rol>?p=N   -> listado.html (20 ofertas) hasta --paginas, luego sin_ofertas.html
+- /ofertas-de-trabajo/... -> detalle.html
+- --latencia-ms agrega una demora fija por petición (el servidor atiende en paralelo)
+- --limite-rps responde 429 con Retry-After cuando se supera ese ritmo (ventana de 1 s)
+
+Uso (desde scraper/):
+    python benchmarks/servidor_fixtures.py --puerto 8765 --paginas 5 --latencia-ms 150
+    # y en otra terminal: RecolectorComputrabajo(...).base_url = "http://127.0.0.1:8765"
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "computrabajo"
+
+
+class ServidorFixtures(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion, paginas: int, latencia_ms: float, limite_rps: float = 0):
+        super().__init__(direccion, _Manejador)
+        self.paginas = paginas
+        self.latencia_ms = latencia_ms
+        self.limite_rps = limite_rps
+        self.retry_after = "1"
+        self.peticiones = 0
+        self.rechazadas = 0
+        self._aceptadas: deque[float] = deque()
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        self._lock = threading.Lock()
+        self.listado = (FIXTURES / "listado.html").read_text(encoding="utf-8")
+        self.sin_ofertas = (FIXTURES / "sin_ofertas.html").read_bytes()
+        self.detalle = (FIXTURES / "detalle.html").read_bytes()
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self.peticiones = self.rechazadas = self.max_en_vuelo = 0
+            self._aceptadas.clear()
+
+    def _excede_limite(self) -> bool:
+        """Cuenta la petición en la ventana de 1 s; True si hay que responder 429. Llamar con _lock."""
+        if not self.limite_rps:
+            return False
+        ahora = time.monotonic()
+        while self._aceptadas and self._aceptadas[0] < ahora - 1:
+            self._aceptadas.popleft()
+        if len(self._aceptadas) >= self.limite_rps:
+            self.rechazadas += 1
+            return True
+        self._aceptadas.append(ahora)
+        return False
+
+    def handle_error(self, request, client_address):
+        # Un cliente que corta a mitad de respuesta (corte simulado en el bench) no es un error
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como el sitio real
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        servidor: ServidorFixtures = self.server
+        with servidor._lock:
+            servidor.peticiones += 1
+            servidor.en_vuelo += 1
+            servidor.max_en_vuelo = max(servidor.max_en_vuelo, servidor.en_vuelo)
+            limitada = servidor._excede_limite()
+        try:
+            if limitada:
+                self._responder(429, b"demasiadas peticiones", {"Retry-After": servidor.retry_after})
+                return
+            if servidor.latencia_ms:
+                time.sleep(servidor.latencia_ms / 1000)
+            partes = urlsplit(self.path)
+            if partes.path.startswith("/trabajo-de-"):
+                pagina = int(parse_qs(partes.query).get("p", ["1"])[0])
+                if pagina <= servidor.paginas:
+                    cuerpo = servidor.listado.replace("{pagina}", str(pagina)).encode("utf-8")
+                else:
+                    cuerpo = servidor.sin_ofertas
+                self._responder(200, cuerpo)
+            elif partes.path.startswith("/ofertas-de-trabajo/"):
+                self._responder(200, servidor.detalle)
+            else:
+                self._responder(404, b"no encontrado")
+        finally:
+            with servidor._lock:
+                servidor.en_vuelo -= 1
+
+    def _responder(self, estado: int, cuerpo: bytes, headers: dict | None = None):
+        self.send_response(estado)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for clave, valor in (headers or {}).items():
+            self.send_header(clave, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def iniciar_servidor(paginas: int = 3, latencia_ms: float = 0, puerto: int = 0,
+                     limite_rps: float = 0) -> ServidorFixtures:
+    """Levanta el servidor en un hilo daemon; puerto 0 elige uno libre. Detener con .shutdown()."""
+    servidor = ServidorFixtures(("127.0.0.1", puerto), paginas, latencia_ms, limite_rps)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local con páginas de Computrabajo")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--paginas", type=int, default=3)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--limite-rps", type=float, default=0, help="0 = sin límite")
+    args = parser.parse_args()
+
+    servidor = ServidorFixtures(("127.0.0.1", args.puerto), args.paginas, args.latencia_ms, args.limite_rps)
+    print(f"🧪 Fixtures de Computrabajo en {servidor.url} ({args.paginas} páginas, {args.latencia_ms} ms)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
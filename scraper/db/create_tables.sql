@@ -18,7 +18,9 @@ CREATE TABLE IF NOT EXISTS public.jobs_raw (
     url_publicacion TEXT UNIQUE NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     processed BOOLEAN NOT NULL DEFAULT FALSE,
-    processed_at TIMESTAMP WITH TIME ZONE
+    processed_at TIMESTAMP WITH TIME ZONE,
+    content_hash TEXT,              -- hash de título, descripción, sueldo y compañía normalizados
+    last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()  -- última corrida que vio la oferta
 );
 
 -- Tabla 2: jobs_clean (Datos limpios con habilidades)
@@ -67,12 +69,105 @@ CREATE TABLE IF NOT EXISTS public.jobs (
 -- ALTER TABLE public.jobs_raw ADD COLUMN IF NOT EXISTS processed BOOLEAN NOT NULL DEFAULT FALSE;
 -- ALTER TABLE public.jobs_raw ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP WITH TIME ZONE;
 
+-- Si ya tenías jobs_raw sin content_hash / last_seen_at (re-scrapes sin re-procesar):
+-- ALTER TABLE public.jobs_raw ADD COLUMN IF NOT EXISTS content_hash TEXT;
+-- ALTER TABLE public.jobs_raw ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+
+-- Upsert de ofertas crudas usado por los scrapers (una llamada por lote):
+-- [{plataforma, rol_busqueda, fecha_publicacion, oferta_laboral, locacion, descripcion,
+--   sueldo, compania, url_publicacion, content_hash}, ...]
+-- Solo una oferta nueva o con content_hash distinto vuelve a processed = FALSE (y conserva la
+-- fecha nueva); las que no cambiaron solo refrescan last_seen_at. Las filas anteriores a
+-- content_hash (NULL) se toman como sin cambios para no re-procesar toda la tabla de golpe.
+-- Devuelve (url, estado) con estado 'nueva' | 'modificada' | 'sin_cambios'.
+CREATE OR REPLACE FUNCTION public.upsert_jobs_raw(filas JSONB)
+RETURNS TABLE (url TEXT, estado TEXT) AS $$
+    WITH entrada AS (
+        SELECT * FROM jsonb_to_recordset(filas) AS f(
+            plataforma TEXT, rol_busqueda TEXT, fecha_publicacion TEXT, oferta_laboral TEXT,
+            locacion TEXT, descripcion TEXT, sueldo NUMERIC, compania TEXT,
+            url_publicacion TEXT, content_hash TEXT)
+    ),
+    previas AS (
+        SELECT r.url_publicacion, r.content_hash
+        FROM public.jobs_raw r JOIN entrada e ON e.url_publicacion = r.url_publicacion
+    ),
+    escritas AS (
+        INSERT INTO public.jobs_raw AS r
+            (plataforma, rol_busqueda, fecha_publicacion, oferta_laboral, locacion, descripcion,
+             sueldo, compania, url_publicacion, content_hash, processed, last_seen_at)
+        SELECT plataforma, rol_busqueda, fecha_publicacion, oferta_laboral, locacion, descripcion,
+               sueldo, compania, url_publicacion, content_hash, FALSE, NOW()
+        FROM entrada
+        ON CONFLICT (url_publicacion) DO UPDATE SET
+            plataforma = EXCLUDED.plataforma,
+            rol_busqueda = EXCLUDED.rol_busqueda,
+            oferta_laboral = EXCLUDED.oferta_laboral,
+            locacion = EXCLUDED.locacion,
+            descripcion = EXCLUDED.descripcion,
+            sueldo = EXCLUDED.sueldo,
+            compania = EXCLUDED.compania,
+            content_hash = EXCLUDED.content_hash,
+            last_seen_at = NOW(),
+            fecha_publicacion = CASE WHEN r.content_hash IS NULL OR r.content_hash = EXCLUDED.content_hash
+                                     THEN r.fecha_publicacion ELSE EXCLUDED.fecha_publicacion END,
+            processed = CASE WHEN r.content_hash IS NULL OR r.content_hash = EXCLUDED.content_hash
+                             THEN r.processed ELSE FALSE END,
+            processed_at = CASE WHEN r.content_hash IS NULL OR r.content_hash = EXCLUDED.content_hash
+                                THEN r.processed_at ELSE NULL END
+        RETURNING r.url_publicacion
+    )
+    SELECT e.url_publicacion,
+           CASE WHEN p.url_publicacion IS NULL THEN 'nueva'
+                WHEN p.content_hash IS NULL OR p.content_hash = e.content_hash THEN 'sin_cambios'
+                ELSE 'modificada' END
+    FROM entrada e
+    JOIN escritas w ON w.url_publicacion = e.url_publicacion
+    LEFT JOIN previas p ON p.url_publicacion = e.url_publicacion;
+$$ LANGUAGE sql;
+
+-- Ofertas ya conocidas que el scraper vio de nuevo sin bajar su detalle: solo last_seen_at
+CREATE OR REPLACE FUNCTION public.marcar_vistas_jobs_raw(urls TEXT[]) RETURNS void AS $$
+    UPDATE public.jobs_raw SET last_seen_at = NOW() WHERE url_publicacion = ANY(urls);
+$$ LANGUAGE sql;
+
+-- Tabla 4: jobs_rollup_mensual (cubo mensual mantenido por el limpiador)
+-- Conteos y sumas de salario por (mes, skill, seniority, locacion). El valor '*'
+-- significa "todos" en esa dimensión, así una serie mensual se lee con ~12 filas.
+CREATE TABLE IF NOT EXISTS public.jobs_rollup_mensual (
+    mes DATE NOT NULL,          -- primer día del mes (según fecha_publicacion)
+    skill TEXT NOT NULL,
+    seniority TEXT NOT NULL,
+    locacion TEXT NOT NULL,
+    ofertas INTEGER NOT NULL DEFAULT 0,
+    salario_suma NUMERIC NOT NULL DEFAULT 0,
+    salario_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (mes, skill, seniority, locacion)
+);
+
+-- Suma incremental de deltas: [{mes, skill, seniority, locacion, ofertas, salario_suma, salario_count}, ...]
+CREATE OR REPLACE FUNCTION public.incrementar_rollup(deltas JSONB) RETURNS void AS $$
+    INSERT INTO public.jobs_rollup_mensual AS r
+        (mes, skill, seniority, locacion, ofertas, salario_suma, salario_count)
+    SELECT (d->>'mes')::date, d->>'skill', d->>'seniority', d->>'locacion',
+           (d->>'ofertas')::int, (d->>'salario_suma')::numeric, (d->>'salario_count')::int
+    FROM jsonb_array_elements(deltas) AS d
+    ON CONFLICT (mes, skill, seniority, locacion) DO UPDATE SET
+        ofertas = r.ofertas + EXCLUDED.ofertas,
+        salario_suma = r.salario_suma + EXCLUDED.salario_suma,
+        salario_count = r.salario_count + EXCLUDED.salario_count,
+        updated_at = NOW();
+$$ LANGUAGE sql;
+
 -- Índices para mejorar el rendimiento
 CREATE INDEX IF NOT EXISTS idx_jobs_raw_url ON public.jobs_raw(url_publicacion);
 CREATE INDEX IF NOT EXISTS idx_jobs_raw_processed ON public.jobs_raw(processed);
+CREATE INDEX IF NOT EXISTS idx_jobs_raw_plataforma_visto ON public.jobs_raw(plataforma, last_seen_at);
 CREATE INDEX IF NOT EXISTS idx_jobs_clean_url ON public.jobs_clean(url_publicacion);
 CREATE INDEX IF NOT EXISTS idx_jobs_url ON public.jobs(url_publicacion);
 CREATE INDEX IF NOT EXISTS idx_jobs_embedding ON public.jobs USING ivfflat (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_rollup_serie ON public.jobs_rollup_mensual(skill, seniority, locacion, mes);
 
 -- Habilitar Row Level Security (RLS) si es necesario
 -- ALTER TABLE public.jobs_raw ENABLE ROW LEVEL SECURITY;
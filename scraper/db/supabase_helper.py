@@ -2,12 +2,16 @@
 Helper para conexión a Supabase - Producción Blindada.
 Carga variables desde .env en la raíz del proyecto.
 """
+import hashlib
 import os
 import re
+import time
 from pathlib import Path
+from typing import NamedTuple
 
 import pandas as pd
 from dotenv import load_dotenv
+from postgrest import APIError, ReturnMethod
 from supabase import create_client, Client
 
 # Cargar .env desde la raíz del proyecto (no desde scraper/db/)
@@ -56,36 +60,192 @@ def limpiar_valor_para_supabase(value, campo_tipo='text'):
     
     return str(value).strip() if value else ''
 
+def preparar_oferta_cruda(datos):
+    """Diccionario limpio listo para jobs_raw; None si no trae URL (no se puede guardar)."""
+    # Preparamos el diccionario limpio para la base de datos
+    datos_limpios = {
+        'plataforma': limpiar_valor_para_supabase(datos.get('plataforma'), 'text') or 'desconocida',
+        'rol_busqueda': limpiar_valor_para_supabase(datos.get('rol_busqueda'), 'text') or '',
+        'fecha_publicacion': limpiar_valor_para_supabase(datos.get('fecha_publicacion'), 'text') or '',
+        'oferta_laboral': limpiar_valor_para_supabase(datos.get('oferta_laboral'), 'text') or 'Sin Título',
+        'locacion': limpiar_valor_para_supabase(datos.get('locacion'), 'text') or 'Ecuador',
+        'descripcion': limpiar_valor_para_supabase(datos.get('descripcion'), 'text') or '',
+        'sueldo': limpiar_valor_para_supabase(datos.get('sueldo'), 'numeric'),
+        'compania': limpiar_valor_para_supabase(datos.get('compania'), 'text') or 'Confidencial',
+        'url_publicacion': limpiar_valor_para_supabase(datos.get('url_publicacion'), 'text') or '',
+        # Importante: Marcamos como procesado = False para que la IA la limpie después
+        # (upsert_jobs_raw solo lo aplica si la oferta es nueva o cambió su content_hash)
+        'processed': False 
+    }
+
+    # Validación mínima: Si no hay URL, no podemos guardarlo
+    if not datos_limpios['url_publicacion']:
+        return None
+    datos_limpios['content_hash'] = hash_contenido(datos_limpios)
+    return datos_limpios
+
+def _normalizar_para_hash(valor):
+    return re.sub(r'\s+', ' ', str(valor or '')).strip().lower()
+
+def hash_contenido(datos_limpios):
+    """
+    Hash de lo que procesa el limpiador: título, descripción, sueldo y compañía normalizados.
+    La fecha (Computrabajo la calcula desde "hace N horas"), el rol y la locación no cuentan.
+    """
+    sueldo = datos_limpios.get('sueldo')
+    partes = [
+        _normalizar_para_hash(datos_limpios.get('oferta_laboral')),
+        _normalizar_para_hash(datos_limpios.get('descripcion')),
+        f"{sueldo:.2f}" if sueldo is not None else '',
+        _normalizar_para_hash(datos_limpios.get('compania')),
+    ]
+    return hashlib.blake2b("\x1f".join(partes).encode('utf-8'), digest_size=16).hexdigest()
+
 def guardar_oferta_cruda(datos):
-    """Guarda una oferta cruda en la tabla jobs_raw usando UPSERT"""
-    try:
-        # Preparamos el diccionario limpio para la base de datos
-        datos_limpios = {
-            'plataforma': limpiar_valor_para_supabase(datos.get('plataforma'), 'text') or 'desconocida',
-            'rol_busqueda': limpiar_valor_para_supabase(datos.get('rol_busqueda'), 'text') or '',
-            'fecha_publicacion': limpiar_valor_para_supabase(datos.get('fecha_publicacion'), 'text') or '',
-            'oferta_laboral': limpiar_valor_para_supabase(datos.get('oferta_laboral'), 'text') or 'Sin Título',
-            'locacion': limpiar_valor_para_supabase(datos.get('locacion'), 'text') or 'Ecuador',
-            'descripcion': limpiar_valor_para_supabase(datos.get('descripcion'), 'text') or '',
-            'sueldo': limpiar_valor_para_supabase(datos.get('sueldo'), 'numeric'),
-            'compania': limpiar_valor_para_supabase(datos.get('compania'), 'text') or 'Confidencial',
-            'url_publicacion': limpiar_valor_para_supabase(datos.get('url_publicacion'), 'text') or '',
-            # Importante: Marcamos como procesado = False para que la IA la limpie después
-            'processed': False 
-        }
-        
-        # Validación mínima: Si no hay URL, no podemos guardarlo
-        if not datos_limpios['url_publicacion']:
-            return False
-        
-        # UPSERT: Si la URL ya existe, actualiza los datos. Si no, crea la fila.
-        supabase.table('jobs_raw').upsert(
-            datos_limpios, 
-            on_conflict='url_publicacion'
-        ).execute()
-        
-        return True
+    """Guarda una oferta cruda en la tabla jobs_raw usando UPSERT (ver guardar_ofertas_crudas)"""
+    resultado = guardar_ofertas_crudas([datos], verbose=False)[0]
+    if not resultado.ok:
+        print(f"⚠️ Error en Supabase Helper: {resultado.error}")
+    return resultado.ok
+
+# =============================================================================
+# 📦 UPSERT POR LOTES
+# =============================================================================
+TAMANO_LOTE_UPSERT = int(os.getenv("SCRAPER_LOTE_UPSERT", "500"))
+
+_RPC_UPSERT = True # False si la base todavía no tiene la función upsert_jobs_raw
+
+class ResultadoUpsert(NamedTuple):
+    url_publicacion: str
+    ok: bool
+    error: str | None = None
+    estado: str | None = None # 'nueva' | 'modificada' | 'sin_cambios' (None sin upsert_jobs_raw)
+
+def _enviar_lote(cliente, filas):
+    """
+    Un lote a jobs_raw vía la función upsert_jobs_raw (solo re-encola las ofertas nuevas o
+    modificadas). Devuelve {url: estado}. Si la migración no se aplicó todavía, cae al
+    upsert plano de antes, que deja todo en processed=False.
+    """
+    global _RPC_UPSERT
+    if _RPC_UPSERT:
+        try:
+            response = cliente.rpc('upsert_jobs_raw', {'filas': filas}).execute()
+            return {fila['url']: fila['estado'] for fila in response.data or []}
+        except APIError as e:
+            if e.code != 'PGRST202':
+                raise
+            _RPC_UPSERT = False
+            print("⚠️ Falta la función upsert_jobs_raw (ver db/create_tables.sql): "
+                  "upsert plano, todas las ofertas vuelven a processed=False")
+    cliente.table('jobs_raw').upsert(
+        [{k: v for k, v in fila.items() if k != 'content_hash'} for fila in filas],
+        on_conflict='url_publicacion',
+        returning=ReturnMethod.minimal,
+    ).execute()
+    return {}
 
-    except Exception as e:
-        print(f"⚠️ Error en Supabase Helper: {str(e)[:100]}")
-        return False
\ No newline at end of file
+# SQLSTATE de datos inválidos (22: valor fuera de rango, formato...; 23: NOT NULL, CHECK,
+# claves): los causa una fila concreta y vale la pena aislarla partiendo el lote
+_CLASES_ERROR_DE_FILA = ('22', '23')
+
+def _es_error_de_fila(e: APIError) -> bool:
+    return str(e.code or '')[:2] in _CLASES_ERROR_DE_FILA
+
+def _fallar_lote(filas, resultados, error):
+    for i, fila in filas:
+        resultados[i] = ResultadoUpsert(fila['url_publicacion'], False, error)
+
+def _upsert_lote(cliente, filas, resultados, stats):
+    """
+    Un upsert para todo el lote. Si Postgres lo rechaza por datos inválidos (una fila
+    mala tumba el lote entero) se parte en mitades hasta aislar la(s) fila(s) culpables.
+    Cualquier otro rechazo (JWT vencido, RLS/permisos, statement timeout) fallaría igual
+    en cada mitad: falla el lote completo de una. Un error de red se reintenta una vez
+    y, si persiste, también falla el lote completo sin partirlo.
+    """
+    for _ in range(2):
+        stats['llamadas'] += 1
+        try:
+            estados = _enviar_lote(cliente, [fila for _, fila in filas])
+            for i, fila in filas:
+                url = fila['url_publicacion']
+                resultados[i] = ResultadoUpsert(url, True, estado=estados.get(url))
+            return
+        except APIError as e:
+            if not _es_error_de_fila(e):
+                _fallar_lote(filas, resultados, f"{e.code}: {e.message or e}"[:200])
+                return
+            if len(filas) == 1:
+                i, fila = filas[0]
+                resultados[i] = ResultadoUpsert(fila['url_publicacion'], False, str(e.message or e)[:200])
+                return
+            mitad = len(filas) // 2
+            _upsert_lote(cliente, filas[:mitad], resultados, stats)
+            _upsert_lote(cliente, filas[mitad:], resultados, stats)
+            return
+        except Exception as e:
+            error = str(e)[:200]
+    _fallar_lote(filas, resultados, error)
+
+def guardar_ofertas_crudas(ofertas, tamano_lote: int | None = None, cliente=None,
+                           verbose: bool = True) -> list[ResultadoUpsert]:
+    """
+    UPSERT masivo en jobs_raw (on_conflict='url_publicacion'), en lotes de
+    SCRAPER_LOTE_UPSERT filas: una petición HTTP por lote en vez de una por oferta.
+
+    Una oferta ya guardada solo vuelve a processed=False (Groq + embedding) si cambió su
+    content_hash; si no, solo se refresca last_seen_at.
+
+    Devuelve un ResultadoUpsert por oferta, en el mismo orden de entrada. Las URLs
+    repetidas se mandan una sola vez (gana la última, como con upserts sueltos;
+    Postgres no acepta la misma clave dos veces en un mismo upsert).
+    """
+    cliente = cliente or supabase
+    tamano_lote = tamano_lote or TAMANO_LOTE_UPSERT
+    ofertas = list(ofertas)
+    resultados: list[ResultadoUpsert | None] = [None] * len(ofertas)
+
+    preparadas = [preparar_oferta_cruda(datos) for datos in ofertas]
+    ultima_por_url = {fila['url_publicacion']: i for i, fila in enumerate(preparadas) if fila is not None}
+    filas = [(i, preparadas[i]) for i in sorted(ultima_por_url.values())]
+
+    stats = {'llamadas': 0}
+    inicio = time.perf_counter()
+    for k in range(0, len(filas), tamano_lote):
+        _upsert_lote(cliente, filas[k:k + tamano_lote], resultados, stats)
+
+    for i, fila in enumerate(preparadas):
+        if fila is None:
+            resultados[i] = ResultadoUpsert('', False, 'sin url_publicacion')
+        elif resultados[i] is None:
+            # Duplicada: corre la suerte de la última aparición, que es la que se mandó
+            resultados[i] = resultados[ultima_por_url[fila['url_publicacion']]]
+
+    if not verbose:
+        return resultados
+    fallidas = [r for r in resultados if not r.ok]
+    guardadas = sum(1 for i, _ in filas if resultados[i].ok)
+    estados = {}
+    for i, _ in filas:
+        if resultados[i].estado:
+            estados[resultados[i].estado] = estados.get(resultados[i].estado, 0) + 1
+    detalle = ", ".join(f"{n} {estado.replace('_', ' ')}" for estado, n in sorted(estados.items()))
+    print(f"📦 jobs_raw: {guardadas}/{len(filas)} filas en "
+          f"{stats['llamadas']} peticiones ({time.perf_counter() - inicio:.2f} s)"
+          + (f" [{detalle}]" if detalle else "")
+          + (f", {len(fallidas)} con error" if fallidas else ""))
+    for r in fallidas[:5]:
+        print(f"   ⚠️ {r.url_publicacion or '(sin url)'}: {r.error}")
+    return resultados
+
+def marcar_vistas(urls, cliente=None, tamano_lote: int = 1000):
+    """Refresca last_seen_at de ofertas que la corrida vio pero no re-subió (ver urls_conocidas)."""
+    cliente = cliente or supabase
+    urls = list(urls)
+    for k in range(0, len(urls), tamano_lote):
+        try:
+            cliente.rpc('marcar_vistas_jobs_raw', {'urls': urls[k:k + tamano_lote]}).execute()
+        except Exception as e:
+            print(f"⚠️ No se pudo refrescar last_seen_at: {str(e)[:100]}")
+            return
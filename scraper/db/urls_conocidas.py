@@ -0,0 +1,135 @@
+"""
+URLs de ofertas que ya están en jobs_raw, para no volver a descargar su detalle.
+
+Al arrancar, cada scraper carga las url_publicacion de su plataforma guardadas en
+la ventana de la corrida (scrape_days + SCRAPER_MARGEN_CONOCIDAS_DIAS). Si son
+muchas (más de SCRAPER_BLOOM_DESDE) se guardan en un filtro de Bloom en vez de un set:
+pesa ~1.2 bytes por URL en vez de ~100, y sus falsos positivos (≈1%) se confirman
+contra la base antes de saltarse una oferta, así que ninguna oferta nueva se pierde.
+
+Si la carga falla, el set queda vacío y se descargan todos los detalles, como antes.
+"""
+import hashlib
+import math
+import os
+from datetime import datetime, timedelta, timezone
+
+from db.supabase_helper import supabase
+
+MARGEN_DIAS = int(os.getenv("SCRAPER_MARGEN_CONOCIDAS_DIAS", "7"))
+BLOOM_DESDE = int(os.getenv("SCRAPER_BLOOM_DESDE", "200000"))
+BLOOM_ERROR = 0.01
+PAGINA = 1000       # máximo de filas por select en Supabase
+LOTE_CONFIRMAR = 25 # URLs por .in_() para no exceder el largo de la URL
+
+
+class FiltroBloom:
+    def __init__(self, capacidad: int, error: float = BLOOM_ERROR):
+        capacidad = max(capacidad, 1)
+        self.bits = max(8, int(-capacidad * math.log(error) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacidad * math.log(2)))
+        self._tabla = bytearray((self.bits + 7) // 8)
+
+    def _posiciones(self, valor: str):
+        # Doble hashing (Kirsch-Mitzenmacher) sobre un solo blake2b de 16 bytes
+        digest = hashlib.blake2b(valor.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def agregar(self, valor: str):
+        for pos in self._posiciones(valor):
+            self._tabla[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, valor: str) -> bool:
+        return all(self._tabla[pos >> 3] & (1 << (pos & 7)) for pos in self._posiciones(valor))
+
+    @property
+    def tamano_bytes(self) -> int:
+        return len(self._tabla)
+
+
+class UrlsConocidas:
+    def __init__(self, plataforma: str, urls=None, bloom: FiltroBloom | None = None):
+        self.plataforma = plataforma
+        self._urls: set[str] = set(urls or ())
+        self._bloom = bloom
+        self.total = len(self._urls)
+        self.evitadas = 0
+        self.confirmaciones = 0
+        self.vistas: set[str] = set() # conocidas que aparecieron en esta corrida (para last_seen_at)
+
+    def _confirmar(self, urls: list[str]) -> set[str]:
+        """Positivos del Bloom que de verdad están en jobs_raw. Ante un error, ninguno (se descargan)."""
+        existentes: set[str] = set()
+        for k in range(0, len(urls), LOTE_CONFIRMAR):
+            self.confirmaciones += 1
+            try:
+                response = supabase.table('jobs_raw').select('url_publicacion').in_(
+                    'url_publicacion', urls[k:k + LOTE_CONFIRMAR]).execute()
+                existentes.update(row['url_publicacion'] for row in response.data or [])
+            except Exception as e:
+                print(f"⚠️ No se pudieron confirmar URLs conocidas: {str(e)[:100]}")
+                return set()
+        return existentes
+
+    def conocidas(self, urls) -> set[str]:
+        """Subconjunto de `urls` que ya está en jobs_raw; suma al contador de detalles evitados."""
+        if self._bloom is not None:
+            candidatas = [u for u in urls if u in self._bloom]
+            encontradas = self._confirmar(candidatas) if candidatas else set()
+        else:
+            encontradas = {u for u in urls if u in self._urls}
+        self.evitadas += len(encontradas)
+        self.vistas.update(encontradas)
+        return encontradas
+
+    def resumen(self) -> str:
+        modo = f"Bloom {self._bloom.tamano_bytes / 1e3:.0f} KB, {self.confirmaciones} consultas" if self._bloom else "set"
+        return f"{self.evitadas} detalles evitados (ya en jobs_raw; {self.total} URLs conocidas, {modo})"
+
+
+def _cargar(plataforma: str, columna: str, desde: str) -> UrlsConocidas:
+    def consulta(inicio: int, contar: bool = False):
+        return supabase.table('jobs_raw').select('url_publicacion', count='exact' if contar else None).eq(
+            'plataforma', plataforma).gte(columna, desde).order('id').range(inicio, inicio + PAGINA - 1).execute()
+
+    response = consulta(0, contar=True)
+    total = response.count or len(response.data or [])
+    bloom = FiltroBloom(total) if total > BLOOM_DESDE else None
+    conocidas = UrlsConocidas(plataforma, bloom=bloom)
+    inicio = 0
+    while True:
+        filas = response.data or []
+        for fila in filas:
+            if bloom is not None:
+                bloom.agregar(fila['url_publicacion'])
+            else:
+                conocidas._urls.add(fila['url_publicacion'])
+        if len(filas) < PAGINA:
+            break
+        inicio += PAGINA
+        response = consulta(inicio)
+    conocidas.total = total
+    return conocidas
+
+
+def cargar_urls_conocidas(plataforma: str, scrape_days: int) -> UrlsConocidas:
+    """
+    url_publicacion de la plataforma vistas en la ventana de la corrida. Se filtra por
+    last_seen_at (una oferta que sigue publicada semanas después sigue siendo conocida);
+    sin esa columna (migración pendiente), por created_at.
+    """
+    desde = (datetime.now(timezone.utc) - timedelta(days=scrape_days + MARGEN_DIAS)).isoformat()
+    for columna in ('last_seen_at', 'created_at'):
+        try:
+            conocidas = _cargar(plataforma, columna, desde)
+            break
+        except Exception as e:
+            error = str(e)[:100]
+    else:
+        print(f"⚠️ No se pudieron cargar las URLs conocidas de {plataforma}; se descargarán todos los detalles: {error}")
+        return UrlsConocidas(plataforma)
+
+    print(f"🗂️ {plataforma.upper()}: {conocidas.total} URLs ya en jobs_raw (vistas en los últimos {scrape_days + MARGEN_DIAS} días)")
+    return conocidas
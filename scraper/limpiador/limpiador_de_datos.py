@@ -13,12 +13,18 @@ if str(_scraper_root) not in sys.path:
     sys.path.insert(0, str(_scraper_root))
 
 _PROJECT_ROOT = _scraper_root.parent
+# Paquete compartido con el backend (comun/skills.py)
+if str(_PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(_PROJECT_ROOT))
 from dotenv import load_dotenv
 
 load_dotenv(_PROJECT_ROOT / ".env")
 
 from pydantic import BaseModel, Field
 from db.supabase_helper import supabase
+from comun.skills import SkillMatcher
+from comun.modelo_embeddings import kwargs_modelo, mapear_pesos, ruta_modelo
+from limpiador.rollup import actualizar_rollup
 from langchain_groq import ChatGroq
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
@@ -62,6 +68,38 @@ def extraer_sueldo_numerico(valor: str | int | float | None) -> Optional[float]:
     return sum(numeros_limpios) / len(numeros_limpios)  # promedio si hay rango
 
 
+def cargar_vocabulario_skills() -> set[str]:
+    """Habilidades distintas ya presentes en jobs_clean (vocabulario del diccionario)."""
+    vocabulario: set[str] = set()
+    try:
+        response = supabase.table('jobs_clean').select('habilidades').execute()
+        for row in response.data or []:
+            for h in str(row.get('habilidades') or '').split(','):
+                if h.strip():
+                    vocabulario.add(h.strip().upper())
+    except Exception as e:
+        print(f"⚠️ No se pudo cargar el vocabulario de skills: {e}")
+    return vocabulario
+
+
+def filas_en_jobs_clean(urls: list[str], chunk_size: int = 25) -> dict[str, dict] | None:
+    """
+    Filas de jobs_clean de las URLs de la lista, con las columnas que cuenta el rollup
+    (en bloques para no exceder el largo de URL). Retorna None si no se pudo verificar.
+    """
+    existentes: dict[str, dict] = {}
+    for k in range(0, len(urls), chunk_size):
+        try:
+            response = supabase.table('jobs_clean').select(
+                'url_publicacion, fecha_publicacion, seniority, locacion, sueldo, habilidades'
+            ).in_('url_publicacion', urls[k:k + chunk_size]).execute()
+            existentes.update((row['url_publicacion'], row) for row in response.data or [])
+        except Exception as e:
+            print(f"⚠️ No se pudo verificar URLs existentes en jobs_clean: {e}")
+            return None
+    return existentes
+
+
 # =============================================================================
 # 🧠 MODELO DE DATOS
 # =============================================================================
@@ -96,13 +134,22 @@ class JobAIProcessor:
 
         # --- Embeddings: HuggingFace sentence-transformers (local, gratuito) ---
         # all-MiniLM-L6-v2 es el modelo estándar: rápido, ligero (90MB), muy buena calidad.
-        # Se descarga automáticamente la primera vez (~5 seg).
+        # En la imagen Docker viene empaquetado (sin red al arrancar); fuera de Docker
+        # se descarga del hub la primera vez (~5 seg).
         # Genera vectores de 384 dimensiones.
+        ruta = ruta_modelo()
         self.embeddings_model = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={"device": "cpu"},          # "cuda" si tienes GPU
+            model_name=ruta,
+            model_kwargs=kwargs_modelo("cpu"),        # "cuda" si tienes GPU
             encode_kwargs={"normalize_embeddings": True},  # Normalizar mejora coseno similarity
         )
+        mapear_pesos(self.embeddings_model._client, ruta)
+
+        # --- Diccionario de skills (Aho-Corasick) construido desde jobs_clean ---
+        # Extracción barata previa al LLM: se pasa como pista en el prompt y sirve
+        # de respaldo si Groq falla.
+        self.skill_matcher = SkillMatcher(cargar_vocabulario_skills())
+        print(f"📚 Diccionario de skills: {len(self.skill_matcher)} habilidades conocidas.")
 
         # Configuración del parser
         self.parser = PydanticOutputParser(pydantic_object=JobAnalysis)
@@ -118,21 +165,34 @@ class JobAIProcessor:
              "3. Si hay un rango ($1000 - $2000), calcula el PROMEDIO (1500).\n"
              "4. Tu objetivo es devolver siempre el estimado MENSUAL en USD.\n"
              "NO incluyas texto introductorio ni explicaciones, solo el JSON raw. "
-             "Ignora ofertas que no sean del rubro tecnológico. \n{format_instructions}"),
-            ("human", "Analiza la siguiente oferta:\nTITULO: {titulo}\nDESCRIPCIÓN: {descripcion}")
+             "Ignora ofertas que no sean del rubro tecnológico. "
+             "Se te da una lista de skills detectadas por diccionario: úsala como punto de partida, "
+             "descarta las que no apliquen y agrega las que falten.\n{format_instructions}"),
+            ("human", "Analiza la siguiente oferta:\nTITULO: {titulo}\nDESCRIPCIÓN: {descripcion}\n"
+                      "SKILLS DETECTADAS POR DICCIONARIO: {skills_detectadas}")
         ]).partial(format_instructions=self.parser.get_format_instructions())
 
         self.chain = self.prompt | self.llm | self.parser
 
     def analizar_oferta(self, titulo: str, descripcion: str) -> JobAnalysis:
         """Envía el texto a Groq y retorna un objeto estructurado."""
+        skills_detectadas = self.skill_matcher.buscar(f"{titulo} {descripcion}")
         try:
-            return self.chain.invoke({"titulo": titulo, "descripcion": descripcion})
+            analisis = self.chain.invoke({
+                "titulo": titulo,
+                "descripcion": descripcion,
+                "skills_detectadas": ", ".join(skills_detectadas) or "ninguna",
+            })
+            # Misma forma canónica que usa el backend (alias: REACTJS -> REACT)
+            analisis.skills = list(dict.fromkeys(
+                self.skill_matcher.canonico(s) for s in analisis.skills if s and s.strip()
+            ))
+            return analisis
         except Exception as e:
             print(f"⚠️ Error analizando oferta '{titulo}' con Groq: {e}")
             return JobAnalysis(
                 es_oferta_valida_tech=False,
-                skills=[],
+                skills=skills_detectadas,
                 seniority="No especificado",
                 sueldo_normalizado="No especificado",
                 ubicacion_tipo="No especificado",
@@ -148,6 +208,115 @@ class JobAIProcessor:
             print(f"⚠️ Error generando embedding: {e}")
             return []
 
+def procesar_lote(processor, data_final, etiqueta: str = "Lote") -> int:
+    """
+    Analiza (Groq), vectoriza y guarda en jobs_clean un lote de filas de jobs_raw, y
+    marca todas como procesadas. Lo usan el bucle por lotes de ejecutar_limpieza_ia y
+    la etapa de limpieza del pipeline en streaming. Devuelve cuántas quedaron marcadas.
+    """
+    resultados = []
+    ids_vistos = set()
+    
+    # --- PROCESAMIENTO DEL LOTE ---
+    for i, item in enumerate(data_final):
+        url = item.get("url_publicacion", "")
+        if not url or url in ids_vistos:
+            continue
+
+        titulo = item.get("oferta_laboral", "Sin Título")
+        descripcion = item.get("descripcion", "")
+
+        # A. ANÁLISIS IA
+        analisis = processor.analizar_oferta(titulo, descripcion)
+
+        # B. FILTRO
+        if not analisis.es_oferta_valida_tech:
+            print(f"   🚫 Filtrada: {titulo[:40]}...")
+            # IMPORTANTE: Igual debemos marcarla como procesada en jobs_raw para no leerla de nuevo
+            # La agregamos a una lista de "descartados" para actualizar su estado al final del lote?
+            # Para simplificar, actualizaremos 'processed=True' incluso si no entra a jobs_clean
+            # (Lo haremos abajo en el bloque de actualización masiva)
+        else:
+            # C. EMBEDDING
+            texto_a_vectorizar = f"{titulo} {descripcion[:500]} {' '.join(analisis.skills)}"
+            vector = processor.generar_embedding(texto_a_vectorizar)
+
+            if vector:
+                # D. PREPARAR REGISTRO
+                texto_sueldo = (
+                    analisis.sueldo_normalizado
+                    if analisis.sueldo_normalizado != "No especificado"
+                    else str(item.get("sueldo", "") or "")
+                )
+                sueldo_num = extraer_sueldo_numerico(texto_sueldo)
+
+                registro = {
+                    "plataforma": item.get("plataforma", ""),
+                    "rol_busqueda": item.get("rol_busqueda", ""),
+                    "fecha_publicacion": item.get("fecha_publicacion", ""),
+                    "oferta_laboral": titulo,
+                    "locacion": item.get("locacion", "Ecuador"),
+                    "descripcion": descripcion,
+                    "sueldo": sueldo_num,
+                    "compania": item.get("compania", "Confidencial"),
+                    "habilidades": ", ".join(analisis.skills),
+                    "seniority": analisis.seniority,
+                    "url_publicacion": url,
+                    "embedding": vector,
+                }
+                resultados.append(registro)
+        
+        ids_vistos.add(url) # Agregamos al set para evitar duplicados en este lote
+        
+        # Feedback visual
+        if (i + 1) % 10 == 0:
+            print(f"   ⏳ {etiqueta}: {i + 1}/{len(data_final)} analizados...")
+
+    # --- GUARDADO DEL LOTE ---
+    if resultados:
+        print(f"💾 Guardando {len(resultados)} ofertas VALIDAS en 'jobs_clean'...")
+        # Se leen antes del upsert: una oferta modificada resta su versión anterior del rollup
+        filas_existentes = filas_en_jobs_clean([r["url_publicacion"] for r in resultados])
+        guardados = []
+        anteriores = []
+        for registro in resultados:
+            try:
+                supabase.table('jobs_clean').upsert(registro, on_conflict='url_publicacion').execute()
+                guardados.append(registro)
+                if filas_existentes and registro["url_publicacion"] in filas_existentes:
+                    anteriores.append(filas_existentes[registro["url_publicacion"]])
+            except Exception as e:
+                pass # Ignorar errores puntuales de guardado
+        if filas_existentes is None:
+            # Sin verificación no tocamos el rollup (podría contar dos veces), pero que se note
+            print(f"   ⚠️ Rollup mensual: {len(guardados)} ofertas sin contar; "
+                  f"corre 'python limpiador/rollup.py --reconstruir' para ponerlo al día.")
+        else:
+            actualizar_rollup(guardados, anteriores)
+
+    # --- MARCADO FINAL (CRÍTICO PARA QUE EL BUCLE AVANCE) ---
+    # Marcamos TODAS las ofertas de este lote (validas y no validas) como procesadas
+    # para que en la siguiente vuelta del While NO las vuelva a traer.
+    urls_lote = [item.get("url_publicacion") for item in data_final if item.get("url_publicacion")]
+    
+    # --- MARCADO FINAL (SÚPER SEGURO) ---
+    if urls_lote:
+        chunk_size = 25 # Bajamos a 25 para evitar el Bad Request por URL larga
+        for k in range(0, len(urls_lote), chunk_size):
+            chunk_urls = urls_lote[k:k + chunk_size]
+            try:
+                # Usamos UTC para el timestamp
+                now_utc = datetime.now(timezone.utc).isoformat()
+                supabase.table('jobs_raw').update({
+                    'processed': True,
+                    'processed_at': now_utc
+                }).in_('url_publicacion', chunk_urls).execute()
+                print(f"   ✅ Marcados {len(chunk_urls)} como procesados.")
+            except Exception as e:
+                print(f"   ⚠️ Error grave marcando procesados: {e}")
+    return len(urls_lote)
+
+
 # =============================================================================
 # 🚀 EJECUCIÓN PRINCIPAL
 # =============================================================================
@@ -185,94 +354,7 @@ def ejecutar_limpieza_ia():
 
         print(f"⚡ Procesando lote de {len(data_final)} ofertas...")
 
-        resultados = []
-        ids_vistos = set()
-        
-        # --- PROCESAMIENTO DEL LOTE ---
-        for i, item in enumerate(data_final):
-            url = item.get("url_publicacion", "")
-            if not url or url in ids_vistos:
-                continue
-
-            titulo = item.get("oferta_laboral", "Sin Título")
-            descripcion = item.get("descripcion", "")
-
-            # A. ANÁLISIS IA
-            analisis = processor.analizar_oferta(titulo, descripcion)
-
-            # B. FILTRO
-            if not analisis.es_oferta_valida_tech:
-                print(f"   🚫 Filtrada: {titulo[:40]}...")
-                # IMPORTANTE: Igual debemos marcarla como procesada en jobs_raw para no leerla de nuevo
-                # La agregamos a una lista de "descartados" para actualizar su estado al final del lote?
-                # Para simplificar, actualizaremos 'processed=True' incluso si no entra a jobs_clean
-                # (Lo haremos abajo en el bloque de actualización masiva)
-            else:
-                # C. EMBEDDING
-                texto_a_vectorizar = f"{titulo} {descripcion[:500]} {' '.join(analisis.skills)}"
-                vector = processor.generar_embedding(texto_a_vectorizar)
-
-                if vector:
-                    # D. PREPARAR REGISTRO
-                    texto_sueldo = (
-                        analisis.sueldo_normalizado
-                        if analisis.sueldo_normalizado != "No especificado"
-                        else str(item.get("sueldo", "") or "")
-                    )
-                    sueldo_num = extraer_sueldo_numerico(texto_sueldo)
-
-                    registro = {
-                        "plataforma": item.get("plataforma", ""),
-                        "rol_busqueda": item.get("rol_busqueda", ""),
-                        "fecha_publicacion": item.get("fecha_publicacion", ""),
-                        "oferta_laboral": titulo,
-                        "locacion": item.get("locacion", "Ecuador"),
-                        "descripcion": descripcion,
-                        "sueldo": sueldo_num,
-                        "compania": item.get("compania", "Confidencial"),
-                        "habilidades": ", ".join(analisis.skills),
-                        "seniority": analisis.seniority,
-                        "url_publicacion": url,
-                        "embedding": vector,
-                    }
-                    resultados.append(registro)
-            
-            ids_vistos.add(url) # Agregamos al set para evitar duplicados en este lote
-            
-            # Feedback visual
-            if (i + 1) % 10 == 0:
-                print(f"   ⏳ Lote {ciclo}: {i + 1}/{len(data_final)} analizados...")
-
-        # --- GUARDADO DEL LOTE ---
-        if resultados:
-            print(f"💾 Guardando {len(resultados)} ofertas VALIDAS en 'jobs_clean'...")
-            for registro in resultados:
-                try:
-                    supabase.table('jobs_clean').upsert(registro, on_conflict='url_publicacion').execute()
-                except Exception as e:
-                    pass # Ignorar errores puntuales de guardado
-
-        # --- MARCADO FINAL (CRÍTICO PARA QUE EL BUCLE AVANCE) ---
-        # Marcamos TODAS las ofertas de este lote (validas y no validas) como procesadas
-        # para que en la siguiente vuelta del While NO las vuelva a traer.
-        urls_lote = [item.get("url_publicacion") for item in data_final if item.get("url_publicacion")]
-        
-        # --- MARCADO FINAL (SÚPER SEGURO) ---
-        if urls_lote:
-            chunk_size = 25 # Bajamos a 25 para evitar el Bad Request por URL larga
-            for k in range(0, len(urls_lote), chunk_size):
-                chunk_urls = urls_lote[k:k + chunk_size]
-                try:
-                    # Usamos UTC para el timestamp
-                    now_utc = datetime.now(timezone.utc).isoformat()
-                    supabase.table('jobs_raw').update({
-                        'processed': True,
-                        'processed_at': now_utc
-                    }).in_('url_publicacion', chunk_urls).execute()
-                    print(f"   ✅ Marcados {len(chunk_urls)} como procesados.")
-                except Exception as e:
-                    print(f"   ⚠️ Error grave marcando procesados: {e}")
-            total_procesados_global += len(urls_lote)
+        total_procesados_global += procesar_lote(processor, data_final, etiqueta=f"Lote {ciclo}")
         
         ciclo += 1
         # Fin del While, vuelve arriba a cargar los siguientes 1000
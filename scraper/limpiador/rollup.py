@@ -0,0 +1,149 @@
+"""
+Cubo mensual de ofertas (jobs_rollup_mensual) mantenido de forma incremental.
+
+Cada oferta nueva en jobs_clean suma 1 oferta (y su sueldo, si tiene) en todas las
+combinaciones de (skill | '*') x (seniority | '*') x (locacion | '*') de su mes.
+Una oferta modificada que se vuelve a limpiar resta sus celdas anteriores y suma las
+nuevas. El backend lee de aquí las tendencias y variaciones mes a mes sin escanear
+jobs_clean.
+
+Reconstrucción completa (p. ej. tras crear la tabla):
+    python limpiador/rollup.py --reconstruir
+"""
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+_scraper_root = Path(__file__).resolve().parent.parent
+if str(_scraper_root) not in sys.path:
+    sys.path.insert(0, str(_scraper_root))
+if str(_scraper_root.parent) not in sys.path:
+    sys.path.append(str(_scraper_root.parent))
+
+from db.supabase_helper import supabase
+from comun.skills import canonizar_skill
+
+TODOS = "*"
+CHUNK_RPC = 500
+
+
+def normalizar_seniority(valor) -> str:
+    """Mismos grupos que usa el backend: senior, semi-senior, junior o no especificado."""
+    s = str(valor or "").lower()
+    if not s or s == "no especificado":
+        return "no especificado"
+    if "senior" in s and "semi" not in s:
+        return "senior"
+    if "junior" in s or "trainee" in s:
+        return "junior"
+    return "semi-senior"
+
+
+def normalizar_locacion(valor) -> str:
+    loc = re.sub(r"\s+", " ", str(valor or "")).strip()
+    return loc.title() if loc else "Ecuador"
+
+
+def mes_de_fecha(fecha_publicacion, respaldo: datetime | None = None) -> str:
+    """Primer día del mes ('YYYY-MM-01') según fecha_publicacion (ISO o DD/MM/YYYY)."""
+    texto = str(fecha_publicacion or "").strip()
+    m = re.match(r"(\d{4})-(\d{2})", texto)
+    if m and 1 <= int(m.group(2)) <= 12:
+        return f"{m.group(1)}-{m.group(2)}-01"
+    m = re.match(r"\d{1,2}[/-](\d{1,2})[/-](\d{4})", texto)
+    if m and 1 <= int(m.group(1)) <= 12:
+        return f"{m.group(2)}-{int(m.group(1)):02d}-01"
+    respaldo = respaldo or datetime.now(timezone.utc)
+    return respaldo.strftime("%Y-%m-01")
+
+
+def calcular_deltas(registros: list[dict], anteriores: list[dict] = ()) -> list[dict]:
+    """
+    Agrupa registros de jobs_clean en deltas del cubo, listos para incrementar_rollup.
+    Los `anteriores` (la versión previa de ofertas reemplazadas) restan; las celdas que
+    quedan en cero no se envían.
+    """
+    acumulado: dict[tuple[str, str, str, str], list[float]] = defaultdict(lambda: [0, 0.0, 0])
+    for reg, signo in [*((r, 1) for r in registros), *((r, -1) for r in anteriores)]:
+        mes = mes_de_fecha(reg.get("fecha_publicacion"))
+        seniority = normalizar_seniority(reg.get("seniority"))
+        locacion = normalizar_locacion(reg.get("locacion"))
+        try:
+            sueldo = float(reg.get("sueldo")) if reg.get("sueldo") not in (None, "") else None
+        except (TypeError, ValueError):
+            sueldo = None
+
+        skills = {canonizar_skill(s) for s in str(reg.get("habilidades") or "").split(",") if s.strip()}
+        for skill in skills | {TODOS}:
+            for sen in (seniority, TODOS):
+                for loc in (locacion, TODOS):
+                    celda = acumulado[(mes, skill, sen, loc)]
+                    celda[0] += signo
+                    if sueldo and sueldo > 0:
+                        celda[1] += signo * sueldo
+                        celda[2] += signo
+
+    return [
+        {
+            "mes": mes, "skill": skill, "seniority": sen, "locacion": loc,
+            "ofertas": ofertas, "salario_suma": round(suma, 2), "salario_count": count,
+        }
+        for (mes, skill, sen, loc), (ofertas, suma, count) in acumulado.items()
+        if ofertas or count or round(suma, 2)
+    ]
+
+
+def aplicar_deltas(deltas: list[dict]) -> bool:
+    """Envía los deltas a la función incrementar_rollup en bloques."""
+    try:
+        for k in range(0, len(deltas), CHUNK_RPC):
+            supabase.rpc("incrementar_rollup", {"deltas": deltas[k:k + CHUNK_RPC]}).execute()
+        return True
+    except Exception as e:
+        print(f"   ⚠️ Error actualizando jobs_rollup_mensual: {e}")
+        return False
+
+
+def actualizar_rollup(registros_nuevos: list[dict], registros_anteriores: list[dict] = ()):
+    """
+    Suma al cubo las ofertas recién guardadas en jobs_clean y resta la versión anterior
+    de las que reemplazaron a una fila existente.
+    """
+    if not registros_nuevos:
+        return
+    deltas = calcular_deltas(registros_nuevos, registros_anteriores)
+    if deltas and aplicar_deltas(deltas):
+        print(f"   📊 Rollup mensual: {len(registros_nuevos)} ofertas ({len(registros_anteriores)} modificadas) "
+              f"-> {len(deltas)} celdas actualizadas.")
+
+
+def reconstruir_rollup(tamano_pagina: int = 1000):
+    """Vacía el cubo y lo recalcula desde todo jobs_clean."""
+    print("📊 Reconstruyendo jobs_rollup_mensual desde jobs_clean...")
+    supabase.table("jobs_rollup_mensual").delete().neq("skill", "").execute()
+    desde = 0
+    total = 0
+    while True:
+        r = (
+            supabase.table("jobs_clean")
+            .select("fecha_publicacion, seniority, locacion, sueldo, habilidades")
+            .order("id")
+            .range(desde, desde + tamano_pagina - 1)
+            .execute()
+        )
+        filas = r.data or []
+        if not filas:
+            break
+        aplicar_deltas(calcular_deltas(filas))
+        total += len(filas)
+        desde += tamano_pagina
+    print(f"✅ Rollup reconstruido con {total} ofertas.")
+
+
+if __name__ == "__main__":
+    if "--reconstruir" in sys.argv:
+        reconstruir_rollup()
+    else:
+        print("Uso: python limpiador/rollup.py --reconstruir")
@@ -1,4 +1,4 @@
-import sys
+import argparse
 import os
 import time
 from datetime import datetime
@@ -8,16 +8,32 @@ ROLES_GLOBALES = [
     "desarrollador python"
 ]
 
+EN_PARALELO = os.getenv("SCRAPER_EN_PARALELO", "1") != "0"
+STREAMING = os.getenv("SCRAPER_STREAMING", "0") == "1"
+
+def leer_argumentos():
+    parser = argparse.ArgumentParser(description="DevRadar: scraping de ofertas + limpieza con IA")
+    # Por defecto 2 días para el cron job diario en Contabo (python main.py 2)
+    parser.add_argument("dias", nargs="?", type=int, default=2, help="Días hacia atrás a scrapear")
+    parser.add_argument("--streaming", action="store_true", default=STREAMING,
+                        help="Subir y limpiar las ofertas mientras se scrapea (SCRAPER_STREAMING=1)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Seguir la corrida anterior desde la última página guardada (Computrabajo y Jooble)")
+    return parser.parse_args()
+
 def main():
-    # Parámetro dinámico: python main.py [dias]
-    # Por defecto 2 días para el cron job diario en Contabo
-    scrape_days = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    args = leer_argumentos()
+    scrape_days = args.dias
 
     start_time = time.time()
     print("\n" + "█" * 60)
     print(f"🚀 DEVRADAR ECUADOR - PIPELINE AUTOMATIZADO")
     print(f"📅 Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"🔎 Rango: Últimos {scrape_days} días")
+    if args.streaming:
+        print("🌊 Modo: streaming (scraping, jobs_raw y limpieza en simultáneo; sin checkpoints nuevos para --resume)")
+    if args.resume:
+        print("⏯️ Reanudando desde los checkpoints de la corrida anterior")
     print("█" * 60 + "\n")
 
     # =========================================================
@@ -25,29 +41,31 @@ def main():
     # =========================================================
     print("📡 --- FASE 1: RECOLECCIÓN DE OFERTAS ---")
 
-    # 1. COMPUTRABAJO
-    try:
-        from scrapers.scraper_computrabajos import correr_scraper_computrabajo
-        print("\n🔹 [1/3] EJECUTANDO COMPUTRABAJO...")
-        correr_scraper_computrabajo(ROLES_GLOBALES, dias=scrape_days)
-    except Exception as e:
-        print(f"❌ Error en Computrabajo: {e}")
-
-    # 2. JOOBLE
-    try:
-        from scrapers.scraper_jooble import correr_scraper_jooble
-        print("\n🔹 [2/3] EJECUTANDO JOOBLE...")
-        correr_scraper_jooble(ROLES_GLOBALES, dias=scrape_days)
-    except Exception as e:
-        print(f"❌ Error en Jooble: {e}")
+    # Cada plataforma en su propio proceso, en paralelo y con su timeout
+    # (SCRAPER_EN_PARALELO=0 vuelve a correrlas una tras otra en este proceso)
+    from scrapers.orquestador import ejecutar_en_paralelo, ejecutar_en_secuencia, imprimir_resumen
+    # En streaming las ofertas van a jobs_raw y al limpiador mientras se scrapea
+    pipeline = None
+    if args.streaming:
+        from scrapers.pipeline_streaming import PipelineStreaming
+        pipeline = PipelineStreaming()
+        pipeline.iniciar()
+    cola_ofertas = pipeline.cola_ofertas if pipeline else None
 
-    # 3. LINKEDIN
+    inicio_recoleccion = time.time()
     try:
-        from scrapers.scraper_linkedin import ejecutar_linkedin
-        print("\n🔹 [3/3] EJECUTANDO LINKEDIN...")
-        ejecutar_linkedin(ROLES_GLOBALES, scrape_days=scrape_days)
-    except Exception as e:
-        print(f"❌ Error en LinkedIn: {e}")
+        if EN_PARALELO:
+            resumenes = ejecutar_en_paralelo(ROLES_GLOBALES, scrape_days, cola_ofertas=cola_ofertas,
+                                             reanudar=args.resume)
+        else:
+            resumenes = ejecutar_en_secuencia(ROLES_GLOBALES, scrape_days, cola_ofertas=cola_ofertas,
+                                              reanudar=args.resume)
+    finally:
+        if pipeline:
+            pipeline.cerrar()
+    imprimir_resumen(resumenes, time.time() - inicio_recoleccion)
+    if any(r["estado"] != "ok" for r in resumenes):
+        print(f"💡 Lo recolectado ya está en jobs_raw; 'python main.py {scrape_days} --resume' sigue desde la última página")
 
     # =========================================================
     # FASE 2: LIMPIEZA E INTELIGENCIA ARTIFICIAL
@@ -59,6 +77,7 @@ def main():
     try:
         # Importamos y ejecutamos el limpiador
         from limpiador.limpiador_de_datos import ejecutar_limpieza_ia
+        # En streaming solo quedan las que el pipeline no alcanzó a limpiar
         print("\n🔹 Procesando nuevas ofertas detectadas...")
         ejecutar_limpieza_ia() # Solo limpia donde processed=False
     except Exception as e:
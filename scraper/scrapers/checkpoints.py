@@ -0,0 +1,92 @@
+"""
+Puntos de control por rol y por página para reanudar una corrida cortada (main.py --resume).
+
+Cada scraper sube sus ofertas a jobs_raw a medida que completa una página (o un tramo
+de scroll en Jooble) y recién entonces anota esa página en un JSON local por
+plataforma (SCRAPER_CHECKPOINTS_DIR). Si la corrida muere (timeout, Chrome que
+revienta, el VPS que se reinicia), lo anotado ya está en la base: con --resume se
+saltan los roles terminados y se sigue desde la página siguiente a la última anotada.
+
+En modo streaming el scraper solo encola las ofertas (las sube el pipeline en el
+proceso principal), así que no se anota nada: una página anotada cuyas ofertas
+murieron en la cola se saltaría para siempre con --resume. Se puede reanudar en
+streaming desde un checkpoint de una corrida normal, pero no dejarlo avanzar.
+
+El archivo se borra cuando la plataforma termina todos sus roles. Un punto de control
+de otro rango de días o de más de SCRAPER_CHECKPOINT_MAX_HORAS no se usa. Si no se
+puede leer o escribir, la corrida sigue igual, solo que sin poder reanudarse.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+DIRECTORIO = Path(os.getenv("SCRAPER_CHECKPOINTS_DIR", Path(__file__).resolve().parent.parent / ".checkpoints"))
+MAX_HORAS = float(os.getenv("SCRAPER_CHECKPOINT_MAX_HORAS", "24"))
+
+
+class Checkpoint:
+    def __init__(self, plataforma: str, scrape_days: int, reanudar: bool = False, directorio: Path | None = None,
+                 anotar: bool = True):
+        self.plataforma = plataforma
+        self.scrape_days = scrape_days
+        self.anotar = anotar # False en streaming: se lee, pero no se escribe ni se borra
+        self.ruta = Path(directorio or DIRECTORIO) / f"{plataforma}.json"
+        # {rol: {"pagina": última página guardada, "completo": bool}}
+        self.roles: dict[str, dict] = self._leer() if reanudar else {}
+        if reanudar:
+            hechos = [r for r, e in self.roles.items() if e.get("completo")]
+            en_curso = {r: e["pagina"] for r, e in self.roles.items() if not e.get("completo")}
+            print(f"⏯️ {plataforma.upper()}: reanudando ({len(hechos)} roles terminados, en curso: {en_curso or 'ninguno'})")
+
+    def _leer(self) -> dict:
+        try:
+            estado = json.loads(self.ruta.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Checkpoint de {self.plataforma} ilegible, se empieza de cero: {e}")
+            return {}
+        if estado.get("scrape_days") != self.scrape_days:
+            print(f"⚠️ Checkpoint de {self.plataforma} es de otro rango ({estado.get('scrape_days')} días): se ignora")
+            return {}
+        if time.time() - estado.get("actualizado", 0) > MAX_HORAS * 3600:
+            print(f"⚠️ Checkpoint de {self.plataforma} tiene más de {MAX_HORAS:g} h: se ignora")
+            return {}
+        return estado.get("roles", {})
+
+    def _escribir(self):
+        if not self.anotar:
+            return
+        estado = {"scrape_days": self.scrape_days, "actualizado": time.time(), "roles": self.roles}
+        try:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            temporal = self.ruta.with_suffix(".tmp")
+            temporal.write_text(json.dumps(estado, ensure_ascii=False), encoding="utf-8")
+            os.replace(temporal, self.ruta) # atómico: un corte a mitad no deja un JSON roto
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el checkpoint de {self.plataforma}: {e}")
+
+    def rol_completo(self, rol: str) -> bool:
+        return self.roles.get(rol, {}).get("completo", False)
+
+    def pagina_inicial(self, rol: str) -> int:
+        """Primera página a pedir: la siguiente a la última guardada (1 si no hay nada)."""
+        return self.roles.get(rol, {}).get("pagina", 0) + 1
+
+    def marcar_pagina(self, rol: str, pagina: int):
+        self.roles[rol] = {"pagina": pagina, "completo": False}
+        self._escribir()
+
+    def marcar_rol(self, rol: str):
+        self.roles[rol] = {**self.roles.get(rol, {"pagina": 0}), "completo": True}
+        self._escribir()
+
+    def terminar(self):
+        """Todos los roles listos: la próxima corrida empieza de cero."""
+        if not self.anotar:
+            return
+        try:
+            self.ruta.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -0,0 +1,122 @@
+"""
+Motor de descargas asíncrono para los scrapers basados en HTTP.
+
+Un solo httpx.AsyncClient por corrida (conexiones keep-alive reutilizadas en vez de
+un requests.get suelto por página) y un semáforo por host que limita cuántas
+peticiones hay en vuelo contra cada sitio. Así las páginas de detalle de una
+página de listado se descargan en paralelo mientras se pide la siguiente página.
+
+El ritmo (peticiones/s) lo pone el regulador AIMD compartido (regulador_tasa.py):
+cada petición espera su turno y reporta estado, latencia y Retry-After. Las respuestas
+429/5xx se reintentan hasta MAX_REINTENTOS veces, ya con el ritmo recortado.
+
+Lleva la cuenta de páginas, errores, bytes y páginas/minuto para el log de la corrida.
+"""
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from scrapers.regulador_tasa import REGULADOR, ReguladorAIMD
+
+CONCURRENCIA_POR_HOST = int(os.getenv("SCRAPER_CONCURRENCIA_POR_HOST", "4"))
+TIMEOUT_S = float(os.getenv("SCRAPER_TIMEOUT_S", "10"))
+MAX_CONEXIONES = 20
+MAX_REINTENTOS = 2
+ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class EstadisticasDescarga:
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.paginas = 0
+        self.errores = 0
+        self.bytes = 0
+        self.segundos_red = 0.0
+        self.por_estado: dict[int, int] = {}
+
+    def registrar(self, estado: int | None, tamano: int, segundos: float):
+        self.segundos_red += segundos
+        if estado is None:
+            self.errores += 1
+            return
+        self.paginas += 1
+        self.bytes += tamano
+        self.por_estado[estado] = self.por_estado.get(estado, 0) + 1
+
+    @property
+    def paginas_por_minuto(self) -> float:
+        transcurrido = max(time.monotonic() - self.inicio, 1e-9)
+        return self.paginas / transcurrido * 60
+
+    def resumen(self) -> str:
+        transcurrido = time.monotonic() - self.inicio
+        latencia = self.segundos_red / max(self.paginas + self.errores, 1)
+        return (
+            f"{self.paginas} páginas en {transcurrido:.1f} s ({self.paginas_por_minuto:.0f} páginas/min), "
+            f"{self.errores} errores de red, {self.bytes / 1e6:.1f} MB, latencia media {latencia * 1000:.0f} ms, "
+            f"estados {dict(sorted(self.por_estado.items()))}"
+        )
+
+
+class MotorDescargas:
+    """
+    Uso:
+        async with MotorDescargas(headers) as motor:
+            respuesta = await motor.obtener(url)   # httpx.Response o None si falló la red
+    """
+
+    def __init__(self, headers: dict | None = None, concurrencia_por_host: int | None = None,
+                 timeout: float | None = None, regulador: ReguladorAIMD | None = None):
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        self.concurrencia_por_host = concurrencia_por_host or CONCURRENCIA_POR_HOST
+        self.timeout = timeout or TIMEOUT_S
+        self.regulador = regulador or REGULADOR
+        self.stats = EstadisticasDescarga()
+        self._semaforos: dict[str, asyncio.Semaphore] = {}
+        self.cliente: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "MotorDescargas":
+        self.cliente = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=MAX_CONEXIONES, max_keepalive_connections=MAX_CONEXIONES),
+        )
+        self.stats = EstadisticasDescarga()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cliente.aclose()
+
+    def _semaforo(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaforos:
+            self._semaforos[host] = asyncio.Semaphore(self.concurrencia_por_host)
+        return self._semaforos[host]
+
+    async def obtener(self, url: str, timeout: float | None = None) -> httpx.Response | None:
+        """GET con el límite por host y el ritmo del regulador; None si hubo timeout o error de conexión."""
+        async with self._semaforo(url):
+            for intento in range(MAX_REINTENTOS + 1):
+                await self.regulador.esperar_async(url)
+                inicio = time.perf_counter()
+                try:
+                    respuesta = await self.cliente.get(url, timeout=timeout or self.timeout)
+                except httpx.HTTPError:
+                    segundos = time.perf_counter() - inicio
+                    self.stats.registrar(None, 0, segundos)
+                    self.regulador.registrar(url, None, segundos)
+                    return None
+                segundos = time.perf_counter() - inicio
+                self.stats.registrar(respuesta.status_code, len(respuesta.content), segundos)
+                self.regulador.registrar(url, respuesta.status_code, segundos, respuesta.headers.get("Retry-After"))
+                if respuesta.status_code not in ESTADOS_REINTENTABLES or intento == MAX_REINTENTOS:
+                    return respuesta
@@ -0,0 +1,187 @@
+"""
+Corre los scrapers de cada plataforma en procesos separados y en paralelo.
+
+Cada plataforma pega a un host distinto y pasa casi todo el tiempo esperando red
+(Chrome en Jooble, jobspy en LinkedIn, httpx en Computrabajo), así que la corrida
+tarda lo que el scraper más lento en vez de la suma de los tres. Un proceso por
+plataforma aísla las caídas (un Chrome que revienta no se lleva a los demás) y
+permite cortar por timeout sin dejar al resto colgado.
+
+El log de cada proceso sale con el prefijo de su plataforma, y al final se imprime
+un resumen combinado (estado, duración, ofertas y guardadas por plataforma).
+
+Con cola_ofertas (modo streaming, ver pipeline_streaming.py) cada scraper pone sus
+ofertas en esa cola a medida que las encuentra en vez de subirlas al final. Con
+reanudar, las plataformas con checkpoints (ver checkpoints.py) siguen desde la última
+página guardada de una corrida cortada.
+"""
+import functools
+import importlib
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+import traceback
+from typing import NamedTuple
+
+
+class Plataforma(NamedTuple):
+    nombre: str
+    modulo: str
+    funcion: str
+    timeout_min: float
+    kwarg_dias: str = "dias"
+    reanudable: bool = False # acepta reanudar=True (checkpoints por rol/página)
+
+
+PLATAFORMAS = [
+    Plataforma("computrabajo", "scrapers.scraper_computrabajos", "correr_scraper_computrabajo",
+               float(os.getenv("SCRAPER_TIMEOUT_COMPUTRABAJO_MIN", "45")), reanudable=True),
+    Plataforma("jooble", "scrapers.scraper_jooble", "correr_scraper_jooble",
+               float(os.getenv("SCRAPER_TIMEOUT_JOOBLE_MIN", "45")), reanudable=True),
+    Plataforma("linkedin", "scrapers.scraper_linkedin", "ejecutar_linkedin",
+               float(os.getenv("SCRAPER_TIMEOUT_LINKEDIN_MIN", "60")), kwarg_dias="scrape_days"),
+]
+
+GRACIA_TERMINAR_S = 20 # tras SIGTERM, tiempo para cerrar Chrome y guardar lo recolectado
+_cortado = False
+
+
+class _SalidaConPrefijo:
+    """stdout/stderr del proceso hijo con '[plataforma]' al inicio de cada línea."""
+
+    def __init__(self, destino, prefijo: str):
+        self.destino = destino
+        self.prefijo = prefijo
+        self._inicio_linea = True
+
+    def write(self, texto: str):
+        for parte in texto.splitlines(keepends=True):
+            if self._inicio_linea and parte.strip():
+                self.destino.write(self.prefijo)
+            self.destino.write(parte)
+            self._inicio_linea = parte.endswith("\n")
+        self.destino.flush()
+        return len(texto)
+
+    def flush(self):
+        self.destino.flush()
+
+
+def _proceso_plataforma(plataforma: Plataforma, roles, dias: int, cola, cola_ofertas=None, reanudar=False):
+    prefijo = f"[{plataforma.nombre}] "
+    sys.stdout = _SalidaConPrefijo(sys.__stdout__, prefijo)
+    sys.stderr = _SalidaConPrefijo(sys.__stderr__, prefijo)
+    signal.signal(signal.SIGTERM, _al_cortar)
+    cola.put(_correr_plataforma(plataforma, roles, dias, cola_ofertas, reanudar))
+
+
+def _al_cortar(*_):
+    # SIGTERM (timeout) como SystemExit: corren los finally (driver.quit(), guardar_supabase)
+    global _cortado
+    _cortado = True
+    sys.exit(143)
+
+
+def _emitir(cola_ofertas, oferta: dict):
+    # _t: cuándo se encontró, para medir cuánto tarda en llegar a jobs_clean
+    cola_ofertas.put({**oferta, "_t": time.time()})
+
+
+def _correr_plataforma(plataforma: Plataforma, roles, dias: int, cola_ofertas=None, reanudar=False) -> dict:
+    inicio = time.time()
+    resultado = {"plataforma": plataforma.nombre, "estado": "ok", "error": None}
+    try:
+        funcion = getattr(importlib.import_module(plataforma.modulo), plataforma.funcion)
+        kwargs = {plataforma.kwarg_dias: dias}
+        if cola_ofertas is not None:
+            kwargs["sumidero"] = functools.partial(_emitir, cola_ofertas)
+        if reanudar and plataforma.reanudable:
+            kwargs["reanudar"] = True
+        resumen = funcion(roles, **kwargs)
+        resultado.update(resumen or {})
+    except SystemExit as e:
+        if _cortado:
+            resultado.update(estado="timeout", error="cortado por timeout")
+        else:
+            resultado.update(estado="error", error=f"exit({e.code})")
+    except Exception as e:
+        traceback.print_exc()
+        resultado.update(estado="error", error=str(e)[:200])
+    resultado["segundos"] = time.time() - inicio
+    return resultado
+
+
+def ejecutar_en_secuencia(roles, dias: int, plataformas=None, cola_ofertas=None, reanudar=False) -> list[dict]:
+    """Una plataforma tras otra en este mismo proceso (SCRAPER_EN_PARALELO=0), sin timeouts."""
+    resumenes = []
+    for idx, plataforma in enumerate(plataformas or PLATAFORMAS, 1):
+        print(f"\n🔹 [{idx}/{len(plataformas or PLATAFORMAS)}] EJECUTANDO {plataforma.nombre.upper()}...")
+        resumen = _correr_plataforma(plataforma, roles, dias, cola_ofertas, reanudar)
+        if resumen["error"]:
+            print(f"❌ Error en {plataforma.nombre}: {resumen['error']}")
+        resumenes.append(resumen)
+    return resumenes
+
+
+def ejecutar_en_paralelo(roles, dias: int, plataformas=None, cola_ofertas=None, reanudar=False) -> list[dict]:
+    """Lanza un proceso por plataforma, aplica el timeout de cada una y devuelve sus resúmenes."""
+    plataformas = plataformas or PLATAFORMAS
+    ctx = mp.get_context("spawn") # sin fork: los hijos no heredan hilos ni clientes HTTP del padre
+    cola = ctx.Queue()
+    procesos = {}
+    inicio = time.time()
+    for plataforma in plataformas:
+        proceso = ctx.Process(target=_proceso_plataforma, args=(plataforma, roles, dias, cola, cola_ofertas, reanudar),
+                              name=f"scraper-{plataforma.nombre}")
+        proceso.start()
+        procesos[plataforma.nombre] = (plataforma, proceso)
+        print(f"🔹 {plataforma.nombre.upper()} en el proceso {proceso.pid} (timeout {plataforma.timeout_min:g} min)")
+
+    resultados = {}
+    cortados: dict[str, float] = {}
+    while any(p.is_alive() for _, p in procesos.values()):
+        while not cola.empty():
+            r = cola.get()
+            resultados[r["plataforma"]] = r
+        ahora = time.time()
+        for nombre, (plataforma, proceso) in procesos.items():
+            if not proceso.is_alive():
+                continue
+            if nombre not in cortados and ahora - inicio > plataforma.timeout_min * 60:
+                print(f"⏱️ {nombre.upper()} superó {plataforma.timeout_min:g} min: deteniendo...")
+                proceso.terminate()
+                cortados[nombre] = ahora
+            elif nombre in cortados and ahora - cortados[nombre] > GRACIA_TERMINAR_S:
+                proceso.kill()
+        time.sleep(0.5)
+
+    while not cola.empty():
+        r = cola.get()
+        resultados[r["plataforma"]] = r
+
+    resumenes = []
+    for nombre, (plataforma, proceso) in procesos.items():
+        proceso.join()
+        r = resultados.get(nombre) or {
+            "plataforma": nombre,
+            "estado": "timeout" if nombre in cortados else "error",
+            "error": f"el proceso terminó sin resumen (código {proceso.exitcode})",
+            "segundos": time.time() - inicio,
+        }
+        if nombre in cortados:
+            r["estado"] = "timeout"
+        resumenes.append(r)
+    return resumenes
+
+
+def imprimir_resumen(resumenes: list[dict], segundos_total: float):
+    print(f"\n{'plataforma':<14} {'estado':<8} {'duración':>9} {'ofertas':>8} {'guardadas':>10} {'evitados':>9}")
+    for r in resumenes:
+        icono = {"ok": "✅", "timeout": "⏱️", "error": "❌"}.get(r["estado"], "❔")
+        print(f"{r['plataforma']:<14} {r['estado']:<8} {r.get('segundos', 0) / 60:>7.1f}m "
+              f"{r.get('ofertas', '-'):>8} {r.get('guardadas', '-'):>10} {r.get('detalles_evitados', '-'):>9} {icono}"
+              + (f"  {r['error']}" if r.get("error") else ""))
+    suma = sum(r.get("segundos", 0) for r in resumenes)
+    print(f"⚡ Recolección en {segundos_total / 60:.1f} min (en secuencia habrían sido ~{suma / 60:.1f} min)")
@@ -0,0 +1,179 @@
+"""
+Modo streaming: las ofertas pasan del scraper a jobs_raw y al limpiador mientras se scrapea.
+
+En el modo por fases cada scraper junta todas sus ofertas en memoria, las sube al
+final y recién entonces arranca el limpiador: una oferta descubierta al minuto 2
+llega a jobs_clean una hora después. Aquí los scrapers (en sus procesos) ponen cada
+oferta en una cola acotada apenas la parsean y dos hilos de este proceso la consumen:
+
+- escritura: junta lotes de PIPELINE_LOTE_ESCRITURA ofertas (o lo que haya tras
+  PIPELINE_ESPERA_MAX_S) y los sube con guardar_ofertas_crudas. Las nuevas o
+  modificadas pasan a la cola de limpieza.
+- limpieza: micro-lotes de PIPELINE_LOTE_LIMPIEZA ofertas por procesar_lote del
+  limpiador (Groq + embedding + jobs_clean + processed=True).
+
+Contrapresión: la cola de ofertas tiene PIPELINE_TAMANO_COLA lugares; si la escritura
+se atrasa, el put del scraper se bloquea y el scraper espera. La limpieza (Groq) es
+mucho más lenta que el scraping, así que no se la deja frenar a los scrapers (que
+tienen timeout): si su cola está llena, la oferta ya quedó en jobs_raw con
+processed=False y la limpia la FASE 2 al terminar. La memoria queda acotada por el
+tamaño de las dos colas, no por el total de la corrida.
+"""
+import multiprocessing as mp
+import os
+import queue
+import statistics
+import threading
+import time
+
+from db.supabase_helper import guardar_ofertas_crudas, preparar_oferta_cruda
+
+TAMANO_COLA = int(os.getenv("PIPELINE_TAMANO_COLA", "200"))
+LOTE_ESCRITURA = int(os.getenv("PIPELINE_LOTE_ESCRITURA", "50"))
+LOTE_LIMPIEZA = int(os.getenv("PIPELINE_LOTE_LIMPIEZA", "20"))
+ESPERA_MAX_S = float(os.getenv("PIPELINE_ESPERA_MAX_S", "5"))
+
+_FIN = None # marca de cierre en las colas
+
+
+def _juntar(cola, tamano: int, espera_max: float) -> tuple[list, bool]:
+    """Hasta `tamano` elementos o lo que llegue en `espera_max` s; True si apareció la marca de fin."""
+    lote = []
+    limite = time.monotonic() + espera_max
+    while len(lote) < tamano:
+        try:
+            elemento = cola.get(timeout=max(limite - time.monotonic(), 0.05))
+        except queue.Empty:
+            break
+        if elemento is _FIN:
+            return lote, True
+        lote.append(elemento)
+    return lote, False
+
+
+def _tamano(cola) -> int:
+    try:
+        return cola.qsize()
+    except NotImplementedError: # macOS no implementa qsize en multiprocessing
+        return 0
+
+
+class PipelineStreaming:
+    def __init__(self, tamano_cola: int = TAMANO_COLA, lote_escritura: int = LOTE_ESCRITURA,
+                 lote_limpieza: int = LOTE_LIMPIEZA, espera_max: float = ESPERA_MAX_S,
+                 limpiar=None, cliente=None):
+        # spawn, como los procesos del orquestador que escriben en ella
+        self.cola_ofertas = mp.get_context("spawn").Queue(maxsize=tamano_cola)
+        self.cola_limpieza: queue.Queue = queue.Queue(maxsize=tamano_cola)
+        self.tamano_cola = tamano_cola
+        self.lote_escritura = lote_escritura
+        self.lote_limpieza = lote_limpieza
+        self.espera_max = espera_max
+        self._limpiar = limpiar   # callable(lote) -> None; por defecto procesar_lote del limpiador
+        self._cliente = cliente   # cliente de Supabase para jobs_raw (None = el global)
+        self._hilos: list[threading.Thread] = []
+        self._encoladas: set[str] = set()
+
+        self.recibidas = 0
+        self.escritas = 0
+        self.fallidas = 0
+        self.sin_cambios = 0
+        self.limpiadas = 0
+        self.diferidas = 0 # quedan en jobs_raw con processed=False para la FASE 2
+        self.max_cola = 0
+        self.latencias: list[float] = [] # segundos desde que el scraper la encontró hasta jobs_clean
+
+    def iniciar(self):
+        for nombre, destino in (("pipeline-escritura", self._escribir), ("pipeline-limpieza", self._limpiar_continuo)):
+            hilo = threading.Thread(target=destino, name=nombre, daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+        print(f"🌊 Pipeline streaming: cola de {self.tamano_cola} ofertas, "
+              f"lotes de {self.lote_escritura} a jobs_raw y de {self.lote_limpieza} al limpiador")
+
+    def cerrar(self):
+        """Se llama cuando terminaron todos los scrapers: vacía las colas, espera los hilos e imprime el resumen."""
+        self.cola_ofertas.put(_FIN)
+        for hilo in self._hilos:
+            hilo.join()
+        print(f"\n🌊 {self.resumen()}")
+
+    # --- Escritura en jobs_raw ---
+    def _escribir(self):
+        fin = False
+        while not fin:
+            lote, fin = _juntar(self.cola_ofertas, self.lote_escritura, self.espera_max)
+            self.max_cola = max(self.max_cola, _tamano(self.cola_ofertas) + len(lote))
+            if lote:
+                self._guardar(lote)
+        self.cola_limpieza.put(_FIN)
+
+    def _guardar(self, lote: list[dict]):
+        self.recibidas += len(lote)
+        try:
+            resultados = guardar_ofertas_crudas(lote, cliente=self._cliente, verbose=False)
+        except Exception as e:
+            print(f"⚠️ Pipeline: no se pudo escribir un lote de {len(lote)} ofertas: {str(e)[:120]}")
+            self.fallidas += len(lote)
+            return
+
+        for oferta, resultado in zip(lote, resultados):
+            if not resultado.ok:
+                self.fallidas += 1
+                continue
+            self.escritas += 1
+            # Sin cambios: ya estaba limpia (o en cola); una URL repetida entre roles se limpia una vez
+            if resultado.estado == "sin_cambios" or resultado.url_publicacion in self._encoladas:
+                self.sin_cambios += 1
+                continue
+            self._encoladas.add(resultado.url_publicacion)
+            try:
+                self.cola_limpieza.put_nowait({**preparar_oferta_cruda(oferta), "_t": oferta.get("_t", time.time())})
+            except queue.Full:
+                self.diferidas += 1
+
+    # --- Limpieza con IA ---
+    def _preparar_limpieza(self):
+        if self._limpiar is not None:
+            return self._limpiar
+        try:
+            from limpiador.limpiador_de_datos import JobAIProcessor, procesar_lote
+            processor = JobAIProcessor()
+        except Exception as e:
+            print(f"⚠️ Pipeline: limpiador no disponible ({str(e)[:120]}); las ofertas quedan para la FASE 2")
+            return None
+        return lambda lote: procesar_lote(processor, lote, etiqueta="Streaming")
+
+    def _limpiar_continuo(self):
+        limpiar = None
+        preparado = False
+        fin = False
+        while not fin:
+            lote, fin = _juntar(self.cola_limpieza, self.lote_limpieza, self.espera_max)
+            if not lote:
+                continue
+            if not preparado: # los modelos se cargan con la primera oferta, no antes
+                limpiar, preparado = self._preparar_limpieza(), True
+            if limpiar is None:
+                self.diferidas += len(lote)
+                continue
+            try:
+                limpiar(lote)
+            except Exception as e:
+                print(f"⚠️ Pipeline: error limpiando {len(lote)} ofertas (quedan para la FASE 2): {str(e)[:120]}")
+                self.diferidas += len(lote)
+                continue
+            ahora = time.time()
+            self.limpiadas += len(lote)
+            self.latencias.extend(ahora - oferta["_t"] for oferta in lote)
+
+    def resumen(self) -> str:
+        texto = (
+            f"Pipeline: {self.recibidas} ofertas recibidas, {self.escritas} en jobs_raw "
+            f"({self.fallidas} fallidas, {self.sin_cambios} sin cambios), {self.limpiadas} limpiadas, "
+            f"{self.diferidas} para la FASE 2, cola máx {self.max_cola}"
+        )
+        if self.latencias:
+            texto += (f"; descubrimiento → jobs_clean: mediana {statistics.median(self.latencias):.0f} s, "
+                      f"máx {max(self.latencias):.0f} s")
+        return texto
@@ -0,0 +1,177 @@
+"""
+Regulador de ritmo por host (AIMD) compartido por los tres scrapers.
+
+En vez de pausas fijas al azar, cada host tiene una tasa (peticiones/s) que:
+- sube de a poco (+SCRAPER_AIMD_INCREMENTO) con cada respuesta sana y rápida,
+- se corta a la mitad (×SCRAPER_AIMD_FACTOR) ante 429, 5xx, errores de red o latencias
+  muy por encima de lo normal para ese host (como mucho un corte por ventana, para no
+  castigar varias veces la misma congestión con las respuestas que ya estaban en vuelo),
+- y respeta Retry-After: el host queda en pausa hasta esa hora.
+
+Uso síncrono (requests / selenium):
+    REGULADOR.esperar(url)
+    ...petición...
+    REGULADOR.registrar(url, estado, segundos, retry_after)
+
+Uso asíncrono (MotorDescargas): `await REGULADOR.esperar_async(url)`.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+TASA_INICIAL = float(os.getenv("SCRAPER_TASA_INICIAL", "0.5"))  # req/s: una cada 2 s, como las pausas de antes
+TASA_MIN = float(os.getenv("SCRAPER_TASA_MIN", "0.1"))
+TASA_MAX = float(os.getenv("SCRAPER_TASA_MAX", "5"))
+INCREMENTO = float(os.getenv("SCRAPER_AIMD_INCREMENTO", "0.1"))
+FACTOR_CORTE = float(os.getenv("SCRAPER_AIMD_FACTOR", "0.5"))
+
+LATENCIA_LENTA_X = 3.0     # una respuesta es "lenta" si tarda 3× la latencia habitual del host...
+LATENCIA_LENTA_MIN_S = 1.0 # ...y además más de 1 s
+MAX_RETRY_AFTER_S = 300
+VENTANA_TASA_S = 60        # ventana para la tasa efectiva que se muestra en el log
+
+# 403 y 999 (LinkedIn) suelen ser bloqueos anti-bot: también cuentan como "bajar el ritmo"
+ESTADOS_SATURACION = {403, 429, 500, 502, 503, 504, 999}
+
+
+def host_de(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+def segundos_retry_after(valor) -> float | None:
+    """Retry-After en segundos ('120' o fecha HTTP); None si no viene o no se entiende."""
+    if valor is None or valor == "":
+        return None
+    try:
+        segundos = float(valor)
+    except (TypeError, ValueError):
+        try:
+            segundos = parsedate_to_datetime(str(valor)).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError):
+            return None
+    return min(max(segundos, 0.0), MAX_RETRY_AFTER_S)
+
+
+class EstadoHost:
+    def __init__(self, tasa: float):
+        self.tasa = tasa
+        self.proximo = 0.0          # monotonic desde el que se puede lanzar la siguiente petición
+        self.pausado_hasta = 0.0    # Retry-After
+        self.ultimo_corte = 0.0
+        self.latencia_ewma: float | None = None
+        self.inicio = time.monotonic()
+        self.peticiones = 0
+        self.cortes = 0
+        self.retry_afters = 0
+        self.tasa_maxima = tasa
+        self.recientes: deque[float] = deque()
+
+    def tasa_efectiva(self) -> float:
+        ahora = time.monotonic()
+        while self.recientes and self.recientes[0] < ahora - VENTANA_TASA_S:
+            self.recientes.popleft()
+        ventana = min(VENTANA_TASA_S, max(ahora - self.inicio, 1e-9))
+        return len(self.recientes) / ventana
+
+
+class ReguladorAIMD:
+    def __init__(self, tasa_inicial: float = TASA_INICIAL, tasa_min: float = TASA_MIN,
+                 tasa_max: float = TASA_MAX, incremento: float = INCREMENTO, factor: float = FACTOR_CORTE):
+        self.tasa_inicial = tasa_inicial
+        self.tasa_min = tasa_min
+        self.tasa_max = tasa_max
+        self.incremento = incremento
+        self.factor = factor
+        self._hosts: dict[str, EstadoHost] = {}
+        self._lock = threading.Lock()
+
+    def _estado(self, host: str) -> EstadoHost:
+        if host not in self._hosts:
+            self._hosts[host] = EstadoHost(min(max(self.tasa_inicial, self.tasa_min), self.tasa_max))
+        return self._hosts[host]
+
+    def _turno(self, url: str) -> float:
+        """0 si la petición puede salir ya (y la cuenta); si no, cuántos segundos esperar antes de reintentar."""
+        ahora = time.monotonic()
+        with self._lock:
+            estado = self._estado(host_de(url))
+            desde = max(estado.proximo, estado.pausado_hasta)
+            if ahora < desde:
+                return desde - ahora
+            estado.proximo = ahora + 1 / estado.tasa
+            estado.peticiones += 1
+            estado.recientes.append(ahora)
+            return 0.0
+
+    def esperar(self, url: str):
+        # Se vuelve a pedir turno tras cada espera: un Retry-After o un corte que llegó
+        # mientras tanto alargan la pausa de quienes ya estaban esperando.
+        while (espera := self._turno(url)) > 0:
+            time.sleep(espera)
+
+    async def esperar_async(self, url: str):
+        while (espera := self._turno(url)) > 0:
+            await asyncio.sleep(espera)
+
+    def registrar(self, url: str, estado: int | None, segundos: float, retry_after=None):
+        """Ajusta la tasa del host según la respuesta (estado None = error de red / timeout)."""
+        host = host_de(url)
+        pausa = segundos_retry_after(retry_after)
+        ahora = time.monotonic()
+        with self._lock:
+            h = self._estado(host)
+            lenta = (
+                h.latencia_ewma is not None
+                and segundos > LATENCIA_LENTA_MIN_S
+                and segundos > LATENCIA_LENTA_X * h.latencia_ewma
+            )
+            if pausa is not None and (estado is None or estado in ESTADOS_SATURACION):
+                h.pausado_hasta = max(h.pausado_hasta, ahora + pausa)
+                h.retry_afters += 1
+
+            if estado is None or estado in ESTADOS_SATURACION or lenta:
+                # Un corte por ventana (~1 petición a la tasa vigente, mínimo 1 s)
+                if ahora - h.ultimo_corte < max(1.0, 1 / h.tasa):
+                    return
+                anterior = h.tasa
+                h.tasa = max(self.tasa_min, h.tasa * self.factor)
+                h.proximo = max(h.proximo, ahora + 1 / h.tasa)
+                h.ultimo_corte = ahora
+                h.cortes += 1
+                if estado is None:
+                    motivo = "error de red"
+                elif estado in ESTADOS_SATURACION:
+                    motivo = f"HTTP {estado}"
+                else:
+                    motivo = f"respuesta lenta ({segundos:.1f} s)"
+                extra = f", pausa Retry-After {pausa:.0f} s" if pausa else ""
+                print(f"   🐢 {host}: {motivo} → tasa {anterior:.2f} → {h.tasa:.2f} req/s{extra}")
+                return
+
+            if estado < 400 or estado == 404:
+                h.latencia_ewma = segundos if h.latencia_ewma is None else 0.8 * h.latencia_ewma + 0.2 * segundos
+                h.tasa = min(self.tasa_max, h.tasa + self.incremento)
+                h.tasa_maxima = max(h.tasa_maxima, h.tasa)
+
+    def tasa(self, url: str) -> float:
+        with self._lock:
+            return self._estado(host_de(url)).tasa
+
+    def resumen(self, url: str) -> str:
+        host = host_de(url)
+        with self._lock:
+            h = self._estado(host)
+            transcurrido = max(time.monotonic() - h.inicio, 1e-9)
+            return (
+                f"{host}: {h.peticiones} peticiones, {h.peticiones / transcurrido:.2f} req/s de media "
+                f"({h.tasa_efectiva():.2f} en el último minuto), tasa actual {h.tasa:.2f} "
+                f"(máx {h.tasa_maxima:.2f}), {h.cortes} recortes, {h.retry_afters} Retry-After"
+            )
+
+
+# Instancia compartida: todos los scrapers del proceso regulan cada host con el mismo estado
+REGULADOR = ReguladorAIMD()
@@ -1,10 +1,7 @@
+import asyncio
 import os
 import sys
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import random
 from datetime import datetime, timedelta
 import re
 
@@ -15,22 +12,40 @@ _scraper_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _scraper_root not in sys.path:
     sys.path.insert(0, _scraper_root)
 
-from db.supabase_helper import guardar_oferta_cruda
+from db.supabase_helper import guardar_ofertas_crudas, marcar_vistas
+from db.urls_conocidas import UrlsConocidas, cargar_urls_conocidas
+from scrapers.checkpoints import Checkpoint
+from scrapers.motor_descargas import MotorDescargas
+from scrapers.regulador_tasa import REGULADOR
 
 class RecolectorComputrabajo:
     """
     Scraper optimizado para ejecución diaria en Contabo.
+    Listados en orden y detalles en paralelo sobre un cliente HTTP compartido (MotorDescargas).
     """
 
-    def __init__(self, roles, scrape_days: int = 2):
+    def __init__(self, roles, scrape_days: int = 2, concurrencia: int | None = None, sumidero=None,
+                 reanudar: bool = False):
         self.base_url = "https://ec.computrabajo.com"
         self.roles = roles
         self.scrape_days = scrape_days # Ahora controlado desde el main (ej: 2 días)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
-        self.datos = []
+        # El ritmo de listados y detalles lo ajusta el regulador AIMD compartido (ya no hay pausas fijas)
+        self.regulador = REGULADOR
+        self.concurrencia = concurrencia # Peticiones simultáneas por host (None = SCRAPER_CONCURRENCIA_POR_HOST)
+        self.conocidas: UrlsConocidas | None = None # Se carga al empezar la corrida
+        # Modo streaming: cada oferta se entrega a sumidero(oferta) al completarse, en vez de
+        # juntarlas en self.datos hasta el final
+        self.sumidero = sumidero
+        # Cada página se sube a jobs_raw al completarse y queda anotada para --resume
+        self.reanudar = reanudar
+        self.checkpoint: Checkpoint | None = None
+        self.datos = [] # ofertas completadas que aún no se subieron
+        self.urls_guardadas: set[str] = set()
         self.registros_por_rol = {}
+        self.detalles_fallidos = 0 # ofertas descartadas porque su detalle no se pudo bajar
 
     def parsear_fecha(self, texto_fecha):
         ahora = datetime.now()
@@ -61,135 +76,239 @@ class RecolectorComputrabajo:
                 return None
         return None
 
-    def recolectar(self):
-        for rol in self.roles:
-            print(f"\n🔎 BUSCANDO EN COMPUTRABAJO: {rol.upper()} (Últimos {self.scrape_days} días)")
-            
-            slug = rol.replace(" ", "-")
-            contador_rol = 0
-            pagina_actual = 1
-            max_paginas_seguridad = 20 # Reducido para diario, usualmente sobran
-
-            while pagina_actual <= max_paginas_seguridad:
-                # pubdate={self.scrape_days} filtra directamente en el servidor de Computrabajo
-                url = f"{self.base_url}/trabajo-de-{slug}?pubdate={self.scrape_days}&p={pagina_actual}"
-                
-                try:
-                    time.sleep(random.uniform(2, 4))
-                    print(f"   📡 Pág {pagina_actual}...", end=" ")
-                    res = requests.get(url, headers=self.headers, timeout=10)
-                    
-                    if res.status_code != 200: break
-
-                    soup = BeautifulSoup(res.content, 'html.parser')
-                    no_ofertas = soup.find('div', string=re.compile("No se ha encontrado ofertas"))
-                    if no_ofertas: break
-
-                    ofertas = soup.find_all('article', class_='box_offer') or soup.find_all('article')
-                    if not ofertas: break
-
-                    print(f"✅ {len(ofertas)} ofertas.")
-
-                    for oferta in ofertas:
-                        titulo_tag = oferta.find('h1') or oferta.find('a', recursive=True)
-                        if not titulo_tag: continue
-
-                        anchor = titulo_tag.find('a') if titulo_tag.name == 'h1' else titulo_tag
-                        href = anchor['href'] if anchor and anchor.has_attr('href') else None
-                        if not href: continue
-                        link = self.base_url + href
-
-                        raw_title = titulo_tag.get_text(strip=True)
-                        oferta_laboral = raw_title.replace('PostuladoVista', '').strip()
-
-                        # Locación y Compañía
-                        parrafos = oferta.find_all('p')
-                        locacion = 'Ecuador'
-                        if len(parrafos) > 1:
-                            loc_candidata = parrafos[1].get_text(strip=True)
-                            if "días" not in loc_candidata.lower() and "hoy" not in loc_candidata.lower():
-                                locacion = loc_candidata
-
-                        compania = 'Confidencial'
-                        p_fs16 = oferta.find('p', class_='fs16')
-                        if p_fs16:
-                            compania = p_fs16.get_text(strip=True).split(' - ', 1)[0].strip()
-
-                        # Sueldo
-                        sueldo_texto = 'No especificado'
-                        info_extras = oferta.find_all('span', class_='mr10')
-                        for info in info_extras:
-                            if '$' in info.get_text():
-                                sueldo_texto = info.get_text(strip=True)
-                                break
-
-                        fecha_texto, descripcion = self.parse_detalle(link)
-                        fecha_calculada = self.parsear_fecha(fecha_texto)
-
-                        self.datos.append({
-                            'plataforma': 'computrabajo',
-                            'rol_busqueda': rol,
-                            'fecha_publicacion': fecha_calculada,
-                            'oferta_laboral': oferta_laboral,
-                            'locacion': locacion,
-                            'descripcion': descripcion,
-                            'sueldo': self.extraer_sueldo_numerico(sueldo_texto),
-                            'compania': compania,
-                            'url_publicacion': link,
-                            'processed': False # Se marca como pendiente para el Limpiador
-                        })
-
-                        contador_rol += 1
-                    pagina_actual += 1
-
-                except Exception as e:
-                    print(f"\n   💥 Error en p.{pagina_actual}: {e}")
+    def parsear_listado(self, html) -> list[dict]:
+        """Tarjetas de una página de listado (sin el detalle). Lista vacía si no hay ofertas."""
+        soup = BeautifulSoup(html, 'html.parser')
+        no_ofertas = soup.find('div', string=re.compile("No se ha encontrado ofertas"))
+        if no_ofertas: return []
+
+        ofertas = soup.find_all('article', class_='box_offer') or soup.find_all('article')
+        tarjetas = []
+        for oferta in ofertas:
+            titulo_tag = oferta.find('h1') or oferta.find('a', recursive=True)
+            if not titulo_tag: continue
+
+            anchor = titulo_tag.find('a') if titulo_tag.name == 'h1' else titulo_tag
+            href = anchor['href'] if anchor and anchor.has_attr('href') else None
+            if not href: continue
+
+            raw_title = titulo_tag.get_text(strip=True)
+
+            # Locación y Compañía
+            parrafos = oferta.find_all('p')
+            locacion = 'Ecuador'
+            if len(parrafos) > 1:
+                loc_candidata = parrafos[1].get_text(strip=True)
+                if "días" not in loc_candidata.lower() and "hoy" not in loc_candidata.lower():
+                    locacion = loc_candidata
+
+            compania = 'Confidencial'
+            p_fs16 = oferta.find('p', class_='fs16')
+            if p_fs16:
+                compania = p_fs16.get_text(strip=True).split(' - ', 1)[0].strip()
+
+            # Sueldo
+            sueldo_texto = 'No especificado'
+            info_extras = oferta.find_all('span', class_='mr10')
+            for info in info_extras:
+                if '$' in info.get_text():
+                    sueldo_texto = info.get_text(strip=True)
                     break
 
-            self.registros_por_rol[rol] = contador_rol
+            tarjetas.append({
+                'url_publicacion': self.base_url + href,
+                'oferta_laboral': raw_title.replace('PostuladoVista', '').strip(),
+                'locacion': locacion,
+                'compania': compania,
+                'sueldo': self.extraer_sueldo_numerico(sueldo_texto),
+            })
+        return tarjetas
 
-        self.guardar_supabase()
+    def recolectar(self):
+        if self.conocidas is None:
+            self.conocidas = cargar_urls_conocidas('computrabajo', self.scrape_days)
+        if self.checkpoint is None:
+            # En streaming las ofertas solo se encolan: no hay página guardada que anotar
+            self.checkpoint = Checkpoint('computrabajo', self.scrape_days, reanudar=self.reanudar,
+                                         anotar=self.sumidero is None)
+        asyncio.run(self._recolectar())
+        if all(self.checkpoint.rol_completo(rol) for rol in self.roles):
+            self.checkpoint.terminar()
+        return self.guardar_supabase()
+
+    async def _recolectar(self):
+        # Un cliente keep-alive para toda la corrida; los detalles van en paralelo (límite por host)
+        async with MotorDescargas(self.headers, concurrencia_por_host=self.concurrencia,
+                                  regulador=self.regulador) as motor:
+            for rol in self.roles:
+                if self.checkpoint.rol_completo(rol):
+                    print(f"\n⏭️ COMPUTRABAJO: {rol.upper()} ya se completó en la corrida anterior")
+                    continue
+                print(f"\n🔎 BUSCANDO EN COMPUTRABAJO: {rol.upper()} (Últimos {self.scrape_days} días)")
+                self.registros_por_rol[rol] = await self._recolectar_rol(motor, rol)
+            print(f"\n📊 COMPUTRABAJO: {motor.stats.resumen()}")
+            print(f"🚦 Ritmo {self.regulador.resumen(self.base_url)}")
+            print(f"🔁 COMPUTRABAJO: {self.conocidas.resumen()}")
+            if self.detalles_fallidos:
+                print(f"⚠️ COMPUTRABAJO: {self.detalles_fallidos} ofertas sin detalle descartadas (se reintentan en la próxima corrida)")
+
+    async def _recolectar_rol(self, motor: MotorDescargas, rol: str) -> int:
+        """
+        Recorre las páginas de listado en orden; los detalles de cada página se lanzan
+        como tareas y se descargan mientras se pide y parsea la página siguiente.
+        Cada página se sube y se anota en el checkpoint cuando terminan sus detalles.
+        Devuelve cuántas ofertas se completaron.
+        """
+        slug = rol.replace(" ", "-")
+        pagina_actual = self.checkpoint.pagina_inicial(rol)
+        if pagina_actual > 1:
+            print(f"   ⏯️ Retomando desde la página {pagina_actual}")
+        max_paginas_seguridad = 20 # Reducido para diario, usualmente sobran
+        cierres = []
+        completadas = 0
+        completo = True
+
+        while pagina_actual <= max_paginas_seguridad:
+            # pubdate={self.scrape_days} filtra directamente en el servidor de Computrabajo
+            url = f"{self.base_url}/trabajo-de-{slug}?pubdate={self.scrape_days}&p={pagina_actual}"
 
-    def parse_detalle(self, url):
-        try:
-            res = requests.get(url, headers=self.headers, timeout=5)
-            if res.status_code != 200: return '', ''
-            soup = BeautifulSoup(res.content, 'html.parser')
-
-            fecha = ''
-            elementos_fs13 = soup.find_all('p', class_='fs13')
-            for el in elementos_fs13:
-                txt = el.get_text(strip=True)
-                if "Publicado" in txt or "hace" in txt.lower():
-                    fecha = txt
+            try:
+                res = await motor.obtener(url)
+                if res is None: # sin respuesta tras los reintentos: el rol queda a medias
+                    completo = False
+                    break
+                if res.status_code != 200:
+                    # 404 = no hay más páginas; 403/429/5xx tras los reintentos dejan el rol a medias
+                    completo = res.status_code == 404
                     break
 
-            descripcion_str = ''
-            box_desc = soup.find('div', class_='mb40 pb40 bb1')
-            if box_desc:
-                partes = [p.get_text(strip=True) for p in box_desc.find_all('p')]
-                descripcion_str = "\n\n".join(partes)
+                tarjetas = self.parsear_listado(res.content)
+                if not tarjetas: break
+
+                # Las ofertas que ya están en jobs_raw no se vuelven a descargar ni a guardar
+                conocidas = await asyncio.to_thread(self.conocidas.conocidas, [t['url_publicacion'] for t in tarjetas])
+                print(f"   📡 Pág {pagina_actual}... ✅ {len(tarjetas)} ofertas ({len(conocidas)} ya conocidas).")
+                detalles = [asyncio.create_task(self._completar(motor, rol, tarjeta))
+                            for tarjeta in tarjetas if tarjeta['url_publicacion'] not in conocidas]
+                completadas += len(detalles)
+                anterior = cierres[-1] if cierres else None
+                cierres.append(asyncio.create_task(self._cerrar_pagina(rol, pagina_actual, detalles, anterior)))
+                pagina_actual += 1
+
+            except Exception as e:
+                print(f"\n   💥 Error en p.{pagina_actual}: {e}")
+                completo = False
+                break
+
+        guardadas_en_orden = all(await asyncio.gather(*cierres))
+        if completo and guardadas_en_orden:
+            self.checkpoint.marcar_rol(rol)
+        return completadas
+
+    async def _cerrar_pagina(self, rol: str, pagina: int, detalles: list, anterior) -> bool:
+        """
+        Espera los detalles de la página, la sube a jobs_raw y la anota en el checkpoint.
+        Va después del cierre de la página anterior: el checkpoint avanza siempre en orden
+        y nunca queda una página anotada con otra anterior sin guardar.
+        """
+        registros = await asyncio.gather(*detalles)
+        previas_guardadas = anterior is None or await anterior
+        if self.sumidero is None:
+            self.datos.extend(r for r in registros if r is not None)
+        guardada = await asyncio.to_thread(self.guardar_lote)
+        if not (previas_guardadas and guardada):
+            return False # el checkpoint queda en la última página guardada sin huecos
+        await asyncio.to_thread(self.checkpoint.marcar_pagina, rol, pagina)
+        return True
+
+    async def _completar(self, motor: MotorDescargas, rol: str, tarjeta: dict) -> dict | None:
+        detalle = await self.parse_detalle(motor, tarjeta['url_publicacion'])
+        if detalle is None:
+            # Sin detalle no se guarda: una fila vacía quedaría "conocida" y no se repararía nunca.
+            # Así sigue desconocida y la próxima corrida la vuelve a pedir.
+            self.detalles_fallidos += 1
+            return None
+        fecha_texto, descripcion = detalle
+        registro = {
+            'plataforma': 'computrabajo',
+            'rol_busqueda': rol,
+            'fecha_publicacion': self.parsear_fecha(fecha_texto),
+            'oferta_laboral': tarjeta['oferta_laboral'],
+            'locacion': tarjeta['locacion'],
+            'descripcion': descripcion,
+            'sueldo': tarjeta['sueldo'],
+            'compania': tarjeta['compania'],
+            'url_publicacion': tarjeta['url_publicacion'],
+            'processed': False # Se marca como pendiente para el Limpiador
+        }
+        if self.sumidero is None:
+            return registro
+        # put bloqueante (cola llena = contrapresión) fuera del event loop
+        await asyncio.to_thread(self.sumidero, registro)
+        return None
 
-            return fecha, descripcion_str
+    async def parse_detalle(self, motor: MotorDescargas, url) -> tuple[str, str] | None:
+        """(fecha, descripción) del detalle; None si no se pudo bajar o parsear."""
+        res = await motor.obtener(url, timeout=5)
+        if res is None or res.status_code != 200: return None
+        try:
+            return self.parsear_detalle(res.content)
         except Exception:
-            return "", ""
+            return None
+
+    @staticmethod
+    def parsear_detalle(html):
+        soup = BeautifulSoup(html, 'html.parser')
+
+        fecha = ''
+        elementos_fs13 = soup.find_all('p', class_='fs13')
+        for el in elementos_fs13:
+            txt = el.get_text(strip=True)
+            if "Publicado" in txt or "hace" in txt.lower():
+                fecha = txt
+                break
+
+        descripcion_str = ''
+        box_desc = soup.find('div', class_='mb40 pb40 bb1')
+        if box_desc:
+            partes = [p.get_text(strip=True) for p in box_desc.find_all('p')]
+            descripcion_str = "\n\n".join(partes)
+
+        return fecha, descripcion_str
+
+    def guardar_lote(self) -> bool:
+        """
+        Sube a jobs_raw las ofertas completadas desde el último volcado (una página).
+        False si no se pudo guardar ninguna: Supabase caído, la página no se anota.
+        """
+        lote, self.datos = self.datos, []
+        if not lote: return True
+
+        # UPSERT por lotes basado en 'url_publicacion'
+        resultados = guardar_ofertas_crudas(lote, verbose=False)
+        ok = {r.url_publicacion for r in resultados if r.ok}
+        self.urls_guardadas.update(ok)
+        print(f"   💾 {len(ok)}/{len(resultados)} ofertas de la página en jobs_raw.")
+        return bool(ok)
 
     def guardar_supabase(self):
-        df = pd.DataFrame(self.datos)
-        if df.empty: return
-
-        df.drop_duplicates(subset=['url_publicacion'], inplace=True)
-        print(f"\n💾 Subiendo {len(df)} registros únicos a jobs_raw...")
-
-        exitos = 0
-        for _, row in df.iterrows():
-            # El helper debe usar UPSERT basado en 'url_publicacion'
-            if guardar_oferta_cruda(row.to_dict()):
-                exitos += 1
-        
-        print(f"✅ Proceso terminado: {exitos} guardados/actualizados.")
+        # Las ya conocidas no se re-suben: solo se registra que siguen publicadas
+        if self.conocidas and self.conocidas.vistas:
+            marcar_vistas(self.conocidas.vistas)
 
-# Función para ser llamada desde main.py
-def correr_scraper_computrabajo(roles, dias=2):
-    recolector = RecolectorComputrabajo(roles=roles, scrape_days=dias)
-    recolector.recolectar()
\ No newline at end of file
+        self.guardar_lote() # lo que haya quedado sin volcar
+        exitos = len(self.urls_guardadas)
+        print(f"✅ Proceso terminado: {exitos} guardados/actualizados.")
+        return exitos
+
+# Función para ser llamada desde main.py (devuelve el resumen de la corrida)
+def correr_scraper_computrabajo(roles, dias=2, sumidero=None, reanudar=False):
+    recolector = RecolectorComputrabajo(roles=roles, scrape_days=dias, sumidero=sumidero, reanudar=reanudar)
+    guardadas = recolector.recolectar()
+    resumen = {
+        'ofertas': sum(recolector.registros_por_rol.values()),
+        'detalles_evitados': recolector.conocidas.evitadas,
+    }
+    if sumidero is None: # en streaming las guarda el pipeline
+        resumen['guardadas'] = guardadas or 0
+    return resumen
@@ -1,13 +1,13 @@
 import os
 import sys
 import time
-import pandas as pd
-import random 
 from datetime import datetime
 import re
 
 import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 
 # =============================================================================
 # 🔗 CONFIGURACIÓN DE RUTAS E IMPORTACIONES
@@ -16,7 +16,9 @@ _scraper_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _scraper_root not in sys.path:
     sys.path.insert(0, _scraper_root)
 
-from db.supabase_helper import guardar_oferta_cruda
+from db.supabase_helper import guardar_ofertas_crudas
+from scrapers.checkpoints import Checkpoint
+from scrapers.regulador_tasa import REGULADOR
 
 # Pantalla virtual para VPS Linux
 try:
@@ -24,18 +26,29 @@ try:
 except ImportError:
     pass
 
+SELECTOR_TARJETAS = 'article, [data-test-name="_jobCard"]'
+# Jooble no expone el código HTTP a Selenium: un título así equivale a un 429
+MARCAS_BLOQUEO = ("too many requests", "429", "access denied", "captcha", "are you a robot")
+
 class RecolectorJooble:
     """
     Scraper optimizado con Scroll Humano y selectores de alta resistencia.
     Evita el error 'no such window' al no saturar el navegador con comandos rápidos.
     """
 
-    def __init__(self, roles, scrape_days: int = 2):
+    def __init__(self, roles, scrape_days: int = 2, sumidero=None, reanudar: bool = False):
         self.base_url = "https://ec.jooble.org"
         self.roles = roles
         self.scrape_days = scrape_days 
-        self.datos = []
+        self.sumidero = sumidero # Modo streaming: cada oferta va a sumidero(oferta) en vez de a self.datos
+        # Las ofertas se suben tras cada tramo de scroll y cada rol terminado queda anotado para --resume
+        # (en streaming solo se encolan: no se anota nada, ver checkpoints.py)
+        self.checkpoint = Checkpoint('jooble', scrape_days, reanudar=reanudar, anotar=sumidero is None)
+        self.datos = [] # ofertas aún no subidas a jobs_raw
+        self.urls_guardadas = set()
+        self.emitidas = 0
         self.registros_por_rol = {}
+        self.guardadas = 0
         
         self.options = uc.ChromeOptions()
         self.options.add_argument("--start-maximized")
@@ -64,6 +77,35 @@ class RecolectorJooble:
         if "remoto" in t or "teletrabajo" in t: return "Remoto"
         return "Ecuador"
 
+    def _cargar(self, driver, url, scroll: bool, timeout: float) -> bool:
+        """
+        Espera el turno del regulador, carga la URL (o baja 800 px, que dispara la carga
+        de más tarjetas) y espera a que aparezcan tarjetas nuevas. Reporta al regulador
+        cuánto tardaron. Devuelve True si Jooble mostró una página de bloqueo o captcha.
+        """
+        previas = len(driver.find_elements(By.CSS_SELECTOR, SELECTOR_TARJETAS)) if scroll else 0
+        REGULADOR.esperar(url)
+        inicio = time.perf_counter()
+        try:
+            if scroll:
+                driver.execute_script("window.scrollBy(0, 800);")
+            else:
+                driver.get(url)
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, SELECTOR_TARJETAS)) > previas
+            )
+        except TimeoutException:
+            # Sin tarjetas nuevas: fin de resultados o página bloqueada
+            titulo = (driver.title or "").lower()
+            if any(marca in titulo for marca in MARCAS_BLOQUEO):
+                REGULADOR.registrar(url, 429, time.perf_counter() - inicio)
+                return True
+            if not scroll:
+                REGULADOR.registrar(url, None, time.perf_counter() - inicio)
+            return False
+        REGULADOR.registrar(url, 200, time.perf_counter() - inicio)
+        return False
+
     def recolectar(self):
         print(f"🚀 INICIANDO JOOBLE DIARIO (Mirando {self.scrape_days} días atrás)")
         
@@ -87,25 +129,30 @@ class RecolectorJooble:
             driver.set_page_load_timeout(35)
 
             for rol in self.roles:
+                # El scroll infinito no se puede retomar a mitad: un rol cortado se repite entero
+                # (lo ya guardado vuelve como 'sin cambios' y no pasa otra vez por el limpiador)
+                if self.checkpoint.rol_completo(rol):
+                    print(f"\n⏭️ JOOBLE: {rol.upper()} ya se completó en la corrida anterior")
+                    continue
                 print(f"\n🔎 BUSCANDO: {rol.upper()}...")
                 query = f"ukw={rol.replace(' ', '%20')}" 
                 url = f"{self.base_url}/SearchResult?date={date_param}&{query}" if date_param else f"{self.base_url}/SearchResult?{query}"
                 
                 try:
-                    driver.get(url)
-                    time.sleep(random.uniform(5, 8))
-                    
+                    # El ritmo de cargas y scrolls lo pone el regulador AIMD (antes: pausas fijas de 2.5-8 s)
+                    bloqueado = self._cargar(driver, url, scroll=False, timeout=15)
+
                     links_vistos = set()
                     contador_rol = 0
                     
                     # --- SCROLL HUMANO POR TRAMOS ---
                     # Bajamos de 800 en 800 píxeles para que Jooble no nos tumbe la ventana
                     for scroll_step in range(1, 6): 
-                        driver.execute_script("window.scrollBy(0, 800);")
-                        time.sleep(random.uniform(2.5, 4.0)) 
-                        
+                        if bloqueado: break
+                        bloqueado = self._cargar(driver, url, scroll=True, timeout=4)
+
                         # Selectores basados en data-test-name identificados en inspección
-                        tarjetas = driver.find_elements(By.CSS_SELECTOR, 'article, [data-test-name="_jobCard"]')
+                        tarjetas = driver.find_elements(By.CSS_SELECTOR, SELECTOR_TARJETAS)
 
                         for tarjeta in tarjetas:
                             try:
@@ -133,7 +180,7 @@ class RecolectorJooble:
                                 except Exception:
                                     compania = "Confidencial"
 
-                                self.datos.append({
+                                self._emitir({
                                     'plataforma': 'jooble',
                                     'rol_busqueda': rol,
                                     'fecha_publicacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -147,13 +194,24 @@ class RecolectorJooble:
                                 contador_rol += 1
                                 
                             except Exception: continue
+
+                        self.guardar_lote()
                 except Exception as e:
                     print(f"⚠️ Error cargando rol {rol}: {e}")
                     continue
 
                 self.registros_por_rol[rol] = contador_rol
+                if bloqueado:
+                    # Lo visto ya se guardó, pero el rol no queda terminado: --resume lo repite
+                    print(f"   🚫 Jooble bloqueó la búsqueda tras {contador_rol} ofertas; el rol queda pendiente.")
+                    continue
+                self.checkpoint.marcar_rol(rol)
                 print(f"   ✅ Encontradas {contador_rol} ofertas.")
 
+            print(f"🚦 Ritmo {REGULADOR.resumen(self.base_url)}")
+            if all(self.checkpoint.rol_completo(rol) for rol in self.roles):
+                self.checkpoint.terminar()
+
         finally:
             if driver:
                 try: driver.quit()
@@ -161,18 +219,31 @@ class RecolectorJooble:
             if display:
                 try: display.stop()
                 except Exception: pass
-            self.guardar_supabase()
+            self.guardadas = self.guardar_supabase()
+
+    def _emitir(self, registro: dict):
+        self.emitidas += 1
+        if self.sumidero is not None:
+            self.sumidero(registro)
+        else:
+            self.datos.append(registro)
+
+    def guardar_lote(self):
+        """Sube a jobs_raw lo recolectado desde el último tramo de scroll."""
+        lote, self.datos = self.datos, []
+        if not lote: return
+        resultados = guardar_ofertas_crudas(lote, verbose=False)
+        self.urls_guardadas.update(r.url_publicacion for r in resultados if r.ok)
 
     def guardar_supabase(self):
-        if not self.datos: return
-        df = pd.DataFrame(self.datos).drop_duplicates(subset=['url_publicacion'])
-        
-        exitos = 0
-        for _, row in df.iterrows():
-            if guardar_oferta_cruda(row.to_dict()):
-                exitos += 1
+        self.guardar_lote() # lo que haya quedado sin volcar
+        exitos = len(self.urls_guardadas)
         print(f"✅ JOOBLE: {exitos} registros en jobs_raw.")
-
-def correr_scraper_jooble(roles, dias=2):
-    bot = RecolectorJooble(roles, scrape_days=dias)
-    bot.recolectar()
\ No newline at end of file
+        return exitos
+
+def correr_scraper_jooble(roles, dias=2, sumidero=None, reanudar=False):
+    bot = RecolectorJooble(roles, scrape_days=dias, sumidero=sumidero, reanudar=reanudar)
+    bot.recolectar()
+    if sumidero is not None: # en streaming las guarda el pipeline
+        return {'ofertas': bot.emitidas}
+    return {'ofertas': bot.emitidas, 'guardadas': bot.guardadas}
\ No newline at end of file
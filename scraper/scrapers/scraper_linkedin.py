@@ -5,7 +5,6 @@ from jobspy import scrape_jobs
 import requests
 from bs4 import BeautifulSoup
 import time
-import random
 import re
 from datetime import datetime
 
@@ -16,7 +15,9 @@ _scraper_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if _scraper_root not in sys.path:
     sys.path.insert(0, _scraper_root)
 
-from db.supabase_helper import guardar_oferta_cruda
+from db.supabase_helper import guardar_ofertas_crudas, marcar_vistas
+from db.urls_conocidas import cargar_urls_conocidas
+from scrapers.regulador_tasa import REGULADOR
 
 class DetectorSueldo:
     @staticmethod
@@ -44,9 +45,16 @@ def extraer_detalles_completos(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
     }
     resultado = {"description": None, "salary_extracted": None}
+    # El ritmo lo pone el regulador AIMD compartido (antes: pausa fija de 2-5 s)
+    REGULADOR.esperar(url)
+    inicio = time.perf_counter()
     try:
-        time.sleep(random.uniform(2, 5)) 
         res = requests.get(url, headers=headers, timeout=10)
+    except requests.RequestException:
+        REGULADOR.registrar(url, None, time.perf_counter() - inicio)
+        return resultado
+    REGULADOR.registrar(url, res.status_code, time.perf_counter() - inicio, res.headers.get("Retry-After"))
+    try:
         if res.status_code == 200:
             soup = BeautifulSoup(res.text, 'html.parser')
             desc_tag = soup.find('div', {'class': 'show-more-less-html__markup'}) or \
@@ -58,10 +66,12 @@ def extraer_detalles_completos(url):
     except Exception:
         return resultado
 
-def ejecutar_linkedin(roles, scrape_days: int = 2): 
+def ejecutar_linkedin(roles, scrape_days: int = 2, sumidero=None): 
     """
     Versión optimizada para ejecución diaria. 
     scrape_days se multiplica por 24 para obtener las horas exactas.
+    Con sumidero (modo streaming) cada oferta enriquecida se entrega a sumidero(oferta)
+    en vez de subirse al final.
     """
     hours_old = scrape_days * 24 
     RESULTS_WANTED = 40 # LinkedIn suele limitar resultados públicos
@@ -70,18 +80,21 @@ def ejecutar_linkedin(roles, scrape_days: int = 2):
     print(f"🚀 SCRAPER LINKEDIN DIARIO ({hours_old} horas atrás)")
     print("="*60)
 
+    conocidas = cargar_urls_conocidas('linkedin', scrape_days)
+
     df_lista = []
     for idx, t in enumerate(roles, 1): 
         print(f"[{idx}/{len(roles)}] 🔎 Buscando: {t.upper()}...")
         try:
-            # JobSpy filtra por antigüedad usando hours_old
+            # JobSpy filtra por antigüedad usando hours_old. La descripción no se la pedimos:
+            # bajaría el detalle de todas las ofertas, también de las que ya tenemos guardadas.
             jobs = scrape_jobs(
                 site_name=["linkedin"],
                 search_term=t,
                 location="Ecuador",
                 results_wanted=RESULTS_WANTED,
                 hours_old=hours_old,
-                linkedin_fetch_description=True 
+                linkedin_fetch_description=False
             )
             if not jobs.empty:
                 jobs['rol_busqueda'] = t
@@ -93,14 +106,24 @@ def ejecutar_linkedin(roles, scrape_days: int = 2):
 
     if not df_lista:
         print("\n⚠️ No se encontraron ofertas nuevas en LinkedIn.")
-        return
+        return {'ofertas': 0, 'guardadas': 0}
 
     df = pd.concat(df_lista, ignore_index=True)
     df = df.drop_duplicates(subset=['job_url'])
 
+    # Las ofertas que ya están en jobs_raw no se vuelven a descargar ni a guardar
+    ya_guardadas = conocidas.conocidas(df['job_url'].dropna().tolist())
+    df = df[~df['job_url'].isin(ya_guardadas)].reset_index(drop=True)
+    marcar_vistas(ya_guardadas) # siguen publicadas: solo se refresca last_seen_at
+    print(f"🔁 LINKEDIN: {conocidas.resumen()}")
+    if df.empty:
+        print("\n⚠️ No hay ofertas nuevas de LinkedIn para enriquecer.")
+        return {'ofertas': len(ya_guardadas), 'guardadas': 0, 'detalles_evitados': conocidas.evitadas}
+
     print(f"🕵️ Enriqueciendo {len(df)} ofertas...")
     
-    exitos = 0
+    registros = []
+    sin_detalle = 0
     for index, row in df.iterrows():
         url = row.get('job_url', '')
         desc_original = row.get('description', '')
@@ -108,7 +131,12 @@ def ejecutar_linkedin(roles, scrape_days: int = 2):
         # Solo extraemos detalles si la descripción está incompleta
         if not desc_original or len(str(desc_original)) < 200:
             info = extraer_detalles_completos(url)
-            descripcion = info["description"] if info["description"] else desc_original
+            if not info["description"]:
+                # Sin detalle no se guarda: una fila vacía quedaría "conocida" y no se repararía
+                # nunca. Así sigue desconocida y la próxima corrida la vuelve a pedir.
+                sin_detalle += 1
+                continue
+            descripcion = info["description"]
             sueldo = info["salary_extracted"]
         else:
             descripcion = desc_original
@@ -128,14 +156,28 @@ def ejecutar_linkedin(roles, scrape_days: int = 2):
             'processed': False # Clave para que el limpiador las recoja
         }
         
-        # Guardar con UPSERT (Evita duplicados en la DB)
-        if guardar_oferta_cruda(datos):
-            exitos += 1
-        
+        if sumidero is not None:
+            sumidero(datos)
+        else:
+            registros.append(datos)
+
         if (index + 1) % 5 == 0:
             print(f"   ↳ Procesadas {index+1}/{len(df)}...")
 
+    if sin_detalle:
+        print(f"⚠️ LINKEDIN: {sin_detalle} ofertas sin detalle descartadas (se reintentan en la próxima corrida)")
+
+    if sumidero is not None: # en streaming las guarda el pipeline
+        print(f"✨ LINKEDIN FINALIZADO: {len(df) - sin_detalle} ofertas entregadas al pipeline.")
+        print(f"🚦 Ritmo {REGULADOR.resumen('https://www.linkedin.com')}")
+        return {'ofertas': len(df) + len(ya_guardadas), 'detalles_evitados': conocidas.evitadas}
+
+    # Guardar con UPSERT por lotes (Evita duplicados en la DB)
+    resultados = guardar_ofertas_crudas(registros)
+    exitos = sum(1 for r in resultados if r.ok)
     print(f"✨ LINKEDIN FINALIZADO: {exitos} registros nuevos/actualizados.")
+    print(f"🚦 Ritmo {REGULADOR.resumen('https://www.linkedin.com')}")
+    return {'ofertas': len(df) + len(ya_guardadas), 'guardadas': exitos, 'detalles_evitados': conocidas.evitadas}
 
 if __name__ == "__main__":
     ejecutar_linkedin(["desarrollador python"], scrape_days=2)
\ No newline at end of file